@@ -0,0 +1,73 @@
+"""
+Measures the per-invocation cost of setting up AWS clients the old way
+(fresh boto3 resource/client in every handler call) against the shared
+client registry.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_client_registry --invocations 200
+"""
+import argparse
+import os
+import time
+import boto3
+
+import backend.common.clients as aws_clients
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+
+def setup_per_invocation():
+    dynamodb = boto3.resource('dynamodb')
+    users_table = dynamodb.Table('users')
+    events_table = dynamodb.Table('events')
+    s3_client = boto3.client('s3')
+
+    return users_table, events_table, s3_client
+
+def setup_with_registry():
+    users_table = aws_clients.get_dynamodb_table('users')
+    events_table = aws_clients.get_dynamodb_table('events')
+    s3_client = aws_clients.get_s3_client()
+
+    return users_table, events_table, s3_client
+
+def measure(setup, invocations):
+    timings = []
+
+    for _ in range(invocations):
+        started_at = time.perf_counter()
+        setup()
+        timings.append((time.perf_counter() - started_at) * 1000)
+
+    timings.sort()
+
+    return {
+        'mean_ms': sum(timings) / len(timings),
+        'p50_ms': timings[len(timings) // 2],
+        'p99_ms': timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--invocations', type=int, default=200)
+    args = parser.parse_args()
+
+    # Warm up botocore's model loading so both variants start from the same state
+    setup_per_invocation()
+
+    per_invocation = measure(setup_per_invocation, args.invocations)
+
+    cold_started_at = time.perf_counter()
+    setup_with_registry()
+    registry_cold_ms = (time.perf_counter() - cold_started_at) * 1000
+
+    registry = measure(setup_with_registry, args.invocations)
+
+    print(f'Invocations: {args.invocations}')
+    print(f"Per-invocation boto3 setup: mean {per_invocation['mean_ms']:.3f} ms, p50 {per_invocation['p50_ms']:.3f} ms, p99 {per_invocation['p99_ms']:.3f} ms")
+    print(f'Registry first (cold) call: {registry_cold_ms:.3f} ms')
+    print(f"Registry warm setup:        mean {registry['mean_ms']:.3f} ms, p50 {registry['p50_ms']:.3f} ms, p99 {registry['p99_ms']:.3f} ms")
+
+if __name__ == '__main__':
+    main()
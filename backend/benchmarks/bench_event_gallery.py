@@ -0,0 +1,164 @@
+"""
+Fills event_images with 200k gallery rows spread over 2000 events and compares
+loading one event's gallery the old way (Scan with a FilterExpression on
+event_id, every page, since a single page misses most of the gallery) with
+one page from the event_id-created_at GSI. It also times event_info, which now
+reads the event and the first gallery page concurrently. DynamoDB is moto, which
+evaluates a GSI query by walking every item it holds, so the items read
+(ScannedCount, what read capacity is billed on) matter more than its latency.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_event_gallery --rows 200000 --events 2000
+"""
+import argparse
+import json
+import os
+import time
+import uuid
+from boto3.dynamodb.conditions import Attr
+from moto import mock_aws
+
+import backend.common.clients as aws_clients
+import backend.common.common as common_handler
+import backend.common.gallery as gallery
+from backend.events_service.events import event_info
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+os.environ['EVENTS_TABLE_NAME'] = 'events'
+os.environ['EVENT_IMAGES_TABLE_NAME'] = 'event_images'
+os.environ['JWT_SECRET_NAME'] = 'jwt-secret'
+os.environ['SECRETS_REGION_NAME'] = 'eu-central-1'
+
+def create_resources(rows, event_count):
+    dynamodb = aws_clients.get_dynamodb_resource()
+
+    dynamodb.create_table(
+        TableName='events',
+        KeySchema=[{'AttributeName': 'event_id', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'event_id', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+    dynamodb.create_table(
+        TableName='event_images',
+        KeySchema=[{'AttributeName': 'id', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[
+            {'AttributeName': 'id', 'AttributeType': 'S'},
+            {'AttributeName': 'event_id', 'AttributeType': 'S'},
+            {'AttributeName': 'created_at', 'AttributeType': 'S'}
+        ],
+        GlobalSecondaryIndexes=[{
+            'IndexName': gallery.EVENT_IMAGES_INDEX_NAME,
+            'KeySchema': [
+                {'AttributeName': 'event_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'created_at', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+    aws_clients.get_client('secretsmanager').create_secret(
+        Name='jwt-secret',
+        SecretString=json.dumps({'jwt_secret': 'benchmark', 'refresh_secret': 'benchmark'})
+    )
+
+    event_ids = [str(uuid.uuid4()) for _ in range(event_count)]
+
+    with dynamodb.Table('events').batch_writer() as batch:
+        for event_id in event_ids:
+            batch.put_item(Item={'event_id': event_id, 'title': 'Benchmark event'})
+
+    with dynamodb.Table('event_images').batch_writer() as batch:
+        for row in range(rows):
+            batch.put_item(Item={
+                'id': str(uuid.uuid4()),
+                'event_id': event_ids[row % event_count],
+                'user_id': f'user{row % 5000}@gmail.com',
+                'first_name': 'John',
+                'last_name': 'Doe',
+                'image_link': f'https://cdn.example.com/{row}.jpg',
+                'created_at': f'2030-05-01T{(row // 3600) % 24:02d}:{(row // 60) % 60:02d}:{row % 60:02d}+00:00'
+            })
+
+    return event_ids
+
+def count_items_read():
+    items_read = {'count': 0}
+
+    def add_scanned_count(parsed, **kwargs):
+        items_read['count'] += parsed.get('ScannedCount', 0)
+
+    events = aws_clients.get_dynamodb_client().meta.events
+    events.register('after-call.dynamodb.Scan', add_scanned_count)
+    events.register('after-call.dynamodb.Query', add_scanned_count)
+
+    return items_read
+
+def scan_gallery(event_id):
+    event_images_table = aws_clients.get_dynamodb_table('event_images')
+
+    scan_kwargs = {'FilterExpression': Attr('event_id').eq(event_id)}
+    items = []
+
+    while True:
+        response = event_images_table.scan(**scan_kwargs)
+        items.extend(response['Items'])
+
+        if 'LastEvaluatedKey' not in response:
+            return items
+
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def measure(function, repeats):
+    timings = []
+
+    for _ in range(repeats):
+        started_at = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - started_at) * 1000)
+
+    timings.sort()
+
+    return timings[len(timings) // 2], result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--events', type=int, default=2000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    # Keep handler logging out of the measurement
+    for module in (event_info, common_handler, gallery):
+        module.logger.setLevel('WARNING')
+
+    with mock_aws():
+        started_at = time.perf_counter()
+        event_ids = create_resources(args.rows, args.events)
+        print(f'Loaded {args.rows} gallery rows for {args.events} events in {time.perf_counter() - started_at:.0f} s')
+
+        event_id = event_ids[0]
+        items_read = count_items_read()
+
+        scan_ms, scanned_items = measure(lambda: scan_gallery(event_id), 1)
+        scan_items_read = items_read['count']
+
+        items_read['count'] = 0
+        query_ms, (page, _) = measure(lambda: gallery.get_gallery_page(event_id), 1)
+        query_items_read = items_read['count']
+
+        info_request = {
+            'queryStringParameters': {'event_id': event_id},
+            'requestContext': {'authorizer': {'lambda': {'email': 'john.doe@gmail.com'}}}
+        }
+        info_ms, _ = measure(lambda: event_info.lambda_handler(info_request, None), args.repeats)
+
+    print(f'Scan + filter (all pages):  {scan_ms:9.1f} ms, {scan_items_read} items read for {len(scanned_items)} images')
+    print(f'GSI query (first page):     {query_ms:9.1f} ms, {query_items_read} items read for {len(page)} images')
+    print(f'event_info (event + page):  {info_ms:9.1f} ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Calls get_users_events for a user with 30 joined events, once with inline
+base64 images and once with presigned URLs, and reports latency, peak
+Python memory (tracemalloc) and response size. S3 and DynamoDB are moto.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_event_images --events 30 --image-kb 300
+"""
+import argparse
+import os
+import time
+import tracemalloc
+import uuid
+from moto import mock_aws
+
+import backend.common.clients as aws_clients
+import backend.common.images as images
+from backend.events_service.events import get_users_events_lambda
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+os.environ['USERS_TABLE_NAME'] = 'users'
+os.environ['EVENTS_TABLE_NAME'] = 'events'
+os.environ['EVENT_PICTURES_BUCKET'] = 'lambda-event-pictures'
+
+EMAIL = 'john.doe@gmail.com'
+
+def create_resources(event_count, image_bytes):
+    dynamodb = aws_clients.get_dynamodb_resource()
+
+    for table_name, key in (('users', 'email'), ('events', 'event_id')):
+        dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=[{'AttributeName': key, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': key, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+    s3_client = aws_clients.get_s3_client()
+    s3_client.create_bucket(
+        Bucket=os.environ['EVENT_PICTURES_BUCKET'],
+        CreateBucketConfiguration={'LocationConstraint': 'eu-central-1'}
+    )
+
+    event_ids = []
+
+    for index in range(event_count):
+        event_id = str(uuid.uuid4())
+        event_ids.append(event_id)
+
+        dynamodb.Table('events').put_item(Item={
+            'event_id': event_id,
+            'title': f'Event {index}',
+            'description': 'Benchmark event',
+            'latitude': '45.33',
+            'longitude': '14.44'
+        })
+
+        s3_client.put_object(Bucket=os.environ['EVENT_PICTURES_BUCKET'], Key=f'{event_id}.jpg', Body=os.urandom(image_bytes))
+
+    dynamodb.Table('users').put_item(Item={'email': EMAIL, 'events': event_ids})
+
+def invoke(image_mode, repeats):
+    event = {
+        'queryStringParameters': {'image_mode': image_mode},
+        'requestContext': {'authorizer': {'lambda': {'email': EMAIL}}}
+    }
+
+    timings = []
+    peaks = []
+
+    for _ in range(repeats):
+        tracemalloc.start()
+        started_at = time.perf_counter()
+
+        result = get_users_events_lambda.lambda_handler(event, None)
+
+        timings.append((time.perf_counter() - started_at) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+        assert result['statusCode'] == 200
+
+    timings.sort()
+
+    return timings[len(timings) // 2], max(peaks), len(result['body'])
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=30)
+    parser.add_argument('--image-kb', type=int, default=300)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    # Keep handler logging out of the measurement
+    get_users_events_lambda.logger.setLevel('WARNING')
+
+    with mock_aws():
+        create_resources(args.events, args.image_kb * 1024)
+
+        inline = invoke(images.IMAGE_MODE_INLINE, args.repeats)
+        presigned = invoke(images.IMAGE_MODE_URL, args.repeats)
+
+    print(f'Events: {args.events}, image size: {args.image_kb} KB')
+    print(f'Inline base64:  p50 {inline[0]:7.1f} ms, peak memory {inline[1] / 1024 / 1024:6.1f} MB, body {inline[2] / 1024:8.1f} KB')
+    print(f'Presigned URLs: p50 {presigned[0]:7.1f} ms, peak memory {presigned[1] / 1024 / 1024:6.1f} MB, body {presigned[2] / 1024:8.1f} KB')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Imports --events events for one club and compares one /event/register call per
+event with a single /event/import of the whole schedule as JSON Lines. Moto
+answers in-process, so --latency-ms adds a per-request delay that stands in for
+the network round trip.
+
+The second part reports the peak Python memory (tracemalloc) of reading and
+validating schedules of growing size, without the writes: the old way of
+splitting the body and parsing every row up front, and import_events_lambda's
+streaming rows. The body itself is allocated before tracing starts.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_event_import --events 1000 --latency-ms 10
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from moto import mock_aws
+
+import backend.common.clients as aws_clients
+import backend.common.event_schema as event_schema
+from backend.events_service.events import register_lambda
+from backend.events_service.events import import_events_lambda
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+os.environ['EVENTS_TABLE_NAME'] = 'events'
+os.environ['GIVEAWAY_TABLE_NAME'] = 'giveaways'
+os.environ['CLUBS_TABLE_NAME'] = 'clubs'
+os.environ['EVENT_PICTURES_BUCKET'] = 'lambda-event-pictures'
+
+CLUB = 'club@club.com'
+
+AUTHORIZER = {'authorizer': {'lambda': {'email': CLUB}}}
+
+def event_row(index):
+    return {
+        'title': f'Night {index}',
+        'description': 'Techno in the arena, from ten until the sun comes up',
+        'startingAt': '2030-05-01 22:00',
+        'endingAt': '2030-05-02 04:00',
+        'genre': 'techno',
+        'performers': 'Resident DJs',
+        'giveaway': {'prize': 'Two tickets', 'description': 'Join to win', 'name': 'Ticket giveaway'}
+    }
+
+def create_resources():
+    dynamodb = aws_clients.get_dynamodb_resource()
+
+    for table_name, key in (('events', 'event_id'), ('giveaways', 'giveaway_id'), ('clubs', 'club_id')):
+        dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=[{'AttributeName': key, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': key, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+    dynamodb.Table('clubs').put_item(Item={'club_id': CLUB, 'latitude': '45.33', 'longitude': '14.44'})
+
+    aws_clients.get_s3_client().create_bucket(
+        Bucket=os.environ['EVENT_PICTURES_BUCKET'],
+        CreateBucketConfiguration={'LocationConstraint': 'eu-central-1'}
+    )
+
+def count_requests(latency_ms):
+    requests = {'count': 0}
+
+    def delay(**kwargs):
+        requests['count'] += 1
+        time.sleep(latency_ms / 1000)
+
+    aws_clients.get_dynamodb_client().meta.events.register('before-send.dynamodb', delay)
+
+    return requests, delay
+
+def register_one_by_one(events):
+    for row in events:
+        result = register_lambda.lambda_handler({'body': json.dumps(row), 'requestContext': AUTHORIZER}, None)
+        assert result['statusCode'] == 200
+
+def import_all(events):
+    body = '\n'.join(json.dumps(row) for row in events)
+
+    result = import_events_lambda.lambda_handler({
+        'body': body,
+        'headers': {'content-type': 'application/x-ndjson'},
+        'requestContext': AUTHORIZER
+    }, None)
+
+    assert json.loads(result['body'])['created'] == len(events)
+
+def measure_writes(write, events, latency_ms):
+    requests, delay = count_requests(latency_ms)
+
+    started_at = time.perf_counter()
+    write(events)
+    elapsed = time.perf_counter() - started_at
+
+    aws_clients.get_dynamodb_client().meta.events.unregister('before-send.dynamodb', delay)
+
+    return elapsed, requests['count']
+
+def read_whole(body):
+    rows = [json.loads(line) for line in body.splitlines() if line.strip()]
+    items = [event_schema.build_event_items(row, CLUB, {}) for row in rows if not event_schema.validate_event(row)]
+
+    return len(items)
+
+def read_streaming(body):
+    rows = import_events_lambda.iter_jsonl_rows(import_events_lambda.iter_body_lines({'body': body}))
+
+    return sum(1 for _, row, _ in rows if not event_schema.validate_event(row) and event_schema.build_event_items(row, CLUB, {}))
+
+def peak_megabytes(read, body):
+    tracemalloc.start()
+    read(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak / 1024 / 1024
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=1000)
+    parser.add_argument('--latency-ms', type=float, default=10)
+    args = parser.parse_args()
+
+    register_lambda.logger.setLevel('WARNING')
+
+    events = [event_row(index) for index in range(args.events)]
+
+    with mock_aws():
+        create_resources()
+
+        register_seconds, register_requests = measure_writes(register_one_by_one, events, args.latency_ms)
+        import_seconds, import_requests = measure_writes(import_all, events, args.latency_ms)
+
+    print(f'{args.events} events, {args.latency_ms:.0f} ms per DynamoDB request')
+    print(f'/event/register per event: {register_seconds:7.2f} s, {register_requests:5} DynamoDB requests')
+    print(f'/event/import:             {import_seconds:7.2f} s, {import_requests:5} DynamoDB requests')
+
+    print('Peak memory reading and validating the body (MB)')
+    print('rows      whole  streaming')
+
+    for rows in (1000, 5000, 20000):
+        body = '\n'.join(json.dumps(event_row(index)) for index in range(rows))
+
+        print(f'{rows:5} {peak_megabytes(read_whole, body):10.1f} {peak_megabytes(read_streaming, body):10.1f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""
+--users users join one event from --threads threads, first the old way (GetItem
+event, GetItem user, UpdateItem participants, UpdateItem with list_append on the
+user's events list) and then through join_event_lambda's single transaction.
+Every user sends the join twice, like a client retrying after a timeout. Moto
+answers in-process, so --latency-ms adds a per-request delay that stands in for
+the network round trip. Moto doesn't isolate transactions from each other (it
+restores a copy of the tables when one is cancelled), so they are serialised
+with a lock here the way DynamoDB would.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_event_join --users 500 --threads 16 --latency-ms 10
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from moto import mock_aws
+from moto.dynamodb.models import DynamoDBBackend
+
+import backend.common.clients as aws_clients
+import backend.common.participants as participants
+from backend.events_service.events import join_event_lambda
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+os.environ['EVENTS_TABLE_NAME'] = 'events'
+os.environ['USERS_TABLE_NAME'] = 'users'
+os.environ['EVENT_PARTICIPANTS_TABLE_NAME'] = 'event_participants'
+os.environ['EVENT_PARTICIPANT_COUNTERS_TABLE_NAME'] = 'event_participant_counters'
+
+def isolate_transactions():
+    transaction_lock = threading.Lock()
+    transact_write_items = DynamoDBBackend.transact_write_items
+
+    def locked_transact_write_items(self, *args, **kwargs):
+        with transaction_lock:
+            return transact_write_items(self, *args, **kwargs)
+
+    DynamoDBBackend.transact_write_items = locked_transact_write_items
+
+def create_tables(users):
+    dynamodb = aws_clients.get_dynamodb_resource()
+
+    for table_name, key in (('events', 'event_id'), ('users', 'email')):
+        dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=[{'AttributeName': key, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': key, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+    dynamodb.create_table(
+        TableName='event_participants',
+        KeySchema=[{'AttributeName': 'event_id', 'KeyType': 'HASH'}, {'AttributeName': 'user_email', 'KeyType': 'RANGE'}],
+        AttributeDefinitions=[
+            {'AttributeName': 'event_id', 'AttributeType': 'S'},
+            {'AttributeName': 'user_email', 'AttributeType': 'S'},
+            {'AttributeName': 'joined_at', 'AttributeType': 'S'}
+        ],
+        GlobalSecondaryIndexes=[{
+            'IndexName': 'user_email-joined_at-index',
+            'KeySchema': [{'AttributeName': 'user_email', 'KeyType': 'HASH'}, {'AttributeName': 'joined_at', 'KeyType': 'RANGE'}],
+            'Projection': {'ProjectionType': 'KEYS_ONLY'}
+        }],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+    dynamodb.create_table(
+        TableName='event_participant_counters',
+        KeySchema=[{'AttributeName': 'event_id', 'KeyType': 'HASH'}, {'AttributeName': 'shard', 'KeyType': 'RANGE'}],
+        AttributeDefinitions=[
+            {'AttributeName': 'event_id', 'AttributeType': 'S'},
+            {'AttributeName': 'shard', 'AttributeType': 'N'}
+        ],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+    with dynamodb.Table('users').batch_writer() as batch:
+        for email in users:
+            batch.put_item(Item={'email': email, 'password': 'secret'})
+
+def create_event():
+    event_id = str(uuid.uuid4())
+
+    aws_clients.get_dynamodb_table('events').put_item(Item={'event_id': event_id, 'title': 'Benchmark event'})
+
+    return event_id
+
+def join_old_way(event_id, email):
+    events_table = aws_clients.get_dynamodb_table('events')
+    users_table = aws_clients.get_dynamodb_table('users')
+
+    events_table.get_item(Key={'event_id': event_id})
+    users_table.get_item(Key={'email': email})
+
+    events_table.update_item(
+        Key={'event_id': event_id},
+        UpdateExpression='SET participants = if_not_exists(participants, :start) + :inc',
+        ExpressionAttributeValues={':start': 0, ':inc': 1}
+    )
+    users_table.update_item(
+        Key={'email': email},
+        UpdateExpression='SET events = list_append(if_not_exists(events, :empty_list), :event_id_list)',
+        ExpressionAttributeValues={':empty_list': [], ':event_id_list': [event_id]}
+    )
+
+def join_transaction(event_id, email):
+    result = join_event_lambda.lambda_handler({
+        'body': json.dumps({'event_id': event_id}),
+        'requestContext': {'authorizer': {'lambda': {'email': email}}}
+    }, None)
+
+    assert result['statusCode'] == 200
+
+def measure(join, users, threads, latency_ms):
+    event_id = create_event()
+
+    def delay(**kwargs):
+        time.sleep(latency_ms / 1000)
+
+    aws_clients.get_dynamodb_client().meta.events.register('before-send.dynamodb', delay)
+
+    started_at = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda email: join(event_id, email), users * 2))
+
+    elapsed = time.perf_counter() - started_at
+
+    aws_clients.get_dynamodb_client().meta.events.unregister('before-send.dynamodb', delay)
+
+    event_item = aws_clients.get_dynamodb_table('events').get_item(Key={'event_id': event_id})['Item']
+
+    return len(users) * 2 / elapsed, participants.total_participants(event_item, participants.get_participant_counts([event_id]))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--latency-ms', type=float, default=10)
+    args = parser.parse_args()
+
+    join_event_lambda.logger.setLevel('WARNING')
+
+    users = [f'user{index}@gmail.com' for index in range(args.users)]
+
+    with mock_aws():
+        isolate_transactions()
+        create_tables(users)
+
+        # The shared client is created before the threads race to create it
+        aws_clients.get_dynamodb_client()
+
+        old_rate, old_participants = measure(join_old_way, users, args.threads, args.latency_ms)
+        new_rate, new_participants = measure(join_transaction, users, args.threads, args.latency_ms)
+
+    print(f'{args.users} users joining twice from {args.threads} threads, {args.latency_ms:.0f} ms per DynamoDB request')
+    print(f'GetItem x2 + UpdateItem x2:  {old_rate:7.1f} joins/s, participants counted: {old_participants}')
+    print(f'TransactWriteItems:          {new_rate:7.1f} joins/s, participants counted: {new_participants}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+Registers events with covers of growing size, once sending the cover inline as
+base64 (the older dashboard flow) and once asking for a presigned POST, and
+reports the registration latency. The derivative work that now runs in
+event_image_uploaded_lambda, after the upload, is timed separately.
+S3 and DynamoDB are moto.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_event_register --sizes-mb 0.5 2 5
+"""
+import argparse
+import base64
+import io
+import json
+import os
+import time
+import numpy as np
+from moto import mock_aws
+from PIL import Image
+
+import backend.common.clients as aws_clients
+import backend.common.images as images
+from backend.events_service.events import register_lambda, event_image_uploaded_lambda
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+os.environ['EVENTS_TABLE_NAME'] = 'events'
+os.environ['GIVEAWAY_TABLE_NAME'] = 'giveaways'
+os.environ['CLUBS_TABLE_NAME'] = 'clubs'
+os.environ['EVENT_PICTURES_BUCKET'] = 'lambda-event-pictures'
+
+CLUB = 'club@club.com'
+
+def create_resources():
+    dynamodb = aws_clients.get_dynamodb_resource()
+
+    for table_name, key in (('events', 'event_id'), ('giveaways', 'giveaway_id'), ('clubs', 'club_id')):
+        dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=[{'AttributeName': key, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': key, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+    dynamodb.Table('clubs').put_item(Item={'club_id': CLUB, 'latitude': '45.33', 'longitude': '14.44'})
+
+    aws_clients.get_s3_client().create_bucket(
+        Bucket=os.environ['EVENT_PICTURES_BUCKET'],
+        CreateBucketConfiguration={'LocationConstraint': 'eu-central-1'}
+    )
+
+def create_picture(megabytes):
+    # Noise barely compresses, so the JPEG size follows the pixel count
+    side = int((megabytes * 1024 * 1024 / 0.9) ** 0.5)
+    pixels = np.random.default_rng(0).integers(0, 256, (side, side, 3), dtype=np.uint8)
+
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='JPEG', quality=90)
+
+    return buffer.getvalue()
+
+def register(**attributes):
+    body = {
+        'title': 'Benchmark event',
+        'description': 'Benchmark event',
+        'startingAt': '2030-05-01 22:00',
+        'endingAt': '2030-05-02 04:00',
+        'genre': 'techno',
+        'giveaway': {'prize': 'Tickets', 'description': 'Giveaway', 'name': 'Giveaway'}
+    }
+    body.update(attributes)
+
+    event = {
+        'body': json.dumps(body),
+        'requestContext': {'authorizer': {'lambda': {'email': CLUB}}}
+    }
+
+    started_at = time.perf_counter()
+    result = register_lambda.lambda_handler(event, None)
+    elapsed_ms = (time.perf_counter() - started_at) * 1000
+
+    assert result['statusCode'] == 200
+
+    return elapsed_ms, json.loads(result['body'])['event_id']
+
+def median(values):
+    return sorted(values)[len(values) // 2]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes-mb', type=float, nargs='+', default=[0.5, 2, 5])
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    # Keep handler logging out of the measurement
+    for module in (register_lambda, event_image_uploaded_lambda, images):
+        module.logger.setLevel('WARNING')
+
+    with mock_aws():
+        create_resources()
+
+        for megabytes in args.sizes_mb:
+            picture = create_picture(megabytes)
+            event_image = 'data:image/jpeg;base64,' + base64.b64encode(picture).decode('utf-8')
+
+            inline_timings = []
+            presigned_timings = []
+            derivative_timings = []
+
+            for _ in range(args.repeats):
+                elapsed_ms, event_id = register(event_image=event_image)
+                inline_timings.append(elapsed_ms)
+
+                started_at = time.perf_counter()
+                event_image_uploaded_lambda.lambda_handler({
+                    'detail': {
+                        'bucket': {'name': os.environ['EVENT_PICTURES_BUCKET']},
+                        'object': {'key': f'{event_id}.jpg'}
+                    }
+                }, None)
+                derivative_timings.append((time.perf_counter() - started_at) * 1000)
+
+                presigned_timings.append(register(event_image_content_type='image/jpeg')[0])
+
+            print(
+                f'Cover {len(picture) / 1024 / 1024:4.1f} MB: '
+                f'inline p50 {median(inline_timings):7.1f} ms, '
+                f'presigned POST p50 {median(presigned_timings):6.1f} ms, '
+                f'derivatives after upload p50 {median(derivative_timings):7.1f} ms'
+            )
+
+if __name__ == '__main__':
+    main()
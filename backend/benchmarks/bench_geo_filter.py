@@ -0,0 +1,76 @@
+"""
+Filters points by distance with the old per-item loop (float() on the
+stored strings, then scalar haversine) and with the NumPy path from
+backend.common.geo (bounding box, then vectorised haversine).
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_geo_filter --points 1000000
+"""
+import argparse
+import random
+import time
+
+import backend.common.geo as geo
+
+CENTRE_LATITUDE = 45.3271
+CENTRE_LONGITUDE = 14.4422
+RADIUS_KM = 20
+
+def per_item_loop(items):
+    matches = []
+
+    for item in items:
+        try:
+            latitude = float(item['latitude'])
+            longitude = float(item['longitude'])
+        except (KeyError, TypeError, ValueError):
+            continue
+
+        distance = geo.haversine(CENTRE_LONGITUDE, CENTRE_LATITUDE, longitude, latitude)
+
+        if distance <= RADIUS_KM:
+            matches.append((item, distance))
+
+    return matches
+
+def vectorised(items):
+    return geo.items_within_radius(CENTRE_LATITUDE, CENTRE_LONGITUDE, items, RADIUS_KM)
+
+def timed(function, *args):
+    started_at = time.perf_counter()
+    result = function(*args)
+
+    return result, (time.perf_counter() - started_at) * 1000
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--points', type=int, default=1000000)
+    parser.add_argument('--spread', type=float, default=3.0, help='Degrees around the centre the points are spread over')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+
+    # Coordinates are stored as strings, like the events and clubs tables do
+    items = [
+        {
+            'latitude': str(CENTRE_LATITUDE + rng.uniform(-args.spread, args.spread)),
+            'longitude': str(CENTRE_LONGITUDE + rng.uniform(-args.spread, args.spread))
+        }
+        for _ in range(args.points)
+    ]
+
+    loop_matches, loop_ms = timed(per_item_loop, items)
+    vector_matches, vector_ms = timed(vectorised, items)
+
+    assert [item for item, _ in loop_matches] == [item for item, _ in vector_matches]
+
+    latitudes, longitudes = geo.coordinates_to_arrays(items)
+    (_, _), arrays_ms = timed(geo.within_radius, CENTRE_LATITUDE, CENTRE_LONGITUDE, latitudes, longitudes, RADIUS_KM)
+
+    print(f'Points: {args.points}, matches within {RADIUS_KM} km: {len(loop_matches)}')
+    print(f'Per-item loop:                 {loop_ms:8.0f} ms')
+    print(f'NumPy incl. string parsing:    {vector_ms:8.0f} ms ({loop_ms / vector_ms:.1f}x)')
+    print(f'NumPy on already parsed arrays:{arrays_ms:8.1f} ms ({loop_ms / arrays_ms:.0f}x)')
+
+if __name__ == '__main__':
+    main()
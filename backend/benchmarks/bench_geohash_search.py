@@ -0,0 +1,166 @@
+"""
+Compares the old full-table scan + haversine search with the handler's
+geohash path (initial_sources and search_events) on a moto events table.
+Both paths return the same events; the interesting numbers are latency and
+how many items DynamoDB had to read.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_geohash_search --events 100000
+"""
+import argparse
+import math
+import os
+import random
+import threading
+import time
+import uuid
+from moto import mock_aws
+
+import backend.common.clients as aws_clients
+import backend.common.geo as geo
+from backend.events_service.events import search_lambda
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+os.environ['EVENTS_TABLE_NAME'] = 'events'
+
+# A search centre and a spread roughly the size of Croatia
+CENTRE_LATITUDE = 45.3271
+CENTRE_LONGITUDE = 14.4422
+SPREAD_DEGREES = 3.0
+
+def create_events_table():
+    table = aws_clients.get_dynamodb_resource().create_table(
+        TableName=os.environ['EVENTS_TABLE_NAME'],
+        KeySchema=[{'AttributeName': 'event_id', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[
+            {'AttributeName': 'event_id', 'AttributeType': 'S'},
+            {'AttributeName': 'geohash_3', 'AttributeType': 'S'},
+            {'AttributeName': 'geohash', 'AttributeType': 'S'}
+        ],
+        GlobalSecondaryIndexes=[{
+            'IndexName': geo.GEOHASH_INDEX_NAME,
+            'KeySchema': [
+                {'AttributeName': 'geohash_3', 'KeyType': 'HASH'},
+                {'AttributeName': 'geohash', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+    return table
+
+def fill_events_table(table, count):
+    rng = random.Random(1)
+
+    with table.batch_writer() as batch:
+        for index in range(count):
+            latitude = CENTRE_LATITUDE + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES)
+            longitude = CENTRE_LONGITUDE + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES)
+
+            item = {
+                'event_id': str(uuid.uuid4()),
+                'title': f'Event {index}',
+                'latitude': str(latitude),
+                'longitude': str(longitude)
+            }
+            item.update(geo.geohash_attributes(latitude, longitude))
+
+            batch.put_item(Item=item)
+
+def scan_and_filter(table):
+    scan_kwargs = {}
+    scanned = 0
+    matches = []
+
+    while True:
+        response = table.scan(**scan_kwargs)
+        scanned += response['ScannedCount']
+
+        for item in response['Items']:
+            distance = geo.haversine(CENTRE_LONGITUDE, CENTRE_LATITUDE, float(item['longitude']), float(item['latitude']))
+
+            if distance <= search_lambda.SEARCH_RADIUS_KM:
+                matches.append(item['event_id'])
+
+        if 'LastEvaluatedKey' not in response:
+            return matches, scanned
+
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+class CountingTable:
+    """
+    Passes queries through to the table and adds up how many items they read. search_events
+    reads the cells from several threads.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.scanned = 0
+        self.lock = threading.Lock()
+
+    def query(self, **kwargs):
+        response = self.table.query(**kwargs)
+
+        with self.lock:
+            self.scanned += response['ScannedCount']
+
+        return response
+
+def query_and_filter(table):
+    filters = {
+        'name': None,
+        'theme': None,
+        'genre': None,
+        'type': None,
+        'latitude': CENTRE_LATITUDE,
+        'longitude': CENTRE_LONGITUDE
+    }
+
+    counting_table = CountingTable(table)
+
+    # No limit and no deadline, so every event in the radius is returned like the scan does
+    events, pending = search_lambda.search_events(counting_table, filters, search_lambda.initial_sources(filters), math.inf, math.inf)
+
+    assert pending == []
+
+    return [item['event_id'] for item in events], counting_table.scanned
+
+def timed(function, table, repeats):
+    timings = []
+
+    for _ in range(repeats):
+        started_at = time.perf_counter()
+        result = function(table)
+        timings.append((time.perf_counter() - started_at) * 1000)
+
+    return result, sum(timings) / len(timings)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--events', type=int, default=100000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    with mock_aws():
+        table = create_events_table()
+        fill_events_table(table, args.events)
+
+        # Keep handler logging out of the measurement
+        search_lambda.logger.setLevel('WARNING')
+
+        (scan_matches, scanned), scan_ms = timed(scan_and_filter, table, args.repeats)
+        (query_matches, queried), query_ms = timed(query_and_filter, table, args.repeats)
+
+    assert sorted(scan_matches) == sorted(query_matches)
+
+    cells = geo.geohash_cells_covering_radius(CENTRE_LATITUDE, CENTRE_LONGITUDE, search_lambda.SEARCH_RADIUS_KM)
+
+    print(f'Events: {args.events}, matches within {search_lambda.SEARCH_RADIUS_KM} km: {len(scan_matches)}')
+    print(f'Scan + haversine:    mean {scan_ms:.0f} ms, items read {scanned}')
+    print(f'Geohash query ({len(cells)} cells): mean {query_ms:.0f} ms, items read {queried}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Draws one winner from --entries weighted entries the old way (users and entries
+lists in memory, random.choices) and with giveaways.weighted_reservoir_sample
+over a stream of the same entries, like iter_giveaway_entries yields them page by
+page. Prints the time, the peak memory the draw allocated (tracemalloc) and how
+many random numbers each reservoir variant drew. DynamoDB is left out, the query
+pages cost the same either way.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_giveaway_draw --entries 1000000
+"""
+import argparse
+import math
+import random
+import time
+import tracemalloc
+
+import backend.common.giveaways as giveaways
+
+class CountingRandom(random.Random):
+    calls = 0
+
+    def random(self):
+        self.calls += 1
+        return super().random()
+
+def iter_entries(entries):
+    for index in range(entries):
+        yield f'user{index}@gmail.com', index % 10 + 1
+
+def draw_with_lists(entries, rng):
+    users = []
+    weights = []
+
+    for user_email, weight in iter_entries(entries):
+        users.append(user_email)
+        weights.append(weight)
+
+    return rng.choices(users, weights=weights, k=1)[0]
+
+def draw_with_a_res(entries, rng):
+    # A-Res without jumps: one random number and one key per entry
+    best_key = -math.inf
+    winner = None
+
+    for user_email, weight in iter_entries(entries):
+        key = math.log(1.0 - rng.random()) / weight
+
+        if key > best_key:
+            best_key = key
+            winner = user_email
+
+    return winner
+
+def draw_with_a_expj(entries, rng):
+    return giveaways.weighted_reservoir_sample(iter_entries(entries), 1, rng)[0]
+
+def measure(draw, entries, seed):
+    rng = CountingRandom(seed)
+
+    tracemalloc.start()
+    started_at = time.perf_counter()
+
+    draw(entries, rng)
+
+    elapsed = time.perf_counter() - started_at
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak, rng.calls
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=1000000)
+    parser.add_argument('--seed', default='benchmark')
+    args = parser.parse_args()
+
+    print(f'One winner from {args.entries} entries (weights 1-10), times include tracemalloc overhead')
+
+    for name, draw in (('lists + random.choices', draw_with_lists), ('A-Res stream', draw_with_a_res), ('A-ExpJ stream', draw_with_a_expj)):
+        elapsed, peak, calls = measure(draw, args.entries, args.seed)
+
+        print(f'{name:24s} {elapsed:6.2f} s, peak {peak / 1024 / 1024:8.2f} MiB, {calls} random numbers')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Draws --winners distinct winners from --entries weighted entries three ways:
+random.choices once per winner, removing every winner before the next call
+(one O(n) pass each, timed for --naive-winners winners and extrapolated), the
+Fenwick-tree WeightedSampler draw_winners uses, and a --winners sized
+weighted_reservoir_sample over the stream. Then reads the winners' profiles from
+a moto users table with one GetItem per winner and with batch_get_items, with
+--latency-ms added to every DynamoDB request for the network round trip.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_giveaway_winners --entries 1000000 --winners 1000
+"""
+import argparse
+import os
+import random
+import time
+from moto import mock_aws
+
+import backend.common.clients as aws_clients
+import backend.common.giveaways as giveaways
+from backend.common.batch import batch_get_items
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+
+def build_entries(entries):
+    return [f'user{index}@gmail.com' for index in range(entries)], [index % 10 + 1 for index in range(entries)]
+
+def draw_with_choices(user_emails, weights, winners, rng):
+    user_emails = list(user_emails)
+    weights = list(weights)
+    picked = []
+
+    for _ in range(winners):
+        index = rng.choices(range(len(weights)), weights=weights, k=1)[0]
+
+        picked.append(user_emails[index])
+        weights[index] = 0
+
+    return picked
+
+def measure_profiles(winner_emails, latency_ms):
+    dynamodb = aws_clients.get_dynamodb_resource()
+
+    dynamodb.create_table(
+        TableName='users',
+        KeySchema=[{'AttributeName': 'email', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'email', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+    with dynamodb.Table('users').batch_writer() as batch:
+        for email in winner_emails:
+            batch.put_item(Item={'email': email, 'first_name': 'First', 'last_name': 'Last', 'password': 'secret'})
+
+    def delay(**kwargs):
+        time.sleep(latency_ms / 1000)
+
+    client_events = aws_clients.get_dynamodb_client().meta.events
+    client_events.register('before-send.dynamodb', delay)
+
+    users_table = aws_clients.get_dynamodb_table('users')
+
+    started_at = time.perf_counter()
+
+    for email in winner_emails:
+        users_table.get_item(Key={'email': email}, ProjectionExpression='first_name, last_name')
+
+    get_item_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    batch_get_items('users', [{'email': email} for email in winner_emails], attributes=['first_name', 'last_name'])
+    batch_get_seconds = time.perf_counter() - started_at
+
+    client_events.unregister('before-send.dynamodb', delay)
+
+    return get_item_seconds, batch_get_seconds
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=1000000)
+    parser.add_argument('--winners', type=int, default=1000)
+    parser.add_argument('--naive-winners', type=int, default=10)
+    parser.add_argument('--latency-ms', type=float, default=10)
+    args = parser.parse_args()
+
+    user_emails, weights = build_entries(args.entries)
+
+    started_at = time.perf_counter()
+    draw_with_choices(user_emails, weights, args.naive_winners, random.Random('benchmark'))
+    choices_seconds = (time.perf_counter() - started_at) / args.naive_winners * args.winners
+
+    started_at = time.perf_counter()
+    sampler = giveaways.WeightedSampler(weights)
+    build_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    winner_emails = [user_emails[index] for index in sampler.sample(args.winners, random.Random('benchmark'))]
+    fenwick_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    giveaways.weighted_reservoir_sample(zip(user_emails, weights), args.winners, random.Random('benchmark'))
+    reservoir_seconds = time.perf_counter() - started_at
+
+    assert len(set(winner_emails)) == args.winners
+
+    with mock_aws():
+        get_item_seconds, batch_get_seconds = measure_profiles(winner_emails, args.latency_ms)
+
+    print(f'{args.winners} winners from {args.entries} entries (weights 1-10)')
+    print(f'random.choices per winner:  {choices_seconds:8.2f} s (extrapolated from {args.naive_winners} winners)')
+    print(f'Fenwick tree:               {build_seconds + fenwick_seconds:8.2f} s ({build_seconds:.2f} s build, {fenwick_seconds * 1000:.1f} ms for the draws)')
+    print(f'A-ExpJ reservoir (k={args.winners}): {reservoir_seconds:8.2f} s')
+    print(f'Profiles, {args.latency_ms:.0f} ms per request: GetItem per winner {get_item_seconds:.2f} s, BatchGetItem {batch_get_seconds:.2f} s')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Downloads the pictures of 30 events from moto S3 with an injected per-call
+latency, once one after another (the old inline path) and once through the
+bounded thread pool in backend.common.images, and reports the latency.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_image_fetch --images 30 --image-kb 100 --latency-ms 50
+"""
+import argparse
+import os
+import time
+import uuid
+from moto import mock_aws
+
+import backend.common.clients as aws_clients
+import backend.common.images as images
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+
+BUCKET = 'lambda-event-pictures'
+
+def create_images(image_count, image_bytes):
+    s3_client = aws_clients.get_s3_client()
+    s3_client.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={'LocationConstraint': 'eu-central-1'})
+
+    keys = []
+
+    for _ in range(image_count):
+        key = f'{uuid.uuid4()}.jpg'
+        keys.append(key)
+
+        s3_client.put_object(Bucket=BUCKET, Key=key, Body=os.urandom(image_bytes))
+
+    return keys
+
+def inject_latency(latency_ms):
+    # Sleeps inside botocore, so concurrent requests overlap their latency like real network calls would
+    def delay(**kwargs):
+        time.sleep(latency_ms / 1000)
+
+    aws_clients.get_s3_client().meta.events.register('before-send.s3.GetObject', delay)
+
+def measure(fetch, repeats):
+    timings = []
+
+    for _ in range(repeats):
+        started_at = time.perf_counter()
+        fetch()
+        timings.append((time.perf_counter() - started_at) * 1000)
+
+    timings.sort()
+
+    return timings[len(timings) // 2]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--images', type=int, default=30)
+    parser.add_argument('--image-kb', type=int, default=100)
+    parser.add_argument('--latency-ms', type=int, default=50)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    images.logger.setLevel('WARNING')
+
+    with mock_aws():
+        keys = create_images(args.images, args.image_kb * 1024)
+        inject_latency(args.latency_ms)
+
+        sequential = measure(lambda: [images.get_image_as_base64(BUCKET, key) for key in keys], args.repeats)
+
+        print(f'Images: {args.images} x {args.image_kb} KB, injected latency: {args.latency_ms} ms per GetObject')
+        print(f'Sequential:            p50 {sequential:7.1f} ms')
+
+        for max_workers in (4, 8, 16):
+            pooled = measure(lambda: images.fetch_images_as_base64(BUCKET, keys, max_workers=max_workers, max_total_bytes=2 ** 40), args.repeats)
+
+            print(f'Pool of {max_workers:2d} workers:    p50 {pooled:7.1f} ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Verifies the same bearer token many times with the verified-JWT cache
+switched on and off. Secrets Manager is mocked with moto and the secret
+itself is cached in both runs, so the numbers isolate jwt.decode.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_jwt_cache --verifications 10000
+"""
+import argparse
+import json
+import os
+import time
+import jwt
+from datetime import datetime, timedelta, timezone
+from moto import mock_aws
+
+import backend.common.common as common_handler
+import backend.common.clients as aws_clients
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+os.environ['JWT_SECRET_NAME'] = 'python-lambda-app/prod/jwt-secret'
+os.environ['SECRETS_REGION_NAME'] = 'eu-central-1'
+
+JWT_SECRET = 'ioejfi8rjwiojfekajgvurasjfiaedjgboigrfjsgfivdklcbnrsjhfgujdlbknfusghvcxkjbhnfsoj'
+
+def run(event, verifications):
+    timings = []
+
+    for _ in range(verifications):
+        started_at = time.perf_counter()
+        error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(event)
+        timings.append((time.perf_counter() - started_at) * 1_000_000)
+
+        assert error_response is None
+
+    timings.sort()
+
+    return sum(timings) / len(timings), timings[len(timings) // 2], timings[int(len(timings) * 0.99)]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--verifications', type=int, default=10000)
+    args = parser.parse_args()
+
+    with mock_aws():
+        aws_clients.get_secrets_manager_client('eu-central-1').create_secret(
+            Name=os.environ['JWT_SECRET_NAME'],
+            SecretString=json.dumps({'jwt_secret': JWT_SECRET, 'refresh_secret': JWT_SECRET})
+        )
+
+        token = jwt.encode(
+            {'email': 'john.doe@gmail.com', 'exp': datetime.now(timezone.utc) + timedelta(hours=1)},
+            JWT_SECRET,
+            algorithm='HS256'
+        )
+
+        event = {'headers': {'authorization': f'Bearer {token}'}}
+
+        # Keep handler logging out of the measurement
+        common_handler.logger.setLevel('WARNING')
+
+        common_handler.JWT_CACHE_ENABLED = False
+        uncached = run(event, args.verifications)
+
+        common_handler.JWT_CACHE_ENABLED = True
+        cached = run(event, args.verifications)
+
+    print(f'Verifications: {args.verifications}')
+    print(f'Without cache: mean {uncached[0]:.1f} us, p50 {uncached[1]:.1f} us, p99 {uncached[2]:.1f} us')
+    print(f'With cache:    mean {cached[0]:.1f} us, p50 {cached[1]:.1f} us, p99 {cached[2]:.1f} us')
+    print(f'Cache stats:   {common_handler.get_jwt_cache_stats()}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+Builds the top --limit of a moto users table with --users users two ways: the
+old full Scan sorted in memory, and one get_leaderboard_page over the sparse
+leaderboard-index GSI, at each --buckets count. --latency-ms is added to every
+DynamoDB request for the network round trip. Moto filters its whole table on
+every request, so the table is kept to --users and the scan is extrapolated to
+--target-users by its page count; a GSI page reads a fixed number of index
+items whatever the table size.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_leaderboard --users 100000 --target-users 1000000
+"""
+import argparse
+import json
+import os
+import random
+import time
+from moto import mock_aws
+
+import backend.common.clients as aws_clients
+import backend.common.leaderboard as leaderboard
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+
+os.environ['USERS_TABLE_NAME'] = 'users'
+os.environ['JWT_SECRET_NAME'] = 'jwt-secret'
+os.environ['SECRETS_REGION_NAME'] = 'eu-central-1'
+
+def create_users_table(users):
+    table = aws_clients.get_dynamodb_resource().create_table(
+        TableName='users',
+        KeySchema=[{'AttributeName': 'email', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[
+            {'AttributeName': 'email', 'AttributeType': 'S'},
+            {'AttributeName': 'leaderboard_bucket', 'AttributeType': 'S'},
+            {'AttributeName': 'leaderboard_score', 'AttributeType': 'S'}
+        ],
+        GlobalSecondaryIndexes=[{
+            'IndexName': leaderboard.LEADERBOARD_INDEX_NAME,
+            'KeySchema': [
+                {'AttributeName': 'leaderboard_bucket', 'KeyType': 'HASH'},
+                {'AttributeName': 'leaderboard_score', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'INCLUDE', 'NonKeyAttributes': ['first_name', 'last_name', 'points']}
+        }],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+    rng = random.Random('benchmark')
+
+    with table.batch_writer() as batch:
+        for index in range(users):
+            email = f'user{index}@gmail.com'
+            points = rng.randrange(100000)
+
+            batch.put_item(Item={
+                'email': email,
+                'first_name': 'John',
+                'last_name': 'Doe',
+                'password': '$2b$12$' + 'x' * 53,
+                'refresh_token': 'x' * 180,
+                'points': points,
+                **leaderboard.leaderboard_attributes(email, points)
+            })
+
+    return table
+
+def item_kilobytes(items):
+    return sum(len(json.dumps(item, default=str)) for item in items) / 1024
+
+def full_scan_top(table, limit):
+    users = []
+    pages = 0
+    scan_kwargs = {}
+
+    while True:
+        response = table.scan(**scan_kwargs)
+        users.extend(response.get('Items', []))
+        pages += 1
+
+        if 'LastEvaluatedKey' not in response:
+            break
+
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    users.sort(key=lambda user: int(user.get('points', 0)), reverse=True)
+
+    return users[:limit], pages, item_kilobytes(users)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--target-users', type=int, default=1000000)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--buckets', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--latency-ms', type=float, default=10)
+    args = parser.parse_args()
+
+    results = []
+
+    for buckets in args.buckets:
+        leaderboard.LEADERBOARD_BUCKETS = buckets
+
+        with mock_aws():
+            table = create_users_table(args.users)
+
+            # Cursors are signed with the JWT secret
+            aws_clients.get_client('secretsmanager').create_secret(
+                Name='jwt-secret',
+                SecretString=json.dumps({'jwt_secret': 'benchmark', 'refresh_secret': 'benchmark'})
+            )
+
+            requests = []
+
+            def delay(**kwargs):
+                requests.append(1)
+                time.sleep(args.latency_ms / 1000)
+
+            client_events = aws_clients.get_dynamodb_client().meta.events
+            client_events.register('before-send.dynamodb', delay)
+
+            if not results:
+                started_at = time.perf_counter()
+                top, pages, scan_kilobytes = full_scan_top(table, args.limit)
+                scan_seconds = time.perf_counter() - started_at
+
+                network_seconds = pages * args.latency_ms / 1000
+                scale = args.target_users / args.users
+
+                print(f'Full scan of {args.users} users: {scan_seconds:.2f} s, {pages} pages, {scan_kilobytes / 1024:.1f} MB read')
+                print(f'Full scan of {args.target_users} users: ~{network_seconds * scale:.2f} s of sequential round trips alone, ~{round(pages * scale)} pages, ~{scan_kilobytes * scale / 1024:.0f} MB read (extrapolated)')
+
+            del requests[:]
+
+            started_at = time.perf_counter()
+            users, cursor = leaderboard.get_leaderboard_page(args.limit)
+            first_page_seconds = time.perf_counter() - started_at
+            first_page_requests = len(requests)
+
+            del requests[:]
+
+            started_at = time.perf_counter()
+            leaderboard.get_leaderboard_page(args.limit, cursor)
+            next_page_seconds = time.perf_counter() - started_at
+
+            client_events.unregister('before-send.dynamodb', delay)
+
+            if not results:
+                assert [user['points'] for user in users] == [int(user['points']) for user in top]
+
+            results.append(users)
+            print(f'GSI page, {buckets} bucket(s): first {first_page_seconds * 1000:.0f} ms ({first_page_requests} Query, {item_kilobytes(users):.1f} KB of users), next {next_page_seconds * 1000:.0f} ms ({len(requests)} Query)')
+
+    print(f'{args.limit} users a page, {args.latency_ms:.0f} ms per request. Moto filters the whole table on every Query, so the GSI times above include that in-process cost; DynamoDB reads only the {args.limit + 1} index items per bucket')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Reads a whole moto table through ParallelScan at different segment counts.
+Moto answers in-process, so --latency-ms adds a per-request delay that
+stands in for the network round trip a real scan page pays.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_parallel_scan --items 20000 --segments 1 2 4 8 16
+"""
+import argparse
+import os
+import time
+from moto import mock_aws
+
+import backend.common.clients as aws_clients
+import backend.common.scan as scan_module
+from backend.common.scan import ParallelScan
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+
+class DelayedTable:
+    def __init__(self, table, latency_seconds):
+        self.table = table
+        self.latency_seconds = latency_seconds
+        self.key_schema = table.key_schema
+
+    def scan(self, **kwargs):
+        time.sleep(self.latency_seconds)
+
+        return self.table.scan(**kwargs)
+
+def create_users_table(count):
+    table = aws_clients.get_dynamodb_resource().create_table(
+        TableName='users',
+        KeySchema=[{'AttributeName': 'email', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'email', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+    with table.batch_writer() as batch:
+        for index in range(count):
+            batch.put_item(Item={
+                'email': f'user{index}@gmail.com',
+                'first_name': 'John',
+                'last_name': 'Doe',
+                'points': index % 1000
+            })
+
+    return table
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=20000)
+    parser.add_argument('--segments', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--page-size', type=int, default=500)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    args = parser.parse_args()
+
+    # Keep scan logging out of the measurement
+    scan_module.logger.setLevel('WARNING')
+
+    with mock_aws():
+        table = DelayedTable(create_users_table(args.items), args.latency_ms / 1000)
+
+        print(f'Items: {args.items}, page size: {args.page_size}, injected latency: {args.latency_ms} ms/request')
+
+        for total_segments in args.segments:
+            started_at = time.perf_counter()
+
+            with ParallelScan(table, total_segments=total_segments, Limit=args.page_size) as scan:
+                count = sum(1 for _ in scan)
+
+            elapsed = time.perf_counter() - started_at
+
+            assert count == args.items
+
+            print(f'Segments {total_segments:>2}: {elapsed * 1000:7.0f} ms, {count / elapsed:8.0f} items/s, {scan.stats["pages"]} pages')
+
+if __name__ == '__main__':
+    main()
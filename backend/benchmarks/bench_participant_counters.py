@@ -0,0 +1,226 @@
+"""
+--users users join one event at once from --threads threads through
+join_event_lambda, first with every join incrementing a single counter item (what
+the events item's participants attribute used to be) and then with the counter
+split over PARTICIPANT_COUNTER_SHARDS items. Moto never throttles, so every
+counter item gets a token bucket of --item-wcu write units per second and
+transactions that write an exhausted item are cancelled with ThrottlingError, the
+way DynamoDB cancels them. A transactional write costs 2 WCU. --latency-ms adds a
+per-request delay that stands in for the network round trip, and moto's
+transactions are serialised with a lock since moto doesn't isolate them.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_participant_counters --users 1000 --threads 100 --item-wcu 20
+"""
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from botocore.awsrequest import AWSResponse
+from moto import mock_aws
+from moto.dynamodb.models import DynamoDBBackend
+
+import backend.common.clients as aws_clients
+import backend.common.participants as participants
+from backend.events_service.events import join_event_lambda
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+os.environ['EVENTS_TABLE_NAME'] = 'events'
+os.environ['USERS_TABLE_NAME'] = 'users'
+os.environ['EVENT_PARTICIPANTS_TABLE_NAME'] = 'event_participants'
+os.environ['EVENT_PARTICIPANT_COUNTERS_TABLE_NAME'] = 'event_participant_counters'
+
+TRANSACTIONAL_WRITE_UNITS = 2
+
+def isolate_transactions():
+    transaction_lock = threading.Lock()
+    transact_write_items = DynamoDBBackend.transact_write_items
+
+    def locked_transact_write_items(self, *args, **kwargs):
+        with transaction_lock:
+            return transact_write_items(self, *args, **kwargs)
+
+    DynamoDBBackend.transact_write_items = locked_transact_write_items
+
+class CounterThrottle:
+    """
+    Cancels TransactWriteItems calls whose counter update lands on an item that has used up
+    its write units, before they reach moto.
+    """
+
+    def __init__(self, item_wcu):
+        self.item_wcu = item_wcu
+        self.buckets = {}
+        self.throttles = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, params, **kwargs):
+        transact_items = json.loads(params['body'])['TransactItems']
+
+        for position, transact_item in enumerate(transact_items):
+            update = transact_item.get('Update')
+
+            if not update or update['TableName'] != os.environ['EVENT_PARTICIPANT_COUNTERS_TABLE_NAME']:
+                continue
+
+            if self.take(json.dumps(update['Key'], sort_keys=True)):
+                return None
+
+            reasons = [{'Code': 'None'} for _ in transact_items]
+            reasons[position] = {'Code': 'ThrottlingError', 'Message': 'Throughput exceeds the current capacity for one or more global secondary indexes.'}
+
+            return AWSResponse(params['url'], 400, {}, None), {
+                'Error': {'Code': 'TransactionCanceledException', 'Message': 'Transaction cancelled, please refer cancellation reasons for specific reasons [Throttled]'},
+                'CancellationReasons': reasons,
+                'ResponseMetadata': {'HTTPStatusCode': 400}
+            }
+
+        return None
+
+    def take(self, key):
+        now = time.monotonic()
+
+        with self.lock:
+            # Buckets start full with one second worth of write units
+            tokens, refilled_at = self.buckets.get(key, (self.item_wcu, now))
+            tokens = min(self.item_wcu, tokens + (now - refilled_at) * self.item_wcu)
+
+            if tokens < TRANSACTIONAL_WRITE_UNITS:
+                self.buckets[key] = (tokens, now)
+                self.throttles += 1
+
+                return False
+
+            self.buckets[key] = (tokens - TRANSACTIONAL_WRITE_UNITS, now)
+
+            return True
+
+def create_tables(users):
+    dynamodb = aws_clients.get_dynamodb_resource()
+
+    for table_name, key in (('events', 'event_id'), ('users', 'email')):
+        dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=[{'AttributeName': key, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': key, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+    dynamodb.create_table(
+        TableName='event_participants',
+        KeySchema=[{'AttributeName': 'event_id', 'KeyType': 'HASH'}, {'AttributeName': 'user_email', 'KeyType': 'RANGE'}],
+        AttributeDefinitions=[
+            {'AttributeName': 'event_id', 'AttributeType': 'S'},
+            {'AttributeName': 'user_email', 'AttributeType': 'S'}
+        ],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+    dynamodb.create_table(
+        TableName='event_participant_counters',
+        KeySchema=[{'AttributeName': 'event_id', 'KeyType': 'HASH'}, {'AttributeName': 'shard', 'KeyType': 'RANGE'}],
+        AttributeDefinitions=[
+            {'AttributeName': 'event_id', 'AttributeType': 'S'},
+            {'AttributeName': 'shard', 'AttributeType': 'N'}
+        ],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+    with dynamodb.Table('users').batch_writer() as batch:
+        for email in users:
+            batch.put_item(Item={'email': email, 'password': 'secret'})
+
+def create_event():
+    event_id = str(uuid.uuid4())
+
+    aws_clients.get_dynamodb_table('events').put_item(Item={'event_id': event_id, 'title': 'Benchmark event'})
+
+    return event_id
+
+def measure(shards, users, threads, item_wcu, latency_ms):
+    participants.PARTICIPANT_COUNTER_SHARDS = shards
+    participants.clear_participant_count_cache()
+
+    event_id = create_event()
+    throttle = CounterThrottle(item_wcu)
+
+    def delay(**kwargs):
+        time.sleep(latency_ms / 1000)
+
+    def join(email):
+        started_at = time.perf_counter()
+
+        result = join_event_lambda.lambda_handler({
+            'body': json.dumps({'event_id': event_id}),
+            'requestContext': {'authorizer': {'lambda': {'email': email}}}
+        }, None)
+
+        return result['statusCode'], time.perf_counter() - started_at
+
+    client_events = aws_clients.get_dynamodb_client().meta.events
+    client_events.register('before-call.dynamodb.TransactWriteItems', throttle)
+    client_events.register('before-send.dynamodb', delay)
+
+    started_at = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(join, users))
+
+    elapsed = time.perf_counter() - started_at
+
+    client_events.unregister('before-send.dynamodb', delay)
+    client_events.unregister('before-call.dynamodb.TransactWriteItems', throttle)
+
+    latencies = sorted(latency * 1000 for _, latency in results)
+    percentiles = statistics.quantiles(latencies, n=100)
+
+    return {
+        'joined': sum(1 for status_code, _ in results if status_code == 200),
+        'failed': sum(1 for status_code, _ in results if status_code != 200),
+        'throttles': throttle.throttles,
+        'p50': percentiles[49],
+        'p95': percentiles[94],
+        'p99': percentiles[98],
+        'rate': len(users) / elapsed,
+        'counted': participants.get_participant_counts([event_id])[event_id]
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--threads', type=int, default=100)
+    parser.add_argument('--shards', type=int, default=participants.PARTICIPANT_COUNTER_SHARDS)
+    parser.add_argument('--item-wcu', type=float, default=20)
+    parser.add_argument('--latency-ms', type=float, default=10)
+    args = parser.parse_args()
+
+    join_event_lambda.logger.setLevel('WARNING')
+
+    users = [f'user{index}@gmail.com' for index in range(args.users)]
+
+    with mock_aws():
+        isolate_transactions()
+        create_tables(users)
+
+        # The shared client is created before the threads race to create it
+        aws_clients.get_dynamodb_client()
+
+        results = [(shards, measure(shards, users, args.threads, args.item_wcu, args.latency_ms)) for shards in (1, args.shards)]
+
+    print(f'{args.users} users joining one event from {args.threads} threads, {args.item_wcu:.0f} WCU per counter item, {args.latency_ms:.0f} ms per DynamoDB request')
+
+    for shards, result in results:
+        print(
+            f'{shards:3d} shard(s): {result["joined"]} joined, {result["failed"]} failed, {result["throttles"]} throttles, '
+            f'p50 {result["p50"]:.0f} ms, p95 {result["p95"]:.0f} ms, p99 {result["p99"]:.0f} ms, '
+            f'{result["rate"]:.1f} joins/s, participants counted: {result["counted"]}'
+        )
+
+if __name__ == '__main__':
+    main()
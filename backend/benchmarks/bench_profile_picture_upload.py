@@ -0,0 +1,122 @@
+"""
+Takes a ~5 MB JPEG profile picture sent as base64 and reports the peak Python
+memory (tracemalloc) and latency of the old way (b64decode of the whole string,
+one put_object) and the streaming way (chunked decode into a spooled file,
+multipart upload above 5 MB): first the decode alone, then the decode plus the
+upload of the original to moto S3. moto keeps objects in memory, which is
+included in the upload numbers. The full save_profile_picture_to_s3, with
+derivatives, is reported last; Pillow's pixel buffers are not traced.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_profile_picture_upload --megabytes 5
+"""
+import argparse
+import base64
+import io
+import os
+import time
+import tracemalloc
+import numpy as np
+from moto import mock_aws
+from PIL import Image
+
+import backend.common.clients as aws_clients
+import backend.common.common as common_handler
+import backend.common.images as images
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+os.environ['PROFILE_PICTURES_BUCKET'] = 'lambda-profile-pictures'
+os.environ['PROFILE_PICTURES_PREFIX'] = 'profile-pictures/'
+
+KEY = 'profile-pictures/john.doe@gmail.com.jpg'
+
+def create_picture(megabytes):
+    # Noise barely compresses, so the JPEG size follows the pixel count
+    side = int((megabytes * 1024 * 1024 / 0.9) ** 0.5)
+    pixels = np.random.default_rng(0).integers(0, 256, (side, side, 3), dtype=np.uint8)
+
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='JPEG', quality=90)
+
+    return buffer.getvalue()
+
+def decode_whole(picture_base64):
+    return len(base64.b64decode(picture_base64))
+
+def decode_streaming(picture_base64):
+    image_file, _ = images.decode_base64_image_to_file(picture_base64)
+    image_file.close()
+
+def upload_whole(picture_base64):
+    aws_clients.get_s3_client().put_object(
+        Bucket=os.environ['PROFILE_PICTURES_BUCKET'],
+        Key=KEY,
+        Body=base64.b64decode(picture_base64),
+        ContentType='image/jpeg'
+    )
+
+def upload_streaming(picture_base64):
+    image_file, content_type = images.decode_base64_image_to_file(picture_base64)
+
+    with image_file:
+        image_file.seek(0, io.SEEK_END)
+
+        if image_file.tell() > images.IMAGE_MULTIPART_PART_BYTES:
+            image_file.seek(0)
+            images._multipart_upload(os.environ['PROFILE_PICTURES_BUCKET'], KEY, image_file, content_type)
+        else:
+            image_file.seek(0)
+            aws_clients.get_s3_client().put_object(Bucket=os.environ['PROFILE_PICTURES_BUCKET'], Key=KEY, Body=image_file, ContentType=content_type)
+
+def measure(upload, picture_base64, repeats):
+    timings = []
+    peaks = []
+
+    for _ in range(repeats):
+        tracemalloc.start()
+        started_at = time.perf_counter()
+
+        upload(picture_base64)
+
+        timings.append((time.perf_counter() - started_at) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    timings.sort()
+
+    return timings[len(timings) // 2], max(peaks)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--megabytes', type=float, default=5)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    common_handler.logger.setLevel('WARNING')
+
+    picture = create_picture(args.megabytes)
+    picture_base64 = base64.b64encode(picture).decode('utf-8')
+
+    with mock_aws():
+        aws_clients.get_s3_client().create_bucket(
+            Bucket=os.environ['PROFILE_PICTURES_BUCKET'],
+            CreateBucketConfiguration={'LocationConstraint': 'eu-central-1'}
+        )
+
+        results = {
+            'Decode: whole b64decode': measure(decode_whole, picture_base64, args.repeats),
+            'Decode: chunked, spooled': measure(decode_streaming, picture_base64, args.repeats),
+            'Upload: whole + put_object': measure(upload_whole, picture_base64, args.repeats),
+            'Upload: chunked + multipart': measure(upload_streaming, picture_base64, args.repeats),
+            'save_profile_picture_to_s3': measure(lambda value: common_handler.save_profile_picture_to_s3(value, 'john.doe@gmail.com'), picture_base64, args.repeats)
+        }
+
+    print(f'Picture: {len(picture) / 1024 / 1024:.1f} MB, base64: {len(picture_base64) / 1024 / 1024:.1f} MB')
+
+    for name, (latency, peak) in results.items():
+        print(f'{name:30s} p50 {latency:7.1f} ms, peak traced memory {peak / 1024 / 1024:6.1f} MB')
+
+if __name__ == '__main__':
+    main()
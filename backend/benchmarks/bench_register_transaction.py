@@ -0,0 +1,199 @@
+"""
+Registers events for a club that already has --existing-events events and
+compares the old write path (GetItem on the whole club, PutItem event,
+PutItem giveaway, UpdateItem rewriting both club lists; reproduced here with
+the list append bug fixed) with register_lambda's single TransactWriteItems.
+
+Moto answers in-process, so --latency-ms adds a per-request delay that stands
+in for the network round trip. Moto doesn't report consumed capacity for
+transactions, so write units are computed from the stored item sizes with
+DynamoDB's rules: 1 WCU per started KB, updates billed on the larger of the
+old and new item, and transactional writes at twice the price.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_register_transaction --existing-events 200 --latency-ms 10
+"""
+import argparse
+import json
+import math
+import os
+import time
+import uuid
+from decimal import Decimal
+from moto import mock_aws
+
+import backend.common.clients as aws_clients
+from backend.events_service.events import register_lambda
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-central-1')
+os.environ['EVENTS_TABLE_NAME'] = 'events'
+os.environ['GIVEAWAY_TABLE_NAME'] = 'giveaways'
+os.environ['CLUBS_TABLE_NAME'] = 'clubs'
+os.environ['EVENT_PICTURES_BUCKET'] = 'lambda-event-pictures'
+
+CLUB = 'club@club.com'
+
+REQUEST = {
+    'title': 'Benchmark event',
+    'description': 'Benchmark event',
+    'startingAt': '2030-05-01 22:00',
+    'endingAt': '2030-05-02 04:00',
+    'genre': 'techno',
+    'event_image_content_type': 'image/jpeg',
+    'giveaway': {'prize': 'Tickets', 'description': 'Giveaway', 'name': 'Giveaway'}
+}
+
+def create_resources(existing_events):
+    dynamodb = aws_clients.get_dynamodb_resource()
+
+    for table_name, key in (('events', 'event_id'), ('giveaways', 'giveaway_id'), ('clubs', 'club_id')):
+        dynamodb.create_table(
+            TableName=table_name,
+            KeySchema=[{'AttributeName': key, 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': key, 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+
+    dynamodb.Table('clubs').put_item(Item={
+        'club_id': CLUB,
+        'latitude': '45.33',
+        'longitude': '14.44',
+        'events': [str(uuid.uuid4()) for _ in range(existing_events)],
+        'giveaways': [str(uuid.uuid4()) for _ in range(existing_events)]
+    })
+
+    aws_clients.get_s3_client().create_bucket(
+        Bucket=os.environ['EVENT_PICTURES_BUCKET'],
+        CreateBucketConfiguration={'LocationConstraint': 'eu-central-1'}
+    )
+
+def inject_latency(latency_ms):
+    def delay(**kwargs):
+        time.sleep(latency_ms / 1000)
+
+    aws_clients.get_dynamodb_client().meta.events.register('before-send.dynamodb', delay)
+
+    return delay
+
+def register_old_way():
+    dynamodb = aws_clients.get_dynamodb_resource()
+    clubs_table = dynamodb.Table('clubs')
+
+    event_id = str(uuid.uuid4())
+    giveaway_id = str(uuid.uuid4())
+
+    club_info = clubs_table.get_item(Key={'club_id': CLUB}).get('Item', {})
+
+    dynamodb.Table('events').put_item(Item={
+        'event_id': event_id,
+        'club_id': CLUB,
+        'title': REQUEST['title'],
+        'description': REQUEST['description'],
+        'startingAt': REQUEST['startingAt'],
+        'endingAt': REQUEST['endingAt'],
+        'genre': REQUEST['genre'],
+        'longitude': club_info.get('longitude', '0'),
+        'latitude': club_info.get('latitude', '0')
+    })
+
+    dynamodb.Table('giveaways').put_item(Item=dict(REQUEST['giveaway'], giveaway_id=giveaway_id, event_id=event_id, users=[], entries=[]))
+
+    clubs_table.update_item(
+        Key={'club_id': CLUB},
+        UpdateExpression='SET giveaways = :giveaways, events = :events',
+        ExpressionAttributeValues={
+            ':giveaways': club_info.get('giveaways', []) + [giveaway_id],
+            ':events': club_info.get('events', []) + [event_id]
+        }
+    )
+
+    return event_id
+
+def register_transaction():
+    result = register_lambda.lambda_handler({
+        'body': json.dumps(REQUEST),
+        'requestContext': {'authorizer': {'lambda': {'email': CLUB}}}
+    }, None)
+
+    assert result['statusCode'] == 200
+
+    return json.loads(result['body'])['event_id']
+
+def attribute_size(value):
+    if isinstance(value, str):
+        return len(value.encode())
+    if isinstance(value, bool) or value is None:
+        return 1
+    if isinstance(value, (int, float, Decimal)):
+        return len(str(value).lstrip('-').replace('.', '')) // 2 + 1
+    if isinstance(value, list):
+        return 3 + sum(attribute_size(element) + 1 for element in value)
+    if isinstance(value, dict):
+        return 3 + sum(len(key.encode()) + attribute_size(element) + 1 for key, element in value.items())
+
+    return len(str(value))
+
+def item_size(item):
+    return sum(len(key.encode()) + attribute_size(value) for key, value in item.items())
+
+def write_units(event_id, giveaway_id, club_before, club_after, transactional):
+    dynamodb = aws_clients.get_dynamodb_resource()
+
+    event_item = dynamodb.Table('events').get_item(Key={'event_id': event_id})['Item']
+    giveaway_item = dynamodb.Table('giveaways').get_item(Key={'giveaway_id': giveaway_id})['Item']
+
+    units = (
+        math.ceil(item_size(event_item) / 1024) +
+        math.ceil(item_size(giveaway_item) / 1024) +
+        math.ceil(max(item_size(club_before), item_size(club_after)) / 1024)
+    )
+
+    return units * 2 if transactional else units
+
+def measure(register, transactional, repeats, latency_ms):
+    clubs_table = aws_clients.get_dynamodb_table('clubs')
+
+    timings = []
+    units = []
+
+    for _ in range(repeats):
+        club_before = clubs_table.get_item(Key={'club_id': CLUB})['Item']
+
+        delay = inject_latency(latency_ms)
+        started_at = time.perf_counter()
+
+        event_id = register()
+
+        timings.append((time.perf_counter() - started_at) * 1000)
+        aws_clients.get_dynamodb_client().meta.events.unregister('before-send.dynamodb', delay)
+
+        club_after = clubs_table.get_item(Key={'club_id': CLUB})['Item']
+        units.append(write_units(event_id, club_after['giveaways'][-1], club_before, club_after, transactional))
+
+    timings.sort()
+
+    return timings[len(timings) // 2], sum(units) / len(units)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--existing-events', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=10)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    register_lambda.logger.setLevel('WARNING')
+
+    with mock_aws():
+        create_resources(args.existing_events)
+
+        old_latency, old_units = measure(register_old_way, False, args.repeats, args.latency_ms)
+        new_latency, new_units = measure(register_transaction, True, args.repeats, args.latency_ms)
+
+    print(f'Club with {args.existing_events} events, {args.latency_ms:.0f} ms per DynamoDB request')
+    print(f'GetItem + 2 PutItem + UpdateItem:  p50 {old_latency:6.1f} ms, {old_units:5.1f} WCU')
+    print(f'GetItem + TransactWriteItems:      p50 {new_latency:6.1f} ms, {new_units:5.1f} WCU')
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,21 @@
 import json
-import boto3
 import os
 import logging
-from decimal import Decimal
-from boto3.dynamodb.conditions import Attr
+
+import backend.common.clients as aws_clients
+import backend.common.geo as geo
+from backend.common.scan import ParallelScan
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+CLUBS_SEARCH_RADIUS_KM = float(os.getenv('CLUBS_SEARCH_RADIUS_KM', '50'))
+
+# Nearest mode keeps only the k closest clubs while the scan streams past
+CLUBS_NEAREST_MAX_K = int(os.getenv('CLUBS_NEAREST_MAX_K', '50'))
+CLUBS_NEAREST_MAX_RADIUS_KM = float(os.getenv('CLUBS_NEAREST_MAX_RADIUS_KM', '200'))
+CLUBS_NEAREST_BATCH_SIZE = 500
+
 def lambda_handler(event, context):
     try:
         event = event.get('queryStringParameters', {})
@@ -28,6 +36,25 @@ def lambda_handler(event, context):
                 })
             }
         
+        nearest = event.get('nearest')
+
+        if nearest is not None:
+            try:
+                nearest = int(nearest)
+
+                if not 1 <= nearest <= CLUBS_NEAREST_MAX_K:
+                    raise ValueError('nearest out of range')
+            except ValueError:
+                return {
+                    'statusCode': 400,
+                    'headers': {
+                        'Content-Type': 'application/json'
+                    },
+                    'body': json.dumps({
+                        'message': f'Nearest must be a number between 1 and {CLUBS_NEAREST_MAX_K}.'
+                    })
+                }
+
         logger.info(f'GET ALL CLUBS - Converting longitude: {longitude} and latitude: {latitude} to decimals.')
         
         longitude = str(longitude)
@@ -35,15 +62,12 @@ def lambda_handler(event, context):
         
         logger.info(f'GET ALL CLUBS - Getting table for clubs.')
 
-        dynamodb = boto3.resource('dynamodb')
-        clubs_table = dynamodb.Table(os.getenv('CLUBS_TABLE_NAME'))
+        clubs_table = aws_clients.get_dynamodb_table(os.getenv('CLUBS_TABLE_NAME'))
 
         try:
             # Getting clubs in the area
-            min_latitude = float(latitude) - 0.5
-            max_latitude = float(latitude) + 0.5
-            min_longitude = float(longitude) - 10
-            max_longitude = float(longitude) + 10
+            latitude = float(latitude)
+            longitude = float(longitude)
         except Exception as e:
             logger.error(f'GET ALL CLUBS - Unable to calculate range: {str(e)}')
 
@@ -58,30 +82,38 @@ def lambda_handler(event, context):
             }
 
         try:
-            clubs = clubs_table.scan()
-            clubs_items = clubs.get('Items', [])
-
-            logger.info(f'GET ALL CLUBS - Found clubs: {clubs_items}')
+            # Clubs stream in from all scan segments in parallel
+            with ParallelScan(
+                clubs_table,
+                ProjectionExpression='club_id, club_name, working_days, default_working_hours, latitude, longitude'
+            ) as scan:
+                if nearest:
+                    clubs_in_range = find_nearest_clubs(scan, latitude, longitude, nearest)
+                else:
+                    clubs_items = list(scan)
+
+                    # Bounding box first, then haversine over the clubs that are left, nearest first
+                    clubs_in_range = sorted(
+                        geo.items_within_radius(latitude, longitude, clubs_items, CLUBS_SEARCH_RADIUS_KM),
+                        key=lambda club_and_distance: club_and_distance[1]
+                    )
 
             filtered_clubs = []
 
-            for club in clubs_items:
-                if (
-                    min_longitude <= float(club["longitude"]) <= max_longitude and
-                    min_latitude <= float(club["latitude"]) <= max_latitude
-                    ):
-                    club_response = {
-                        'club_name': club['club_name'],
-                        'working_days': club['working_days'],
-                        'default_working_hours': club['default_working_hours'],
-                        'club_id': club['club_id'],
-                        'longitude': float(club["longitude"]),
-                        'latitude': float(club["latitude"])
-                    }
-
-                    filtered_clubs.append(club_response)
-
-            logger.info(f'GET ALL CLUBS - Found clubs: {filtered_clubs}')
+            for club, distance in clubs_in_range:
+                club_response = {
+                    'club_name': club['club_name'],
+                    'working_days': club['working_days'],
+                    'default_working_hours': club['default_working_hours'],
+                    'club_id': club['club_id'],
+                    'longitude': float(club["longitude"]),
+                    'latitude': float(club["latitude"]),
+                    'distance_km': round(distance, 3)
+                }
+
+                filtered_clubs.append(club_response)
+
+            logger.info(f'GET ALL CLUBS - Found {len(filtered_clubs)} clubs.')
         except Exception as e:
             logger.error(f'GET ALL CLUBS - Unable to read item: {str(e)}')
 
@@ -114,4 +146,24 @@ def lambda_handler(event, context):
             'body': json.dumps({
                 'message': f"An error occurred: {str(e)}"
             })
-        }
\ No newline at end of file
+        }
+
+def find_nearest_clubs(clubs, latitude, longitude, k):
+    """
+    The k clubs closest to the user within the maximum radius, closest first.
+    Clubs are pushed through a heap of size k in batches, so memory stays bounded
+    by k and the batch size however large the table is.
+    """
+    heap = []
+    batch = []
+
+    for club in clubs:
+        batch.append(club)
+
+        if len(batch) >= CLUBS_NEAREST_BATCH_SIZE:
+            geo.push_nearest(heap, k, latitude, longitude, batch, CLUBS_NEAREST_MAX_RADIUS_KM)
+            batch = []
+
+    geo.push_nearest(heap, k, latitude, longitude, batch, CLUBS_NEAREST_MAX_RADIUS_KM)
+
+    return geo.sorted_nearest(heap)
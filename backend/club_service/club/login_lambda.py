@@ -1,10 +1,10 @@
 import json
-import boto3
 import os
 import bcrypt
 import logging
 
 import backend.common.common as common_handler
+import backend.common.clients as aws_clients
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -30,8 +30,7 @@ def lambda_handler(event, context):
 
     logger.info(f'LOGIN - Getting database client.')
     
-    dynamodb = boto3.resource('dynamodb')
-    clubs_table = dynamodb.Table(os.getenv('CLUBS_TABLE_NAME'))
+    clubs_table = aws_clients.get_dynamodb_table(os.getenv('CLUBS_TABLE_NAME'))
 
     logger.info(f'CLUB LOGIN - Checking if user exists in the database.')
 
@@ -1,23 +1,22 @@
 import json
-import boto3
 import os
 import logging
 
 import backend.common.common as common_handler
+import backend.common.clients as aws_clients
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 def lambda_handler(event, context):
-    error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(event)
+    error_response, email = common_handler.get_authenticated_user_email(event)
     
     if error_response:
         return error_response
     
     logger.info("LOGOUT USER - Getting database client.")
     
-    dynamodb = boto3.resource('dynamodb')
-    clubs_table = dynamodb.Table(os.getenv('CLUBS_TABLE_NAME'))
+    clubs_table = aws_clients.get_dynamodb_table(os.getenv('CLUBS_TABLE_NAME'))
 
     logger.info("LOGOUT USER - Checking if user exists.")
 
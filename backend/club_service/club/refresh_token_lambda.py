@@ -1,9 +1,9 @@
 import json
-import boto3
 import os
 import logging
 
 import backend.common.common as common_handler
+import backend.common.clients as aws_clients
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -31,8 +31,7 @@ def lambda_handler(event, context):
     
     logger.info(f'CLUB REFRESH TOKEN - Getting database client.')
 
-    dynamodb = boto3.resource('dynamodb')
-    clubs_table = dynamodb.Table(os.getenv('CLUBS_TABLE_NAME'))
+    clubs_table = aws_clients.get_dynamodb_table(os.getenv('CLUBS_TABLE_NAME'))
 
     logger.info(f'CLUB REFRESH TOKEN - Checking if user exists.')
 
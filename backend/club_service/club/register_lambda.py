@@ -1,9 +1,9 @@
 import json
 import bcrypt
-import boto3
 import os
 import logging
 from decimal import Decimal
+import backend.common.clients as aws_clients
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -34,8 +34,7 @@ def lambda_handler(event, context):
     
     logger.info(f'REGISTER CLUB - Getting table for clubs.')
 
-    dynamodb = boto3.resource('dynamodb')
-    clubs_table = dynamodb.Table(os.getenv('CLUBS_TABLE_NAME'))
+    clubs_table = aws_clients.get_dynamodb_table(os.getenv('CLUBS_TABLE_NAME'))
 
     logger.info(f'REGISTER CLUB - Checking if club already exists.')
 
@@ -0,0 +1,26 @@
+import logging
+
+import backend.common.common as common_handler
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def lambda_handler(event, context):
+    # HTTP API Lambda authorizer (payload format 2.0, simple responses)
+    logger.info('AUTHORIZER - Verifying bearer token.')
+
+    error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(event)
+
+    if error_response:
+        logger.info(f"AUTHORIZER - Denying request: {error_response['statusCode']}")
+
+        return {
+            'isAuthorized': False
+        }
+
+    return {
+        'isAuthorized': True,
+        'context': {
+            'email': email
+        }
+    }
@@ -0,0 +1,85 @@
+import os
+import random
+import time
+import logging
+
+import backend.common.clients as aws_clients
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_MAX_KEYS = 100
+
+BATCH_GET_MAX_RETRIES = int(os.getenv('BATCH_GET_MAX_RETRIES', '8'))
+BATCH_GET_BACKOFF_BASE_SECONDS = float(os.getenv('BATCH_GET_BACKOFF_BASE_SECONDS', '0.05'))
+BATCH_GET_BACKOFF_MAX_SECONDS = float(os.getenv('BATCH_GET_BACKOFF_MAX_SECONDS', '2'))
+
+def batch_get_items(table_name, keys, attributes=None, consistent_read=False, region_name=None):
+    """
+    Reads items by key with as few BatchGetItem requests as possible.
+
+    Returns a list aligned with keys: the item for every key, or None when it doesn't exist.
+    Duplicate keys are fetched once. attributes limits the returned attributes (key attributes
+    are always included), and UnprocessedKeys are retried with exponential backoff.
+    """
+    if not keys:
+        return []
+
+    dynamodb = aws_clients.get_dynamodb_resource(region_name)
+    key_attributes = list(keys[0].keys())
+
+    unique_keys = list({_key_identity(key): key for key in keys}.values())
+
+    request_options = {
+        'ConsistentRead': consistent_read
+    }
+
+    if attributes:
+        projected_attributes = key_attributes + [attribute for attribute in attributes if attribute not in key_attributes]
+
+        # Placeholders keep reserved words like "type" or "name" usable
+        request_options['ProjectionExpression'] = ', '.join(f'#a{index}' for index in range(len(projected_attributes)))
+        request_options['ExpressionAttributeNames'] = {
+            f'#a{index}': attribute for index, attribute in enumerate(projected_attributes)
+        }
+
+    items_by_key = {}
+
+    for start in range(0, len(unique_keys), BATCH_GET_MAX_KEYS):
+        chunk = unique_keys[start:start + BATCH_GET_MAX_KEYS]
+
+        for item in _batch_get_chunk(dynamodb, table_name, chunk, request_options):
+            items_by_key[_key_identity({attribute: item[attribute] for attribute in key_attributes})] = item
+
+    return [items_by_key.get(_key_identity(key)) for key in keys]
+
+def _batch_get_chunk(dynamodb, table_name, keys, request_options):
+    request_items = {
+        table_name: dict(request_options, Keys=keys)
+    }
+
+    items = []
+
+    for attempt in range(BATCH_GET_MAX_RETRIES + 1):
+        response = dynamodb.batch_get_item(RequestItems=request_items)
+
+        items.extend(response.get('Responses', {}).get(table_name, []))
+
+        request_items = response.get('UnprocessedKeys') or {}
+
+        if not request_items:
+            return items
+
+        if attempt < BATCH_GET_MAX_RETRIES:
+            # Full jitter, so retries of concurrent requests don't line up
+            backoff_seconds = min(BATCH_GET_BACKOFF_BASE_SECONDS * (2 ** attempt), BATCH_GET_BACKOFF_MAX_SECONDS)
+
+            logger.info(f'BATCH GET - {len(request_items[table_name]["Keys"])} unprocessed keys, retrying in up to {backoff_seconds:.2f}s.')
+
+            time.sleep(random.uniform(0, backoff_seconds))
+
+    raise RuntimeError(f'BatchGetItem left {len(request_items[table_name]["Keys"])} keys unprocessed after {BATCH_GET_MAX_RETRIES} retries.')
+
+def _key_identity(key):
+    return tuple(sorted((attribute, str(value)) for attribute, value in key.items()))
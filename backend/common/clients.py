@@ -0,0 +1,95 @@
+import os
+import threading
+import boto3
+from botocore.config import Config
+import logging
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Clients are created once per container and reused by every warm invocation
+BOTO_MAX_POOL_CONNECTIONS = int(os.getenv('BOTO_MAX_POOL_CONNECTIONS', '32'))
+BOTO_CONNECT_TIMEOUT_SECONDS = float(os.getenv('BOTO_CONNECT_TIMEOUT_SECONDS', '2'))
+BOTO_READ_TIMEOUT_SECONDS = float(os.getenv('BOTO_READ_TIMEOUT_SECONDS', '10'))
+BOTO_MAX_ATTEMPTS = int(os.getenv('BOTO_MAX_ATTEMPTS', '3'))
+
+_clients = {}
+_resources = {}
+_tables = {}
+_clients_lock = threading.Lock()
+
+def get_boto_config():
+    return Config(
+        max_pool_connections=BOTO_MAX_POOL_CONNECTIONS,
+        connect_timeout=BOTO_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=BOTO_READ_TIMEOUT_SECONDS,
+        tcp_keepalive=True,
+        retries={
+            'max_attempts': BOTO_MAX_ATTEMPTS,
+            'mode': 'standard'
+        }
+    )
+
+def get_client(service_name, region_name=None):
+    cache_key = (service_name, region_name)
+    client = _clients.get(cache_key)
+
+    if client is None:
+        # boto3's default session is not thread safe, so creation is serialized
+        with _clients_lock:
+            client = _clients.get(cache_key)
+
+            if client is None:
+                logger.info(f'CLIENTS - Creating {service_name} client.')
+
+                client = boto3.client(service_name, region_name=region_name, config=get_boto_config())
+                _clients[cache_key] = client
+
+    return client
+
+def get_resource(service_name, region_name=None):
+    cache_key = (service_name, region_name)
+    resource = _resources.get(cache_key)
+
+    if resource is None:
+        with _clients_lock:
+            resource = _resources.get(cache_key)
+
+            if resource is None:
+                logger.info(f'CLIENTS - Creating {service_name} resource.')
+
+                resource = boto3.resource(service_name, region_name=region_name, config=get_boto_config())
+                _resources[cache_key] = resource
+
+    return resource
+
+def get_dynamodb_resource(region_name=None):
+    return get_resource('dynamodb', region_name)
+
+def get_dynamodb_client(region_name=None):
+    return get_dynamodb_resource(region_name).meta.client
+
+def get_dynamodb_table(table_name, region_name=None):
+    cache_key = (table_name, region_name)
+    table = _tables.get(cache_key)
+
+    if table is None:
+        table = get_dynamodb_resource(region_name).Table(table_name)
+        _tables[cache_key] = table
+
+    return table
+
+def get_s3_client(region_name=None):
+    return get_client('s3', region_name)
+
+def get_ses_client(region_name=None):
+    return get_client('ses', region_name)
+
+def get_secrets_manager_client(region_name=None):
+    return get_client('secretsmanager', region_name)
+
+def reset_clients():
+    with _clients_lock:
+        _clients.clear()
+        _resources.clear()
+        _tables.clear()
@@ -1,15 +1,64 @@
+import io
 import json
 import os
-import boto3
 import jwt
 import random
 import base64
+import hashlib
+import hmac
+import threading
+import time
+import decimal
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
 import logging
 
+import backend.common.clients as aws_clients
+import backend.common.images as images
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Secrets are cached per container, so warm invocations skip Secrets Manager
+SECRETS_CACHE_TTL_SECONDS = int(os.getenv('SECRETS_CACHE_TTL_SECONDS', '300'))
+SECRETS_CACHE_STALE_WHILE_REVALIDATE = os.getenv('SECRETS_CACHE_STALE_WHILE_REVALIDATE', 'true').lower() == 'true'
+SECRETS_CACHE_MAX_STALE_SECONDS = int(os.getenv('SECRETS_CACHE_MAX_STALE_SECONDS', '3600'))
+SECRETS_CACHE_MIN_REFRESH_INTERVAL_SECONDS = int(os.getenv('SECRETS_CACHE_MIN_REFRESH_INTERVAL_SECONDS', '30'))
+
+_secrets_cache = {}
+_secrets_cache_lock = threading.Lock()
+_secrets_refreshing = set()
+_secrets_cache_stats = {
+    'hits': 0,
+    'misses': 0,
+    'stale_hits': 0,
+    'refreshes': 0,
+    'invalidations': 0
+}
+
+# Verified tokens are remembered until they expire, so repeated requests skip jwt.decode
+JWT_CACHE_ENABLED = os.getenv('JWT_CACHE_ENABLED', 'true').lower() == 'true'
+JWT_CACHE_MAX_SIZE = int(os.getenv('JWT_CACHE_MAX_SIZE', '1024'))
+
+_jwt_cache = OrderedDict()
+_jwt_cache_lock = threading.Lock()
+_jwt_cache_stats = {
+    'hits': 0,
+    'misses': 0
+}
+
+def get_authenticated_user_email(event):
+    # When the API Gateway authorizer already verified the token it passes the email in the request context
+    authorizer_context = (event.get('requestContext') or {}).get('authorizer') or {}
+    email = (authorizer_context.get('lambda') or {}).get('email')
+
+    if email:
+        logger.info("SERVICE - Using email from the authorizer context")
+
+        return None, email
+
+    return check_is_user_authenticated_and_fetch_email_from_jwt(event)
+
 def check_is_user_authenticated_and_fetch_email_from_jwt(event):
     logger.info("SERVICE - Checking if user is authenticated")
 
@@ -32,18 +81,10 @@ def check_is_user_authenticated_and_fetch_email_from_jwt(event):
     token = authorization_header.split(' ')[1] if ' ' in authorization_header else authorization_header
     
     try:
-        logger.info("SERVICE - Accessing jwt secret.")
-
-        # Get jwt secret for generating jwt token
-        secrets = get_secrets_from_aws_secrets_manager(
-            os.getenv('JWT_SECRET_NAME'),
-            os.getenv('SECRETS_REGION_NAME')
-        )
-
         logger.info("SERVICE - Verifying token and extracting email.")
 
         # Decode and verify the JWT token
-        decoded_token = jwt.decode(token, secrets['jwt_secret'], algorithms=['HS256'])
+        decoded_token = decode_jwt_with_cached_secret(token, 'jwt_secret')
         email = decoded_token['email']
 
         return None, email
@@ -79,6 +120,75 @@ def check_is_user_authenticated_and_fetch_email_from_jwt(event):
             'body': json.dumps({'message': f'There was an error trying to decode the token: {str(e)}'})
         }, None
 
+def decode_jwt_with_cached_secret(token, secret_key):
+    if not JWT_CACHE_ENABLED or JWT_CACHE_MAX_SIZE <= 0:
+        return _decode_jwt(token, secret_key)
+
+    cache_key = (secret_key, hashlib.sha256(token.encode()).hexdigest())
+
+    with _jwt_cache_lock:
+        cached_entry = _jwt_cache.get(cache_key)
+
+        if cached_entry and time.time() < cached_entry['exp']:
+            _jwt_cache.move_to_end(cache_key)
+            _jwt_cache_stats['hits'] += 1
+
+            return dict(cached_entry['claims'])
+
+        # Expired entries fall through so jwt.decode raises the usual error
+        _jwt_cache.pop(cache_key, None)
+        _jwt_cache_stats['misses'] += 1
+
+    decoded_token = _decode_jwt(token, secret_key)
+
+    if isinstance(decoded_token.get('exp'), (int, float)):
+        with _jwt_cache_lock:
+            _jwt_cache[cache_key] = {
+                'claims': dict(decoded_token),
+                'exp': decoded_token['exp']
+            }
+
+            while len(_jwt_cache) > JWT_CACHE_MAX_SIZE:
+                _jwt_cache.popitem(last=False)
+
+    return decoded_token
+
+def get_jwt_cache_stats():
+    with _jwt_cache_lock:
+        lookups = _jwt_cache_stats['hits'] + _jwt_cache_stats['misses']
+
+        return dict(
+            _jwt_cache_stats,
+            size=len(_jwt_cache),
+            hit_rate=_jwt_cache_stats['hits'] / lookups if lookups else 0.0
+        )
+
+def clear_jwt_cache():
+    with _jwt_cache_lock:
+        _jwt_cache.clear()
+
+        for stat in _jwt_cache_stats:
+            _jwt_cache_stats[stat] = 0
+
+def _decode_jwt(token, secret_key):
+    secret_id = os.getenv('JWT_SECRET_NAME')
+    region_name = os.getenv('SECRETS_REGION_NAME')
+
+    logger.info("SERVICE - Accessing jwt secret.")
+
+    secrets = get_secrets_from_aws_secrets_manager(secret_id, region_name)
+
+    try:
+        return jwt.decode(token, secrets[secret_key], algorithms=['HS256'])
+    except jwt.InvalidSignatureError:
+        # The secret could have been rotated after it was cached, so retry once with a fresh one
+        refreshed_secrets = invalidate_cached_secret(secret_id, region_name)
+
+        if not refreshed_secrets or refreshed_secrets.get(secret_key) == secrets.get(secret_key):
+            raise
+
+        return jwt.decode(token, refreshed_secrets[secret_key], algorithms=['HS256'])
+
 def generate_access_token(user_email):
     try:
         logger.info(f'SERVICE - Getting secret value.')
@@ -142,24 +252,14 @@ def generate_refresh_token(table, user_email, is_clubs_table=False):
     
 def check_is_refresh_token_valid(refresh_token, is_clubs_table=False):
     try:
-        logger.info(f'SERVICE - Getting secret value.')
-
-        # Get jwt secret for generating jwt token
-        secrets = get_secrets_from_aws_secrets_manager(
-            os.getenv('JWT_SECRET_NAME'),
-            os.getenv('SECRETS_REGION_NAME')
-        )
-
         logger.info(f'SERVICE - Verifying refresh token.')
 
-        decoded_token = jwt.decode(refresh_token, secrets['refresh_secret'], algorithms=['HS256'])
+        decoded_token = decode_jwt_with_cached_secret(refresh_token, 'refresh_secret')
 
         logger.info('SERVICE - Getting database client')
 
-        dynamodb = boto3.resource('dynamodb')
-
         if is_clubs_table:
-            clubs_table = dynamodb.Table(os.getenv('CLUBS_TABLE_NAME'))
+            clubs_table = aws_clients.get_dynamodb_table(os.getenv('CLUBS_TABLE_NAME'))
 
             logger.info('SERVICE - Getting user from the database')
 
@@ -175,7 +275,7 @@ def check_is_refresh_token_valid(refresh_token, is_clubs_table=False):
                 club_table_item.get('Item').get('refresh_token') == refresh_token
             )
         else:
-            users_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
+            users_table = aws_clients.get_dynamodb_table(os.getenv('USERS_TABLE_NAME'))
 
             logger.info('SERVICE - Getting user from the database')
 
@@ -207,21 +307,23 @@ def save_profile_picture_to_s3(profile_picture, user_email, should_convert_from_
     try:
         logger.info(f'SERVICE - Converting profile picture to data.')
 
+        # Decoded in chunks into a spooled file instead of one bytes object next to the request body
         if should_convert_from_base64:
-            profile_picture_data = base64.b64decode(profile_picture)
+            profile_picture_file, content_type = images.decode_base64_image_to_file(profile_picture)
         else:
-            profile_picture_data = profile_picture
+            profile_picture_file = io.BytesIO(profile_picture)
+            content_type = images.detect_image_content_type(profile_picture[:16]) or 'image/jpeg'
 
         logger.info(f'SERVICE - Saving profile picture to S3.')
 
-        s3_client = boto3.client('s3')
-
-        s3_client.put_object(
-            Bucket=os.getenv('PROFILE_PICTURES_BUCKET'),
-            Key=f"{os.getenv('PROFILE_PICTURES_PREFIX')}{user_email}.jpg",
-            Body=profile_picture_data,
-            ContentType='image/jpeg'
-        )
+        # Thumbnail and medium derivatives are stored alongside the original
+        with profile_picture_file:
+            images.save_image(
+                os.getenv('PROFILE_PICTURES_BUCKET'),
+                f"{os.getenv('PROFILE_PICTURES_PREFIX')}{user_email}.jpg",
+                profile_picture_file,
+                content_type
+            )
 
         return True
     except Exception as e:
@@ -229,17 +331,17 @@ def save_profile_picture_to_s3(profile_picture, user_email, should_convert_from_
 
         return False
     
-def get_profile_picture_as_base64_from_s3(user_email):
+def get_profile_picture_as_base64_from_s3(user_email, size=images.IMAGE_SIZE_ORIGINAL, image_format=images.IMAGE_DEFAULT_FORMAT):
     try:
         logger.info("SERVICE - Getting client for profile picture deletion")
 
-        s3_client = boto3.client('s3')
+        s3_client = aws_clients.get_s3_client()
 
         logger.info("SERVICE - Fetching profile picture")
 
         response = s3_client.get_object(
             Bucket=os.getenv('PROFILE_PICTURES_BUCKET'),
-            Key=f"{os.getenv('PROFILE_PICTURES_PREFIX')}{user_email}.jpg",
+            Key=images.derivative_key(f"{os.getenv('PROFILE_PICTURES_PREFIX')}{user_email}.jpg", size, image_format),
         )
 
         if 'Body' in response:
@@ -252,11 +354,24 @@ def get_profile_picture_as_base64_from_s3(user_email):
         logger.error(f'SERVICE - Unable to get profile picture: {str(e)}')
         return None
     
+def get_profile_picture_url_from_s3(user_email, size=images.IMAGE_SIZE_ORIGINAL, image_format=images.IMAGE_DEFAULT_FORMAT):
+    try:
+        logger.info("SERVICE - Getting presigned profile picture url")
+
+        return images.get_presigned_image_url(
+            os.getenv('PROFILE_PICTURES_BUCKET'),
+            images.derivative_key(f"{os.getenv('PROFILE_PICTURES_PREFIX')}{user_email}.jpg", size, image_format),
+            check_exists=True
+        )
+    except Exception as e:
+        logger.error(f'SERVICE - Unable to get profile picture url: {str(e)}')
+        return None
+
 def delete_profile_picture_from_s3(user_email):
     try:
         logger.info("SERVICE - Getting client for profile picture deletion")
 
-        s3_client = boto3.client('s3')
+        s3_client = aws_clients.get_s3_client()
 
         logger.info("SERVICE - Checking if profile picture exists")
 
@@ -268,9 +383,9 @@ def delete_profile_picture_from_s3(user_email):
         if 'Body' in response:
             logger.info("SERVICE - Deleting profile picture")
 
-            s3_client.delete_object(
-                Bucket=os.getenv('PROFILE_PICTURES_BUCKET'),
-                Key=f"{os.getenv('PROFILE_PICTURES_PREFIX')}{user_email}.jpg"
+            images.delete_image(
+                os.getenv('PROFILE_PICTURES_BUCKET'),
+                f"{os.getenv('PROFILE_PICTURES_PREFIX')}{user_email}.jpg"
             )
     except Exception as e:
         logger.error(f'SERVICE - Unable to delete profile picture: {str(e)}')
@@ -283,8 +398,7 @@ def check_is_six_digit_code_valid(entered_six_digit_code, email):
     try:
         logger.info("SERVICE - Getting database client.")
 
-        dynamodb = boto3.resource('dynamodb')
-        users_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
+        users_table = aws_clients.get_dynamodb_table(os.getenv('USERS_TABLE_NAME'))
 
         logger.info("SERVICE - Getting user.")
 
@@ -314,7 +428,7 @@ def check_is_six_digit_code_valid(entered_six_digit_code, email):
 
 def send_email(sendTo, subject, body):
     try:
-        ses_client = boto3.client('ses', region_name=os.getenv('SES_REGION_NAME'))
+        ses_client = aws_clients.get_ses_client(os.getenv('SES_REGION_NAME'))
 
         ses_client.send_email(
             Source=os.getenv('EMAIL_SENDER'),
@@ -335,18 +449,169 @@ def send_email(sendTo, subject, body):
     except Exception as e:
         logger.error(f'SERVICE - Unable to send email: {str(e)}')
 
-def get_secrets_from_aws_secrets_manager(secret_id, region_name):
+def convert_decimals(obj):
+    """
+    Copy of a DynamoDB item (or list of them) with Decimals turned into floats, so it can be
+    passed to json.dumps.
+    """
+    if isinstance(obj, list):
+        return [convert_decimals(i) for i in obj]
+    elif isinstance(obj, dict):
+        return {k: convert_decimals(v) for k, v in obj.items()}
+    elif isinstance(obj, decimal.Decimal):
+        return float(obj)
+    else:
+        return obj
+
+def encode_cursor(state):
+    """
+    Turns pagination state into an opaque token the client sends back unchanged.
+    The token is signed, so clients can't tamper with start keys or filters.
+    """
+    payload = base64.urlsafe_b64encode(
+        json.dumps(state, separators=(',', ':'), sort_keys=True, default=str).encode()
+    ).decode().rstrip('=')
+
+    return f'{payload}.{_sign_cursor_payload(payload)}'
+
+def decode_cursor(cursor):
+    """
+    Returns the state stored in a cursor, or None if the cursor is malformed or was not signed by us.
+    """
     try:
-        secrets_manager = boto3.client(
-            service_name='secretsmanager', 
-            region_name=region_name
-        )
+        payload, signature = cursor.split('.')
+
+        if not hmac.compare_digest(signature, _sign_cursor_payload(payload)):
+            logger.error('SERVICE - Cursor signature mismatch.')
+
+            return None
+
+        return json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.error(f'SERVICE - Unable to decode cursor: {str(e)}')
+
+        return None
+
+def _sign_cursor_payload(payload):
+    secrets = get_secrets_from_aws_secrets_manager(
+        os.getenv('JWT_SECRET_NAME'),
+        os.getenv('SECRETS_REGION_NAME')
+    )
+
+    # Derive a separate key so a cursor signature can never double as a token signature
+    cursor_key = hmac.new(secrets['jwt_secret'].encode(), b'pagination-cursor', hashlib.sha256).digest()
+
+    return base64.urlsafe_b64encode(
+        hmac.new(cursor_key, payload.encode(), hashlib.sha256).digest()
+    ).decode().rstrip('=')
+
+def get_secrets_from_aws_secrets_manager(secret_id, region_name, force_refresh=False):
+    cache_key = (secret_id, region_name)
+    now = time.monotonic()
+
+    with _secrets_cache_lock:
+        cached_entry = _secrets_cache.get(cache_key)
+
+    if cached_entry and not force_refresh and SECRETS_CACHE_TTL_SECONDS > 0:
+        age = now - cached_entry['fetched_at']
+
+        if age < SECRETS_CACHE_TTL_SECONDS:
+            _increment_secrets_cache_stat('hits')
+
+            return cached_entry['value']
+
+        if SECRETS_CACHE_STALE_WHILE_REVALIDATE and age < SECRETS_CACHE_TTL_SECONDS + SECRETS_CACHE_MAX_STALE_SECONDS:
+            logger.info('SERVICE - Serving stale secret while refreshing it in the background.')
+
+            _increment_secrets_cache_stat('stale_hits')
+            _refresh_secret_in_background(secret_id, region_name)
+
+            return cached_entry['value']
+
+    _increment_secrets_cache_stat('misses')
+
+    secrets = _fetch_secret_from_aws_secrets_manager(secret_id, region_name)
+
+    if secrets is None and cached_entry:
+        logger.error('SERVICE - Falling back to the previously cached secret.')
+
+        return cached_entry['value']
+
+    return secrets
+
+def invalidate_cached_secret(secret_id, region_name):
+    """
+    Drops the cached secret and fetches it again, so a rotated key is picked up.
+    Returns the refreshed secret, or None when it was refreshed too recently.
+    """
+    cache_key = (secret_id, region_name)
+
+    with _secrets_cache_lock:
+        cached_entry = _secrets_cache.get(cache_key)
+
+        if cached_entry and time.monotonic() - cached_entry['fetched_at'] < SECRETS_CACHE_MIN_REFRESH_INTERVAL_SECONDS:
+            return None
+
+        _secrets_cache.pop(cache_key, None)
+
+    logger.info('SERVICE - Invalidating cached secret.')
+
+    _increment_secrets_cache_stat('invalidations')
+
+    return get_secrets_from_aws_secrets_manager(secret_id, region_name, force_refresh=True)
+
+def get_secrets_cache_stats():
+    with _secrets_cache_lock:
+        return dict(_secrets_cache_stats, size=len(_secrets_cache))
+
+def clear_secrets_cache():
+    with _secrets_cache_lock:
+        _secrets_cache.clear()
+        _secrets_refreshing.clear()
+
+        for stat in _secrets_cache_stats:
+            _secrets_cache_stats[stat] = 0
+
+def _fetch_secret_from_aws_secrets_manager(secret_id, region_name):
+    try:
+        secrets_manager = aws_clients.get_secrets_manager_client(region_name)
 
         secret_string = secrets_manager.get_secret_value(
             SecretId=secret_id
         )
 
-        return json.loads(secret_string['SecretString'])
+        secrets = json.loads(secret_string['SecretString'])
+
+        with _secrets_cache_lock:
+            _secrets_cache[(secret_id, region_name)] = {
+                'value': secrets,
+                'fetched_at': time.monotonic()
+            }
+
+        return secrets
     except Exception as e:
         logger.error(f'SERVICE - Failed to retrieve secrets: {str(e)}')
-        return None
\ No newline at end of file
+        return None
+
+def _refresh_secret_in_background(secret_id, region_name):
+    cache_key = (secret_id, region_name)
+
+    with _secrets_cache_lock:
+        if cache_key in _secrets_refreshing:
+            return
+
+        _secrets_refreshing.add(cache_key)
+
+    def refresh():
+        try:
+            if _fetch_secret_from_aws_secrets_manager(secret_id, region_name) is not None:
+                _increment_secrets_cache_stat('refreshes')
+        finally:
+            with _secrets_cache_lock:
+                _secrets_refreshing.discard(cache_key)
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+def _increment_secrets_cache_stat(stat):
+    with _secrets_cache_lock:
+        _secrets_cache_stats[stat] += 1
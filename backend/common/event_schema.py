@@ -0,0 +1,89 @@
+import uuid
+
+import backend.common.geo as geo
+
+# Attributes every event needs and their types
+EVENT_REQUIRED_ATTRIBUTES = {
+    'title': str,
+    'description': str,
+    'startingAt': str,
+    'endingAt': str,
+}
+
+# Structure of the giveaway object every event comes with
+GIVEAWAY_REQUIRED_ATTRIBUTES = {
+    'prize': str,
+    'description': str,
+    'name': str
+}
+
+# At least one of these has to be set so the event can be filtered in search
+EVENT_CATEGORY_ATTRIBUTES = ('genre', 'type', 'theme')
+
+def validate_event(event):
+    """
+    Checks an event request against the rules shared by registration and bulk import.
+    Returns the message to send back, or None when the event is valid. Covers are
+    not checked here, since only registration accepts them.
+    """
+    for key, expected_type in EVENT_REQUIRED_ATTRIBUTES.items():
+        if key not in event:
+            return f'Missing required attribute: {key}'
+        if not isinstance(event[key], expected_type):
+            return f'Attribute {key} must be of type {expected_type.__name__}'
+
+    if not isinstance(event.get('giveaway'), dict):
+        return 'Missing required attribute: giveaway'
+
+    for key, expected_type in GIVEAWAY_REQUIRED_ATTRIBUTES.items():
+        if key not in event['giveaway']:
+            return f'Missing required giveaway attribute: {key}'
+        if not isinstance(event['giveaway'][key], expected_type):
+            return f'Giveaway attribute {key} must be of type {expected_type.__name__}'
+
+    if not any(event.get(key) for key in EVENT_CATEGORY_ATTRIBUTES):
+        return 'At least one of genre, type, or theme must be provided.'
+
+    return None
+
+def build_event_items(event, club_id, club_info):
+    """
+    The event and giveaway items for a validated event request, with fresh ids.
+    club_info only needs the club's latitude and longitude.
+    """
+    event_id = str(uuid.uuid4())
+    giveaway_id = str(uuid.uuid4())
+
+    event_item = {
+        'event_id': event_id,
+        'club_id': club_id,
+        'title': event['title'],
+        'description': event['description'],
+        'startingAt': event['startingAt'],
+        'endingAt': event['endingAt'],
+        'performers': event.get('performers', ""),
+        'longitude': club_info.get('longitude', "0"),
+        'latitude': club_info.get('latitude', "0"),
+        # Set once the cover lands in S3, see event_image_uploaded_lambda
+        'has_image': False
+    }
+
+    # Geohash attributes let search query nearby cells instead of scanning the table
+    event_item.update(geo.geohash_attributes(event_item['latitude'], event_item['longitude']))
+
+    for key in EVENT_CATEGORY_ATTRIBUTES:
+        if event.get(key):
+            event_item[key] = event[key]
+
+    giveaway_item = {
+        'giveaway_id': giveaway_id,
+        'event_id': event_id,
+        'prize': event['giveaway']['prize'],
+        'description': event['giveaway']['description'],
+        'name': event['giveaway']['name'],
+        # Entries live in the giveaway_entries table, see giveaways.join_giveaway
+        'entrants': 0,
+        'total_weight': 0
+    }
+
+    return event_item, giveaway_item
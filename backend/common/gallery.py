@@ -0,0 +1,34 @@
+import os
+import logging
+from boto3.dynamodb.conditions import Key
+
+import backend.common.clients as aws_clients
+import backend.common.pagination as pagination
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Gallery images are read per event, newest first, from this GSI
+EVENT_IMAGES_INDEX_NAME = 'event_id-created_at-index'
+
+GALLERY_DEFAULT_PAGE_SIZE = int(os.getenv('GALLERY_DEFAULT_PAGE_SIZE', '20'))
+GALLERY_MAX_PAGE_SIZE = int(os.getenv('GALLERY_MAX_PAGE_SIZE', '100'))
+
+GALLERY_CURSOR_VERSION = 1
+
+def get_gallery_page(event_id, limit=GALLERY_DEFAULT_PAGE_SIZE, cursor=None):
+    """
+    One page of an event's gallery, newest first, and the cursor of the next page (None on the last one).
+    Raises ValueError for a cursor that is invalid or belongs to another event.
+    """
+    query_kwargs = {
+        'IndexName': EVENT_IMAGES_INDEX_NAME,
+        'KeyConditionExpression': Key('event_id').eq(event_id),
+        'ScanIndexForward': False
+    }
+
+    event_images_table = aws_clients.get_dynamodb_table(os.getenv('EVENT_IMAGES_TABLE_NAME'))
+
+    items, next_cursor = pagination.query_cursor_page(event_images_table, query_kwargs, limit, cursor, GALLERY_CURSOR_VERSION, {'event_id': event_id}, ('id', 'event_id', 'created_at'))
+
+    return items, next_cursor
@@ -0,0 +1,255 @@
+import math
+import heapq
+import itertools
+import numpy as np
+from math import radians, degrees, cos, sin, asin, sqrt
+
+EARTH_RADIUS_KM = 6371
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Precision stored on every event and the shorter prefix used as the GSI partition key
+GEOHASH_PRECISION = 9
+GEOHASH_INDEX_PRECISION = 3
+GEOHASH_INDEX_NAME = 'geohash-index'
+
+# Finest precision tried when covering a search area, and how many cells we are willing to query
+GEOHASH_MAX_COVER_PRECISION = 6
+GEOHASH_MAX_COVER_CELLS = 16
+
+# Breaks distance ties in the nearest heaps, so items themselves are never compared
+_heap_counter = itertools.count()
+
+def haversine(lon1, lat1, lon2, lat2):
+    """
+    Calculate the great circle distance between two points
+    on the earth (specified in decimal degrees).
+    Returns distance in kilometers.
+    """
+    # Convert decimal degrees to radians
+    lon1_rad, lat1_rad, lon2_rad, lat2_rad = map(radians, [lon1, lat1, lon2, lat2])
+
+    # Haversine formula
+    dlon = lon2_rad - lon1_rad
+    dlat = lat2_rad - lat1_rad
+    a = sin(dlat/2)**2 + cos(lat1_rad) * cos(lat2_rad) * sin(dlon/2)**2
+    c = 2 * asin(sqrt(a))
+
+    return c * EARTH_RADIUS_KM
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Smallest lat/lon box containing every point within radius_km of the centre.
+    Returns (min_lat, max_lat, min_lon, max_lon); longitudes may fall outside
+    [-180, 180] when the box crosses the antimeridian.
+    """
+    angular_radius = radius_km / EARTH_RADIUS_KM
+    delta_lat = degrees(angular_radius)
+
+    min_lat = max(latitude - delta_lat, -90.0)
+    max_lat = min(latitude + delta_lat, 90.0)
+
+    # Near the poles (or for huge radii) the circle spans every longitude
+    if min_lat <= -90.0 or max_lat >= 90.0 or sin(angular_radius) >= cos(radians(latitude)):
+        return min_lat, max_lat, -180.0, 180.0
+
+    delta_lon = degrees(asin(sin(angular_radius) / cos(radians(latitude))))
+
+    return min_lat, max_lat, longitude - delta_lon, longitude + delta_lon
+
+def haversine_many(longitude, latitude, longitudes, latitudes):
+    """
+    Vectorised haversine from one point to arrays of points, in kilometers.
+    """
+    longitude_rad, latitude_rad = radians(longitude), radians(latitude)
+    longitudes_rad = np.radians(longitudes)
+    latitudes_rad = np.radians(latitudes)
+
+    a = np.sin((latitudes_rad - latitude_rad) / 2) ** 2 + cos(latitude_rad) * np.cos(latitudes_rad) * np.sin((longitudes_rad - longitude_rad) / 2) ** 2
+
+    return 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0))) * EARTH_RADIUS_KM
+
+def coordinates_to_arrays(items, latitude_key='latitude', longitude_key='longitude'):
+    """
+    Loads item coordinates (strings or Decimals in DynamoDB) into float arrays.
+    Missing or malformed coordinates become NaN, which never matches a distance check.
+    """
+    latitudes = [item.get(latitude_key) for item in items]
+    longitudes = [item.get(longitude_key) for item in items]
+
+    try:
+        return np.asarray(latitudes, dtype=float), np.asarray(longitudes, dtype=float)
+    except (TypeError, ValueError):
+        return np.array([_to_float(value) for value in latitudes]), np.array([_to_float(value) for value in longitudes])
+
+def within_radius(latitude, longitude, latitudes, longitudes, radius_km):
+    """
+    Indices of the points within radius_km of the centre and their distances.
+    A bounding box discards most points before the haversine runs on the rest.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+
+    mask = (latitudes >= min_lat) & (latitudes <= max_lat)
+
+    half_lon_span = (max_lon - min_lon) / 2
+
+    if half_lon_span < 180:
+        # Compare the wrapped longitude difference so boxes crossing the antimeridian still work
+        longitude_delta = (longitudes - longitude + 180.0) % 360.0 - 180.0
+        mask &= np.abs(longitude_delta) <= half_lon_span
+
+    candidates = np.flatnonzero(mask)
+    distances = haversine_many(longitude, latitude, longitudes[candidates], latitudes[candidates])
+
+    inside = distances <= radius_km
+
+    return candidates[inside], distances[inside]
+
+def items_within_radius(latitude, longitude, items, radius_km, latitude_key='latitude', longitude_key='longitude'):
+    """
+    (item, distance_km) pairs for the items within radius_km, in their original order.
+    """
+    if not items:
+        return []
+
+    latitudes, longitudes = coordinates_to_arrays(items, latitude_key, longitude_key)
+    indices, distances = within_radius(latitude, longitude, latitudes, longitudes, radius_km)
+
+    return [(items[index], float(distance)) for index, distance in zip(indices, distances)]
+
+def push_nearest(heap, k, latitude, longitude, items, max_radius_km, latitude_key='latitude', longitude_key='longitude'):
+    """
+    Keeps the k items closest to the centre (and within max_radius_km) in heap.
+    The heap is a max-heap on distance, so it never holds more than k entries
+    however many batches of items are pushed through it.
+    """
+    for item, distance in items_within_radius(latitude, longitude, items, max_radius_km, latitude_key, longitude_key):
+        entry = (-distance, next(_heap_counter), item)
+
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif distance < -heap[0][0]:
+            heapq.heapreplace(heap, entry)
+
+    return heap
+
+def merge_nearest(heap, k, other_heap):
+    for entry in other_heap:
+        if len(heap) < k:
+            heapq.heappush(heap, entry)
+        elif entry[0] > heap[0][0]:
+            heapq.heapreplace(heap, entry)
+
+    return heap
+
+def farthest_in_heap(heap):
+    return -heap[0][0] if heap else None
+
+def sorted_nearest(heap):
+    """
+    (item, distance_km) pairs from a nearest heap, closest first.
+    """
+    return [(item, -negative_distance) for negative_distance, _, item in sorted(heap, key=lambda entry: (-entry[0], entry[1]))]
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+
+    geohash = []
+    bits = 0
+    bit_count = 0
+    is_longitude_bit = True
+
+    while len(geohash) < precision:
+        value_range, value = (lon_range, longitude) if is_longitude_bit else (lat_range, latitude)
+        middle = (value_range[0] + value_range[1]) / 2
+
+        if value >= middle:
+            bits = (bits << 1) | 1
+            value_range[0] = middle
+        else:
+            bits = bits << 1
+            value_range[1] = middle
+
+        is_longitude_bit = not is_longitude_bit
+        bit_count += 1
+
+        if bit_count == 5:
+            geohash.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(geohash)
+
+def geohash_cell_size(precision):
+    """
+    Returns (lat_height, lon_width) in degrees of a cell at the given precision.
+    """
+    total_bits = precision * 5
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+def geohash_attributes(latitude, longitude):
+    """
+    Geohash attributes stored on an item so it can be found through the geohash GSI.
+    """
+    geohash = encode_geohash(float(latitude), float(longitude))
+
+    return {
+        'geohash': geohash,
+        'geohash_3': geohash[:GEOHASH_INDEX_PRECISION]
+    }
+
+def geohash_cells_covering_radius(latitude, longitude, radius_km, max_cells=GEOHASH_MAX_COVER_CELLS):
+    """
+    Geohash cells that together cover every point within radius_km of the centre.
+    Uses the finest precision (never coarser than the GSI partition precision)
+    that needs no more than max_cells cells.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+
+    cells = _cells_covering_box(min_lat, max_lat, min_lon, max_lon, GEOHASH_INDEX_PRECISION)
+
+    for precision in range(GEOHASH_INDEX_PRECISION + 1, GEOHASH_MAX_COVER_PRECISION + 1):
+        finer_cells = _cells_covering_box(min_lat, max_lat, min_lon, max_lon, precision)
+
+        if len(finer_cells) > max_cells:
+            break
+
+        cells = finer_cells
+
+    return cells
+
+def _cells_covering_box(min_lat, max_lat, min_lon, max_lon, precision):
+    lat_height, lon_width = geohash_cell_size(precision)
+
+    lat_start = math.floor((min_lat + 90.0) / lat_height)
+    lat_end = min(math.floor((max_lat + 90.0) / lat_height), int(180.0 / lat_height) - 1)
+
+    lon_columns = int(360.0 / lon_width)
+    lon_start = math.floor((min_lon + 180.0) / lon_width)
+    lon_end = math.floor((max_lon + 180.0) / lon_width)
+
+    # Every column is needed once the box wraps all the way around
+    if lon_end - lon_start + 1 >= lon_columns:
+        lon_start, lon_end = 0, lon_columns - 1
+
+    cells = []
+
+    for lat_index in range(lat_start, lat_end + 1):
+        cell_latitude = -90.0 + (lat_index + 0.5) * lat_height
+
+        for lon_index in range(lon_start, lon_end + 1):
+            cell_longitude = -180.0 + ((lon_index % lon_columns) + 0.5) * lon_width
+
+            cells.append(encode_geohash(cell_latitude, cell_longitude, precision))
+
+    return sorted(set(cells))
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
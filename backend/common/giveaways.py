@@ -0,0 +1,389 @@
+import os
+import math
+import heapq
+import random
+import secrets
+from datetime import datetime, timezone
+from boto3.dynamodb.conditions import Key
+
+import backend.common.clients as aws_clients
+import backend.common.pagination as pagination
+from backend.common.transactions import NotFoundError, run_transaction
+
+# Entries weigh 1 unless the user asks for more, up to this many
+GIVEAWAY_DEFAULT_ENTRY_WEIGHT = 1
+GIVEAWAY_MAX_ENTRY_WEIGHT = int(os.getenv('GIVEAWAY_MAX_ENTRY_WEIGHT', '100'))
+
+GIVEAWAY_ENTRANTS_DEFAULT_PAGE_SIZE = int(os.getenv('GIVEAWAY_ENTRANTS_DEFAULT_PAGE_SIZE', '50'))
+# One page of entrants' profiles is fetched with a single BatchGetItem
+GIVEAWAY_ENTRANTS_MAX_PAGE_SIZE = int(os.getenv('GIVEAWAY_ENTRANTS_MAX_PAGE_SIZE', '100'))
+
+GIVEAWAY_ENTRANTS_CURSOR_VERSION = 1
+
+# Most winners one draw can pick, each of them comes back with their profile
+GIVEAWAY_MAX_WINNERS = int(os.getenv('GIVEAWAY_MAX_WINNERS', '1000'))
+
+class AlreadyDrawnError(Exception):
+    pass
+
+def join_giveaway(giveaway_id, user_email, weight=GIVEAWAY_DEFAULT_ENTRY_WEIGHT):
+    """
+    Saves the user's entry and adds it to the totals on the giveaway item in one transaction.
+    Returns False when the user had already entered, in which case nothing changes, so a
+    repeated join can't enter anyone twice. Raises NotFoundError when the giveaway doesn't exist
+    and AlreadyDrawnError once its winners were drawn.
+    """
+    entered_at = datetime.now(timezone.utc).isoformat()
+
+    def transact_items():
+        return [
+            {
+                'Put': {
+                    'TableName': os.getenv('GIVEAWAY_ENTRIES_TABLE_NAME'),
+                    'Item': {
+                        'giveaway_id': giveaway_id,
+                        'user_email': user_email,
+                        'weight': weight,
+                        'entered_at': entered_at
+                    },
+                    'ConditionExpression': 'attribute_not_exists(user_email)'
+                }
+            },
+            {
+                # The counters only ever grow by one entry, whatever the giveaway's size
+                'Update': {
+                    'TableName': os.getenv('GIVEAWAY_TABLE_NAME'),
+                    'Key': {'giveaway_id': giveaway_id},
+                    'UpdateExpression': 'ADD entrants :one, total_weight :weight SET last_entry_at = :entered_at',
+                    # Entries after the draw would change what the saved draw was taken from
+                    'ConditionExpression': 'attribute_exists(giveaway_id) AND attribute_not_exists(winners)',
+                    'ExpressionAttributeValues': {
+                        ':one': 1,
+                        ':weight': weight,
+                        ':entered_at': entered_at
+                    }
+                }
+            }
+        ]
+
+    failed = run_transaction(transact_items)
+
+    if 1 in failed:
+        # Giveaways are never deleted, so one that exists failed the condition for being drawn
+        giveaway_item = aws_clients.get_dynamodb_table(os.getenv('GIVEAWAY_TABLE_NAME')).get_item(
+            Key={
+                'giveaway_id': giveaway_id
+            },
+            ProjectionExpression='giveaway_id'
+        ).get('Item')
+
+        if giveaway_item is None:
+            raise NotFoundError('Giveaway not found')
+
+        raise AlreadyDrawnError('Giveaway already drawn')
+
+    return not failed
+
+def parse_entry_weight(value):
+    """
+    Entry weight from a query parameter. Raises ValueError unless it is an integer between 1
+    and GIVEAWAY_MAX_ENTRY_WEIGHT.
+    """
+    if value is None:
+        return GIVEAWAY_DEFAULT_ENTRY_WEIGHT
+
+    weight = int(value)
+
+    if not 1 <= weight <= GIVEAWAY_MAX_ENTRY_WEIGHT:
+        raise ValueError(f'Entry weight must be between 1 and {GIVEAWAY_MAX_ENTRY_WEIGHT}.')
+
+    return weight
+
+def parse_winner_count(value):
+    """
+    Number of winners from a query parameter. Raises ValueError unless it is an integer between 1
+    and GIVEAWAY_MAX_WINNERS.
+    """
+    if value is None:
+        return 1
+
+    winners = int(value)
+
+    if not 1 <= winners <= GIVEAWAY_MAX_WINNERS:
+        raise ValueError(f'Winners must be between 1 and {GIVEAWAY_MAX_WINNERS}.')
+
+    return winners
+
+def draw_winners(giveaway_id, winners=1, seed=None):
+    """
+    The giveaway's winners, drawn once without replacement and then kept on the giveaway item,
+    so every later call gets the same ones in the same order. Returns (winner_emails, draw)
+    where draw records the seed, how many winners were asked for and what was drawn from, or
+    ([], None) when nobody entered. Without a seed a random one is picked and saved, so every
+    draw can be repeated from the same entries. Raises NotFoundError when the giveaway
+    doesn't exist.
+    """
+    giveaways_table = aws_clients.get_dynamodb_table(os.getenv('GIVEAWAY_TABLE_NAME'))
+
+    giveaway_item = giveaways_table.get_item(
+        Key={
+            'giveaway_id': giveaway_id
+        },
+        ProjectionExpression='winners, draw'
+    ).get('Item')
+
+    if giveaway_item is None:
+        raise NotFoundError('Giveaway not found')
+
+    if 'winners' in giveaway_item:
+        return giveaway_item['winners'], giveaway_item['draw']
+
+    seed = str(seed) if seed is not None else secrets.token_hex(16)
+    rng = random.Random(seed)
+
+    entries = 0
+    total_weight = 0
+
+    def counted(giveaway_entries):
+        nonlocal entries, total_weight
+
+        for user_email, weight in giveaway_entries:
+            entries += 1
+            total_weight += weight
+
+            yield user_email, weight
+
+    if winners == 1:
+        # A single winner needs nothing but the best key seen so far
+        winner_emails = weighted_reservoir_sample(counted(iter_giveaway_entries(giveaway_id)), 1, rng)
+    else:
+        user_emails = []
+        weights = []
+
+        for user_email, weight in counted(iter_giveaway_entries(giveaway_id)):
+            user_emails.append(user_email)
+            weights.append(weight)
+
+        winner_emails = [user_emails[index] for index in WeightedSampler(weights).sample(winners, rng)]
+
+    if not winner_emails:
+        return [], None
+
+    draw = {
+        'seed': seed,
+        'winners': winners,
+        'entries': entries,
+        'total_weight': total_weight,
+        'drawn_at': datetime.now(timezone.utc).isoformat()
+    }
+
+    try:
+        giveaways_table.update_item(
+            Key={
+                'giveaway_id': giveaway_id
+            },
+            UpdateExpression='SET winners = :winners, draw = :draw',
+            ConditionExpression='attribute_exists(giveaway_id) AND attribute_not_exists(winners)',
+            ExpressionAttributeValues={
+                ':winners': winner_emails,
+                ':draw': draw
+            }
+        )
+    except giveaways_table.meta.client.exceptions.ConditionalCheckFailedException:
+        # A concurrent call saved its winners first, those stand
+        giveaway_item = giveaways_table.get_item(
+            Key={
+                'giveaway_id': giveaway_id
+            },
+            ProjectionExpression='winners, draw',
+            ConsistentRead=True
+        )['Item']
+
+        return giveaway_item['winners'], giveaway_item['draw']
+
+    return winner_emails, draw
+
+def iter_giveaway_entries(giveaway_id):
+    """
+    Yields (user_email, weight) for every entry of the giveaway, one query page at a time.
+    Entries come in user_email order, so a seeded draw over the same entries repeats.
+    """
+    entries_table = aws_clients.get_dynamodb_table(os.getenv('GIVEAWAY_ENTRIES_TABLE_NAME'))
+
+    query_kwargs = {
+        'KeyConditionExpression': Key('giveaway_id').eq(giveaway_id),
+        'ProjectionExpression': 'user_email, weight'
+    }
+
+    while True:
+        response = entries_table.query(**query_kwargs)
+
+        for item in response.get('Items', []):
+            yield item['user_email'], int(item['weight'])
+
+        if 'LastEvaluatedKey' not in response:
+            break
+
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def get_giveaway_club_id(giveaway_id):
+    """
+    The club that holds the giveaway, looked up through its event. Raises NotFoundError when
+    the giveaway doesn't exist.
+    """
+    dynamodb = aws_clients.get_dynamodb_resource()
+
+    giveaway_item = dynamodb.Table(os.getenv('GIVEAWAY_TABLE_NAME')).get_item(
+        Key={
+            'giveaway_id': giveaway_id
+        },
+        ProjectionExpression='event_id'
+    ).get('Item')
+
+    if giveaway_item is None:
+        raise NotFoundError('Giveaway not found')
+
+    event_item = dynamodb.Table(os.getenv('EVENTS_TABLE_NAME')).get_item(
+        Key={
+            'event_id': giveaway_item['event_id']
+        },
+        ProjectionExpression='club_id'
+    ).get('Item', {})
+
+    return event_item.get('club_id')
+
+def get_entrants_page(giveaway_id, limit=GIVEAWAY_ENTRANTS_DEFAULT_PAGE_SIZE, cursor=None):
+    """
+    One page of a giveaway's entries, ordered by user_email, and the cursor of the next page
+    (None on the last one). Raises ValueError for a cursor that is invalid or belongs to
+    another giveaway.
+    """
+    query_kwargs = {
+        'KeyConditionExpression': Key('giveaway_id').eq(giveaway_id),
+        'ProjectionExpression': 'giveaway_id, user_email, weight, entered_at'
+    }
+
+    entries_table = aws_clients.get_dynamodb_table(os.getenv('GIVEAWAY_ENTRIES_TABLE_NAME'))
+
+    items, next_cursor = pagination.query_cursor_page(entries_table, query_kwargs, limit, cursor, GIVEAWAY_ENTRANTS_CURSOR_VERSION, {'giveaway_id': giveaway_id}, ('giveaway_id', 'user_email'))
+
+    return items, next_cursor
+
+def weighted_reservoir_sample(weighted_items, k, rng):
+    """
+    Picks k distinct items from (item, weight) pairs with probability proportional to weight,
+    in one pass and O(k) memory (Efraimidis and Spirakis' A-ExpJ). Returns them largest key
+    first, which is the order drawing one at a time without replacement would pick them, or
+    all of them when there are fewer than k.
+
+    Every item gets the key u ** (1 / weight) and the k largest keys win. Keys are kept as
+    log(u) / weight so large weights don't round to 1, and after the reservoir fills, an
+    exponential jump skips the items that couldn't beat its smallest key without drawing a
+    random number for each of them.
+    """
+    reservoir = []
+    jump = None
+
+    for item, weight in weighted_items:
+        if weight <= 0:
+            continue
+
+        if len(reservoir) < k:
+            heapq.heappush(reservoir, (_log_random(rng) / weight, len(reservoir), item))
+
+            if len(reservoir) == k:
+                jump = _next_jump(rng, reservoir[0][0])
+
+            continue
+
+        jump -= weight
+
+        if jump > 0:
+            continue
+
+        # The item beats the smallest key, its own key is drawn from the range above it
+        threshold = reservoir[0][0]
+        log_key = math.log(rng.uniform(math.exp(threshold * weight), 1)) / weight
+
+        heapq.heapreplace(reservoir, (min(log_key, 0.0), reservoir[0][1], item))
+
+        jump = _next_jump(rng, reservoir[0][0])
+
+    return [item for _, _, item in sorted(reservoir, reverse=True)]
+
+class WeightedSampler:
+    """
+    Draws indexes of a list of integer weights with probability proportional to their weight,
+    without replacement. A Fenwick tree over the weights finds an index by its cumulative
+    weight and removes it in O(log n), so k winners cost O(n + k log n) instead of a pass
+    over all weights per winner.
+    """
+
+    def __init__(self, weights):
+        self.weights = list(weights)
+        self.total = sum(self.weights)
+
+        # tree[i] holds the sum of the weights in (i - lowbit(i), i], built in O(n)
+        self.tree = [0] + self.weights
+
+        for index in range(1, len(self.tree)):
+            parent = index + (index & -index)
+
+            if parent < len(self.tree):
+                self.tree[parent] += self.tree[index]
+
+        self.top_bit = 1 << (len(self.weights).bit_length() - 1) if self.weights else 0
+
+    def sample(self, k, rng):
+        """
+        Up to k distinct indexes in the order they were drawn.
+        """
+        picked = []
+
+        while len(picked) < k and self.total > 0:
+            index = self.find(rng.randrange(self.total))
+
+            picked.append(index)
+            self.remove(index)
+
+        return picked
+
+    def find(self, target):
+        """
+        Index of the weight whose cumulative range [sum before it, sum with it) holds target.
+        """
+        position = 0
+        step = self.top_bit
+
+        while step:
+            next_position = position + step
+
+            if next_position < len(self.tree) and self.tree[next_position] <= target:
+                position = next_position
+                target -= self.tree[position]
+
+            step >>= 1
+
+        return position
+
+    def remove(self, index):
+        weight = self.weights[index]
+        self.weights[index] = 0
+        self.total -= weight
+
+        position = index + 1
+
+        while position < len(self.tree):
+            self.tree[position] -= weight
+            position += position & -position
+
+def _next_jump(rng, threshold):
+    # Weight to skip before an item beats the threshold key, a key of log(1) can't be beaten
+    if threshold == 0:
+        return math.inf
+
+    return _log_random(rng) / threshold
+
+def _log_random(rng):
+    # 1 - random() is in (0, 1], so its log is finite
+    return math.log(1.0 - rng.random())
@@ -0,0 +1,523 @@
+import os
+import io
+import base64
+import binascii
+import tempfile
+import threading
+import time
+import logging
+from collections import OrderedDict
+from urllib.parse import unquote_plus
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+import backend.common.clients as aws_clients
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+IMAGE_MODE_URL = 'url'
+IMAGE_MODE_INLINE = 'inline'
+
+# Derivatives made for every uploaded picture: longest edge in pixels per size, and the
+# formats each size is stored in. They live under derivatives/<size>/ next to the original
+IMAGE_SIZE_ORIGINAL = 'original'
+IMAGE_SIZES = {
+    'thumbnail': 200,
+    'medium': 800
+}
+IMAGE_FORMATS = {
+    'webp': {'extension': 'webp', 'pillow_format': 'WEBP', 'content_type': 'image/webp', 'options': {'quality': 80, 'method': 4}},
+    'jpeg': {'extension': 'jpg', 'pillow_format': 'JPEG', 'content_type': 'image/jpeg', 'options': {'quality': 85, 'optimize': True, 'progressive': True}}
+}
+IMAGE_DEFAULT_FORMAT = 'jpeg'
+IMAGE_DERIVATIVES_PREFIX = 'derivatives/'
+
+# Derivatives never change for a key, so clients and CDNs may keep them
+IMAGE_DERIVATIVE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Refuse decompression bombs before Pillow allocates the pixels
+Image.MAX_IMAGE_PIXELS = int(os.getenv('IMAGE_MAX_PIXELS', str(40_000_000)))
+
+# Uploads are decoded from base64 a chunk at a time into a buffer that spills to /tmp,
+# so the decoded picture never sits in memory next to the request body
+IMAGE_UPLOAD_MAX_BYTES = int(os.getenv('IMAGE_UPLOAD_MAX_BYTES', str(7 * 1024 * 1024)))
+IMAGE_DECODE_CHUNK_CHARS = 256 * 1024
+IMAGE_SPOOL_MAX_MEMORY_BYTES = int(os.getenv('IMAGE_SPOOL_MAX_MEMORY_BYTES', str(1024 * 1024)))
+
+# Left out when decoding, as the one-shot b64decode did, so line-wrapped base64 is accepted
+BASE64_WHITESPACE = ' \t\r\n'
+_BASE64_WHITESPACE_TABLE = str.maketrans('', '', BASE64_WHITESPACE)
+
+# Pictures above this are sent as a multipart upload; 5 MB is the smallest part S3 accepts
+IMAGE_MULTIPART_PART_BYTES = int(os.getenv('IMAGE_MULTIPART_PART_BYTES', str(5 * 1024 * 1024)))
+
+# Leading bytes of the formats accepted for upload
+IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif')
+)
+
+IMAGE_UPLOAD_CONTENT_TYPES = ('image/jpeg', 'image/png', 'image/gif', 'image/webp')
+
+# Presigned POSTs let clients upload pictures straight to S3 instead of through the API
+IMAGE_UPLOAD_URL_EXPIRES_SECONDS = int(os.getenv('IMAGE_UPLOAD_URL_EXPIRES_SECONDS', '600'))
+
+class ImageValidationError(ValueError):
+    pass
+
+# Presigned URLs are short-lived, and a cached URL is handed out only while it has
+# enough lifetime left for the client to use it
+PRESIGNED_URL_EXPIRES_SECONDS = int(os.getenv('PRESIGNED_URL_EXPIRES_SECONDS', '900'))
+PRESIGNED_URL_MIN_REMAINING_SECONDS = int(os.getenv('PRESIGNED_URL_MIN_REMAINING_SECONDS', '300'))
+PRESIGNED_URL_CACHE_MAX_SIZE = int(os.getenv('PRESIGNED_URL_CACHE_MAX_SIZE', '4096'))
+
+# Inline images are downloaded concurrently, and the response has to stay below
+# API Gateway's 6 MB limit once base64 adds its third
+IMAGE_FETCH_MAX_WORKERS = int(os.getenv('IMAGE_FETCH_MAX_WORKERS', '8'))
+IMAGE_FETCH_MAX_TOTAL_BYTES = int(os.getenv('IMAGE_FETCH_MAX_TOTAL_BYTES', str(4 * 1024 * 1024)))
+
+_presigned_url_cache = OrderedDict()
+_presigned_url_cache_lock = threading.Lock()
+_presigned_url_cache_stats = {
+    'hits': 0,
+    'misses': 0
+}
+
+def get_image_mode(event):
+    """
+    Images are returned as presigned URLs unless the caller opts into inline base64 with ?image_mode=inline.
+    """
+    query_params = event.get('queryStringParameters') or {}
+
+    if query_params.get('image_mode') == IMAGE_MODE_INLINE:
+        return IMAGE_MODE_INLINE
+
+    return IMAGE_MODE_URL
+
+def get_image_variant(event):
+    """
+    Size and format asked for with ?image_size=thumbnail|medium|original and ?image_format=webp|jpeg.
+    Unknown values fall back to the original picture as JPEG.
+    """
+    query_params = event.get('queryStringParameters') or {}
+
+    size = query_params.get('image_size')
+    image_format = query_params.get('image_format')
+
+    if size not in IMAGE_SIZES:
+        size = IMAGE_SIZE_ORIGINAL
+
+    if image_format not in IMAGE_FORMATS:
+        image_format = IMAGE_DEFAULT_FORMAT
+
+    return size, image_format
+
+def derivative_key(key, size, image_format=IMAGE_DEFAULT_FORMAT):
+    """
+    Deterministic key of a derivative, e.g. derivatives/thumbnail/<event_id>.webp
+    for <event_id>.jpg. The original key is returned for the original size.
+    """
+    if size == IMAGE_SIZE_ORIGINAL:
+        return key
+
+    stem = key.rsplit('.', 1)[0]
+
+    return f"{IMAGE_DERIVATIVES_PREFIX}{size}/{stem}.{IMAGE_FORMATS[image_format]['extension']}"
+
+def derivative_keys(key):
+    return [derivative_key(key, size, image_format) for size in IMAGE_SIZES for image_format in IMAGE_FORMATS]
+
+def detect_image_content_type(header):
+    """
+    Content type of an image from its first bytes, or None when it isn't a supported image.
+    """
+    for signature, content_type in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return content_type
+
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'image/webp'
+
+    return None
+
+def validate_base64_image(value, max_bytes=None):
+    """
+    Cheap checks on a base64 picture before any work is done with it: the decoded size
+    (estimated from the length) and the magic bytes. Returns the content type and raises
+    ImageValidationError for oversized or non-image payloads. Accepts the data:image/...;base64,
+    prefix FileReader.readAsDataURL adds.
+    """
+    max_bytes = IMAGE_UPLOAD_MAX_BYTES if max_bytes is None else max_bytes
+    start = _base64_payload_start(value)
+
+    # Every 4 characters hold 3 bytes, line breaks of wrapped base64 hold none
+    payload_chars = len(value) - start - sum(value.count(character) for character in BASE64_WHITESPACE)
+
+    if payload_chars // 4 * 3 > max_bytes + 2:
+        raise ImageValidationError(f'Image is larger than {max_bytes // (1024 * 1024)} MB.')
+
+    try:
+        header = base64.b64decode(value[start:start + 64].translate(_BASE64_WHITESPACE_TABLE)[:16])
+    except binascii.Error:
+        raise ImageValidationError('Image is not valid base64.')
+
+    content_type = detect_image_content_type(header)
+
+    if content_type is None:
+        raise ImageValidationError('Only JPEG, PNG, GIF and WebP images are supported.')
+
+    return content_type
+
+def decode_base64_image_to_file(value, max_bytes=None):
+    """
+    Validates a base64 picture and decodes it chunk by chunk into a SpooledTemporaryFile,
+    which stays in memory up to IMAGE_SPOOL_MAX_MEMORY_BYTES and spills to /tmp after that.
+    Returns (file, content_type) with the file rewound; the caller closes it.
+    """
+    content_type = validate_base64_image(value, max_bytes)
+    start = _base64_payload_start(value)
+
+    image_file = tempfile.SpooledTemporaryFile(max_size=IMAGE_SPOOL_MAX_MEMORY_BYTES)
+
+    try:
+        # Base64 wrapped in lines has whitespace anywhere, so each chunk is stripped and only
+        # a multiple of 4 characters decoded, the rest carries over to the next chunk
+        leftover = ''
+
+        for offset in range(start, len(value), IMAGE_DECODE_CHUNK_CHARS):
+            chunk = leftover + value[offset:offset + IMAGE_DECODE_CHUNK_CHARS].translate(_BASE64_WHITESPACE_TABLE)
+            complete_chars = len(chunk) - len(chunk) % 4
+
+            image_file.write(base64.b64decode(chunk[:complete_chars]))
+            leftover = chunk[complete_chars:]
+
+        if leftover:
+            raise binascii.Error('Incorrect padding')
+    except binascii.Error:
+        image_file.close()
+
+        raise ImageValidationError('Image is not valid base64.')
+
+    image_file.seek(0)
+
+    return image_file, content_type
+
+def _base64_payload_start(value):
+    return value.index(',') + 1 if value.startswith('data:') and ',' in value else 0
+
+def save_image(bucket, key, data, content_type='image/jpeg'):
+    """
+    Stores an uploaded picture (bytes or a file object) and its derivatives.
+    Returns the derivative keys, or None when the data isn't an image Pillow can read,
+    in which case only the original is stored.
+    """
+    image_file = upload_image(bucket, key, data, content_type)
+
+    return create_image_derivatives(bucket, key, image_file)
+
+def upload_image(bucket, key, data, content_type='image/jpeg'):
+    """
+    Stores a picture (bytes or a file object) without derivatives. Large pictures are sent
+    as a multipart upload straight from the file. Returns the file, rewound.
+    """
+    image_file = io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+
+    image_file.seek(0, io.SEEK_END)
+    size = image_file.tell()
+    image_file.seek(0)
+
+    if size > IMAGE_MULTIPART_PART_BYTES:
+        _multipart_upload(bucket, key, image_file, content_type)
+    else:
+        aws_clients.get_s3_client().put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=image_file,
+            ContentType=content_type
+        )
+
+    image_file.seek(0)
+
+    return image_file
+
+def get_presigned_image_post(bucket, key, content_type, max_bytes=None):
+    """
+    Presigned POST for uploading a picture directly to S3. S3 itself enforces the
+    content type and the size limit. Returns {'url': ..., 'fields': {...}}; the client
+    sends the fields and then the file as multipart/form-data.
+    """
+    if content_type not in IMAGE_UPLOAD_CONTENT_TYPES:
+        raise ImageValidationError('Only JPEG, PNG, GIF and WebP images are supported.')
+
+    max_bytes = IMAGE_UPLOAD_MAX_BYTES if max_bytes is None else max_bytes
+
+    return aws_clients.get_s3_client().generate_presigned_post(
+        Bucket=bucket,
+        Key=key,
+        Fields={
+            'Content-Type': content_type
+        },
+        Conditions=[
+            {'Content-Type': content_type},
+            ['content-length-range', 1, max_bytes]
+        ],
+        ExpiresIn=IMAGE_UPLOAD_URL_EXPIRES_SECONDS
+    )
+
+def uploaded_objects(event):
+    """
+    (bucket, key) pairs from an S3 event notification or an EventBridge "Object Created" event.
+    """
+    if 'Records' in event:
+        return [
+            (record['s3']['bucket']['name'], unquote_plus(record['s3']['object']['key']))
+            for record in event['Records']
+        ]
+
+    detail = event.get('detail') or {}
+
+    if detail.get('bucket') and detail.get('object'):
+        return [(detail['bucket']['name'], detail['object']['key'])]
+
+    return []
+
+def create_image_derivatives(bucket, key, data=None):
+    """
+    Resizes a picture to every size in IMAGE_SIZES and stores each one in every format in IMAGE_FORMATS.
+    data is bytes or a file object; the original is downloaded when it isn't given.
+    Returns the keys written, or None for unreadable images.
+    """
+    s3_client = aws_clients.get_s3_client()
+
+    if data is None:
+        data = s3_client.get_object(Bucket=bucket, Key=key)['Body'].read()
+
+    image_file = io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+
+    try:
+        with Image.open(image_file) as original:
+            # JPEGs can be decoded at 1/2, 1/4 or 1/8 scale, which needs a fraction of the full-size pixels
+            largest_edge = max(IMAGE_SIZES.values())
+            original.draft('RGB', (largest_edge, largest_edge))
+
+            # Phones store rotation in EXIF, which the re-encoded derivatives would lose
+            picture = ImageOps.exif_transpose(original)
+            picture = picture.convert('RGB')
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        logger.info(f'IMAGES - Not creating derivatives for {bucket}/{key}: {str(e)}')
+
+        return None
+
+    written_keys = []
+
+    # Resize from the largest size down, each step starting from the previous result
+    for size, max_edge in sorted(IMAGE_SIZES.items(), key=lambda entry: -entry[1]):
+        picture = picture.copy()
+        picture.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+        for image_format, format_options in IMAGE_FORMATS.items():
+            buffer = io.BytesIO()
+            picture.save(buffer, format=format_options['pillow_format'], **format_options['options'])
+
+            s3_client.put_object(
+                Bucket=bucket,
+                Key=derivative_key(key, size, image_format),
+                Body=buffer.getvalue(),
+                ContentType=format_options['content_type'],
+                CacheControl=IMAGE_DERIVATIVE_CACHE_CONTROL
+            )
+
+            written_keys.append(derivative_key(key, size, image_format))
+
+    logger.info(f'IMAGES - Stored {len(written_keys)} derivatives of {bucket}/{key}.')
+
+    return written_keys
+
+def _multipart_upload(bucket, key, image_file, content_type):
+    """
+    Uploads a file one IMAGE_MULTIPART_PART_BYTES part at a time, so only one part is in memory.
+    """
+    s3_client = aws_clients.get_s3_client()
+
+    upload_id = s3_client.create_multipart_upload(Bucket=bucket, Key=key, ContentType=content_type)['UploadId']
+
+    try:
+        parts = []
+
+        while True:
+            part = image_file.read(IMAGE_MULTIPART_PART_BYTES)
+
+            if not part:
+                break
+
+            response = s3_client.upload_part(
+                Bucket=bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=len(parts) + 1,
+                Body=part
+            )
+
+            parts.append({
+                'PartNumber': len(parts) + 1,
+                'ETag': response['ETag']
+            })
+
+        s3_client.complete_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={
+                'Parts': parts
+            }
+        )
+    except Exception:
+        # Parts of an abandoned upload are billed until it is aborted
+        s3_client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+
+        raise
+
+def delete_image(bucket, key):
+    """
+    Deletes a picture together with its derivatives.
+    """
+    aws_clients.get_s3_client().delete_objects(
+        Bucket=bucket,
+        Delete={
+            'Objects': [{'Key': image_key} for image_key in [key] + derivative_keys(key)],
+            'Quiet': True
+        }
+    )
+
+def get_presigned_image_url(bucket, key, check_exists=False):
+    """
+    Presigned GET URL for an S3 object, reused across warm invocations while it stays valid.
+    Reusing the URL also lets clients cache the image. With check_exists the object is
+    looked up first and None is returned when it is missing; misses are not cached.
+    """
+    cache_key = (bucket, key)
+    now = time.time()
+
+    with _presigned_url_cache_lock:
+        cached_entry = _presigned_url_cache.get(cache_key)
+
+        if cached_entry and cached_entry['expires_at'] - now >= PRESIGNED_URL_MIN_REMAINING_SECONDS:
+            _presigned_url_cache.move_to_end(cache_key)
+            _presigned_url_cache_stats['hits'] += 1
+
+            return cached_entry['url']
+
+        _presigned_url_cache_stats['misses'] += 1
+
+    if check_exists and not image_exists(bucket, key):
+        return None
+
+    url = aws_clients.get_s3_client().generate_presigned_url(
+        'get_object',
+        Params={
+            'Bucket': bucket,
+            'Key': key
+        },
+        ExpiresIn=PRESIGNED_URL_EXPIRES_SECONDS
+    )
+
+    with _presigned_url_cache_lock:
+        _presigned_url_cache[cache_key] = {
+            'url': url,
+            'expires_at': now + PRESIGNED_URL_EXPIRES_SECONDS
+        }
+        _presigned_url_cache.move_to_end(cache_key)
+
+        while len(_presigned_url_cache) > PRESIGNED_URL_CACHE_MAX_SIZE:
+            _presigned_url_cache.popitem(last=False)
+
+    return url
+
+def get_image_as_base64(bucket, key):
+    """
+    Downloads an S3 object and returns it base64 encoded, or None when it doesn't exist.
+    """
+    try:
+        response = aws_clients.get_s3_client().get_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+            logger.info(f'IMAGES - No image at {bucket}/{key}')
+
+            return None
+
+        raise
+
+    return base64.b64encode(response['Body'].read()).decode('utf-8')
+
+def fetch_images_as_base64(bucket, keys, max_workers=None, max_total_bytes=None):
+    """
+    Downloads several S3 objects concurrently through the shared S3 client.
+    Returns a list aligned with keys holding base64 strings, or None for objects that
+    are missing or that would push the total past max_total_bytes.
+    """
+    if not keys:
+        return []
+
+    max_workers = max_workers or IMAGE_FETCH_MAX_WORKERS
+    max_total_bytes = IMAGE_FETCH_MAX_TOTAL_BYTES if max_total_bytes is None else max_total_bytes
+
+    s3_client = aws_clients.get_s3_client()
+    budget = {'remaining': max_total_bytes, 'skipped': 0}
+    budget_lock = threading.Lock()
+
+    def fetch_image(key):
+        try:
+            response = s3_client.get_object(Bucket=bucket, Key=key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+                logger.info(f'IMAGES - No image at {bucket}/{key}')
+
+                return None
+
+            raise
+
+        # Reserve the bytes before reading the body, so the budget holds across threads
+        with budget_lock:
+            if response['ContentLength'] > budget['remaining']:
+                budget['skipped'] += 1
+                response['Body'].close()
+
+                return None
+
+            budget['remaining'] -= response['ContentLength']
+
+        return base64.b64encode(response['Body'].read()).decode('utf-8')
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+        encoded_images = list(executor.map(fetch_image, keys))
+
+    if budget['skipped']:
+        logger.info(f'IMAGES - Byte budget of {max_total_bytes} reached, {budget["skipped"]} images left out.')
+
+    return encoded_images
+
+def image_exists(bucket, key):
+    try:
+        aws_clients.get_s3_client().head_object(Bucket=bucket, Key=key)
+
+        return True
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+            return False
+
+        raise
+
+def get_presigned_url_cache_stats():
+    with _presigned_url_cache_lock:
+        return dict(_presigned_url_cache_stats, size=len(_presigned_url_cache))
+
+def clear_presigned_url_cache():
+    with _presigned_url_cache_lock:
+        _presigned_url_cache.clear()
+
+        for stat in _presigned_url_cache_stats:
+            _presigned_url_cache_stats[stat] = 0
@@ -0,0 +1,131 @@
+import os
+import heapq
+import zlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from boto3.dynamodb.conditions import Key
+
+import backend.common.clients as aws_clients
+import backend.common.pagination as pagination
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# GSI on the users table. Only users with leaderboard attributes are in it, registration and
+# point updates write them
+LEADERBOARD_INDEX_NAME = 'leaderboard-index'
+
+# Users are spread over this many index partitions by a hash of their email, and pages merge
+# the partitions. 1 keeps everyone in one partition, raise it (and run backfill_leaderboard)
+# when point updates outgrow what one partition can take
+LEADERBOARD_BUCKETS = int(os.getenv('LEADERBOARD_BUCKETS', '1'))
+
+# Points are zero-padded so the string sort key orders like the number
+LEADERBOARD_POINTS_DIGITS = 12
+
+LEADERBOARD_DEFAULT_PAGE_SIZE = int(os.getenv('LEADERBOARD_DEFAULT_PAGE_SIZE', '50'))
+LEADERBOARD_MAX_PAGE_SIZE = int(os.getenv('LEADERBOARD_MAX_PAGE_SIZE', '100'))
+
+LEADERBOARD_CURSOR_VERSION = 1
+
+# What the index projects, and all a leaderboard entry shows
+LEADERBOARD_PUBLIC_ATTRIBUTES = ('email', 'first_name', 'last_name', 'points')
+
+def leaderboard_attributes(email, points):
+    """
+    The index keys for a user with the given points. Write them whenever points change.
+    """
+    # Points can go below zero, those users share the bottom of the board
+    padded_points = str(max(int(points), 0)).zfill(LEADERBOARD_POINTS_DIGITS)
+
+    return {
+        'leaderboard_bucket': str(zlib.crc32(email.encode('utf-8')) % LEADERBOARD_BUCKETS),
+        # The email breaks ties, so every user has their own place in the order
+        'leaderboard_score': f'{padded_points}#{email}'
+    }
+
+def get_leaderboard_page(limit=LEADERBOARD_DEFAULT_PAGE_SIZE, cursor=None):
+    """
+    One page of users with the most points first, each with their rank, and the cursor of the
+    next page (None on the last one). Raises ValueError for an invalid cursor.
+    """
+    if cursor:
+        cursor_state = pagination.decode_page_cursor(cursor, LEADERBOARD_CURSOR_VERSION, {'buckets': LEADERBOARD_BUCKETS})
+
+        rank = cursor_state['rank']
+        # Bucket -> leaderboard_score of the last user shown from it, None before the first
+        positions = cursor_state['positions']
+    else:
+        rank = 0
+        positions = {str(bucket): None for bucket in range(LEADERBOARD_BUCKETS)}
+
+    buckets = sorted(positions)
+
+    if len(buckets) > 1:
+        with ThreadPoolExecutor(max_workers=len(buckets)) as executor:
+            bucket_pages = list(executor.map(lambda bucket: _query_bucket(bucket, positions[bucket], limit), buckets))
+    else:
+        bucket_pages = [_query_bucket(bucket, positions[bucket], limit) for bucket in buckets]
+
+    # Every bucket comes back in descending order, so the page is the head of their merge
+    merged = heapq.merge(
+        *[[(item['leaderboard_score'], bucket, item) for item in items] for bucket, (items, _) in zip(buckets, bucket_pages)],
+        reverse=True
+    )
+
+    page = [entry for _, entry in zip(range(limit), merged)]
+
+    for score, bucket, _ in page:
+        positions[bucket] = score
+
+    next_positions = {}
+
+    for bucket, (items, has_more) in zip(buckets, bucket_pages):
+        shown = sum(1 for _, page_bucket, _ in page if page_bucket == bucket)
+
+        if shown < len(items) or has_more:
+            next_positions[bucket] = positions[bucket]
+
+    users = [
+        dict(
+            {attribute: item.get(attribute) for attribute in LEADERBOARD_PUBLIC_ATTRIBUTES},
+            points=int(item.get('points', 0)),
+            rank=rank + position
+        )
+        for position, (_, _, item) in enumerate(page, start=1)
+    ]
+
+    next_cursor = None
+
+    if next_positions:
+        next_cursor = pagination.encode_page_cursor(
+            LEADERBOARD_CURSOR_VERSION,
+            {'buckets': LEADERBOARD_BUCKETS},
+            rank=rank + len(page),
+            positions=next_positions
+        )
+
+    return users, next_cursor
+
+def _query_bucket(bucket, after_score, limit):
+    """
+    Up to limit users of one bucket below after_score, and whether the bucket has more
+    than that.
+    """
+    query_kwargs = {
+        'IndexName': LEADERBOARD_INDEX_NAME,
+        'KeyConditionExpression': Key('leaderboard_bucket').eq(bucket),
+        'ScanIndexForward': False
+    }
+
+    if after_score is not None:
+        # The sort key ends with the email, which is the table key
+        query_kwargs['ExclusiveStartKey'] = {
+            'leaderboard_bucket': bucket,
+            'leaderboard_score': after_score,
+            'email': after_score.split('#', 1)[1]
+        }
+
+    users_table = aws_clients.get_dynamodb_table(os.getenv('USERS_TABLE_NAME'))
+
+    return pagination.query_page(users_table, query_kwargs, limit)
@@ -0,0 +1,75 @@
+import backend.common.common as common_handler
+
+def query_cursor_page(table, query_kwargs, limit, cursor, version, scope, key_attributes):
+    """
+    One page of a query and the cursor of the next page (None on the last one). scope holds
+    what the query is for, e.g. {'event_id': event_id}, and is signed into the cursor with
+    version, so a cursor only continues the query it came from. key_attributes are the
+    table and index key attributes the next page starts after. Raises ValueError for a cursor
+    that is invalid or belongs to another query.
+    """
+    query_kwargs = dict(query_kwargs)
+
+    if cursor:
+        query_kwargs['ExclusiveStartKey'] = decode_page_cursor(cursor, version, scope)['start_key']
+
+    items, has_more = query_page(table, query_kwargs, limit)
+
+    next_cursor = None
+
+    if has_more:
+        next_cursor = encode_page_cursor(version, scope, start_key={attribute: items[-1][attribute] for attribute in key_attributes})
+
+    return items, next_cursor
+
+def query_page(table, query_kwargs, limit):
+    """
+    Runs a query for one page of up to limit items and returns (items, has_more). One item
+    past the page is read to tell whether another page exists, so the last page never comes
+    back empty.
+    """
+    query_kwargs = dict(query_kwargs, Limit=limit + 1)
+
+    items = []
+
+    # A page may stop short of Limit when it hits 1 MB, so keep reading until there's enough
+    while len(items) <= limit:
+        response = table.query(**query_kwargs)
+        items.extend(response.get('Items', []))
+
+        if 'LastEvaluatedKey' not in response:
+            break
+
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        query_kwargs['Limit'] = limit + 1 - len(items)
+
+    return items[:limit], len(items) > limit
+
+def decode_page_cursor(cursor, version, scope):
+    """
+    State of a cursor made by encode_page_cursor with the same version and scope. Raises
+    ValueError for any other cursor.
+    """
+    cursor_state = common_handler.decode_cursor(cursor)
+
+    if not cursor_state or cursor_state.get('v') != version or any(cursor_state.get(key) != value for key, value in scope.items()):
+        raise ValueError('Invalid cursor.')
+
+    return cursor_state
+
+def encode_page_cursor(version, scope, **state):
+    return common_handler.encode_cursor({'v': version, **scope, **state})
+
+def parse_page_size(value, default, maximum):
+    """
+    Page size from a query parameter, capped at maximum. Raises ValueError when it isn't a positive integer.
+    """
+    if value is None:
+        return default
+
+    page_size = int(value)
+
+    if page_size < 1:
+        raise ValueError('Page size must be positive.')
+
+    return min(page_size, maximum)
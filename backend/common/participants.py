@@ -0,0 +1,250 @@
+import os
+import random
+import time
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from boto3.dynamodb.conditions import Key
+
+import backend.common.clients as aws_clients
+import backend.common.pagination as pagination
+from backend.common.batch import batch_get_items
+from backend.common.transactions import NotFoundError, run_transaction
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# A user's events are read newest first from this GSI
+USER_EVENTS_INDEX_NAME = 'user_email-joined_at-index'
+
+PARTICIPANTS_DEFAULT_PAGE_SIZE = int(os.getenv('PARTICIPANTS_DEFAULT_PAGE_SIZE', '50'))
+# One page of events is fetched with a single BatchGetItem
+PARTICIPANTS_MAX_PAGE_SIZE = int(os.getenv('PARTICIPANTS_MAX_PAGE_SIZE', '100'))
+
+PARTICIPANTS_CURSOR_VERSION = 1
+
+# Joins and leaves of one event are spread over this many counter items, so a ticket drop
+# doesn't throttle on a single key. Reads sum shards 0..N-1, so only ever raise it
+PARTICIPANT_COUNTER_SHARDS = int(os.getenv('PARTICIPANT_COUNTER_SHARDS', '10'))
+
+# Summed counts are reused for a few seconds instead of reading every shard on every request
+PARTICIPANT_COUNT_CACHE_TTL_SECONDS = float(os.getenv('PARTICIPANT_COUNT_CACHE_TTL_SECONDS', '5'))
+PARTICIPANT_COUNT_CACHE_MAX_SIZE = int(os.getenv('PARTICIPANT_COUNT_CACHE_MAX_SIZE', '4096'))
+
+# Leaves trust an event found in the last few minutes. Events can be deleted (an import removes
+# the events of a chunk it failed to save), so joins, which write a membership and a counter
+# shard for the event, always read it again
+EVENT_EXISTS_CACHE_TTL_SECONDS = float(os.getenv('EVENT_EXISTS_CACHE_TTL_SECONDS', '300'))
+
+_participant_count_cache = OrderedDict()
+_event_exists_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def join_event(event_id, user_email):
+    """
+    Adds the user to the event's participants and increments one of the event's counter shards
+    in one transaction. Returns False when the user had already joined, in which case nothing
+    changes. Raises NotFoundError when the event or the user doesn't exist.
+    """
+    if not _event_exists(event_id, use_cache=False):
+        raise NotFoundError('Event not found')
+
+    joined_at = datetime.now(timezone.utc).isoformat()
+
+    def transact_items():
+        return [
+            {
+                'ConditionCheck': {
+                    'TableName': os.getenv('USERS_TABLE_NAME'),
+                    'Key': {'email': user_email},
+                    'ConditionExpression': 'attribute_exists(email)'
+                }
+            },
+            {
+                'Put': {
+                    'TableName': os.getenv('EVENT_PARTICIPANTS_TABLE_NAME'),
+                    'Item': {
+                        'event_id': event_id,
+                        'user_email': user_email,
+                        'joined_at': joined_at
+                    },
+                    'ConditionExpression': 'attribute_not_exists(user_email)'
+                }
+            },
+            _counter_shard_update(event_id, 1)
+        ]
+
+    failed = run_transaction(transact_items)
+
+    if 0 in failed:
+        raise NotFoundError('User not found')
+
+    if not failed:
+        _forget_participant_count(event_id)
+
+    return not failed
+
+def leave_event(event_id, user_email):
+    """
+    Removes the user from the event's participants and decrements one of the counter shards in
+    one transaction. Returns False when the user wasn't a participant, in which case nothing
+    changes. Raises NotFoundError when the event doesn't exist.
+    """
+    if not _event_exists(event_id):
+        raise NotFoundError('Event not found')
+
+    def transact_items():
+        return [
+            {
+                'Delete': {
+                    'TableName': os.getenv('EVENT_PARTICIPANTS_TABLE_NAME'),
+                    'Key': {'event_id': event_id, 'user_email': user_email},
+                    'ConditionExpression': 'attribute_exists(user_email)'
+                }
+            },
+            # A single shard can go below zero, only the sum of all of them is meaningful
+            _counter_shard_update(event_id, -1)
+        ]
+
+    if run_transaction(transact_items):
+        return False
+
+    _forget_participant_count(event_id)
+
+    return True
+
+def get_participant_counts(event_ids):
+    """
+    {event_id: participants counted on the shards} for the given events, read with BatchGetItem
+    and cached for PARTICIPANT_COUNT_CACHE_TTL_SECONDS. Add it to the participants attribute the
+    event item kept from before the counters were sharded, see total_participants.
+    """
+    now = time.monotonic()
+    counts = {}
+
+    with _cache_lock:
+        for event_id in event_ids:
+            cached_entry = _participant_count_cache.get(event_id)
+
+            if cached_entry and now < cached_entry[0]:
+                counts[event_id] = cached_entry[1]
+
+    missing_ids = list(dict.fromkeys(event_id for event_id in event_ids if event_id not in counts))
+
+    if not missing_ids:
+        return counts
+
+    keys = [{'event_id': event_id, 'shard': shard} for event_id in missing_ids for shard in range(PARTICIPANT_COUNTER_SHARDS)]
+    shards = batch_get_items(os.getenv('EVENT_PARTICIPANT_COUNTERS_TABLE_NAME'), keys, attributes=['participants'])
+
+    for event_id in missing_ids:
+        counts[event_id] = 0
+
+    for key, shard in zip(keys, shards):
+        if shard:
+            counts[key['event_id']] += int(shard.get('participants', 0))
+
+    expires_at = time.monotonic() + PARTICIPANT_COUNT_CACHE_TTL_SECONDS
+
+    with _cache_lock:
+        for event_id in missing_ids:
+            _participant_count_cache[event_id] = (expires_at, counts[event_id])
+            _participant_count_cache.move_to_end(event_id)
+
+        while len(_participant_count_cache) > PARTICIPANT_COUNT_CACHE_MAX_SIZE:
+            _participant_count_cache.popitem(last=False)
+
+    return counts
+
+def total_participants(event_item, participant_counts):
+    """
+    The event's participants: what its item counted before sharding plus its counter shards.
+    """
+    return int(event_item.get('participants', 0)) + participant_counts.get(event_item['event_id'], 0)
+
+def clear_participant_count_cache():
+    with _cache_lock:
+        _participant_count_cache.clear()
+        _event_exists_cache.clear()
+
+def get_user_events_page(user_email, limit=PARTICIPANTS_DEFAULT_PAGE_SIZE, cursor=None):
+    """
+    Ids of one page of the events a user joined, most recently joined first, and the cursor of
+    the next page (None on the last one). Raises ValueError for a cursor that is invalid or
+    belongs to another user.
+    """
+    query_kwargs = {
+        'IndexName': USER_EVENTS_INDEX_NAME,
+        'KeyConditionExpression': Key('user_email').eq(user_email),
+        'ScanIndexForward': False
+    }
+
+    participants_table = aws_clients.get_dynamodb_table(os.getenv('EVENT_PARTICIPANTS_TABLE_NAME'))
+
+    items, next_cursor = pagination.query_cursor_page(participants_table, query_kwargs, limit, cursor, PARTICIPANTS_CURSOR_VERSION, {'user_email': user_email}, ('event_id', 'user_email', 'joined_at'))
+
+    return [item['event_id'] for item in items], next_cursor
+
+def get_joined_event_ids(user_email):
+    """
+    Ids of every event the user joined, most recently joined first, read from the
+    user_email-joined_at-index GSI.
+    """
+    participants_table = aws_clients.get_dynamodb_table(os.getenv('EVENT_PARTICIPANTS_TABLE_NAME'))
+
+    query_kwargs = {
+        'IndexName': USER_EVENTS_INDEX_NAME,
+        'KeyConditionExpression': Key('user_email').eq(user_email),
+        'ScanIndexForward': False,
+        'ProjectionExpression': 'event_id'
+    }
+
+    event_ids = []
+
+    while True:
+        response = participants_table.query(**query_kwargs)
+        event_ids.extend(item['event_id'] for item in response.get('Items', []))
+
+        if 'LastEvaluatedKey' not in response:
+            return event_ids
+
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def _counter_shard_update(event_id, delta):
+    return {
+        'Update': {
+            'TableName': os.getenv('EVENT_PARTICIPANT_COUNTERS_TABLE_NAME'),
+            'Key': {'event_id': event_id, 'shard': random.randrange(PARTICIPANT_COUNTER_SHARDS)},
+            'UpdateExpression': 'ADD participants :delta',
+            'ExpressionAttributeValues': {':delta': delta}
+        }
+    }
+
+def _event_exists(event_id, use_cache=True):
+    if use_cache:
+        with _cache_lock:
+            expires_at = _event_exists_cache.get(event_id)
+
+            if expires_at and time.monotonic() < expires_at:
+                return True
+
+    events_table = aws_clients.get_dynamodb_table(os.getenv('EVENTS_TABLE_NAME'))
+
+    # A fresh read mustn't see an event that was just deleted
+    if 'Item' not in events_table.get_item(Key={'event_id': event_id}, ProjectionExpression='event_id', ConsistentRead=not use_cache):
+        return False
+
+    with _cache_lock:
+        _event_exists_cache[event_id] = time.monotonic() + EVENT_EXISTS_CACHE_TTL_SECONDS
+        _event_exists_cache.move_to_end(event_id)
+
+        while len(_event_exists_cache) > PARTICIPANT_COUNT_CACHE_MAX_SIZE:
+            _event_exists_cache.popitem(last=False)
+
+    return True
+
+def _forget_participant_count(event_id):
+    # The next read in this container sums the shards again and sees the change
+    with _cache_lock:
+        _participant_count_cache.pop(event_id, None)
@@ -0,0 +1,240 @@
+import os
+import queue
+import random
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+SCAN_DEFAULT_TOTAL_SEGMENTS = int(os.getenv('SCAN_DEFAULT_TOTAL_SEGMENTS', '4'))
+
+# Throttled segments back off together, because they all draw from the same table capacity
+SCAN_BACKOFF_BASE_SECONDS = float(os.getenv('SCAN_BACKOFF_BASE_SECONDS', '0.05'))
+SCAN_BACKOFF_MAX_SECONDS = float(os.getenv('SCAN_BACKOFF_MAX_SECONDS', '2'))
+SCAN_MAX_THROTTLE_RETRIES = int(os.getenv('SCAN_MAX_THROTTLE_RETRIES', '10'))
+
+# Pages waiting for the consumer, so workers don't read far ahead of what is used
+SCAN_PREFETCH_PAGES_PER_SEGMENT = 2
+
+THROTTLING_ERROR_CODES = ('ProvisionedThroughputExceededException', 'ThrottlingException', 'RequestLimitExceeded')
+
+_DONE = object()
+
+class ParallelScan:
+    """
+    Scans a DynamoDB table with one thread per Segment and yields items as pages arrive.
+
+    The scan stops once max_items items were yielded or the deadline (time.monotonic())
+    passes. remaining_segments() then tells where every unfinished segment has to resume,
+    which is what a pagination cursor stores. Use it as a context manager so workers stop
+    when the caller breaks out early:
+
+        with ParallelScan(table, max_items=100) as scan:
+            for item in scan:
+                ...
+    """
+
+    def __init__(self, table, total_segments=None, segments=None, max_items=None, deadline=None, key_attributes=None, **scan_kwargs):
+        self.table = table
+        self.total_segments = total_segments or SCAN_DEFAULT_TOTAL_SEGMENTS
+        self.max_items = max_items
+        self.deadline = deadline
+        self.key_attributes = key_attributes
+        self.scan_kwargs = scan_kwargs
+
+        # Segment -> exclusive start key, None for a segment that has not started yet
+        if segments is None:
+            segments = {segment: None for segment in range(self.total_segments)}
+
+        self._start_keys = dict(segments)
+        self._finished = set()
+
+        self.stats = {
+            'pages': 0,
+            'items': 0,
+            'throttles': 0
+        }
+
+        self._pages = queue.Queue(maxsize=max(len(self._start_keys), 1) * SCAN_PREFETCH_PAGES_PER_SEGMENT)
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._backoff_seconds = 0.0
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        if not self._start_keys:
+            return
+
+        self._executor = ThreadPoolExecutor(max_workers=len(self._start_keys))
+
+        for segment, start_key in self._start_keys.items():
+            self._executor.submit(self._scan_segment, segment, start_key)
+
+        running = len(self._start_keys)
+        yielded = 0
+
+        try:
+            while running:
+                if self.max_items is not None and yielded >= self.max_items:
+                    return
+
+                try:
+                    segment, page = self._pages.get(timeout=self._seconds_left())
+                except queue.Empty:
+                    logger.info('PARALLEL SCAN - Time budget exhausted.')
+                    return
+
+                if page is _DONE:
+                    running -= 1
+                    continue
+
+                if isinstance(page, Exception):
+                    raise page
+
+                items = page.get('Items', [])
+
+                if not items:
+                    self._advance_past_page(segment, page)
+
+                for position, item in enumerate(items):
+                    if self.max_items is not None and yielded >= self.max_items:
+                        return
+
+                    # Record the position before handing the item out, so a stop right after it resumes behind it
+                    if position == len(items) - 1:
+                        self._advance_past_page(segment, page)
+                    else:
+                        self._start_keys[segment] = self._item_key(item)
+
+                    yielded += 1
+                    yield item
+
+                if self._seconds_left() == 0:
+                    logger.info('PARALLEL SCAN - Time budget exhausted.')
+                    return
+        finally:
+            self.close()
+
+    def remaining_segments(self):
+        """
+        Unfinished segments and the exclusive start key each one resumes from.
+        """
+        return {
+            segment: start_key
+            for segment, start_key in self._start_keys.items()
+            if segment not in self._finished
+        }
+
+    def close(self):
+        self._stop.set()
+
+        if self._executor:
+            # Unblock workers waiting for queue space
+            while True:
+                try:
+                    self._pages.get_nowait()
+                except queue.Empty:
+                    break
+
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _advance_past_page(self, segment, page):
+        if 'LastEvaluatedKey' in page:
+            self._start_keys[segment] = page['LastEvaluatedKey']
+        else:
+            self._finished.add(segment)
+
+    def _seconds_left(self):
+        if self.deadline is None:
+            return None
+
+        return max(self.deadline - time.monotonic(), 0)
+
+    def _item_key(self, item):
+        if self.key_attributes is None:
+            self.key_attributes = [key['AttributeName'] for key in self.table.key_schema]
+
+        return {attribute: item[attribute] for attribute in self.key_attributes}
+
+    def _scan_segment(self, segment, start_key):
+        try:
+            while not self._stop.is_set():
+                scan_kwargs = dict(self.scan_kwargs, Segment=segment, TotalSegments=self.total_segments)
+                if start_key:
+                    scan_kwargs['ExclusiveStartKey'] = start_key
+
+                page = self._scan_page_with_backoff(scan_kwargs)
+
+                if page is None:
+                    return
+
+                with self._stats_lock:
+                    self.stats['pages'] += 1
+                    self.stats['items'] += len(page.get('Items', []))
+
+                if not self._put(segment, page):
+                    return
+
+                if 'LastEvaluatedKey' not in page:
+                    break
+
+                start_key = page['LastEvaluatedKey']
+
+            self._put(segment, _DONE)
+        except Exception as e:
+            logger.error(f'PARALLEL SCAN - Segment {segment} failed: {str(e)}')
+
+            self._put(segment, e)
+
+    def _scan_page_with_backoff(self, scan_kwargs):
+        for attempt in range(SCAN_MAX_THROTTLE_RETRIES + 1):
+            self._wait(self._backoff_seconds * random.uniform(0.5, 1.0))
+
+            if self._stop.is_set():
+                return None
+
+            try:
+                page = self.table.scan(**scan_kwargs)
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') not in THROTTLING_ERROR_CODES or attempt == SCAN_MAX_THROTTLE_RETRIES:
+                    raise
+
+                with self._stats_lock:
+                    self.stats['throttles'] += 1
+
+                    # Double the shared delay on every throttle...
+                    self._backoff_seconds = min(max(self._backoff_seconds * 2, SCAN_BACKOFF_BASE_SECONDS), SCAN_BACKOFF_MAX_SECONDS)
+
+                logger.info(f'PARALLEL SCAN - Throttled, backing off {self._backoff_seconds:.2f}s.')
+                continue
+
+            with self._stats_lock:
+                # ...and let it decay while requests succeed
+                self._backoff_seconds = self._backoff_seconds / 2 if self._backoff_seconds > SCAN_BACKOFF_BASE_SECONDS else 0.0
+
+            return page
+
+    def _wait(self, seconds):
+        if seconds > 0:
+            self._stop.wait(seconds)
+
+    def _put(self, segment, page):
+        while not self._stop.is_set():
+            try:
+                self._pages.put((segment, page), timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
@@ -0,0 +1,51 @@
+import os
+import random
+import time
+import logging
+
+import backend.common.clients as aws_clients
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# DynamoDB cancels transactions that collide on an item or get throttled, those are worth retrying
+RETRYABLE_CANCELLATION_CODES = {'TransactionConflict', 'ThrottlingError'}
+
+TRANSACTION_MAX_RETRIES = int(os.getenv('TRANSACTION_MAX_RETRIES', '8'))
+TRANSACTION_BACKOFF_BASE_SECONDS = float(os.getenv('TRANSACTION_BACKOFF_BASE_SECONDS', '0.02'))
+TRANSACTION_BACKOFF_MAX_SECONDS = float(os.getenv('TRANSACTION_BACKOFF_MAX_SECONDS', '1'))
+
+class NotFoundError(LookupError):
+    pass
+
+def run_transaction(transact_items):
+    """
+    Runs the transaction built by transact_items() and returns the positions of the items whose
+    condition failed, an empty set when it went through. Transactions cancelled by a conflicting
+    one or by throttling are rebuilt, so randomly picked keys can change, and retried with
+    exponential backoff.
+    """
+    dynamodb_client = aws_clients.get_dynamodb_client()
+
+    for attempt in range(TRANSACTION_MAX_RETRIES + 1):
+        try:
+            dynamodb_client.transact_write_items(TransactItems=transact_items())
+
+            return set()
+        except dynamodb_client.exceptions.TransactionCanceledException as e:
+            reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons', [])]
+
+            failed = {position for position, code in enumerate(reasons) if code == 'ConditionalCheckFailed'}
+
+            if failed:
+                return failed
+
+            if not RETRYABLE_CANCELLATION_CODES.intersection(reasons) or attempt == TRANSACTION_MAX_RETRIES:
+                raise
+
+        # Full jitter, so the colliding transactions don't retry in lockstep
+        backoff_seconds = min(TRANSACTION_BACKOFF_BASE_SECONDS * (2 ** attempt), TRANSACTION_BACKOFF_MAX_SECONDS)
+
+        logger.info(f'TRANSACTIONS - Transaction cancelled ({", ".join(code for code in reasons if code != "None")}), retrying in up to {backoff_seconds:.2f}s.')
+
+        time.sleep(random.uniform(0, backoff_seconds))
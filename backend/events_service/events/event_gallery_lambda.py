@@ -0,0 +1,64 @@
+import json
+import logging
+import backend.common.common as common_handler
+import backend.common.gallery as gallery
+import backend.common.pagination as pagination
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def lambda_handler(event, context):
+    try:
+        # Check if the user is authenticated and fetch email
+        error_response, email = common_handler.get_authenticated_user_email(event)
+        if error_response:
+            return error_response
+
+        query_params = event.get('queryStringParameters') or {}
+        event_id = query_params.get('event_id')
+
+        if not event_id:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json'},
+                'body': json.dumps({
+                    'message': 'Missing required attribute: event_id'
+                })
+            }
+
+        try:
+            limit = pagination.parse_page_size(query_params.get('limit'), gallery.GALLERY_DEFAULT_PAGE_SIZE, gallery.GALLERY_MAX_PAGE_SIZE)
+        except ValueError:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json'},
+                'body': json.dumps({'message': 'Invalid limit.'})
+            }
+
+        try:
+            event_images, next_cursor = gallery.get_gallery_page(event_id, limit, query_params.get('cursor'))
+        except ValueError:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json'},
+                'body': json.dumps({'message': 'Invalid cursor.'})
+            }
+
+        logger.info(f'EVENT GALLERY - Returning {len(event_images)} images for event {event_id}')
+
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json'},
+            'body': json.dumps({
+                'event_images': common_handler.convert_decimals(event_images),
+                'next_cursor': next_cursor
+            })
+        }
+
+    except Exception as e:
+        logger.error(f'An error occurred: {str(e)}')
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json'},
+            'body': json.dumps({'message': f"An error occurred: {str(e)}"})
+        }
@@ -1,9 +1,10 @@
 import json
 import logging
-import boto3
 import os
 import uuid
+from datetime import datetime, timezone
 import backend.common.common as common_handler
+import backend.common.clients as aws_clients
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -11,7 +12,7 @@ logger.setLevel(logging.INFO)
 def lambda_handler(event, context):
     try:
         # Check if the user is authenticated and fetch email
-        error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(event)
+        error_response, email = common_handler.get_authenticated_user_email(event)
         if error_response:
             return error_response
 
@@ -38,10 +39,9 @@ def lambda_handler(event, context):
         event_id = event_body['event_id']
         image_link = event_body['image_link']
 
-        # Initialize DynamoDB resources
-        dynamodb = boto3.resource('dynamodb')
-        event_images_table = dynamodb.Table(os.getenv('EVENT_IMAGES_TABLE_NAME'))
-        users_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
+        # Get DynamoDB tables
+        event_images_table = aws_clients.get_dynamodb_table(os.getenv('EVENT_IMAGES_TABLE_NAME'))
+        users_table = aws_clients.get_dynamodb_table(os.getenv('USERS_TABLE_NAME'))
 
         # Fetch the user item
         user_response = users_table.get_item(Key={'email': email})
@@ -66,7 +66,9 @@ def lambda_handler(event, context):
             'user_id': email,
             'first_name': first_name,
             'last_name': last_name,
-            'image_link': image_link
+            'image_link': image_link,
+            # Sort key of the gallery index, so galleries are read newest first
+            'created_at': datetime.now(timezone.utc).isoformat()
         }
 
         # Save the item to the EventImagesTable
@@ -0,0 +1,64 @@
+import os
+import logging
+from datetime import datetime, timezone
+from botocore.exceptions import ClientError
+
+import backend.common.clients as aws_clients
+import backend.common.images as images
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def lambda_handler(event, context):
+    """
+    Runs when an event cover lands in the event pictures bucket, through the presigned POST
+    from registration or the older inline upload. Creates the derivatives and marks the
+    event as having an image. Uploads that aren't readable images, or belong to no event, are deleted.
+    """
+    events_table = aws_clients.get_dynamodb_table(os.getenv('EVENTS_TABLE_NAME'))
+
+    processed = 0
+
+    for bucket, key in images.uploaded_objects(event):
+        # Derivatives are written to the same bucket, and only <event_id>.jpg is a cover
+        if key.startswith(images.IMAGE_DERIVATIVES_PREFIX) or '/' in key or not key.endswith('.jpg'):
+            logger.info(f'EVENT IMAGE UPLOADED - Ignoring {bucket}/{key}')
+            continue
+
+        event_id = key[:-len('.jpg')]
+
+        logger.info(f'EVENT IMAGE UPLOADED - Creating derivatives for event {event_id}')
+
+        has_image = images.create_image_derivatives(bucket, key) is not None
+
+        if not has_image:
+            logger.info(f'EVENT IMAGE UPLOADED - {bucket}/{key} is not an image, deleting it')
+
+            images.delete_image(bucket, key)
+
+        try:
+            events_table.update_item(
+                Key={
+                    'event_id': event_id
+                },
+                UpdateExpression='SET has_image = :has_image, image_updated_at = :image_updated_at',
+                ConditionExpression='attribute_exists(event_id)',
+                ExpressionAttributeValues={
+                    ':has_image': has_image,
+                    ':image_updated_at': datetime.now(timezone.utc).isoformat()
+                }
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+
+            logger.info(f'EVENT IMAGE UPLOADED - Event {event_id} does not exist, deleting its cover')
+
+            images.delete_image(bucket, key)
+            continue
+
+        processed += 1
+
+    return {
+        'processed': processed
+    }
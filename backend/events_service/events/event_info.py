@@ -1,28 +1,19 @@
 import json
 import logging
-import boto3
 import os
-import decimal  # Import the decimal module
-from boto3.dynamodb.conditions import Key,Attr
+from concurrent.futures import ThreadPoolExecutor
 import backend.common.common as common_handler
+import backend.common.clients as aws_clients
+import backend.common.gallery as gallery
+import backend.common.participants as participants
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-def convert_decimals(obj):
-    if isinstance(obj, list):
-        return [convert_decimals(i) for i in obj]
-    elif isinstance(obj, dict):
-        return {k: convert_decimals(v) for k, v in obj.items()}
-    elif isinstance(obj, decimal.Decimal):
-        return float(obj)
-    else:
-        return obj
-
 def lambda_handler(event, context):
     try:
         # Check if the user is authenticated and fetch email
-        error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(event)
+        error_response, email = common_handler.get_authenticated_user_email(event)
         if error_response:
             return error_response
 
@@ -46,13 +37,23 @@ def lambda_handler(event, context):
                 })
             }
 
-        # Initialize DynamoDB resources
-        dynamodb = boto3.resource('dynamodb')
-        events_table = dynamodb.Table(os.getenv('EVENTS_TABLE_NAME'))
-        event_images_table = dynamodb.Table(os.getenv('EVENT_IMAGES_TABLE_NAME'))
+        events_table = aws_clients.get_dynamodb_table(os.getenv('EVENTS_TABLE_NAME'))
+
+        # The event, its participant counters and the first gallery page don't depend on each other, so read them concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            event_future = executor.submit(events_table.get_item, Key={'event_id': event_id})
+            participant_counts_future = executor.submit(participants.get_participant_counts, [event_id])
+            gallery_future = executor.submit(gallery.get_gallery_page, event_id)
+
+            event_response = event_future.result()
+            participant_counts = participant_counts_future.result()
+
+            try:
+                event_images, event_images_next_cursor = gallery_future.result()
+            except Exception as e:
+                logger.error(f'Error fetching event images: {str(e)}')
+                event_images, event_images_next_cursor = [], None
 
-        # Fetch event info
-        event_response = events_table.get_item(Key={'event_id': event_id})
         if 'Item' not in event_response:
             return {
                 'statusCode': 404,
@@ -60,25 +61,18 @@ def lambda_handler(event, context):
                 'body': json.dumps({'message': 'Event not found'})
             }
         event_info = event_response['Item']
+        event_info['participants'] = participants.total_participants(event_info, participant_counts)
 
-        # Fetch event images
-        # Assuming 'event_id' is a Global Secondary Index (GSI) on the event_images_table
-        try:
-            images_response = event_images_table.scan(
-                FilterExpression=Attr('event_id').eq(event_id)
-            )
-            event_images = images_response.get('Items', [])
-        except Exception as e:
-            logger.error(f'Error fetching event images: {str(e)}')
-            event_images = []
         # Prepare the response
         response_body = {
             'event_info': event_info,
-            'event_images': event_images
+            'event_images': event_images,
+            # Later pages come from /event/gallery
+            'event_images_next_cursor': event_images_next_cursor
         }
 
         # Convert Decimal instances to floats
-        response_body = convert_decimals(response_body)
+        response_body = common_handler.convert_decimals(response_body)
 
         return {
             'statusCode': 200,
@@ -1,22 +1,29 @@
 import json
 import logging
-import boto3
 import os
-import base64
+
+import backend.common.clients as aws_clients
+import backend.common.images as images
+import backend.common.participants as participants
+from backend.common.batch import batch_get_items
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Attributes returned for every event, everything else stays in DynamoDB
+EVENT_ATTRIBUTES = [
+    'title', 'description', 'startAt', 'endingAt', 'theme', 'genre', 'type',
+    'latitude', 'longitude', 'participants', 'club_id', 'has_image'
+]
+
 def lambda_handler(event, context):
     try:
         query_params = event.get('queryStringParameters', {}) or {}
 
         club_id = query_params.get('club_id')
 
-        # Initialize a DynamoDB resource
-        dynamodb = boto3.resource('dynamodb')
-        clubs_table = dynamodb.Table(os.getenv('CLUBS_TABLE_NAME'))
-        events_table = dynamodb.Table(os.getenv('EVENTS_TABLE_NAME'))
+        # Get DynamoDB tables
+        clubs_table = aws_clients.get_dynamodb_table(os.getenv('CLUBS_TABLE_NAME'))
 
         # get item from the DynamoDB table 
         try:
@@ -40,38 +47,56 @@ def lambda_handler(event, context):
             event_ids = club_item['Item'].get('events', [])
 
             events = []
+            image_keys = []
+            image_mode = images.get_image_mode(event)
+            image_size, image_format = images.get_image_variant(event)
+
+            # One BatchGetItem per 100 events instead of a GetItem per event
+            event_items = batch_get_items(
+                os.getenv('EVENTS_TABLE_NAME'),
+                [{'event_id': event_id} for event_id in event_ids],
+                attributes=EVENT_ATTRIBUTES
+            )
+
+            # Joins are counted on sharded counter items, summed here (and cached for a few seconds)
+            participant_counts = participants.get_participant_counts([event_id for event_id, event_item in zip(event_ids, event_items) if event_item])
 
-            for id in event_ids:
-                event_item = events_table.get_item(
-                    Key={
-                        'event_id': id
+            for event_id, event_item in zip(event_ids, event_items):
+                if event_item:
+                    event_response = {
+                        'event_id': event_id,
+                        'title': event_item.get('title'),
+                        'description': event_item.get('description'),
+                        'startAt': event_item.get('startAt'),
+                        'endingAt': event_item.get('endingAt'),
+                        'theme': event_item.get('theme'),
+                        'genre': event_item.get('genre'),
+                        'type': event_item.get('type'),
+                        'latitude': event_item.get('latitude'),
+                        'longitude': event_item.get('longitude'),
+                        'participants': participants.total_participants(event_item, participant_counts),
+                        'club_id': event_item.get('club_id')
                     }
-                )
 
-                if 'Item' in event_item:
-                    event_id = id
-                    s3_client = boto3.client('s3')
+                    # Events whose cover was never uploaded have nothing to link to
+                    image_key = None if event_item.get('has_image') is False else images.derivative_key(f'{event_id}.jpg', image_size, image_format)
 
-                    picture = s3_client.get_object(Bucket=os.getenv('EVENT_PICTURES_BUCKET'), Key=f'{event_id}.jpg')
-                    logger.info(f"Picture: {picture}")
-                    
-                    image = picture['Body'].read()
+                    # A short-lived link keeps the response small, inline base64 is opt-in
+                    if image_mode == images.IMAGE_MODE_URL:
+                        event_response['image_url'] = images.get_presigned_image_url(os.getenv('EVENT_PICTURES_BUCKET'), image_key) if image_key else None
 
-                    events.append({
-                        'event_id': event_id,
-                        'title': event_item['Item'].get('title'),
-                        'description': event_item['Item'].get('description'),
-                        'startAt': event_item['Item'].get('startAt'),
-                        'endingAt': event_item['Item'].get('endingAt'),
-                        'theme': event_item['Item'].get('theme'),
-                        'genre': event_item['Item'].get('genre'),
-                        'type': event_item['Item'].get('type'),
-                        'latitude': event_item['Item'].get('latitude'),
-                        'longitude': event_item['Item'].get('longitude'),
-                        'participants': int(event_item['Item'].get('participants', 0)),
-                        'image': base64.b64encode(image).decode('utf-8'),
-                        'club_id': event_item['Item'].get('club_id')
-                    })
+                    events.append(event_response)
+                    image_keys.append(image_key)
+
+            if image_mode == images.IMAGE_MODE_INLINE:
+                # Download all pictures concurrently, within the response byte budget
+                pictures = iter(images.fetch_images_as_base64(
+                    os.getenv('EVENT_PICTURES_BUCKET'),
+                    [image_key for image_key in image_keys if image_key]
+                ))
+
+                for event_response, image_key in zip(events, image_keys):
+                    event_response['image'] = next(pictures) if image_key else None
         except Exception as e:
             logger.error(f'Error saving event to DynamoDB: {str(e)}')
 
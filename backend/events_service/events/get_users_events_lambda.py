@@ -1,80 +1,110 @@
 import json
 import logging
-import boto3
 import os
-import base64
 
 import backend.common.common as common_handler
+import backend.common.images as images
+import backend.common.participants as participants
+import backend.common.pagination as pagination
+from backend.common.batch import batch_get_items
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Attributes returned for every event, everything else stays in DynamoDB
+EVENT_ATTRIBUTES = [
+    'title', 'description', 'startAt', 'endingAt', 'theme', 'genre', 'type',
+    'latitude', 'longitude', 'participants', 'club_id', 'has_image'
+]
+
 def lambda_handler(event, context):
     try:
-        error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(event)
+        error_response, email = common_handler.get_authenticated_user_email(event)
     
         if error_response:
             return error_response
 
-        # Initialize a DynamoDB resource
-        dynamodb = boto3.resource('dynamodb')
-        users_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
-        events_table = dynamodb.Table(os.getenv('EVENTS_TABLE_NAME'))
+        query_params = event.get('queryStringParameters') or {}
 
-        # get item from the DynamoDB table
         try:
-            user_item = users_table.get_item(
-                Key={
-                    'email': email
-                }
-            )
+            limit = pagination.parse_page_size(query_params.get('limit'), participants.PARTICIPANTS_DEFAULT_PAGE_SIZE, participants.PARTICIPANTS_MAX_PAGE_SIZE)
+        except ValueError:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json'
+                },
+                'body': json.dumps({
+                    'message': 'Invalid limit.'
+                })
+            }
 
-            if 'Item' not in user_item:
+        try:
+            # One page of memberships from the user_email GSI, however many events the user joined
+            try:
+                event_ids, next_cursor = participants.get_user_events_page(email, limit, query_params.get('cursor'))
+            except ValueError:
                 return {
                     'statusCode': 400,
                     'headers': {
                         'Content-Type': 'application/json'
                     },
                     'body': json.dumps({
-                        'message': 'User not found'
+                        'message': 'Invalid cursor.'
                     })
                 }
-            
-            event_ids = user_item['Item'].get('events', [])
 
             events = []
+            image_keys = []
+            image_mode = images.get_image_mode(event)
+            image_size, image_format = images.get_image_variant(event)
+
+            # One BatchGetItem per 100 events instead of a GetItem per event
+            event_items = batch_get_items(
+                os.getenv('EVENTS_TABLE_NAME'),
+                [{'event_id': event_id} for event_id in event_ids],
+                attributes=EVENT_ATTRIBUTES
+            )
 
-            for id in event_ids:
-                event_item = events_table.get_item(
-                    Key={
-                        'event_id': id
+            # Joins are counted on sharded counter items, summed here (and cached for a few seconds)
+            participant_counts = participants.get_participant_counts([event_id for event_id, event_item in zip(event_ids, event_items) if event_item])
+
+            for event_id, event_item in zip(event_ids, event_items):
+                if event_item:
+                    event_response = {
+                        'event_id': event_id,
+                        'title': event_item.get('title'),
+                        'description': event_item.get('description'),
+                        'startAt': event_item.get('startAt'),
+                        'endingAt': event_item.get('endingAt'),
+                        'theme': event_item.get('theme'),
+                        'genre': event_item.get('genre'),
+                        'type': event_item.get('type'),
+                        'latitude': event_item.get('latitude'),
+                        'longitude': event_item.get('longitude'),
+                        'participants': participants.total_participants(event_item, participant_counts),
+                        'club_id': event_item.get('club_id')
                     }
-                )
 
-                if 'Item' in event_item:
-                    event_id = id
-                    s3_client = boto3.client('s3')
+                    # Events whose cover was never uploaded have nothing to link to
+                    image_key = None if event_item.get('has_image') is False else images.derivative_key(f'{event_id}.jpg', image_size, image_format)
 
-                    picture = s3_client.get_object(Bucket=os.getenv('EVENT_PICTURES_BUCKET'), Key=f'{event_id}.jpg')
-                    logger.info(f"Picture: {picture}")
-                    
-                    image = picture['Body'].read()
+                    # A short-lived link keeps the response small, inline base64 is opt-in
+                    if image_mode == images.IMAGE_MODE_URL:
+                        event_response['image_url'] = images.get_presigned_image_url(os.getenv('EVENT_PICTURES_BUCKET'), image_key) if image_key else None
 
-                    events.append({
-                        'event_id': event_id,
-                        'title': event_item['Item'].get('title'),
-                        'description': event_item['Item'].get('description'),
-                        'startAt': event_item['Item'].get('startAt'),
-                        'endingAt': event_item['Item'].get('endingAt'),
-                        'theme': event_item['Item'].get('theme'),
-                        'genre': event_item['Item'].get('genre'),
-                        'type': event_item['Item'].get('type'),
-                        'latitude': event_item['Item'].get('latitude'),
-                        'longitude': event_item['Item'].get('longitude'),
-                        'participants': int(event_item['Item'].get('participants', 0)),
-                        'image': base64.b64encode(image).decode('utf-8'),
-                        'club_id': event_item['Item'].get('club_id')
-                    })
+                    events.append(event_response)
+                    image_keys.append(image_key)
+
+            if image_mode == images.IMAGE_MODE_INLINE:
+                # Download all pictures concurrently, within the response byte budget
+                pictures = iter(images.fetch_images_as_base64(
+                    os.getenv('EVENT_PICTURES_BUCKET'),
+                    [image_key for image_key in image_keys if image_key]
+                ))
+
+                for event_response, image_key in zip(events, image_keys):
+                    event_response['image'] = next(pictures) if image_key else None
         except Exception as e:
             logger.error(f'Error saving event to DynamoDB: {str(e)}')
 
@@ -95,7 +125,8 @@ def lambda_handler(event, context):
             },
             'body': json.dumps({
                 'message': 'Got users events!',
-                'events': events
+                'events': events,
+                'next_cursor': next_cursor
             })
         }
     except Exception as e:
@@ -0,0 +1,295 @@
+import os
+import csv
+import json
+import base64
+import codecs
+import time
+import logging
+import backend.common.common as common_handler
+import backend.common.clients as aws_clients
+import backend.common.event_schema as event_schema
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# HTTP API gives up on the integration after 30 seconds and the client loses the report, so an
+# import stops taking rows well before that and says where to resume
+IMPORT_MAX_ROWS = int(os.getenv('IMPORT_MAX_ROWS', '1000'))
+IMPORT_TIME_BUDGET_SECONDS = float(os.getenv('IMPORT_TIME_BUDGET_SECONDS', '20'))
+
+# Valid rows are written and appended to the club's lists in chunks, so a failure only loses one chunk
+IMPORT_CHUNK_ROWS = int(os.getenv('IMPORT_CHUNK_ROWS', '100'))
+
+# Base64 bodies are decoded this many characters at a time (a multiple of 4)
+IMPORT_DECODE_CHUNK_CHARS = 64 * 1024
+
+IMPORT_FORMATS = {
+    'application/x-ndjson': 'jsonl',
+    'application/jsonl': 'jsonl',
+    'application/json': 'jsonl',
+    'text/csv': 'csv'
+}
+
+# CSV has no nesting, so the giveaway comes in prefixed columns
+CSV_GIVEAWAY_PREFIX = 'giveaway_'
+
+def lambda_handler(event, context):
+    try:
+        error_response, email = common_handler.get_authenticated_user_email(event)
+
+        if error_response:
+            return error_response
+
+        import_format = get_import_format(event)
+
+        if import_format is None:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json'
+                },
+                'body': json.dumps({
+                    'message': 'Send events as JSON Lines (application/x-ndjson) or CSV (text/csv).'
+                })
+            }
+
+        clubs_table = aws_clients.get_dynamodb_table(os.getenv('CLUBS_TABLE_NAME'))
+
+        # One club read for the whole file, every event gets the club's coordinates
+        club_info = clubs_table.get_item(
+            Key={
+                'club_id': email
+            },
+            ProjectionExpression='latitude, longitude'
+        ).get('Item', {})
+
+        started_at = time.monotonic()
+
+        lines = iter_body_lines(event)
+        rows = iter_csv_rows(lines) if import_format == 'csv' else iter_jsonl_rows(lines)
+
+        report = []
+        chunk = []
+        truncated = False
+        resume_from_row = None
+
+        for row_count, (row_number, row, parse_error) in enumerate(rows, start=1):
+            if row_count > IMPORT_MAX_ROWS or time.monotonic() - started_at > IMPORT_TIME_BUDGET_SECONDS:
+                truncated = True
+                resume_from_row = row_number
+                break
+
+            validation_error = parse_error or event_schema.validate_event(row)
+
+            if validation_error:
+                report.append({'row': row_number, 'status': 'error', 'message': validation_error})
+                continue
+
+            chunk.append((row_number, *event_schema.build_event_items(row, email, club_info)))
+
+            if len(chunk) >= IMPORT_CHUNK_ROWS:
+                report.extend(write_chunk(email, chunk))
+                chunk = []
+
+        if chunk:
+            report.extend(write_chunk(email, chunk))
+
+        report.sort(key=lambda result: result['row'])
+
+        created = sum(1 for result in report if result['status'] == 'created')
+        unlinked = sum(1 for result in report if result['status'] == 'unlinked')
+
+        logger.info(f'IMPORT EVENTS - {created} of {len(report)} rows imported for {email}.')
+
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': json.dumps({
+                'message': f'Imported {created} of {len(report)} events.',
+                'created': created,
+                'failed': len(report) - created - unlinked,
+                'unlinked': unlinked,
+                'truncated': truncated,
+                'resume_from_row': resume_from_row,
+                'max_rows': IMPORT_MAX_ROWS,
+                'rows': report
+            })
+        }
+    except Exception as e:
+        return {
+            'statusCode': 500,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': json.dumps({
+                'message': f"An error occurred: {str(e)}"
+            })
+        }
+
+def get_import_format(event):
+    """
+    'jsonl' or 'csv' from the format query parameter or the Content-Type header, None otherwise.
+    """
+    requested_format = (event.get('queryStringParameters') or {}).get('format')
+
+    if requested_format:
+        return requested_format.lower() if requested_format.lower() in ('jsonl', 'csv') else None
+
+    headers = {key.lower(): value for key, value in (event.get('headers') or {}).items()}
+    content_type = headers.get('content-type', 'application/x-ndjson').split(';')[0].strip().lower()
+
+    return IMPORT_FORMATS.get(content_type)
+
+def iter_body_lines(event):
+    """
+    Yields the request body line by line without splitting or decoding all of it at once.
+    """
+    body = event.get('body') or ''
+
+    if event.get('isBase64Encoded'):
+        chunks = _iter_base64_decoded(body)
+    else:
+        chunks = (body[start:start + IMPORT_DECODE_CHUNK_CHARS] for start in range(0, len(body), IMPORT_DECODE_CHUNK_CHARS))
+
+    pending = ''
+
+    for position, chunk in enumerate(chunks):
+        # Spreadsheet exports often start with a byte order mark
+        if position == 0 and chunk.startswith('\ufeff'):
+            chunk = chunk[1:]
+
+        pending += chunk
+        lines = pending.split('\n')
+        pending = lines.pop()
+
+        for line in lines:
+            yield line + '\n'
+
+    if pending:
+        yield pending
+
+def _iter_base64_decoded(body):
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+
+    for start in range(0, len(body), IMPORT_DECODE_CHUNK_CHARS):
+        yield decoder.decode(base64.b64decode(body[start:start + IMPORT_DECODE_CHUNK_CHARS]))
+
+    yield decoder.decode(b'', final=True)
+
+def iter_jsonl_rows(lines):
+    """
+    (row_number, event, parse_error) for every non-blank JSON Lines row.
+    """
+    for row_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield row_number, None, 'Row is not valid JSON.'
+            continue
+
+        if not isinstance(row, dict):
+            yield row_number, None, 'Row must be a JSON object.'
+            continue
+
+        yield row_number, row, None
+
+def iter_csv_rows(lines):
+    """
+    (row_number, event, parse_error) for every CSV data row, with the giveaway_ columns
+    nested into a giveaway object. Row numbers count the header as row 1.
+    """
+    reader = csv.DictReader(lines)
+
+    for row in reader:
+        if not any(row.values()):
+            continue
+
+        if None in row:
+            yield reader.line_num, None, 'Row has more columns than the header.'
+            continue
+
+        event = {}
+        giveaway = {}
+
+        for column, value in row.items():
+            # Empty cells are treated as missing, like absent JSON attributes
+            if value in (None, ''):
+                continue
+
+            if column.startswith(CSV_GIVEAWAY_PREFIX):
+                giveaway[column[len(CSV_GIVEAWAY_PREFIX):]] = value
+            else:
+                event[column] = value
+
+        event['giveaway'] = giveaway
+
+        yield reader.line_num, event, None
+
+def write_chunk(club_id, chunk):
+    """
+    Writes a chunk of (row_number, event_item, giveaway_item) and appends the ids to the club's
+    lists. When that fails, the chunk's items are deleted again so a retry of those rows can't
+    create duplicates. Rows whose items couldn't be deleted either are reported as unlinked
+    with their event_id. Returns the report entries for the chunk.
+    """
+    dynamodb = aws_clients.get_dynamodb_resource()
+
+    events_table = dynamodb.Table(os.getenv('EVENTS_TABLE_NAME'))
+    giveaways_table = dynamodb.Table(os.getenv('GIVEAWAY_TABLE_NAME'))
+    clubs_table = dynamodb.Table(os.getenv('CLUBS_TABLE_NAME'))
+
+    try:
+        # batch_writer sends 25 items per BatchWriteItem and resends unprocessed items
+        with events_table.batch_writer() as events_writer, giveaways_table.batch_writer() as giveaways_writer:
+            for _, event_item, giveaway_item in chunk:
+                events_writer.put_item(Item=event_item)
+                giveaways_writer.put_item(Item=giveaway_item)
+
+        clubs_table.update_item(
+            Key={
+                'club_id': club_id
+            },
+            UpdateExpression='SET giveaways = list_append(if_not_exists(giveaways, :empty_list), :giveaway_ids), '
+                             'events = list_append(if_not_exists(events, :empty_list), :event_ids)',
+            ExpressionAttributeValues={
+                ':empty_list': [],
+                ':giveaway_ids': [giveaway_item['giveaway_id'] for _, _, giveaway_item in chunk],
+                ':event_ids': [event_item['event_id'] for _, event_item, _ in chunk]
+            }
+        )
+    except Exception as e:
+        logger.error(f'IMPORT EVENTS - Failed to write rows {chunk[0][0]}-{chunk[-1][0]}: {str(e)}')
+
+        try:
+            # Some or all of the items may be written, deleting missing ones is a no-op
+            with events_table.batch_writer() as events_writer, giveaways_table.batch_writer() as giveaways_writer:
+                for _, event_item, giveaway_item in chunk:
+                    events_writer.delete_item(Key={'event_id': event_item['event_id']})
+                    giveaways_writer.delete_item(Key={'giveaway_id': giveaway_item['giveaway_id']})
+        except Exception as cleanup_error:
+            logger.error(f'IMPORT EVENTS - Failed to remove rows {chunk[0][0]}-{chunk[-1][0]}: {str(cleanup_error)}')
+
+            return [
+                {
+                    'row': row_number,
+                    'status': 'unlinked',
+                    'event_id': event_item['event_id'],
+                    'message': 'Event may be saved but is not listed on the club. Do not import this row again.'
+                }
+                for row_number, event_item, _ in chunk
+            ]
+
+        return [
+            {'row': row_number, 'status': 'error', 'message': 'Failed to save event due to internal server error.'}
+            for row_number, _, _ in chunk
+        ]
+
+    return [
+        {'row': row_number, 'status': 'created', 'event_id': event_item['event_id']}
+        for row_number, event_item, _ in chunk
+    ]
@@ -1,15 +1,14 @@
 import json
 import logging
-import boto3
-import os
 import backend.common.common as common_handler
+import backend.common.participants as participants
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 def lambda_handler(event, context):
     try:
-        error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(event)
+        error_response, email = common_handler.get_authenticated_user_email(event)
 
         if error_response:
             return error_response
@@ -33,52 +32,22 @@ def lambda_handler(event, context):
 
         event_id = event_body['event_id']
 
-        # Initialize DynamoDB resource
-        dynamodb = boto3.resource('dynamodb')
-        events_table = dynamodb.Table(os.getenv('EVENTS_TABLE_NAME'))
-        users_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
-
-        # Fetch the event item
-        event_response = events_table.get_item(Key={'event_id': event_id})
-
-        if 'Item' not in event_response:
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json'
-                },
-                'body': json.dumps({
-                    'message': 'Event not found'
-                })
-            }
-
-        # Fetch the user item
-        user_response = users_table.get_item(Key={'email': email})
-
-        if 'Item' not in user_response:
+        # The membership item, the participants counter and the user check are one transaction,
+        # so joining twice (or retrying a join) never counts the user twice
+        try:
+            joined = participants.join_event(event_id, email)
+        except participants.NotFoundError as e:
             return {
                 'statusCode': 404,
                 'headers': {
                     'Content-Type': 'application/json'
                 },
                 'body': json.dumps({
-                    'message': 'User not found'
+                    'message': str(e)
                 })
             }
-
-        # Update the event item: increment 'participants' field by 1
-        try:
-            events_table.update_item(
-                Key={'event_id': event_id},
-                UpdateExpression='SET participants = if_not_exists(participants, :start) + :inc',
-                ExpressionAttributeValues={
-                    ':start': 0,
-                    ':inc': 1
-                },
-                ReturnValues='UPDATED_NEW'
-            )
         except Exception as e:
-            logger.error(f'Error updating event participants: {str(e)}')
+            logger.error(f'Error joining event: {str(e)}')
             return {
                 'statusCode': 500,
                 'headers': {
@@ -89,26 +58,16 @@ def lambda_handler(event, context):
                 })
             }
 
-        # Update the user item: append event_id to 'events' list field
-        try:
-            users_table.update_item(
-                Key={'email': email},
-                UpdateExpression='SET events = list_append(if_not_exists(events, :empty_list), :event_id_list)',
-                ExpressionAttributeValues={
-                    ':empty_list': [],
-                    ':event_id_list': [event_id]
-                },
-                ReturnValues='UPDATED_NEW'
-            )
-        except Exception as e:
-            logger.error(f'Error updating user events: {str(e)}')
+        if not joined:
+            logger.info(f'User {email} already joined event {event_id}.')
+
             return {
-                'statusCode': 500,
+                'statusCode': 200,
                 'headers': {
                     'Content-Type': 'application/json'
                 },
                 'body': json.dumps({
-                    'message': 'Failed to join event due to internal server error.'
+                    'message': 'Already joined the event.'
                 })
             }
 
@@ -1,8 +1,7 @@
 import json
 import logging
-import boto3
-import os
 import backend.common.common as common_handler
+import backend.common.participants as participants
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -10,7 +9,7 @@ logger.setLevel(logging.INFO)
 def lambda_handler(event, context):
     try:
         # Check if user is authenticated and fetch email
-        error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(event)
+        error_response, email = common_handler.get_authenticated_user_email(event)
         if error_response:
             return error_response
 
@@ -28,60 +27,25 @@ def lambda_handler(event, context):
 
         event_id = event_body['event_id']
 
-        # Initialize DynamoDB resource
-        dynamodb = boto3.resource('dynamodb')
-        events_table = dynamodb.Table(os.getenv('EVENTS_TABLE_NAME'))
-        users_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
-
-        # Fetch the event item
-        event_response = events_table.get_item(Key={'event_id': event_id})
-        if 'Item' not in event_response:
+        # Leaving again (or retrying a leave) finds no membership and changes nothing
+        try:
+            left = participants.leave_event(event_id, email)
+        except participants.NotFoundError as e:
             return {
                 'statusCode': 404,
                 'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({'message': 'Event not found'})
+                'body': json.dumps({'message': str(e)})
             }
 
-        # Fetch the user item
-        user_response = users_table.get_item(Key={'email': email})
-        if 'Item' not in user_response:
-            return {
-                'statusCode': 404,
-                'headers': {'Content-Type': 'application/json'},
-                'body': json.dumps({'message': 'User not found'})
-            }
+        if not left:
+            logger.info(f'User {email} is not registered for event {event_id}.')
 
-        # Check if user is registered for the event
-        user_events = user_response['Item'].get('events', [])
-        if event_id not in user_events:
             return {
-                'statusCode': 400,
+                'statusCode': 200,
                 'headers': {'Content-Type': 'application/json'},
                 'body': json.dumps({'message': 'User is not registered for the event.'})
             }
 
-        # Remove event_id from user's events list
-        user_events.remove(event_id)
-        users_table.update_item(
-            Key={'email': email},
-            UpdateExpression='SET events = :events',
-            ExpressionAttributeValues={':events': user_events},
-            ReturnValues='UPDATED_NEW'
-        )
-
-        # Decrement participants in the event, ensuring it doesn't go below zero
-        events_table.update_item(
-            Key={'event_id': event_id},
-            UpdateExpression='SET participants = if_not_exists(participants, :start) - :dec',
-            ExpressionAttributeValues={
-                ':start': 0,
-                ':dec': 1,
-                ':zero': 0
-            },
-            ConditionExpression='participants > :zero OR attribute_not_exists(participants)',
-            ReturnValues='UPDATED_NEW'
-        )
-
         logger.info(f'User {email} left event {event_id} successfully.')
 
         return {
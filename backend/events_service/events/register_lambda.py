@@ -1,164 +1,115 @@
 import json
 import logging
-import uuid
-import boto3
 import os
 import backend.common.common as common_handler
+import backend.common.clients as aws_clients
+import backend.common.event_schema as event_schema
+import backend.common.images as images
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 def lambda_handler(event, context):
     try:
-        error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(event)
+        error_response, email = common_handler.get_authenticated_user_email(event)
     
         if error_response:
             return error_response
         event = json.loads(event.get('body')) if 'body' in event else event
 
-        logger.info(f'REGISTER EVENT - Checking if every required attribute is found: {event}')
+        # The cover alone can be megabytes of base64, so only the attribute names are logged
+        logger.info(f'REGISTER EVENT - Checking if every required attribute is found: {list(event.keys())}')
 
-        # Define the required attributes and their types
-        required_attributes = {
-            'title': str,
-            'description': str,
-            'startingAt': str,
-            'endingAt': str,
-        }
-
-        # Define the structure of the giveaway object
-        giveaway_attributes = {
-            'prize': str,
-            'description': str,
-            'name': str
-        }
+        validation_error = event_schema.validate_event(event)
 
-        # Check for required attributes
-        for key, expected_type in required_attributes.items():
-            if key not in event:
-                return {
-                    'statusCode': 400,
-                    'headers': {
-                        'Content-Type': 'application/json'
-                    },
-                    'body': json.dumps({
-                        'message': f'Missing required attribute: {key}'
-                    })
-                }
-            if not isinstance(event[key], expected_type):
-                return {
-                    'statusCode': 400,
-                    'headers': {
-                        'Content-Type': 'application/json'
-                    },
-                    'body': json.dumps({
-                        'message': f'Attribute {key} must be of type {expected_type.__name__}'
-                    })
-                }
+        if validation_error:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json'
+                },
+                'body': json.dumps({
+                    'message': validation_error
+                })
+            }
 
-        # Check the structure of the giveaway object
-        for key, expected_type in giveaway_attributes.items():
-            if key not in event['giveaway']:
-                return {
-                    'statusCode': 400,
-                    'headers': {
-                        'Content-Type': 'application/json'
-                    },
-                    'body': json.dumps({
-                        'message': f'Missing required giveaway attribute: {key}'
-                    })
-                }
-            if not isinstance(event['giveaway'][key], expected_type):
+        # Reject oversized or non-image covers before anything is written
+        if event.get('event_image'):
+            try:
+                images.validate_base64_image(event.get('event_image'))
+            except images.ImageValidationError as e:
                 return {
                     'statusCode': 400,
                     'headers': {
                         'Content-Type': 'application/json'
                     },
                     'body': json.dumps({
-                        'message': f'Giveaway attribute {key} must be of type {expected_type.__name__}'
+                        'message': str(e)
                     })
                 }
-
-        # Check that at least one of genre, type, or theme is provided
-        if not (event.get('genre') or event.get('type') or event.get('theme')):
+        elif event.get('event_image_content_type', 'image/jpeg') not in images.IMAGE_UPLOAD_CONTENT_TYPES:
             return {
                 'statusCode': 400,
                 'headers': {
                     'Content-Type': 'application/json'
                 },
                 'body': json.dumps({
-                    'message': 'At least one of genre, type, or theme must be provided.'
+                    'message': 'Only JPEG, PNG, GIF and WebP images are supported.'
                 })
             }
 
-        # Generate a unique event ID
-        event_id = str(uuid.uuid4())
-        giveaway_id = str(uuid.uuid4())
-        logger.info(f'Generated event ID: {event_id}')
-
-        dynamodb = boto3.resource('dynamodb')
-        clubs_table = dynamodb.Table(os.getenv('CLUBS_TABLE_NAME'))
+        clubs_table = aws_clients.get_dynamodb_table(os.getenv('CLUBS_TABLE_NAME'))
 
+        # Only the coordinates are needed, the club's events and giveaways lists are appended to server-side
         club_info_response = clubs_table.get_item(
             Key={
                 'club_id': email
-            }
+            },
+            ProjectionExpression='latitude, longitude'
         )
-        club_info = club_info_response.get('Item', {})    
-        logger.info(f'REGISTER EVENT - Club info response: {club_info_response}')
+        club_info = club_info_response.get('Item', {})
         logger.info(f'REGISTER EVENT - Club info: {club_info}')
 
-        # Prepare only the required attributes for saving
-        item_to_save = {
-            'event_id': event_id,
-            'club_id': email,
-            'title': event['title'],
-            'description': event['description'],
-            'startingAt': event['startingAt'],
-            'endingAt': event['endingAt'],
-            'performers': event.get('performers', ""),
-            'longitude': club_info.get('longitude', "0"),
-            'latitude': club_info.get('latitude', "0")
-        }
-
-        if event.get('genre'):
-            item_to_save['genre'] = event['genre']
-        if event.get('type'):
-            item_to_save['type'] = event['type']
-        if event.get('theme'):
-            item_to_save['theme'] = event['theme']
+        item_to_save, giveaway_item = event_schema.build_event_items(event, email, club_info)
 
-        # Initialize a DynamoDB resource
-        dynamodb = boto3.resource('dynamodb')
-        events_table = dynamodb.Table(os.getenv('EVENTS_TABLE_NAME'))
-        giveaway_table = dynamodb.Table(os.getenv('GIVEAWAY_TABLE_NAME'))
+        event_id = item_to_save['event_id']
+        giveaway_id = giveaway_item['giveaway_id']
+        logger.info(f'Generated event ID: {event_id}')
 
-        # Save the item in the DynamoDB table
+        # The event, its giveaway and the club's lists are written in one round trip, all or nothing
         try:
-            events_table.put_item(Item=item_to_save)
-
-            giveaway_table.put_item(Item={
-                'giveaway_id': giveaway_id,
-                'event_id': event_id,
-                'prize': event['giveaway']['prize'],
-                'description': event['giveaway']['description'],
-                'name': event['giveaway']['name'],
-                'users': [],
-                'entries': []
-            })
-
-            giveaways = club_info.get('giveaways').append(giveaway_id) if club_info.get('giveaways') else [giveaway_id]
-            events = club_info.get('events').append(event_id) if club_info.get('events') else [event_id]
-
-            clubs_table.update_item(
-                Key={
-                    'club_id': email
-                },
-                UpdateExpression='SET giveaways = :giveaways, events = :events',
-                ExpressionAttributeValues={
-                    ':giveaways': giveaways,
-                    ':events': events
-                }
+            aws_clients.get_dynamodb_client().transact_write_items(
+                TransactItems=[
+                    {
+                        'Put': {
+                            'TableName': os.getenv('EVENTS_TABLE_NAME'),
+                            'Item': item_to_save,
+                            'ConditionExpression': 'attribute_not_exists(event_id)'
+                        }
+                    },
+                    {
+                        'Put': {
+                            'TableName': os.getenv('GIVEAWAY_TABLE_NAME'),
+                            'Item': giveaway_item,
+                            'ConditionExpression': 'attribute_not_exists(giveaway_id)'
+                        }
+                    },
+                    {
+                        'Update': {
+                            'TableName': os.getenv('CLUBS_TABLE_NAME'),
+                            'Key': {
+                                'club_id': email
+                            },
+                            'UpdateExpression': 'SET giveaways = list_append(if_not_exists(giveaways, :empty_list), :giveaway_ids), '
+                                                'events = list_append(if_not_exists(events, :empty_list), :event_ids)',
+                            'ExpressionAttributeValues': {
+                                ':empty_list': [],
+                                ':giveaway_ids': [giveaway_id],
+                                ':event_ids': [event_id]
+                            }
+                        }
+                    }
+                ]
             )
         except Exception as e:
             logger.error(f'Error saving event to DynamoDB: {str(e)}')
@@ -172,14 +123,21 @@ def lambda_handler(event, context):
                 })
             }
         
-        if event.get('event_image'):
-            s3_client = boto3.client('s3')
+        image_upload = None
 
-            s3_client.put_object(
-                Bucket=os.getenv('EVENT_PICTURES_BUCKET'),
-                Key=f"{event_id}.jpg",
-                Body=event.get('event_image'),
-                ContentType='image/jpeg'
+        if event.get('event_image'):
+            # Older dashboards still send the cover inline as a base64 data URL. Only the
+            # original is stored here, the upload notification creates the derivatives
+            event_image_file, content_type = images.decode_base64_image_to_file(event.get('event_image'))
+
+            with event_image_file:
+                images.upload_image(os.getenv('EVENT_PICTURES_BUCKET'), f"{event_id}.jpg", event_image_file, content_type)
+        else:
+            # The client uploads the cover straight to S3, so registration doesn't wait on it
+            image_upload = images.get_presigned_image_post(
+                os.getenv('EVENT_PICTURES_BUCKET'),
+                f"{event_id}.jpg",
+                event.get('event_image_content_type', 'image/jpeg')
             )
 
         logger.info(f'Event registered successfully: {item_to_save}')
@@ -191,7 +149,8 @@ def lambda_handler(event, context):
             },
             'body': json.dumps({
                 'message': 'Event registered successfully!',
-                'event_id': event_id
+                'event_id': event_id,
+                'image_upload': image_upload
             })
         }
     except Exception as e:
@@ -1,95 +1,182 @@
 import json
 import logging
-import boto3
 import os
-from boto3.dynamodb.conditions import Attr
-from math import radians, cos, sin, asin, sqrt
+import time
+from concurrent.futures import ThreadPoolExecutor
+from boto3.dynamodb.conditions import Attr, Key
+
+import backend.common.common as common_handler
+import backend.common.clients as aws_clients
+import backend.common.geo as geo
+from backend.common.scan import ParallelScan
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+SEARCH_RADIUS_KM = 20
+SEARCH_MAX_WORKERS = 8
+SEARCH_SCAN_SEGMENTS = int(os.getenv('SEARCH_SCAN_SEGMENTS', '4'))
+
+SEARCH_DEFAULT_LIMIT = int(os.getenv('SEARCH_DEFAULT_LIMIT', '50'))
+SEARCH_MAX_LIMIT = int(os.getenv('SEARCH_MAX_LIMIT', '200'))
+
+# Items DynamoDB evaluates per request, so the time budget is checked between small pages
+SEARCH_PAGE_SIZE = int(os.getenv('SEARCH_PAGE_SIZE', '500'))
+
+# A search stops early and hands back a cursor instead of running into the Lambda timeout
+SEARCH_TIME_BUDGET_MS = int(os.getenv('SEARCH_TIME_BUDGET_MS', '5000'))
+SEARCH_TIMEOUT_SAFETY_MS = 1000
+
+# Nearest mode starts with a small radius and doubles it until k events are found
+NEAREST_MAX_K = int(os.getenv('NEAREST_MAX_K', '50'))
+NEAREST_INITIAL_RADIUS_KM = float(os.getenv('NEAREST_INITIAL_RADIUS_KM', '5'))
+NEAREST_MAX_RADIUS_KM = float(os.getenv('NEAREST_MAX_RADIUS_KM', '200'))
+
+CURSOR_VERSION = 1
+
 def lambda_handler(event, context):
-    # Initialize DynamoDB resource
-    dynamodb = boto3.resource('dynamodb')
-    events_table = dynamodb.Table(os.getenv('EVENTS_TABLE_NAME'))
+    started_at = time.monotonic()
+
+    # Get DynamoDB tables
+    events_table = aws_clients.get_dynamodb_table(os.getenv('EVENTS_TABLE_NAME'))
 
     # Extract query string parameters
     query_params = event.get('queryStringParameters', {}) or {}
 
-    name = query_params.get('name')
-    theme = query_params.get('theme')
-    genre = query_params.get('genre')
-    event_type = query_params.get('type')
-    latitude = query_params.get('latitude')
-    longitude = query_params.get('longitude')
+    limit = query_params.get('limit', SEARCH_DEFAULT_LIMIT)
 
-    # Build the filter expression for DynamoDB scan
-    filter_expression = None
+    try:
+        limit = int(limit)
 
-    if theme:
-        filter_expression = Attr('theme').eq(theme)
-    if genre:
-        if filter_expression is None:
-            filter_expression = Attr('genre').eq(genre)
-        else:
-            filter_expression = filter_expression & Attr('genre').eq(genre)
-    if event_type:
-        if filter_expression is None:
-            filter_expression = Attr('type').eq(event_type)
-        else:
-            filter_expression = filter_expression & Attr('type').eq(event_type)
+        if limit < 1:
+            raise ValueError('limit must be positive')
+    except ValueError:
+        return {
+            'statusCode': 400,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': json.dumps({
+                'message': "Invalid limit."
+            })
+        }
+
+    limit = min(limit, SEARCH_MAX_LIMIT)
+
+    nearest = query_params.get('nearest')
+
+    if nearest is not None and not query_params.get('cursor'):
+        try:
+            nearest = int(nearest)
+
+            if not 1 <= nearest <= NEAREST_MAX_K:
+                raise ValueError('nearest out of range')
+
+            latitude = float(query_params['latitude'])
+            longitude = float(query_params['longitude'])
+        except (KeyError, TypeError, ValueError):
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json'
+                },
+                'body': json.dumps({
+                    'message': f"Nearest search needs latitude, longitude and nearest between 1 and {NEAREST_MAX_K}."
+                })
+            }
 
     try:
-        # Scan DynamoDB
-        scan_kwargs = {}
-        if filter_expression is not None:
-            scan_kwargs['FilterExpression'] = filter_expression
-
-        response = events_table.scan(**scan_kwargs)
-        events = response.get('Items', [])
-
-        # Convert latitude and longitude to float if provided
-        if latitude and longitude:
-            try:
-                latitude = float(latitude)
-                longitude = float(longitude)
-            except ValueError:
+        if isinstance(nearest, int):
+            filters = {
+                'name': query_params.get('name'),
+                'theme': query_params.get('theme'),
+                'genre': query_params.get('genre'),
+                'type': query_params.get('type'),
+                'latitude': latitude,
+                'longitude': longitude
+            }
+
+            deadline = started_at + get_time_budget_ms(context) / 1000
+
+            events, radius_km = search_nearest(events_table, filters, nearest, deadline)
+
+            logger.info(f'SEARCH EVENTS - Returning {len(events)} nearest events within {radius_km} km')
+
+            return {
+                'statusCode': 200,
+                'headers': {
+                    'Content-Type': 'application/json'
+                },
+                'body': json.dumps({
+                    'events': events,
+                    'radius_km': radius_km,
+                    'next_cursor': None,
+                    'message': 'Search completed successfully.'
+                }, default=str)
+            }
+
+        if query_params.get('cursor'):
+            # Filters come from the cursor so every page of a search uses the same ones
+            cursor_state = common_handler.decode_cursor(query_params['cursor'])
+
+            if not cursor_state or cursor_state.get('v') != CURSOR_VERSION:
                 return {
                     'statusCode': 400,
                     'headers': {
                         'Content-Type': 'application/json'
                     },
                     'body': json.dumps({
-                        'message': "Invalid latitude or longitude format."
+                        'message': "Invalid cursor."
                     })
                 }
 
-        # Apply additional filters manually
-        filtered_events = []
-        for event_item in events:
-            if name and name.lower() not in event_item.get('title', '').lower():
-                continue
-
-            # If longitude and latitude are provided, filter events within 20 km radius
-            if latitude and longitude:
-                event_latitude = event_item.get('latitude')
-                event_longitude = event_item.get('longitude')
+            filters = cursor_state['filters']
+            pending = cursor_state['pending']
+        else:
+            filters = {
+                'name': query_params.get('name'),
+                'theme': query_params.get('theme'),
+                'genre': query_params.get('genre'),
+                'type': query_params.get('type'),
+                'latitude': None,
+                'longitude': None
+            }
 
-                if event_latitude is None or event_longitude is None:
-                    continue
+            latitude = query_params.get('latitude')
+            longitude = query_params.get('longitude')
 
+            # Convert latitude and longitude to float if provided
+            if latitude and longitude:
                 try:
-                    event_latitude = float(event_latitude)
-                    event_longitude = float(event_longitude)
+                    filters['latitude'] = float(latitude)
+                    filters['longitude'] = float(longitude)
                 except ValueError:
-                    continue
+                    return {
+                        'statusCode': 400,
+                        'headers': {
+                            'Content-Type': 'application/json'
+                        },
+                        'body': json.dumps({
+                            'message': "Invalid latitude or longitude format."
+                        })
+                    }
+
+            pending = initial_sources(filters)
 
-                # Calculate distance between two points using Haversine formula
-                distance = haversine(longitude, latitude, event_longitude, event_latitude)
-                if distance > 20:
-                    continue
+        deadline = started_at + get_time_budget_ms(context) / 1000
 
-            filtered_events.append(event_item)
+        events, pending = search_events(events_table, filters, pending, limit, deadline)
+
+        next_cursor = None
+
+        if pending:
+            next_cursor = common_handler.encode_cursor({
+                'v': CURSOR_VERSION,
+                'filters': filters,
+                'pending': pending
+            })
+
+        logger.info(f'SEARCH EVENTS - Returning {len(events)} events, more pending: {bool(pending)}')
 
         return {
             'statusCode': 200,
@@ -97,7 +184,8 @@ def lambda_handler(event, context):
                 'Content-Type': 'application/json'
             },
             'body': json.dumps({
-                'events': filtered_events,
+                'events': events,
+                'next_cursor': next_cursor,
                 'message': 'Search completed successfully.'
             }, default=str)
         }
@@ -114,20 +202,256 @@ def lambda_handler(event, context):
             })
         }
 
-def haversine(lon1, lat1, lon2, lat2):
+def get_time_budget_ms(context):
+    budget_ms = SEARCH_TIME_BUDGET_MS
+
+    if hasattr(context, 'get_remaining_time_in_millis'):
+        budget_ms = min(budget_ms, context.get_remaining_time_in_millis() - SEARCH_TIMEOUT_SAFETY_MS)
+
+    return max(budget_ms, 0)
+
+def initial_sources(filters):
     """
-    Calculate the great circle distance between two points 
-    on the earth (specified in decimal degrees).
-    Returns distance in kilometers.
+    Sources a fresh search reads from: the geohash cells around the user,
+    or the segments of a parallel table scan when no location is given.
     """
-    # Convert decimal degrees to radians 
-    lon1_rad, lat1_rad, lon2_rad, lat2_rad = map(radians, [lon1, lat1, lon2, lat2])
+    if filters['latitude'] is None:
+        return [
+            {'source': None, 'segment': segment, 'total_segments': SEARCH_SCAN_SEGMENTS, 'start_key': None}
+            for segment in range(SEARCH_SCAN_SEGMENTS)
+        ]
+
+    # Only read the geohash cells around the user instead of the whole table
+    cells = geo.geohash_cells_covering_radius(filters['latitude'], filters['longitude'], SEARCH_RADIUS_KM)
+
+    logger.info(f'SEARCH EVENTS - Querying {len(cells)} geohash cells: {cells}')
+
+    return [{'source': cell, 'start_key': None} for cell in cells]
+
+def search_events(events_table, filters, pending, limit, deadline):
+    """
+    Reads the pending sources in order until limit events match or the deadline passes.
+    Returns the matching events and the sources still pending, each with the key to resume from.
+    """
+    if not pending:
+        return [], []
+
+    filter_expression = build_filter_expression(filters)
+
+    if pending[0]['source'] is None:
+        return search_scan_segments(events_table, filters, pending, limit, deadline, filter_expression)
+
+    # First pages of all pending sources are read in parallel, later pages on demand
+    with ThreadPoolExecutor(max_workers=min(len(pending), SEARCH_MAX_WORKERS)) as executor:
+        responses = list(executor.map(
+            lambda entry: read_page(events_table, entry['source'], entry['start_key'], filter_expression),
+            pending
+        ))
+
+    events = []
+
+    for index, (entry, response) in enumerate(zip(pending, responses)):
+        later_sources = pending[index + 1:]
+
+        while True:
+            items = response.get('Items', [])
+
+            for position, item in matching_positions(items, filters):
+                events.append(item)
+
+                if len(events) >= limit:
+                    if position == len(items) - 1 and 'LastEvaluatedKey' not in response:
+                        return events, later_sources
+
+                    return events, [{'source': entry['source'], 'start_key': item_key(item)}] + later_sources
+
+            if 'LastEvaluatedKey' not in response:
+                break
+
+            if time.monotonic() >= deadline:
+                logger.info('SEARCH EVENTS - Time budget exhausted, returning a cursor.')
+
+                return events, [{'source': entry['source'], 'start_key': response['LastEvaluatedKey']}] + later_sources
+
+            response = read_page(events_table, entry['source'], response['LastEvaluatedKey'], filter_expression)
+
+    return events, []
+
+def search_nearest(events_table, filters, k, deadline):
+    """
+    Finds the k events closest to the user, closest first.
+    The radius doubles until the k-th closest event lies inside it, the maximum radius
+    is reached or the time budget runs out. Every geohash cell is read only once.
+    Returns the events and the radius that was searched.
+    """
+    filter_expression = build_filter_expression(filters)
+    latitude, longitude = filters['latitude'], filters['longitude']
+
+    heap = []
+    read_cells = []
+    radius_km = min(NEAREST_INITIAL_RADIUS_KM, NEAREST_MAX_RADIUS_KM)
+
+    while True:
+        cells = [
+            cell
+            for cell in geo.geohash_cells_covering_radius(latitude, longitude, radius_km)
+            if not any(cell.startswith(read_cell) for read_cell in read_cells)
+        ]
+
+        logger.info(f'SEARCH EVENTS - Nearest search at {radius_km} km reads {len(cells)} new geohash cells.')
+
+        if cells:
+            def read_cell_nearest(cell):
+                # Every cell keeps its own top k, so memory stays bounded by k per worker
+                cell_heap = []
+                start_key = None
+
+                while True:
+                    response = read_page(events_table, cell, start_key, filter_expression)
+
+                    # A coarser cell overlaps finer cells read at a smaller radius
+                    items = [
+                        item for item in response.get('Items', [])
+                        if matches_name(item, filters)
+                        and not any(item.get('geohash', '').startswith(read_cell) for read_cell in read_cells)
+                    ]
+
+                    geo.push_nearest(cell_heap, k, latitude, longitude, items, NEAREST_MAX_RADIUS_KM)
+
+                    if 'LastEvaluatedKey' not in response:
+                        return cell_heap
+
+                    start_key = response['LastEvaluatedKey']
+
+            with ThreadPoolExecutor(max_workers=min(len(cells), SEARCH_MAX_WORKERS)) as executor:
+                for cell_heap in executor.map(read_cell_nearest, cells):
+                    geo.merge_nearest(heap, k, cell_heap)
+
+            read_cells.extend(cells)
+
+        # Everything within radius_km has been read, so a full heap inside it is the final answer
+        if len(heap) == k and geo.farthest_in_heap(heap) <= radius_km:
+            break
+
+        if radius_km >= NEAREST_MAX_RADIUS_KM or time.monotonic() >= deadline:
+            break
+
+        radius_km = min(radius_km * 2, NEAREST_MAX_RADIUS_KM)
+
+    events = []
+
+    # Only events inside the searched radius are certain to be among the nearest
+    for event_item, distance in geo.sorted_nearest(heap):
+        if distance > radius_km:
+            break
+
+        event_item['distance_km'] = round(distance, 3)
+        events.append(event_item)
+
+    return events, radius_km
+
+def search_scan_segments(events_table, filters, pending, limit, deadline, filter_expression=None):
+    total_segments = pending[0]['total_segments']
+
+    scan_kwargs = {
+        'Limit': SEARCH_PAGE_SIZE
+    }
+    if filter_expression is not None:
+        scan_kwargs['FilterExpression'] = filter_expression
+
+    events = []
+
+    with ParallelScan(
+        events_table,
+        total_segments=total_segments,
+        segments={entry['segment']: entry['start_key'] for entry in pending},
+        deadline=deadline,
+        key_attributes=['event_id'],
+        **scan_kwargs
+    ) as scan:
+        for event_item in scan:
+            if not matches_name(event_item, filters):
+                continue
+
+            events.append(event_item)
+
+            if len(events) >= limit:
+                break
+
+        remaining_segments = scan.remaining_segments()
+
+    return events, [
+        {'source': None, 'segment': segment, 'total_segments': total_segments, 'start_key': start_key}
+        for segment, start_key in sorted(remaining_segments.items())
+    ]
+
+def build_filter_expression(filters):
+    # Build the filter expression for DynamoDB
+    filter_expression = None
+
+    for attribute in ('theme', 'genre', 'type'):
+        if filters.get(attribute):
+            condition = Attr(attribute).eq(filters[attribute])
+            filter_expression = condition if filter_expression is None else filter_expression & condition
+
+    return filter_expression
+
+def matches_name(event_item, filters):
+    name = filters.get('name')
+
+    return not name or name.lower() in event_item.get('title', '').lower()
+
+def matching_positions(items, filters):
+    """
+    (position, item) pairs of a GSI page that pass the name filter and lie within the search radius.
+    Distances are computed for the whole page at once and stored on the item as distance_km.
+    """
+    named_positions = [position for position, item in enumerate(items) if matches_name(item, filters)]
+
+    if not named_positions:
+        return []
+
+    latitudes, longitudes = geo.coordinates_to_arrays([items[position] for position in named_positions])
+
+    # Filter events within 20 km radius
+    indices, distances = geo.within_radius(filters['latitude'], filters['longitude'], latitudes, longitudes, SEARCH_RADIUS_KM)
+
+    matches = []
+
+    for index, distance in zip(indices, distances):
+        position = named_positions[index]
+        items[position]['distance_km'] = round(float(distance), 3)
+        matches.append((position, items[position]))
+
+    return matches
+
+def read_page(events_table, source, start_key, filter_expression=None):
+    """
+    Reads one page of a geohash cell from the GSI.
+    """
+    read_kwargs = {
+        'Limit': SEARCH_PAGE_SIZE
+    }
+    if filter_expression is not None:
+        read_kwargs['FilterExpression'] = filter_expression
+    if start_key:
+        read_kwargs['ExclusiveStartKey'] = start_key
+
+    key_condition = Key('geohash_3').eq(source[:geo.GEOHASH_INDEX_PRECISION])
+
+    if len(source) > geo.GEOHASH_INDEX_PRECISION:
+        key_condition = key_condition & Key('geohash').begins_with(source)
 
-    # Haversine formula 
-    dlon = lon2_rad - lon1_rad 
-    dlat = lat2_rad - lat1_rad 
-    a = sin(dlat/2)**2 + cos(lat1_rad) * cos(lat2_rad) * sin(dlon/2)**2
-    c = 2 * asin(sqrt(a)) 
+    return events_table.query(
+        IndexName=geo.GEOHASH_INDEX_NAME,
+        KeyConditionExpression=key_condition,
+        **read_kwargs
+    )
 
-    r = 6371  # Radius of earth in kilometers
-    return c * r
\ No newline at end of file
+def item_key(event_item):
+    # A GSI query resumes from the index key plus the table key
+    return {
+        'event_id': event_item['event_id'],
+        'geohash_3': event_item['geohash_3'],
+        'geohash': event_item['geohash']
+    }
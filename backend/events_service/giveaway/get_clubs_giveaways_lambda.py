@@ -1,31 +1,32 @@
 import json
 import logging
-import boto3
 import os
 
 import backend.common.common as common_handler
+import backend.common.clients as aws_clients
+from backend.common.batch import batch_get_items
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Counters join_giveaway keeps up to date, so the list never reads a giveaway's entries
+GIVEAWAY_SUMMARY_ATTRIBUTES = ['event_id', 'name', 'description', 'prize', 'entrants', 'total_weight', 'last_entry_at', 'draw']
+
 def lambda_handler(event, context):
     try:
-        error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(event)
+        error_response, email = common_handler.get_authenticated_user_email(event)
     
         if error_response:
             return error_response
 
-        # Initialize a DynamoDB resource
-        dynamodb = boto3.resource('dynamodb')
-        clubs_table = dynamodb.Table(os.getenv('CLUBS_TABLE_NAME'))
-        giveaways_table = dynamodb.Table(os.getenv('GIVEAWAY_TABLE_NAME'))
+        clubs_table = aws_clients.get_dynamodb_table(os.getenv('CLUBS_TABLE_NAME'))
 
-        # get item from the DynamoDB table
         try:
             club_item = clubs_table.get_item(
                 Key={
                     'club_id': email
-                }
+                },
+                ProjectionExpression='giveaways'
             )
 
             if 'Item' not in club_item:
@@ -38,12 +39,10 @@ def lambda_handler(event, context):
                         'message': 'User not found'
                     })
                 }
-            
-            logger.info("We have club item")
-            
+
             giveaway_ids = club_item['Item'].get('giveaways', [])
 
-            logger.info(f"Giveaway ids: {giveaway_ids}")
+            logger.info(f'CLUBS GIVEAWAYS - {len(giveaway_ids)} giveaways for {email}')
 
             if not giveaway_ids:
                 return {
@@ -56,26 +55,30 @@ def lambda_handler(event, context):
                     })
                 }
 
-            events = []
-
-            for id in giveaway_ids:
-                giveaway_item = giveaways_table.get_item(
-                    Key={
-                        'giveaway_id': id
-                    }
-                )
+            # One BatchGetItem per 100 giveaways, with only the summary attributes. Entrants are
+            # paged separately from /giveaway/entrants
+            giveaway_items = batch_get_items(
+                os.getenv('GIVEAWAY_TABLE_NAME'),
+                [{'giveaway_id': giveaway_id} for giveaway_id in giveaway_ids],
+                attributes=GIVEAWAY_SUMMARY_ATTRIBUTES
+            )
 
-                if 'Item' in giveaway_item:
-                    events.append({
-                        'giveaway_id': id,
-                        'title': giveaway_item['Item'].get('title'),
-                        'description': giveaway_item['Item'].get('description'),
-                        'prize': giveaway_item['Item'].get('prize'),
-                        'entries': giveaway_item['Item'].get('entries'),
-                        'users': giveaway_item['Item'].get('users')
-                    })
+            events = [
+                {
+                    'giveaway_id': giveaway_item['giveaway_id'],
+                    'event_id': giveaway_item.get('event_id'),
+                    'name': giveaway_item.get('name'),
+                    'description': giveaway_item.get('description'),
+                    'prize': giveaway_item.get('prize'),
+                    'total_entries': int(giveaway_item.get('total_weight', 0)),
+                    'unique_users': int(giveaway_item.get('entrants', 0)),
+                    'last_entry_at': giveaway_item.get('last_entry_at'),
+                    'winners_drawn': 'draw' in giveaway_item
+                }
+                for giveaway_item in giveaway_items if giveaway_item
+            ]
         except Exception as e:
-            logger.error(f'Error saving event to DynamoDB: {str(e)}')
+            logger.error(f'Error reading giveaways from DynamoDB: {str(e)}')
 
             return {
                 'statusCode': 500,
@@ -83,7 +86,7 @@ def lambda_handler(event, context):
                     'Content-Type': 'application/json'
                 },
                 'body': json.dumps({
-                    'message': 'Failed to join giveaway. Please try again or contact support.'
+                    'message': 'Failed to get giveaways. Please try again or contact support.'
                 })
             }
 
@@ -0,0 +1,102 @@
+import json
+import logging
+import os
+
+import backend.common.common as common_handler
+import backend.common.giveaways as giveaways
+import backend.common.pagination as pagination
+from backend.common.batch import batch_get_items
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def lambda_handler(event, context):
+    try:
+        error_response, email = common_handler.get_authenticated_user_email(event)
+
+        if error_response:
+            return error_response
+
+        query_params = event.get('queryStringParameters') or {}
+        giveaway_id = query_params.get('giveaway_id')
+
+        if not giveaway_id:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json'},
+                'body': json.dumps({
+                    'message': 'Missing required attribute: giveaway_id'
+                })
+            }
+
+        try:
+            limit = pagination.parse_page_size(query_params.get('limit'), giveaways.GIVEAWAY_ENTRANTS_DEFAULT_PAGE_SIZE, giveaways.GIVEAWAY_ENTRANTS_MAX_PAGE_SIZE)
+        except ValueError:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json'},
+                'body': json.dumps({'message': 'Invalid limit.'})
+            }
+
+        # Entrants are only shown to the club that holds the giveaway
+        try:
+            club_id = giveaways.get_giveaway_club_id(giveaway_id)
+        except giveaways.NotFoundError as e:
+            return {
+                'statusCode': 404,
+                'headers': {'Content-Type': 'application/json'},
+                'body': json.dumps({'message': str(e)})
+            }
+
+        if club_id != email:
+            return {
+                'statusCode': 403,
+                'headers': {'Content-Type': 'application/json'},
+                'body': json.dumps({'message': 'Only the club holding the giveaway can see its entrants.'})
+            }
+
+        try:
+            entries, next_cursor = giveaways.get_entrants_page(giveaway_id, limit, query_params.get('cursor'))
+        except ValueError:
+            return {
+                'statusCode': 400,
+                'headers': {'Content-Type': 'application/json'},
+                'body': json.dumps({'message': 'Invalid cursor.'})
+            }
+
+        # The page's profiles in one BatchGetItem, only the names are shown
+        profiles = batch_get_items(
+            os.getenv('USERS_TABLE_NAME'),
+            [{'email': entry['user_email']} for entry in entries],
+            attributes=['first_name', 'last_name']
+        )
+
+        entrants = [
+            {
+                'email': entry['user_email'],
+                'first_name': (profile or {}).get('first_name'),
+                'last_name': (profile or {}).get('last_name'),
+                'entries': int(entry['weight']),
+                'entered_at': entry.get('entered_at')
+            }
+            for entry, profile in zip(entries, profiles)
+        ]
+
+        logger.info(f'GIVEAWAY ENTRANTS - Returning {len(entrants)} entrants of giveaway {giveaway_id}')
+
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json'},
+            'body': json.dumps({
+                'entrants': entrants,
+                'next_cursor': next_cursor
+            })
+        }
+
+    except Exception as e:
+        logger.error(f'An error occurred: {str(e)}')
+        return {
+            'statusCode': 500,
+            'headers': {'Content-Type': 'application/json'},
+            'body': json.dumps({'message': f"An error occurred: {str(e)}"})
+        }
@@ -1,15 +1,22 @@
 import json
 import logging
-import random
-import boto3
 import os
 
+import backend.common.common as common_handler
+import backend.common.giveaways as giveaways
+from backend.common.batch import batch_get_items
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 def lambda_handler(event, context):
     try:
-        event = event.get('queryStringParameters', {})
+        error_response, email = common_handler.get_authenticated_user_email(event)
+
+        if error_response:
+            return error_response
+
+        event = event.get('queryStringParameters') or {}
 
         giveaway_id = event.get('giveaway_id')
 
@@ -24,23 +31,52 @@ def lambda_handler(event, context):
                 })
             }
 
-        # Initialize a DynamoDB resource
-        dynamodb = boto3.resource('dynamodb')
-        giveaway_table = dynamodb.Table(os.getenv('GIVEAWAY_TABLE_NAME'))
-        users_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
+        # The draw is saved for good, so only the club holding the giveaway may make it and
+        # choose its seed and winner count
+        try:
+            club_id = giveaways.get_giveaway_club_id(giveaway_id)
+        except giveaways.NotFoundError as e:
+            return {
+                'statusCode': 404,
+                'headers': {
+                    'Content-Type': 'application/json'
+                },
+                'body': json.dumps({
+                    'message': str(e)
+                })
+            }
+
+        if club_id != email:
+            return {
+                'statusCode': 403,
+                'headers': {
+                    'Content-Type': 'application/json'
+                },
+                'body': json.dumps({
+                    'message': 'Only the club holding the giveaway can draw its winners.'
+                })
+            }
 
-        # get item from the DynamoDB table
         try:
-            giveaway_item = giveaway_table.get_item(
-                Key={
-                    'giveaway_id': giveaway_id
-                }
-            )
+            winner_count = giveaways.parse_winner_count(event.get('winners'))
+        except ValueError:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json'
+                },
+                'body': json.dumps({
+                    'message': f'winners must be a whole number between 1 and {giveaways.GIVEAWAY_MAX_WINNERS}.'
+                })
+            }
 
-            users = giveaway_item.get('users', [])
-            entries = giveaway_item.get('entries', [])
+        # One winner is streamed through a weighted reservoir, more are drawn without replacement
+        # from a Fenwick tree. The winners are saved on the giveaway, so later calls return the
+        # same ones instead of drawing again
+        try:
+            winners, draw = giveaways.draw_winners(giveaway_id, winner_count, event.get('seed'))
 
-            if len(users) == 0 or len(entries) == 0:
+            if not winners:
                 return {
                     'statusCode': 400,
                     'headers': {
@@ -51,36 +87,71 @@ def lambda_handler(event, context):
                     })
                 }
 
-            winner = random.choices(users, weights=entries, k=1)[0]
-
-            user = users_table.get_item(
-                Key={
-                    'email': winner
+            if 'winners' in event and int(draw['winners']) != winner_count:
+                return {
+                    'statusCode': 409,
+                    'headers': {
+                        'Content-Type': 'application/json'
+                    },
+                    'body': json.dumps({
+                        'message': f'This giveaway already drew {int(draw["winners"])} winner(s).'
+                    })
                 }
+
+            # Every winner's profile in one BatchGetItem per 100 winners
+            profiles = batch_get_items(
+                os.getenv('USERS_TABLE_NAME'),
+                [{'email': email} for email in winners],
+                attributes=['first_name', 'last_name']
             )
+        except giveaways.NotFoundError as e:
+            return {
+                'statusCode': 404,
+                'headers': {
+                    'Content-Type': 'application/json'
+                },
+                'body': json.dumps({
+                    'message': str(e)
+                })
+            }
         except Exception as e:
-            logger.error(f'Error saving event to DynamoDB: {str(e)}')
+            logger.error(f'Error drawing giveaway winner: {str(e)}')
             return {
                 'statusCode': 500,
                 'headers': {
                     'Content-Type': 'application/json'
                 },
                 'body': json.dumps({
-                    'message': 'Failed to register event due to internal server error.'
+                    'message': 'Failed to draw the winner due to internal server error.'
                 })
             }
 
+        logger.info(f'GIVEAWAY WINNER - {len(winners)} winner(s) of giveaway {giveaway_id} (seed {draw["seed"]}).')
+
+        winners = [
+            {
+                'email': email,
+                'first_name': (profile or {}).get('first_name'),
+                'last_name': (profile or {}).get('last_name')
+            }
+            for email, profile in zip(winners, profiles)
+        ]
+
         return {
             'statusCode': 200,
             'headers': {
                 'Content-Type': 'application/json'
             },
             'body': json.dumps({
-                'message': 'Event registered successfully!',
-                'winner': {
-                    'email': winner,
-                    'first_name': user.get('first_name'),
-                    'last_name': user.get('last_name')
+                'message': 'Winner drawn successfully!' if len(winners) == 1 else 'Winners drawn successfully!',
+                'winner': winners[0],
+                'winners': winners,
+                'draw': {
+                    'seed': draw['seed'],
+                    'winners': int(draw['winners']),
+                    'entries': int(draw['entries']),
+                    'total_weight': int(draw['total_weight']),
+                    'drawn_at': draw['drawn_at']
                 }
             })
         }
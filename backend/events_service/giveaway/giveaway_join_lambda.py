@@ -1,25 +1,22 @@
 import json
 import logging
-import random
-import boto3
-import os
 
 import backend.common.common as common_handler
+import backend.common.giveaways as giveaways
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 def lambda_handler(event, context):
     try:
-        error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(event)
+        error_response, email = common_handler.get_authenticated_user_email(event)
     
         if error_response:
             return error_response
     
-        event = event.get('queryStringParameters', {})
+        event = event.get('queryStringParameters') or {}
 
         giveaway_id = event.get('giveaway_id')
-        entrance_number = event.get('entrance_number')
 
         if not giveaway_id:
             return {
@@ -32,36 +29,45 @@ def lambda_handler(event, context):
                 })
             }
 
-        # Initialize a DynamoDB resource
-        dynamodb = boto3.resource('dynamodb')
-        giveaway_table = dynamodb.Table(os.getenv('GIVEAWAY_TABLE_NAME'))
-
-        # get item from the DynamoDB table
         try:
-            giveaway_item = giveaway_table.get_item(
-                Key={
-                    'giveaway_id': giveaway_id
-                }
-            )
-
-            users = giveaway_item.get('users', [])
-            entries = giveaway_item.get('entries', [])
-
-            users.append(email)
-            entries.append(entrance_number)
+            weight = giveaways.parse_entry_weight(event.get('entrance_number'))
+        except ValueError:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json'
+                },
+                'body': json.dumps({
+                    'message': f'entrance_number must be a whole number between 1 and {giveaways.GIVEAWAY_MAX_ENTRY_WEIGHT}.'
+                })
+            }
 
-            giveaway_table.update_item(
-                Key={
-                    'giveaway_id': giveaway_id
+        # The entry item and the giveaway's totals are one transaction, so concurrent joins
+        # don't overwrite each other and joining twice never enters the user twice
+        try:
+            joined = giveaways.join_giveaway(giveaway_id, email, weight)
+        except giveaways.NotFoundError as e:
+            return {
+                'statusCode': 404,
+                'headers': {
+                    'Content-Type': 'application/json'
+                },
+                'body': json.dumps({
+                    'message': str(e)
+                })
+            }
+        except giveaways.AlreadyDrawnError:
+            return {
+                'statusCode': 409,
+                'headers': {
+                    'Content-Type': 'application/json'
                 },
-                UpdateExpression='SET users = :users, entries = :entries',
-                ExpressionAttributeValues={
-                    ':users': users,
-                    ':entries': entries
-                }
-            )
+                'body': json.dumps({
+                    'message': 'Giveaway already drawn.'
+                })
+            }
         except Exception as e:
-            logger.error(f'Error saving event to DynamoDB: {str(e)}')
+            logger.error(f'Error joining giveaway: {str(e)}')
 
             return {
                 'statusCode': 500,
@@ -73,6 +79,19 @@ def lambda_handler(event, context):
                 })
             }
 
+        if not joined:
+            logger.info(f'User {email} already joined giveaway {giveaway_id}.')
+
+            return {
+                'statusCode': 200,
+                'headers': {
+                    'Content-Type': 'application/json'
+                },
+                'body': json.dumps({
+                    'message': 'Already joined the giveaway.'
+                })
+            }
+
         return {
             'statusCode': 200,
             'headers': {
@@ -36,6 +36,6 @@ fi
 touch "$ARTIFACTS_DIR/backend/__init__.py"
 touch "$ARTIFACTS_DIR/backend/common/__init__.py"
 
-# Copy common.py to the common directory
-cp "$COMMON_CODE_PATH/common.py" "$ARTIFACTS_DIR/backend/common/"
+# Copy common modules to the common directory
+cp "$COMMON_CODE_PATH"/*.py "$ARTIFACTS_DIR/backend/common/"
 python3 -m pip install -r "$COMMON_CODE_PATH/requirements.txt" --target "$ARTIFACTS_DIR"
@@ -0,0 +1,56 @@
+"""
+Adds geohash attributes to events created before search moved to the
+geohash GSI. Events without them never show up in location searches.
+
+Run from the repository root:
+    EVENTS_TABLE_NAME=<table> python -m backend.scripts.migrations.backfill_event_geohash
+"""
+import os
+import logging
+
+import backend.common.clients as aws_clients
+import backend.common.geo as geo
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def main():
+    events_table = aws_clients.get_dynamodb_table(os.environ['EVENTS_TABLE_NAME'])
+
+    scan_kwargs = {
+        'ProjectionExpression': 'event_id, latitude, longitude, geohash'
+    }
+    updated = 0
+
+    while True:
+        response = events_table.scan(**scan_kwargs)
+
+        for item in response.get('Items', []):
+            if 'geohash' in item:
+                continue
+
+            try:
+                attributes = geo.geohash_attributes(item.get('latitude', '0'), item.get('longitude', '0'))
+            except (TypeError, ValueError):
+                logger.warning(f'BACKFILL GEOHASH - Skipping event {item["event_id"]} with invalid coordinates.')
+                continue
+
+            events_table.update_item(
+                Key={'event_id': item['event_id']},
+                UpdateExpression='SET geohash = :geohash, geohash_3 = :geohash_3',
+                ExpressionAttributeValues={
+                    ':geohash': attributes['geohash'],
+                    ':geohash_3': attributes['geohash_3']
+                }
+            )
+            updated += 1
+
+        if 'LastEvaluatedKey' not in response:
+            break
+
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    print(f'Backfilled geohash on {updated} events.')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Adds created_at to gallery images saved before galleries were read from the
+event_id-created_at GSI. Images without it are left out of the index and
+never show up in a gallery. They get the time of the backfill.
+
+Run from the repository root:
+    EVENT_IMAGES_TABLE_NAME=<table> python -m backend.scripts.migrations.backfill_event_image_created_at
+"""
+import os
+import logging
+from datetime import datetime, timezone
+
+import backend.common.clients as aws_clients
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def main():
+    event_images_table = aws_clients.get_dynamodb_table(os.environ['EVENT_IMAGES_TABLE_NAME'])
+
+    scan_kwargs = {
+        'ProjectionExpression': 'id, created_at'
+    }
+    backfilled_at = datetime.now(timezone.utc).isoformat()
+    updated = 0
+
+    while True:
+        response = event_images_table.scan(**scan_kwargs)
+
+        for item in response.get('Items', []):
+            if 'created_at' in item:
+                continue
+
+            event_images_table.update_item(
+                Key={'id': item['id']},
+                UpdateExpression='SET created_at = if_not_exists(created_at, :created_at)',
+                ExpressionAttributeValues={
+                    ':created_at': backfilled_at
+                }
+            )
+            updated += 1
+
+        if 'LastEvaluatedKey' not in response:
+            break
+
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    print(f'Backfilled created_at on {updated} gallery images.')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Copies the events users joined before memberships moved to the event_participants
+table. They were kept as a list on the user item, in the order they were joined,
+so every membership gets the time of the backfill plus its position in that
+list, and the user's events keep their order. The events' participants counters
+already include these users and are left alone. The lists stay on the user items.
+
+Run from the repository root:
+    USERS_TABLE_NAME=<table> EVENT_PARTICIPANTS_TABLE_NAME=<table> python -m backend.scripts.migrations.backfill_event_participants
+"""
+import os
+import logging
+from datetime import datetime, timedelta, timezone
+
+import backend.common.clients as aws_clients
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def main():
+    users_table = aws_clients.get_dynamodb_table(os.environ['USERS_TABLE_NAME'])
+    participants_table = aws_clients.get_dynamodb_table(os.environ['EVENT_PARTICIPANTS_TABLE_NAME'])
+
+    scan_kwargs = {
+        'ProjectionExpression': 'email, events'
+    }
+    backfilled_at = datetime.now(timezone.utc)
+    copied = 0
+
+    # overwrite_by_pkeys drops repeated joins of the same event within a batch
+    with participants_table.batch_writer(overwrite_by_pkeys=['event_id', 'user_email']) as batch:
+        while True:
+            response = users_table.scan(**scan_kwargs)
+
+            for item in response.get('Items', []):
+                for position, event_id in enumerate(item.get('events') or []):
+                    batch.put_item(Item={
+                        'event_id': event_id,
+                        'user_email': item['email'],
+                        'joined_at': (backfilled_at + timedelta(microseconds=position)).isoformat()
+                    })
+                    copied += 1
+
+            if 'LastEvaluatedKey' not in response:
+                break
+
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    print(f'Copied {copied} event memberships.')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Copies the entries giveaways kept as parallel users and entries lists on the giveaway
+item into the giveaway_entries table. A user who appears several times gets one entry
+weighing the sum of their entries, which is how often random.choices picked them. The
+giveaway's entrants and total_weight are then set from what was copied. The lists stay
+on the giveaway items.
+
+Stop the join function (or deploy the new one) first, since a join that lands between
+the copy and the totals update wouldn't be counted.
+
+Run from the repository root:
+    GIVEAWAY_TABLE_NAME=<table> GIVEAWAY_ENTRIES_TABLE_NAME=<table> python -m backend.scripts.migrations.backfill_giveaway_entries
+"""
+import os
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+
+import backend.common.clients as aws_clients
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def main():
+    giveaways_table = aws_clients.get_dynamodb_table(os.environ['GIVEAWAY_TABLE_NAME'])
+    entries_table = aws_clients.get_dynamodb_table(os.environ['GIVEAWAY_ENTRIES_TABLE_NAME'])
+
+    scan_kwargs = {
+        'ProjectionExpression': 'giveaway_id, #users, entries',
+        'ExpressionAttributeNames': {'#users': 'users'}
+    }
+    backfilled_at = datetime.now(timezone.utc).isoformat()
+    copied = 0
+
+    while True:
+        response = giveaways_table.scan(**scan_kwargs)
+
+        for item in response.get('Items', []):
+            weights = Counter()
+
+            # Old joins stored entrance_number as sent, missing or not, so it's parsed leniently
+            for user_email, entrance_number in zip(item.get('users') or [], item.get('entries') or []):
+                try:
+                    weights[user_email] += max(int(entrance_number), 1)
+                except (TypeError, ValueError):
+                    weights[user_email] += 1
+
+            if not weights:
+                continue
+
+            with entries_table.batch_writer() as batch:
+                for user_email, weight in weights.items():
+                    batch.put_item(Item={
+                        'giveaway_id': item['giveaway_id'],
+                        'user_email': user_email,
+                        'weight': weight,
+                        'entered_at': backfilled_at
+                    })
+
+            giveaways_table.update_item(
+                Key={'giveaway_id': item['giveaway_id']},
+                UpdateExpression='SET entrants = :entrants, total_weight = :total_weight, last_entry_at = :entered_at',
+                ExpressionAttributeValues={
+                    ':entrants': len(weights),
+                    ':total_weight': sum(weights.values()),
+                    ':entered_at': backfilled_at
+                }
+            )
+
+            copied += len(weights)
+
+        if 'LastEvaluatedKey' not in response:
+            break
+
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    print(f'Copied {copied} giveaway entries.')
+
+if __name__ == '__main__':
+    main()
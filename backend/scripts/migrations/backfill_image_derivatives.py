@@ -0,0 +1,50 @@
+"""
+Creates thumbnail and medium derivatives for pictures uploaded before they
+were generated on upload. Without them, requests for a smaller image_size
+get links to objects that don't exist.
+
+Run from the repository root, once per bucket:
+    BUCKET=<bucket> [PREFIX=profile-pictures/] python -m backend.scripts.migrations.backfill_image_derivatives
+"""
+import os
+import logging
+
+import backend.common.clients as aws_clients
+import backend.common.images as images
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def main():
+    bucket = os.environ['BUCKET']
+    prefix = os.getenv('PREFIX', '')
+
+    s3_client = aws_clients.get_s3_client()
+    paginator = s3_client.get_paginator('list_objects_v2')
+
+    existing_keys = set()
+    original_keys = []
+
+    for page in paginator.paginate(Bucket=bucket):
+        for s3_object in page.get('Contents', []):
+            existing_keys.add(s3_object['Key'])
+
+            if s3_object['Key'].startswith(prefix) and not s3_object['Key'].startswith(images.IMAGE_DERIVATIVES_PREFIX):
+                original_keys.append(s3_object['Key'])
+
+    created = 0
+
+    for key in original_keys:
+        if all(derivative in existing_keys for derivative in images.derivative_keys(key)):
+            continue
+
+        if images.create_image_derivatives(bucket, key) is None:
+            logger.warning(f'BACKFILL DERIVATIVES - Skipping {key}, it is not a readable image.')
+            continue
+
+        created += 1
+
+    print(f'Created derivatives for {created} of {len(original_keys)} pictures.')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Writes the leaderboard index keys (see common/leaderboard.py) on every user, so users
+registered or last given points before the index existed show up on the leaderboard.
+Users without points get 0, as registration now writes. Run it again after changing LEADERBOARD_BUCKETS, with the new value
+set, since every user's bucket changes with it.
+
+Run from the repository root:
+    USERS_TABLE_NAME=<table> LEADERBOARD_BUCKETS=<buckets> python -m backend.scripts.migrations.backfill_leaderboard
+"""
+import os
+import logging
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+import backend.common.clients as aws_clients
+import backend.common.leaderboard as leaderboard
+from backend.common.scan import ParallelScan
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+def main():
+    users_table = aws_clients.get_dynamodb_table(os.environ['USERS_TABLE_NAME'])
+
+    updated = 0
+
+    with ParallelScan(
+        users_table,
+        ProjectionExpression='email, points, leaderboard_bucket, leaderboard_score'
+    ) as scan:
+        for user in scan:
+            points = user.get('points', 0)
+            attributes = dict(leaderboard.leaderboard_attributes(user['email'], points), points=points)
+
+            if all(user.get(attribute) == value for attribute, value in attributes.items()):
+                continue
+
+            try:
+                users_table.update_item(
+                    Key={'email': user['email']},
+                    UpdateExpression='SET points = :points, leaderboard_bucket = :leaderboard_bucket, leaderboard_score = :leaderboard_score',
+                    # Points changed since the scan read them, and that update wrote the keys itself
+                    ConditionExpression=Attr('points').eq(points) if 'points' in user else Attr('points').not_exists(),
+                    ExpressionAttributeValues={f':{attribute}': value for attribute, value in attributes.items()}
+                )
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+
+                continue
+
+            updated += 1
+
+    print(f'Updated the leaderboard keys of {updated} users.')
+
+if __name__ == '__main__':
+    main()
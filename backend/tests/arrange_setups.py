@@ -1,9 +1,17 @@
 import boto3
+from boto3.dynamodb.conditions import Key
 import os
 import json
 import jwt
+import io
 import uuid
+from collections import Counter
 from datetime import datetime, timedelta, timezone
+from PIL import Image
+
+import backend.common.geo as geo
+import backend.common.leaderboard as leaderboard
+import backend.common.clients as aws_clients
 
 def add_user_to_the_table(email, password, age=None, first_name=None, last_name=None, refresh_token=None, refresh_token_expiration=None, six_digit_code=None, six_digit_code_expiration=None):
     users_table = boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('USERS_TABLE_NAME'))
@@ -64,7 +72,187 @@ def add_chat_room_to_the_table(chat_id, connections):
 
     return chat_room_table
 
-def generate_jwt_token_for_test(email, is_expired=False, is_refresh=False):
+def add_club_to_the_table(club_id, latitude, longitude, club_name='Club'):
+    clubs_table = boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('CLUBS_TABLE_NAME'))
+
+    clubs_table.put_item(
+        Item={
+            'club_id': club_id,
+            'club_name': club_name,
+            'working_days': ['Friday', 'Saturday'],
+            'default_working_hours': '22:00-05:00',
+            'latitude': str(latitude),
+            'longitude': str(longitude)
+        }
+    )
+
+    return clubs_table
+
+def add_event_to_the_table(latitude, longitude, title='Event', theme=None, genre=None, event_type=None, event_id=None):
+    events_table = boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('EVENTS_TABLE_NAME'))
+
+    item = {
+        'event_id': event_id or str(uuid.uuid4()),
+        'title': title,
+        'latitude': str(latitude),
+        'longitude': str(longitude)
+    }
+    item.update(geo.geohash_attributes(latitude, longitude))
+
+    if theme:
+        item['theme'] = theme
+    if genre:
+        item['genre'] = genre
+    if event_type:
+        item['type'] = event_type
+
+    events_table.put_item(Item=item)
+
+    return item
+
+def add_event_image_to_the_table(event_id, created_at, user_id='john.doe@gmail.com', image_id=None):
+    event_images_table = boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('EVENT_IMAGES_TABLE_NAME'))
+
+    item = {
+        'id': image_id or str(uuid.uuid4()),
+        'event_id': event_id,
+        'user_id': user_id,
+        'first_name': 'John',
+        'last_name': 'Doe',
+        'image_link': f'https://cdn.example.com/{event_id}/{created_at}.jpg',
+        'created_at': created_at
+    }
+
+    event_images_table.put_item(Item=item)
+
+    return item
+
+def add_profile_picture_to_the_bucket(email, picture=b'picture'):
+    boto3.client('s3', region_name='eu-central-1').put_object(
+        Bucket=os.getenv('PROFILE_PICTURES_BUCKET'),
+        Key=f"{os.getenv('PROFILE_PICTURES_PREFIX')}{email}.jpg",
+        Body=picture
+    )
+
+def create_picture(width, height, image_format='JPEG'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), (200, 40, 40)).save(buffer, format=image_format)
+
+    return buffer.getvalue()
+
+def add_event_picture_to_the_bucket(event_id, picture=b'picture'):
+    boto3.client('s3', region_name='eu-central-1').put_object(
+        Bucket=os.getenv('EVENT_PICTURES_BUCKET'),
+        Key=f'{event_id}.jpg',
+        Body=picture
+    )
+
+def add_event_participant_to_the_table(event_id, user_email, joined_at):
+    boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('EVENT_PARTICIPANTS_TABLE_NAME')).put_item(
+        Item={
+            'event_id': event_id,
+            'user_email': user_email,
+            'joined_at': joined_at
+        }
+    )
+
+def count_event_participants(event_id):
+    counters_table = boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('EVENT_PARTICIPANT_COUNTERS_TABLE_NAME'))
+
+    shards = counters_table.query(KeyConditionExpression=Key('event_id').eq(event_id))['Items']
+
+    return sum(int(shard['participants']) for shard in shards)
+
+def add_giveaway_to_the_table(event_id=None, giveaway_id=None):
+    item = {
+        'giveaway_id': giveaway_id or str(uuid.uuid4()),
+        'event_id': event_id or str(uuid.uuid4()),
+        'prize': 'Two tickets',
+        'description': 'Join to win',
+        'name': 'Ticket giveaway'
+    }
+
+    boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('GIVEAWAY_TABLE_NAME')).put_item(Item=item)
+
+    return item
+
+def add_club_giveaway_to_the_table(club_id):
+    saved_event = add_event_to_the_table(45.33, 14.44)
+    set_attribute_on_item(os.getenv('EVENTS_TABLE_NAME'), {'event_id': saved_event['event_id']}, 'club_id', club_id)
+
+    return add_giveaway_to_the_table(saved_event['event_id'])
+
+def get_giveaway_entry(giveaway_id, user_email):
+    return boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('GIVEAWAY_ENTRIES_TABLE_NAME')).get_item(
+        Key={
+            'giveaway_id': giveaway_id,
+            'user_email': user_email
+        }
+    ).get('Item')
+
+def add_giveaway_entry_to_the_table(giveaway_id, user_email, weight=1):
+    boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('GIVEAWAY_ENTRIES_TABLE_NAME')).put_item(
+        Item={
+            'giveaway_id': giveaway_id,
+            'user_email': user_email,
+            'weight': weight,
+            'entered_at': '2030-01-01T00:00:00+00:00'
+        }
+    )
+
+def set_user_points(email, points):
+    attributes = dict(leaderboard.leaderboard_attributes(email, points), points=points)
+
+    boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('USERS_TABLE_NAME')).update_item(
+        Key={'email': email},
+        UpdateExpression='SET ' + ', '.join(f'{attribute} = :{attribute}' for attribute in attributes),
+        ExpressionAttributeValues={f':{attribute}': value for attribute, value in attributes.items()}
+    )
+
+def set_attribute_on_item(table_name, key, attribute, value):
+    boto3.resource('dynamodb', region_name='eu-central-1').Table(table_name).update_item(
+        Key=key,
+        UpdateExpression='SET #attribute = :value',
+        ExpressionAttributeNames={'#attribute': attribute},
+        ExpressionAttributeValues={':value': value}
+    )
+
+def count_dynamodb_requests():
+    """
+    Counts DynamoDB API calls made through the shared client, by operation name.
+    """
+    requests = Counter()
+
+    def count_request(model, **kwargs):
+        requests[model.name] += 1
+
+    aws_clients.get_dynamodb_client().meta.events.register('before-call.dynamodb', count_request)
+
+    return requests
+
+def authorized_request(email, body=None, query=None):
+    """
+    API Gateway event for a request the Lambda authorizer let through for email. A body that
+    isn't already a string is sent as JSON.
+    """
+    event = {
+        'requestContext': {
+            'authorizer': {
+                'lambda': {
+                    'email': email
+                }
+            }
+        }
+    }
+
+    if body is not None:
+        event['body'] = body if isinstance(body, str) else json.dumps(body)
+    if query is not None:
+        event['queryStringParameters'] = query
+
+    return event
+
+def generate_jwt_token_for_test(email, is_expired=False, is_refresh=False, expires_in=timedelta(minutes=5)):
     secrets_manager = boto3.client(
         service_name='secretsmanager',
         region_name=os.getenv('SECRETS_REGION_NAME')
@@ -80,7 +268,7 @@ def generate_jwt_token_for_test(email, is_expired=False, is_refresh=False):
     if is_expired:
         token_expiration_time = datetime.now(timezone.utc) - timedelta(minutes=5)
     else:
-        token_expiration_time = datetime.now(timezone.utc) + timedelta(minutes=5)
+        token_expiration_time = datetime.now(timezone.utc) + expires_in
 
     return jwt.encode(
         {'email': email, 'exp': token_expiration_time}, 
@@ -3,6 +3,7 @@ import boto3
 import bcrypt
 
 from backend.user_service.authentication import register_lambda
+import backend.common.leaderboard as leaderboard
 
 import backend.tests.arrange_setups as arrange
 from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_users_table, s3_bucket_eu_central_1_mock, create_profile_pictures_bucket
@@ -107,4 +108,27 @@ def test_when_user_added_successfuly_and_bcrypt_is_hashing_correctly_return_200(
     assert tableResultValues['last_name'] == event['last_name']
     assert tableResultValues['age'] == event['age']
 
-    assert bcrypt.checkpw(event['password'].encode('utf-8'), tableResultValues['password'].encode('utf-8'))
\ No newline at end of file
+    assert bcrypt.checkpw(event['password'].encode('utf-8'), tableResultValues['password'].encode('utf-8'))
+
+def test_when_user_registers_put_them_on_the_leaderboard_with_no_points(create_users_table):
+    # Arrange
+    arrange.add_user_to_the_table('jane.doe@gmail.com', 'password123')
+    arrange.set_user_points('jane.doe@gmail.com', 10)
+
+    event = {
+        'email': 'john.doe@gmail.com',
+        'password': 'Password123_',
+        'first_name': 'John',
+        'last_name': 'Doe',
+        'age': 30
+    }
+
+    # Act
+    result = register_lambda.lambda_handler(event, "")
+
+    users, next_cursor = leaderboard.get_leaderboard_page()
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert [(user['email'], user['points'], user['rank']) for user in users] == [('jane.doe@gmail.com', 10, 1), ('john.doe@gmail.com', 0, 2)]
+    assert next_cursor is None
@@ -1,10 +1,11 @@
 import json
+import os
 from datetime import datetime, timedelta, timezone
 
 from backend.user_service.authentication import validate_login_lambda
 
 import backend.tests.arrange_setups as arrange
-from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_users_table, secrets_manager_eu_central_1_mock, create_jwt_secret, setup_env_variables
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_users_table, create_event_participants_table, secrets_manager_eu_central_1_mock, create_jwt_secret, setup_env_variables
 
 # Tests
 
@@ -111,7 +112,7 @@ def test_when_six_digit_code_expired_return_400(create_users_table):
     assert "message" in response
     assert response["message"] == "Your six digit code has expired or is incorrect. Please request a new one."
 
-def test_creating_tokens_return_200(create_users_table, create_jwt_secret, setup_env_variables):
+def test_creating_tokens_return_200(create_users_table, create_event_participants_table, create_jwt_secret, setup_env_variables):
     # Arrange
     usersTable = arrange.add_user_to_the_table(
         'john.doe@gmail.com',
@@ -142,4 +143,32 @@ def test_creating_tokens_return_200(create_users_table, create_jwt_secret, setup
     assert response["message"] == "Logged in successfully, welcome!"
     assert "token" in response
     assert "refresh_token" in response
-    assert updated_user['Item']['refresh_token'] == response['refresh_token']
\ No newline at end of file
+    assert updated_user['Item']['refresh_token'] == response['refresh_token']
+
+def test_when_user_joined_events_return_them_from_event_participants(create_users_table, create_event_participants_table, create_jwt_secret, setup_env_variables):
+    # Arrange
+    arrange.add_user_to_the_table(
+        'john.doe@gmail.com',
+        'password123',
+        six_digit_code='001777',
+        six_digit_code_expiration=(datetime.now(timezone.utc) + timedelta(minutes=30)).isoformat()
+    )
+    arrange.set_attribute_on_item(os.getenv('USERS_TABLE_NAME'), {'email': 'john.doe@gmail.com'}, 'events', ['stale-event'])
+
+    arrange.add_event_participant_to_the_table('first-event', 'john.doe@gmail.com', '2030-01-01T10:00:00+00:00')
+    arrange.add_event_participant_to_the_table('second-event', 'john.doe@gmail.com', '2030-01-02T10:00:00+00:00')
+    arrange.add_event_participant_to_the_table('first-event', 'jane.doe@gmail.com', '2030-01-03T10:00:00+00:00')
+
+    event = {
+        'email': 'john.doe@gmail.com',
+        'six_digit_code': '001777'
+    }
+
+    # Act
+    result = validate_login_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert response["event_ids"] == ['second-event', 'first-event']
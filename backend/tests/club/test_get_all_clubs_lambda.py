@@ -0,0 +1,88 @@
+import json
+
+from backend.club_service.club import get_all_clubs_lambda
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_clubs_table
+
+# Tests
+
+def test_when_coordinates_missing_return_400(create_clubs_table):
+    # Arrange
+    event = {
+        'queryStringParameters': {
+            'latitude': '45.33'
+        }
+    }
+
+    # Act
+    result = get_all_clubs_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 400
+    assert response["message"] == "Longitude and latitude are required."
+
+def test_when_clubs_in_range_return_them_nearest_first(create_clubs_table):
+    # Arrange
+    arrange.add_club_to_the_table('far@club.com', 45.60, 14.44, club_name='Far')
+    arrange.add_club_to_the_table('near@club.com', 45.34, 14.45, club_name='Near')
+    arrange.add_club_to_the_table('zagreb@club.com', 45.81, 15.98, club_name='Zagreb')
+
+    event = {
+        'queryStringParameters': {
+            'latitude': '45.33',
+            'longitude': '14.44'
+        }
+    }
+
+    # Act
+    result = get_all_clubs_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert [club['club_name'] for club in response['clubs']] == ['Near', 'Far']
+    assert response['clubs'][0]['distance_km'] < response['clubs'][1]['distance_km']
+
+def test_when_nearest_return_k_closest_clubs(create_clubs_table):
+    # Arrange
+    arrange.add_club_to_the_table('a@club.com', 45.40, 14.44, club_name='A')
+    arrange.add_club_to_the_table('b@club.com', 45.34, 14.45, club_name='B')
+    arrange.add_club_to_the_table('c@club.com', 45.81, 15.98, club_name='C')
+    arrange.add_club_to_the_table('d@club.com', 48.85, 2.35, club_name='D')
+
+    event = {
+        'queryStringParameters': {
+            'latitude': '45.33',
+            'longitude': '14.44',
+            'nearest': '3'
+        }
+    }
+
+    # Act
+    result = get_all_clubs_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert [club['club_name'] for club in response['clubs']] == ['B', 'A', 'C']
+
+def test_when_nearest_invalid_return_400(create_clubs_table):
+    # Arrange
+    event = {
+        'queryStringParameters': {
+            'latitude': '45.33',
+            'longitude': '14.44',
+            'nearest': 'ten'
+        }
+    }
+
+    # Act
+    result = get_all_clubs_lambda.lambda_handler(event, "")
+
+    # Assert
+    assert result["statusCode"] == 400
@@ -0,0 +1,79 @@
+from backend.common import authorizer_lambda
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, secrets_manager_eu_central_1_mock, create_jwt_secret, setup_env_variables
+
+def build_authorizer_event(authorization_header=None):
+    # Synthetic API Gateway v2 (HTTP API) REQUEST authorizer event
+    headers = {}
+
+    if authorization_header:
+        headers['authorization'] = authorization_header
+
+    return {
+        'version': '2.0',
+        'type': 'REQUEST',
+        'routeArn': 'arn:aws:execute-api:eu-central-1:123456789012:abcdef123/api-v1/GET/profile/info/public',
+        'identitySource': [authorization_header] if authorization_header else [],
+        'routeKey': 'GET /profile/info/public',
+        'rawPath': '/api-v1/profile/info/public',
+        'headers': headers,
+        'requestContext': {
+            'http': {
+                'method': 'GET',
+                'path': '/api-v1/profile/info/public'
+            },
+            'stage': 'api-v1'
+        }
+    }
+
+# Tests
+
+def test_when_no_authorization_header_deny(create_jwt_secret, setup_env_variables):
+    # Act
+    result = authorizer_lambda.lambda_handler(build_authorizer_event(), "")
+
+    # Assert
+    assert result == {'isAuthorized': False}
+
+def test_when_invalid_token_deny(create_jwt_secret, setup_env_variables):
+    # Act
+    result = authorizer_lambda.lambda_handler(build_authorizer_event('Bearer token'), "")
+
+    # Assert
+    assert result == {'isAuthorized': False}
+
+def test_when_expired_token_deny(create_jwt_secret, setup_env_variables):
+    # Arrange
+    token = arrange.generate_jwt_token_for_test('john.doe@gmail.com', is_expired=True)
+
+    # Act
+    result = authorizer_lambda.lambda_handler(build_authorizer_event(f'Bearer {token}'), "")
+
+    # Assert
+    assert result == {'isAuthorized': False}
+
+def test_when_refresh_token_used_as_access_token_deny(create_jwt_secret, setup_env_variables):
+    # Arrange
+    token = arrange.generate_jwt_token_for_test('john.doe@gmail.com', is_refresh=True)
+
+    # Act
+    result = authorizer_lambda.lambda_handler(build_authorizer_event(f'Bearer {token}'), "")
+
+    # Assert
+    assert result == {'isAuthorized': False}
+
+def test_when_valid_token_allow_and_pass_email_in_context(create_jwt_secret, setup_env_variables):
+    # Arrange
+    token = arrange.generate_jwt_token_for_test('john.doe@gmail.com')
+
+    # Act
+    result = authorizer_lambda.lambda_handler(build_authorizer_event(f'Bearer {token}'), "")
+
+    # Assert
+    assert result == {
+        'isAuthorized': True,
+        'context': {
+            'email': 'john.doe@gmail.com'
+        }
+    }
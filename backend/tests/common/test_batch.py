@@ -0,0 +1,100 @@
+import boto3
+import os
+import pytest
+
+import backend.common.batch as batch_module
+from backend.common.batch import batch_get_items
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_users_table
+
+def fill_users_table(count):
+    table = boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('USERS_TABLE_NAME'))
+
+    with table.batch_writer() as batch:
+        for index in range(count):
+            batch.put_item(Item={'email': f'user{index}@gmail.com', 'first_name': f'User {index}', 'password': 'secret'})
+
+# Tests
+
+def test_batch_get_returns_items_in_input_order_with_none_for_missing(create_users_table):
+    # Arrange
+    fill_users_table(5)
+    keys = [{'email': 'user3@gmail.com'}, {'email': 'missing@gmail.com'}, {'email': 'user0@gmail.com'}, {'email': 'user3@gmail.com'}]
+
+    # Act
+    items = batch_get_items(os.getenv('USERS_TABLE_NAME'), keys)
+
+    # Assert
+    assert [item['email'] if item else None for item in items] == ['user3@gmail.com', None, 'user0@gmail.com', 'user3@gmail.com']
+
+def test_batch_get_chunks_keys_by_100(create_users_table):
+    # Arrange
+    fill_users_table(250)
+    requests = arrange.count_dynamodb_requests()
+
+    keys = [{'email': f'user{index}@gmail.com'} for index in reversed(range(250))]
+
+    # Act
+    items = batch_get_items(os.getenv('USERS_TABLE_NAME'), keys)
+
+    # Assert
+    assert requests['BatchGetItem'] == 3
+    assert [item['email'] for item in items] == [key['email'] for key in keys]
+
+def test_batch_get_projects_requested_attributes_and_keys(create_users_table):
+    # Arrange
+    fill_users_table(3)
+
+    # Act
+    items = batch_get_items(os.getenv('USERS_TABLE_NAME'), [{'email': 'user1@gmail.com'}], attributes=['first_name'])
+
+    # Assert
+    assert items == [{'email': 'user1@gmail.com', 'first_name': 'User 1'}]
+
+def test_batch_get_retries_unprocessed_keys(create_users_table, monkeypatch):
+    # Arrange
+    fill_users_table(10)
+    monkeypatch.setattr(batch_module, 'BATCH_GET_BACKOFF_BASE_SECONDS', 0)
+
+    requests = arrange.count_dynamodb_requests()
+    dynamodb = batch_module.aws_clients.get_dynamodb_resource()
+    original_batch_get_item = dynamodb.batch_get_item
+
+    def batch_get_item_leaving_keys_unprocessed(RequestItems):
+        table_name, request = next(iter(RequestItems.items()))
+
+        # Process only the first half of the keys on each call
+        processed_keys = request['Keys'][:max(len(request['Keys']) // 2, 1)]
+        unprocessed_keys = request['Keys'][len(processed_keys):]
+
+        response = original_batch_get_item(RequestItems={table_name: dict(request, Keys=processed_keys)})
+
+        if unprocessed_keys:
+            response['UnprocessedKeys'] = {table_name: dict(request, Keys=unprocessed_keys)}
+
+        return response
+
+    monkeypatch.setattr(dynamodb, 'batch_get_item', batch_get_item_leaving_keys_unprocessed)
+
+    keys = [{'email': f'user{index}@gmail.com'} for index in range(10)]
+
+    # Act
+    items = batch_get_items(os.getenv('USERS_TABLE_NAME'), keys)
+
+    # Assert
+    assert [item['email'] for item in items] == [key['email'] for key in keys]
+    assert requests['BatchGetItem'] > 1
+
+def test_batch_get_raises_when_keys_stay_unprocessed(create_users_table, monkeypatch):
+    # Arrange
+    fill_users_table(2)
+    monkeypatch.setattr(batch_module, 'BATCH_GET_BACKOFF_BASE_SECONDS', 0)
+    monkeypatch.setattr(batch_module, 'BATCH_GET_MAX_RETRIES', 2)
+
+    dynamodb = batch_module.aws_clients.get_dynamodb_resource()
+    monkeypatch.setattr(dynamodb, 'batch_get_item', lambda RequestItems: {'Responses': {}, 'UnprocessedKeys': RequestItems})
+
+    # Act / Assert
+    with pytest.raises(RuntimeError):
+        batch_get_items(os.getenv('USERS_TABLE_NAME'), [{'email': 'user0@gmail.com'}])
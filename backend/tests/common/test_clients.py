@@ -0,0 +1,44 @@
+import backend.common.clients as aws_clients
+
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_users_table
+
+# Tests
+
+def test_when_table_requested_twice_same_object_is_returned(create_users_table):
+    # Act
+    first = aws_clients.get_dynamodb_table('users')
+    second = aws_clients.get_dynamodb_table('users')
+
+    # Assert
+    assert first is second
+
+def test_when_clients_requested_twice_same_objects_are_returned(aws_credentials):
+    # Act
+    s3_clients = [aws_clients.get_s3_client(), aws_clients.get_s3_client()]
+    ses_clients = [aws_clients.get_ses_client('eu-central-1'), aws_clients.get_ses_client('eu-central-1')]
+
+    # Assert
+    assert s3_clients[0] is s3_clients[1]
+    assert ses_clients[0] is ses_clients[1]
+    assert s3_clients[0].meta.config.max_pool_connections == aws_clients.BOTO_MAX_POOL_CONNECTIONS
+
+def test_when_table_cached_it_can_still_be_used(create_users_table):
+    # Arrange
+    users_table = aws_clients.get_dynamodb_table('users')
+    users_table.put_item(Item={'email': 'john.doe@gmail.com'})
+
+    # Act
+    response = aws_clients.get_dynamodb_table('users').get_item(Key={'email': 'john.doe@gmail.com'})
+
+    # Assert
+    assert response['Item']['email'] == 'john.doe@gmail.com'
+
+def test_when_registry_reset_new_objects_are_created(aws_credentials):
+    # Arrange
+    s3_client = aws_clients.get_s3_client()
+
+    # Act
+    aws_clients.reset_clients()
+
+    # Assert
+    assert aws_clients.get_s3_client() is not s3_client
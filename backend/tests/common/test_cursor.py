@@ -0,0 +1,31 @@
+import backend.common.common as common_handler
+
+from backend.tests.common_test_setup import aws_credentials, secrets_manager_eu_central_1_mock, create_jwt_secret, setup_env_variables
+
+# Tests
+
+def test_cursor_round_trip_returns_same_state(create_jwt_secret, setup_env_variables):
+    # Arrange
+    state = {'filters': {'theme': 'rock'}, 'start_key': {'event_id': 'abc'}}
+
+    # Act
+    cursor = common_handler.encode_cursor(state)
+
+    # Assert
+    assert common_handler.decode_cursor(cursor) == state
+
+def test_cursor_with_modified_payload_is_rejected(create_jwt_secret, setup_env_variables):
+    # Arrange
+    cursor = common_handler.encode_cursor({'start_key': {'event_id': 'abc'}})
+    forged_payload = common_handler.encode_cursor({'start_key': {'event_id': 'xyz'}}).split('.')[0]
+
+    # Act
+    result = common_handler.decode_cursor(f"{forged_payload}.{cursor.split('.')[1]}")
+
+    # Assert
+    assert result is None
+
+def test_malformed_cursor_is_rejected(create_jwt_secret, setup_env_variables):
+    # Act / Assert
+    assert common_handler.decode_cursor('not-a-cursor') is None
+    assert common_handler.decode_cursor('a.b.c') is None
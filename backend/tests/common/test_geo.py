@@ -0,0 +1,131 @@
+import random
+import numpy as np
+import pytest
+from decimal import Decimal
+
+import backend.common.geo as geo
+
+# Tests
+
+def test_encode_geohash_matches_reference_value():
+    # Act
+    geohash = geo.encode_geohash(57.64911, 10.40744, 11)
+
+    # Assert
+    assert geohash == 'u4pruydqqvj'
+
+def test_geohash_attributes_contain_index_prefix():
+    # Act
+    attributes = geo.geohash_attributes('45.3271', '14.4422')
+
+    # Assert
+    assert len(attributes['geohash']) == geo.GEOHASH_PRECISION
+    assert attributes['geohash_3'] == attributes['geohash'][:geo.GEOHASH_INDEX_PRECISION]
+
+def test_haversine_between_known_cities():
+    # Act
+    # Rijeka -> Zagreb is roughly 132 km
+    distance = geo.haversine(14.4422, 45.3271, 15.9819, 45.8150)
+
+    # Assert
+    assert 125 < distance < 135
+
+def test_covering_cells_contain_every_point_within_radius():
+    # Arrange
+    rng = random.Random(42)
+    centres = [(45.3271, 14.4422), (0.01, 179.99), (-33.86, 151.21), (89.9, 0.0)]
+
+    for latitude, longitude in centres:
+        cells = geo.geohash_cells_covering_radius(latitude, longitude, 20)
+
+        # Act / Assert
+        # Polar circles span every longitude, so only the partition precision can cover them
+        if abs(latitude) < 89:
+            assert len(cells) <= geo.GEOHASH_MAX_COVER_CELLS
+
+        for _ in range(500):
+            point_latitude = max(min(latitude + rng.uniform(-0.2, 0.2), 90.0), -90.0)
+            point_longitude = ((longitude + rng.uniform(-0.3, 0.3) + 180.0) % 360.0) - 180.0
+
+            if geo.haversine(longitude, latitude, point_longitude, point_latitude) > 20:
+                continue
+
+            point_geohash = geo.encode_geohash(point_latitude, point_longitude)
+
+            assert any(point_geohash.startswith(cell) for cell in cells)
+
+def test_vectorised_haversine_matches_scalar_haversine():
+    # Arrange
+    rng = random.Random(5)
+    points = [(rng.uniform(-89, 89), rng.uniform(-180, 180)) for _ in range(200)]
+
+    latitudes = np.array([latitude for latitude, _ in points])
+    longitudes = np.array([longitude for _, longitude in points])
+
+    # Act
+    distances = geo.haversine_many(14.4422, 45.3271, longitudes, latitudes)
+
+    # Assert
+    for (latitude, longitude), distance in zip(points, distances):
+        assert distance == pytest.approx(geo.haversine(14.4422, 45.3271, longitude, latitude), abs=1e-6)
+
+def test_items_within_radius_matches_brute_force_across_antimeridian():
+    # Arrange
+    rng = random.Random(11)
+    latitude, longitude = -16.5, 179.9
+
+    items = [
+        {'latitude': str(latitude + rng.uniform(-0.5, 0.5)), 'longitude': str(((longitude + rng.uniform(-0.6, 0.6) + 180) % 360) - 180)}
+        for _ in range(500)
+    ]
+
+    expected = [
+        item for item in items
+        if geo.haversine(longitude, latitude, float(item['longitude']), float(item['latitude'])) <= 20
+    ]
+
+    # Act
+    result = geo.items_within_radius(latitude, longitude, items, 20)
+
+    # Assert
+    assert expected
+    assert [item for item, _ in result] == expected
+    assert all(distance <= 20 for _, distance in result)
+
+def test_items_with_missing_or_malformed_coordinates_are_skipped():
+    # Arrange
+    items = [
+        {'latitude': '45.33', 'longitude': '14.44'},
+        {'latitude': 'north', 'longitude': '14.44'},
+        {'longitude': '14.44'},
+        {'latitude': Decimal('45.34'), 'longitude': Decimal('14.45')}
+    ]
+
+    # Act
+    result = geo.items_within_radius(45.33, 14.44, items, 20)
+
+    # Assert
+    assert [item for item, _ in result] == [items[0], items[3]]
+
+def test_push_nearest_keeps_k_closest_items_across_batches():
+    # Arrange
+    rng = random.Random(13)
+    items = [{'latitude': str(45.33 + rng.uniform(-1, 1)), 'longitude': str(14.44 + rng.uniform(-1, 1))} for _ in range(1000)]
+
+    expected = sorted(
+        (geo.haversine(14.44, 45.33, float(item['longitude']), float(item['latitude'])), index)
+        for index, item in enumerate(items)
+    )[:10]
+
+    heap = []
+
+    # Act
+    for start in range(0, len(items), 128):
+        geo.push_nearest(heap, 10, 45.33, 14.44, items[start:start + 128], 500)
+
+    result = geo.sorted_nearest(heap)
+
+    # Assert
+    assert len(heap) == 10
+    assert [item for item, _ in result] == [items[index] for _, index in expected]
+    assert [distance for _, distance in result] == pytest.approx([distance for distance, _ in expected])
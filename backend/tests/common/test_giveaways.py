@@ -0,0 +1,63 @@
+import random
+from collections import Counter
+
+import backend.common.giveaways as giveaways
+
+# Tests
+
+def test_when_sampling_one_item_pick_it_in_proportion_to_its_weight():
+    # Arrange
+    weighted_items = [('a', 1), ('b', 2), ('c', 3), ('d', 4)]
+    rng = random.Random(7)
+
+    # Act
+    picks = Counter(giveaways.weighted_reservoir_sample(iter(weighted_items), 1, rng)[0] for _ in range(20000))
+
+    # Assert
+    for item, weight in weighted_items:
+        assert abs(picks[item] / 20000 - weight / 10) < 0.015
+
+def test_when_sampling_more_items_than_exist_return_every_item_with_weight():
+    # Act
+    sample = giveaways.weighted_reservoir_sample(iter([('a', 1), ('b', 0), ('c', 5)]), 5, random.Random(1))
+
+    # Assert
+    assert sorted(sample) == ['a', 'c']
+
+def test_when_sampling_from_a_stream_read_it_once_and_return_distinct_items():
+    # Arrange
+    consumed = []
+
+    def weighted_items():
+        for index in range(100000):
+            consumed.append(index)
+            yield index, index % 7 + 1
+
+    # Act
+    sample = giveaways.weighted_reservoir_sample(weighted_items(), 3, random.Random(3))
+
+    # Assert
+    assert len(consumed) == 100000
+    assert len(set(sample)) == 3
+
+def test_when_fenwick_sampler_draws_first_pick_it_in_proportion_to_weight():
+    # Arrange
+    weights = [1, 2, 3, 4]
+    rng = random.Random(11)
+
+    # Act
+    picks = Counter(giveaways.WeightedSampler(weights).sample(1, rng)[0] for _ in range(20000))
+
+    # Assert
+    for index, weight in enumerate(weights):
+        assert abs(picks[index] / 20000 - weight / 10) < 0.015
+
+def test_when_fenwick_sampler_draws_all_never_repeat_or_pick_zero_weights():
+    # Arrange
+    weights = [index % 4 for index in range(1000)]
+
+    # Act
+    sample = giveaways.WeightedSampler(weights).sample(2000, random.Random(5))
+
+    # Assert
+    assert sorted(sample) == [index for index, weight in enumerate(weights) if weight]
@@ -0,0 +1,213 @@
+import io
+import os
+import base64
+import boto3
+import pytest
+from PIL import Image
+
+import backend.common.images as images
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, s3_bucket_eu_central_1_mock, create_event_pictures_bucket
+
+BUCKET = 'lambda-event-pictures'
+
+# Tests
+
+def test_presigned_url_is_reused_while_valid(create_event_pictures_bucket):
+    # Act
+    first_url = images.get_presigned_image_url(BUCKET, 'event.jpg')
+    second_url = images.get_presigned_image_url(BUCKET, 'event.jpg')
+
+    # Assert
+    assert first_url == second_url
+    assert images.get_presigned_url_cache_stats()['hits'] == 1
+    assert images.get_presigned_url_cache_stats()['misses'] == 1
+
+def test_presigned_url_is_regenerated_when_close_to_expiry(create_event_pictures_bucket, monkeypatch):
+    # Arrange
+    now = [1_000_000.0]
+    monkeypatch.setattr(images.time, 'time', lambda: now[0])
+
+    images.get_presigned_image_url(BUCKET, 'event.jpg')
+
+    # Act
+    now[0] += images.PRESIGNED_URL_EXPIRES_SECONDS - images.PRESIGNED_URL_MIN_REMAINING_SECONDS + 1
+    images.get_presigned_image_url(BUCKET, 'event.jpg')
+
+    # Assert
+    assert images.get_presigned_url_cache_stats()['misses'] == 2
+
+def test_presigned_url_with_existence_check_returns_none_for_missing_object(create_event_pictures_bucket):
+    # Arrange
+    arrange.add_event_picture_to_the_bucket('existing')
+
+    # Act / Assert
+    assert images.get_presigned_image_url(BUCKET, 'missing.jpg', check_exists=True) is None
+    assert images.get_presigned_image_url(BUCKET, 'existing.jpg', check_exists=True)
+
+def test_image_mode_defaults_to_url():
+    # Act / Assert
+    assert images.get_image_mode({}) == images.IMAGE_MODE_URL
+    assert images.get_image_mode({'queryStringParameters': {'image_mode': 'inline'}}) == images.IMAGE_MODE_INLINE
+
+def test_fetch_images_keeps_key_order_and_returns_none_for_missing(create_event_pictures_bucket):
+    # Arrange
+    for index in range(5):
+        arrange.add_event_picture_to_the_bucket(f'event-{index}', f'picture {index}'.encode())
+
+    keys = [f'event-{index}.jpg' for index in range(5)]
+    keys.insert(2, 'missing.jpg')
+
+    # Act
+    encoded_images = images.fetch_images_as_base64(BUCKET, keys, max_workers=3)
+
+    # Assert
+    assert encoded_images[2] is None
+    assert [base64.b64decode(image) for image in encoded_images if image] == [f'picture {index}'.encode() for index in range(5)]
+
+def test_fetch_images_stops_at_byte_budget(create_event_pictures_bucket):
+    # Arrange
+    for index in range(4):
+        arrange.add_event_picture_to_the_bucket(f'event-{index}', b'x' * 100)
+
+    # Act
+    encoded_images = images.fetch_images_as_base64(BUCKET, [f'event-{index}.jpg' for index in range(4)], max_total_bytes=250)
+
+    # Assert
+    assert len(encoded_images) == 4
+    assert sum(image is not None for image in encoded_images) == 2
+
+def test_fetch_images_with_no_keys_returns_empty_list():
+    # Act / Assert
+    assert images.fetch_images_as_base64(BUCKET, []) == []
+
+def test_save_image_stores_every_size_and_format(create_event_pictures_bucket):
+    # Arrange
+    picture = arrange.create_picture(1600, 1200)
+
+    # Act
+    written_keys = images.save_image(BUCKET, 'event.jpg', picture)
+
+    # Assert
+    s3_client = boto3.client('s3', region_name='eu-central-1')
+
+    assert sorted(written_keys) == sorted(images.derivative_keys('event.jpg'))
+
+    thumbnail = s3_client.get_object(Bucket=BUCKET, Key='derivatives/thumbnail/event.webp')
+    medium = s3_client.get_object(Bucket=BUCKET, Key='derivatives/medium/event.jpg')
+
+    assert thumbnail['ContentType'] == 'image/webp'
+    assert Image.open(io.BytesIO(thumbnail['Body'].read())).size == (200, 150)
+    assert medium['ContentType'] == 'image/jpeg'
+    assert Image.open(io.BytesIO(medium['Body'].read())).size == (800, 600)
+    assert s3_client.get_object(Bucket=BUCKET, Key='event.jpg')['Body'].read() == picture
+
+def test_save_image_never_upscales_small_pictures(create_event_pictures_bucket):
+    # Act
+    images.save_image(BUCKET, 'event.jpg', arrange.create_picture(120, 90, 'PNG'))
+
+    # Assert
+    medium = boto3.client('s3', region_name='eu-central-1').get_object(Bucket=BUCKET, Key='derivatives/medium/event.webp')
+
+    assert Image.open(io.BytesIO(medium['Body'].read())).size == (120, 90)
+
+def test_save_image_keeps_original_when_it_is_not_an_image(create_event_pictures_bucket):
+    # Act
+    written_keys = images.save_image(BUCKET, 'event.jpg', b'not a picture')
+
+    # Assert
+    assert written_keys is None
+    assert images.image_exists(BUCKET, 'event.jpg')
+    assert not images.image_exists(BUCKET, 'derivatives/thumbnail/event.jpg')
+
+def test_delete_image_removes_derivatives(create_event_pictures_bucket):
+    # Arrange
+    images.save_image(BUCKET, 'event.jpg', arrange.create_picture(400, 300))
+
+    # Act
+    images.delete_image(BUCKET, 'event.jpg')
+
+    # Assert
+    assert not any(images.image_exists(BUCKET, key) for key in ['event.jpg'] + images.derivative_keys('event.jpg'))
+
+def test_derivative_key_is_deterministic():
+    # Act / Assert
+    assert images.derivative_key('event.jpg', 'original', 'webp') == 'event.jpg'
+    assert images.derivative_key('event.jpg', 'thumbnail', 'webp') == 'derivatives/thumbnail/event.webp'
+    assert images.derivative_key('profile-pictures/john.doe@gmail.com.jpg', 'medium', 'jpeg') == 'derivatives/medium/profile-pictures/john.doe@gmail.com.jpg'
+
+def test_image_variant_defaults_to_original_jpeg():
+    # Act / Assert
+    assert images.get_image_variant({}) == ('original', 'jpeg')
+    assert images.get_image_variant({'queryStringParameters': {'image_size': 'thumbnail', 'image_format': 'webp'}}) == ('thumbnail', 'webp')
+    assert images.get_image_variant({'queryStringParameters': {'image_size': 'huge', 'image_format': 'gif'}}) == ('original', 'jpeg')
+
+def test_decode_base64_image_to_file_decodes_in_chunks(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(images, 'IMAGE_DECODE_CHUNK_CHARS', 8)
+    monkeypatch.setattr(images, 'IMAGE_SPOOL_MAX_MEMORY_BYTES', 64)
+
+    picture = arrange.create_picture(40, 30, 'PNG')
+
+    # Act
+    image_file, content_type = images.decode_base64_image_to_file('data:image/png;base64,' + base64.b64encode(picture).decode('utf-8'))
+
+    # Assert
+    with image_file:
+        assert content_type == 'image/png'
+        assert image_file.read() == picture
+
+def test_decode_base64_image_to_file_accepts_line_wrapped_base64(monkeypatch):
+    # Arrange
+    monkeypatch.setattr(images, 'IMAGE_DECODE_CHUNK_CHARS', 10)
+
+    picture = arrange.create_picture(40, 30, 'PNG')
+    encoded = base64.encodebytes(picture).decode('utf-8').replace('\n', '\r\n')
+
+    # Act
+    image_file, content_type = images.decode_base64_image_to_file(encoded)
+
+    # Assert
+    with image_file:
+        assert content_type == 'image/png'
+        assert image_file.read() == picture
+
+def test_decode_base64_image_to_file_rejects_truncated_base64():
+    # Arrange
+    encoded = base64.b64encode(arrange.create_picture(40, 30, 'PNG')).decode('utf-8')
+
+    # Act / Assert
+    with pytest.raises(images.ImageValidationError):
+        images.decode_base64_image_to_file(encoded[:-3])
+
+def test_decode_base64_image_to_file_rejects_non_images():
+    # Act / Assert
+    with pytest.raises(images.ImageValidationError):
+        images.decode_base64_image_to_file(base64.b64encode(b'%PDF-1.7 not a picture').decode('utf-8'))
+
+def test_validate_base64_image_rejects_oversized_payload_before_decoding():
+    # Arrange
+    oversized = base64.b64encode(arrange.create_picture(10, 10)).decode('utf-8') + 'A' * 2000
+
+    # Act / Assert
+    with pytest.raises(images.ImageValidationError):
+        images.validate_base64_image(oversized, max_bytes=1000)
+
+def test_validate_base64_image_rejects_invalid_base64():
+    # Act / Assert
+    with pytest.raises(images.ImageValidationError):
+        images.validate_base64_image('not base64 at all!')
+
+def test_save_image_uses_multipart_upload_for_large_pictures(create_event_pictures_bucket):
+    # Arrange
+    data = b'\xff\xd8\xff' + os.urandom(11 * 1024 * 1024)
+
+    # Act
+    images.save_image(BUCKET, 'event.jpg', io.BytesIO(data))
+
+    # Assert
+    stored = boto3.client('s3', region_name='eu-central-1').get_object(Bucket=BUCKET, Key='event.jpg')
+
+    assert stored['ETag'].endswith('-3"')
+    assert stored['Body'].read() == data
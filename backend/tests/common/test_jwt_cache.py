@@ -0,0 +1,84 @@
+import time
+from datetime import timedelta
+
+import backend.common.common as common_handler
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, secrets_manager_eu_central_1_mock, create_jwt_secret, setup_env_variables
+
+def build_event(token):
+    return {
+        'headers': {
+            'authorization': f'Bearer {token}',
+        }
+    }
+
+# Tests
+
+def test_when_same_token_verified_repeatedly_cache_is_hit(create_jwt_secret, setup_env_variables):
+    # Arrange
+    token = arrange.generate_jwt_token_for_test('john.doe@gmail.com')
+
+    # Act
+    results = [common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(build_event(token)) for _ in range(10)]
+
+    stats = common_handler.get_jwt_cache_stats()
+
+    # Assert
+    assert all(result == (None, 'john.doe@gmail.com') for result in results)
+    assert stats['misses'] == 1
+    assert stats['hits'] == 9
+    assert stats['size'] == 1
+    assert stats['hit_rate'] == 0.9
+
+def test_when_cached_token_expires_it_is_rejected(create_jwt_secret, setup_env_variables):
+    # Arrange
+    token = arrange.generate_jwt_token_for_test('john.doe@gmail.com', expires_in=timedelta(seconds=1))
+
+    error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(build_event(token))
+
+    assert error_response is None
+
+    # Act
+    time.sleep(2)
+
+    error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(build_event(token))
+
+    # Assert
+    assert error_response['statusCode'] == 401
+    assert email is None
+    assert common_handler.get_jwt_cache_stats()['size'] == 0
+
+def test_when_cache_disabled_nothing_is_stored(create_jwt_secret, setup_env_variables, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(common_handler, 'JWT_CACHE_ENABLED', False)
+
+    token = arrange.generate_jwt_token_for_test('john.doe@gmail.com')
+
+    # Act
+    for _ in range(3):
+        common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(build_event(token))
+
+    stats = common_handler.get_jwt_cache_stats()
+
+    # Assert
+    assert stats['size'] == 0
+    assert stats['hits'] == 0
+
+def test_when_cache_full_least_recently_used_token_is_evicted(create_jwt_secret, setup_env_variables, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(common_handler, 'JWT_CACHE_MAX_SIZE', 2)
+
+    tokens = [arrange.generate_jwt_token_for_test(f'user{i}@gmail.com') for i in range(3)]
+
+    # Act
+    for token in tokens:
+        common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(build_event(token))
+
+    common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(build_event(tokens[0]))
+
+    stats = common_handler.get_jwt_cache_stats()
+
+    # Assert
+    assert stats['size'] == 2
+    assert stats['misses'] == 4
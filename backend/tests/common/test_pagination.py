@@ -0,0 +1,86 @@
+import boto3
+import os
+import pytest
+from boto3.dynamodb.conditions import Key
+
+import backend.common.pagination as pagination
+
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_event_participants_table, secrets_manager_eu_central_1_mock, create_jwt_secret, setup_env_variables
+
+class ShortPagesTable:
+    """
+    Returns at most two items a query, like pages cut short at 1 MB.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.queries = 0
+
+    def query(self, **kwargs):
+        self.queries += 1
+
+        return self.table.query(**dict(kwargs, Limit=min(kwargs['Limit'], 2)))
+
+def fill_participants_table(count):
+    table = boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('EVENT_PARTICIPANTS_TABLE_NAME'))
+
+    with table.batch_writer() as batch:
+        for index in range(count):
+            batch.put_item(Item={'event_id': 'event', 'user_email': f'user{index:02d}@gmail.com', 'joined_at': '2030-01-01T10:00:00+00:00'})
+
+    return table
+
+# Tests
+
+def test_query_page_keeps_reading_short_pages_until_it_knows_another_page_exists(create_event_participants_table):
+    # Arrange
+    table = ShortPagesTable(fill_participants_table(10))
+
+    # Act
+    items, has_more = pagination.query_page(table, {'KeyConditionExpression': Key('event_id').eq('event')}, 5)
+
+    # Assert
+    assert [item['user_email'] for item in items] == [f'user{index:02d}@gmail.com' for index in range(5)]
+    assert has_more is True
+    assert table.queries == 3
+
+def test_query_page_on_the_last_page_reports_no_more(create_event_participants_table):
+    # Arrange
+    table = fill_participants_table(4)
+
+    # Act
+    items, has_more = pagination.query_page(table, {'KeyConditionExpression': Key('event_id').eq('event')}, 5)
+
+    # Assert
+    assert len(items) == 4
+    assert has_more is False
+
+def test_query_cursor_page_continues_only_its_own_query(create_event_participants_table, create_jwt_secret, setup_env_variables):
+    # Arrange
+    table = fill_participants_table(5)
+    query_kwargs = {'KeyConditionExpression': Key('event_id').eq('event')}
+    key_attributes = ('event_id', 'user_email')
+
+    first_items, cursor = pagination.query_cursor_page(table, query_kwargs, 3, None, 1, {'event_id': 'event'}, key_attributes)
+
+    # Act
+    second_items, last_cursor = pagination.query_cursor_page(table, query_kwargs, 3, cursor, 1, {'event_id': 'event'}, key_attributes)
+
+    # Assert
+    assert [item['user_email'] for item in first_items + second_items] == [f'user{index:02d}@gmail.com' for index in range(5)]
+    assert last_cursor is None
+
+    with pytest.raises(ValueError):
+        pagination.query_cursor_page(table, query_kwargs, 3, cursor, 1, {'event_id': 'other-event'}, key_attributes)
+
+    with pytest.raises(ValueError):
+        pagination.query_cursor_page(table, query_kwargs, 3, cursor, 2, {'event_id': 'event'}, key_attributes)
+
+def test_parse_page_size_defaults_and_caps():
+    # Act / Assert
+    assert pagination.parse_page_size(None, 20, 100) == 20
+    assert pagination.parse_page_size('30', 20, 100) == 30
+    assert pagination.parse_page_size('500', 20, 100) == 100
+
+    with pytest.raises(ValueError):
+        pagination.parse_page_size('0', 20, 100)
@@ -0,0 +1,102 @@
+import os
+import time
+import boto3
+from moto.dynamodb.models import DynamoDBBackend
+from moto.dynamodb.exceptions import TransactionCanceledException
+
+import backend.common.participants as participants
+import backend.common.transactions as transactions
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table
+
+# Tests
+
+def test_when_transaction_conflicts_retry_until_it_goes_through(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table, monkeypatch):
+    # Arrange
+    arrange.add_user_to_the_table('john.doe@gmail.com', 'password')
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44)
+
+    monkeypatch.setattr(transactions, 'TRANSACTION_BACKOFF_BASE_SECONDS', 0)
+
+    attempts = []
+    transact_write_items = DynamoDBBackend.transact_write_items
+
+    def conflicting_transact_write_items(self, transact_items):
+        attempts.append(len(transact_items))
+
+        if len(attempts) < 3:
+            raise TransactionCanceledException([(None, None, None), ('TransactionConflict', 'Conflict', None), (None, None, None)])
+
+        return transact_write_items(self, transact_items)
+
+    monkeypatch.setattr(DynamoDBBackend, 'transact_write_items', conflicting_transact_write_items)
+
+    # Act
+    joined = participants.join_event(saved_event['event_id'], 'john.doe@gmail.com')
+
+    # Assert
+    participant_count = arrange.count_event_participants(saved_event['event_id'])
+
+    assert joined is True
+    assert len(attempts) == 3
+    assert participant_count == 1
+
+def test_when_leaving_without_joining_change_nothing(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table):
+    # Arrange
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44)
+    arrange.set_attribute_on_item(os.getenv('EVENTS_TABLE_NAME'), {'event_id': saved_event['event_id']}, 'participants', 3)
+
+    # Act
+    left = participants.leave_event(saved_event['event_id'], 'john.doe@gmail.com')
+
+    # Assert
+    stored_event = boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('EVENTS_TABLE_NAME')).get_item(Key={'event_id': saved_event['event_id']})['Item']
+
+    assert left is False
+    assert participants.total_participants(stored_event, participants.get_participant_counts([saved_event['event_id']])) == 3
+
+def test_when_users_join_spread_counts_over_shards_and_sum_them(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table):
+    # Arrange
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44)
+    arrange.set_attribute_on_item(os.getenv('EVENTS_TABLE_NAME'), {'event_id': saved_event['event_id']}, 'participants', 5)
+
+    for index in range(30):
+        arrange.add_user_to_the_table(f'user{index}@gmail.com', 'password')
+        participants.join_event(saved_event['event_id'], f'user{index}@gmail.com')
+
+    requests = arrange.count_dynamodb_requests()
+
+    # Act
+    participant_counts = participants.get_participant_counts([saved_event['event_id'], 'missing-event'])
+
+    # Assert
+    shards = boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('EVENT_PARTICIPANT_COUNTERS_TABLE_NAME')).scan()['Items']
+
+    assert participant_counts == {saved_event['event_id']: 30, 'missing-event': 0}
+    assert len(shards) > 1
+    assert participants.total_participants(dict(saved_event, participants=5), participant_counts) == 35
+    assert requests['BatchGetItem'] == 1
+
+def test_when_count_was_read_recently_serve_it_from_cache_until_it_expires(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table, monkeypatch):
+    # Arrange
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44)
+    counters_table = boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('EVENT_PARTICIPANT_COUNTERS_TABLE_NAME'))
+
+    counters_table.put_item(Item={'event_id': saved_event['event_id'], 'shard': 0, 'participants': 2})
+    participants.get_participant_counts([saved_event['event_id']])
+
+    # Written by another container, this one doesn't know about it
+    counters_table.put_item(Item={'event_id': saved_event['event_id'], 'shard': 1, 'participants': 1})
+
+    # Act
+    cached_counts = participants.get_participant_counts([saved_event['event_id']])
+
+    real_monotonic = time.monotonic
+    monkeypatch.setattr(participants.time, 'monotonic', lambda: real_monotonic() + participants.PARTICIPANT_COUNT_CACHE_TTL_SECONDS)
+
+    fresh_counts = participants.get_participant_counts([saved_event['event_id']])
+
+    # Assert
+    assert cached_counts[saved_event['event_id']] == 2
+    assert fresh_counts[saved_event['event_id']] == 3
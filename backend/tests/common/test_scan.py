@@ -0,0 +1,115 @@
+import boto3
+import os
+import threading
+import pytest
+from botocore.exceptions import ClientError
+
+import backend.common.scan as scan_module
+from backend.common.scan import ParallelScan
+
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_users_table
+
+def fill_users_table(count):
+    table = boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('USERS_TABLE_NAME'))
+
+    with table.batch_writer() as batch:
+        for index in range(count):
+            batch.put_item(Item={'email': f'user{index}@gmail.com', 'points': index})
+
+    return table
+
+# Tests
+
+def test_parallel_scan_returns_every_item_once(create_users_table):
+    # Arrange
+    table = fill_users_table(250)
+
+    # Act
+    with ParallelScan(table, total_segments=4, Limit=20) as scan:
+        emails = [item['email'] for item in scan]
+
+    # Assert
+    assert sorted(emails) == sorted(f'user{index}@gmail.com' for index in range(250))
+    assert scan.stats['pages'] > 4
+    assert scan.remaining_segments() == {}
+
+def test_parallel_scan_resumes_after_item_budget(create_users_table):
+    # Arrange
+    table = fill_users_table(100)
+    emails = []
+    segments = None
+
+    # Act
+    while True:
+        with ParallelScan(table, total_segments=3, segments=segments, max_items=15, Limit=7) as scan:
+            page = [item['email'] for item in scan]
+
+        assert len(page) <= 15
+
+        emails.extend(page)
+        segments = scan.remaining_segments()
+
+        if not segments:
+            break
+
+    # Assert
+    assert sorted(emails) == sorted(f'user{index}@gmail.com' for index in range(100))
+
+def test_parallel_scan_stops_when_caller_breaks(create_users_table):
+    # Arrange
+    table = fill_users_table(60)
+
+    # Act
+    with ParallelScan(table, total_segments=2, Limit=5) as scan:
+        for first_item in scan:
+            break
+
+        remaining = scan.remaining_segments()
+
+    # Assert
+    assert first_item['email'].startswith('user')
+    assert remaining
+
+def test_parallel_scan_backs_off_when_throttled(create_users_table, monkeypatch):
+    # Arrange
+    table = fill_users_table(30)
+    monkeypatch.setattr(scan_module, 'SCAN_BACKOFF_BASE_SECONDS', 0.001)
+
+    throttled_table = ThrottlingTable(table, throttles=3)
+
+    # Act
+    with ParallelScan(throttled_table, total_segments=2) as scan:
+        emails = [item['email'] for item in scan]
+
+    # Assert
+    assert len(emails) == 30
+    assert scan.stats['throttles'] == 3
+
+def test_parallel_scan_raises_other_errors(create_users_table):
+    # Arrange
+    table = fill_users_table(5)
+
+    # Act / Assert
+    with pytest.raises(ClientError):
+        with ParallelScan(table, total_segments=2, FilterExpression='no_such_function(email)') as scan:
+            list(scan)
+
+class ThrottlingTable:
+    def __init__(self, table, throttles):
+        self.table = table
+        self.throttles = throttles
+        self.key_schema = table.key_schema
+        self.lock = threading.Lock()
+
+    def scan(self, **kwargs):
+        with self.lock:
+            should_throttle = self.throttles > 0
+            self.throttles -= 1
+
+        if should_throttle:
+            raise ClientError(
+                {'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': 'Throttled'}},
+                'Scan'
+            )
+
+        return self.table.scan(**kwargs)
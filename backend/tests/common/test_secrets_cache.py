@@ -0,0 +1,125 @@
+import json
+import boto3
+import jwt
+from datetime import datetime, timedelta, timezone
+
+import backend.common.common as common_handler
+
+from backend.tests.common_test_setup import aws_credentials, secrets_manager_eu_central_1_mock, create_jwt_secret, setup_env_variables
+
+JWT_SECRET_NAME = 'python-lambda-app/prod/jwt-secret'
+SECRETS_REGION_NAME = 'eu-central-1'
+
+def age_cached_secret(seconds):
+    for cached_entry in common_handler._secrets_cache.values():
+        cached_entry['fetched_at'] -= seconds
+
+# Tests
+
+def test_when_secret_requested_twice_second_call_is_cache_hit(create_jwt_secret, setup_env_variables):
+    # Act
+    first = common_handler.get_secrets_from_aws_secrets_manager(JWT_SECRET_NAME, SECRETS_REGION_NAME)
+    second = common_handler.get_secrets_from_aws_secrets_manager(JWT_SECRET_NAME, SECRETS_REGION_NAME)
+
+    stats = common_handler.get_secrets_cache_stats()
+
+    # Assert
+    assert first == second
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+    assert stats['size'] == 1
+
+def test_when_secret_expired_and_stale_while_revalidate_disabled_fetches_again(create_jwt_secret, setup_env_variables, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(common_handler, 'SECRETS_CACHE_STALE_WHILE_REVALIDATE', False)
+
+    common_handler.get_secrets_from_aws_secrets_manager(JWT_SECRET_NAME, SECRETS_REGION_NAME)
+    age_cached_secret(common_handler.SECRETS_CACHE_TTL_SECONDS + 1)
+
+    # Act
+    common_handler.get_secrets_from_aws_secrets_manager(JWT_SECRET_NAME, SECRETS_REGION_NAME)
+
+    stats = common_handler.get_secrets_cache_stats()
+
+    # Assert
+    assert stats['misses'] == 2
+    assert stats['hits'] == 0
+    assert stats['stale_hits'] == 0
+
+def test_when_secret_expired_and_stale_while_revalidate_enabled_serves_stale_value(create_jwt_secret, setup_env_variables, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(common_handler, 'SECRETS_CACHE_STALE_WHILE_REVALIDATE', True)
+
+    cached = common_handler.get_secrets_from_aws_secrets_manager(JWT_SECRET_NAME, SECRETS_REGION_NAME)
+    age_cached_secret(common_handler.SECRETS_CACHE_TTL_SECONDS + 1)
+
+    # Act
+    stale = common_handler.get_secrets_from_aws_secrets_manager(JWT_SECRET_NAME, SECRETS_REGION_NAME)
+
+    stats = common_handler.get_secrets_cache_stats()
+
+    # Assert
+    assert stale == cached
+    assert stats['misses'] == 1
+    assert stats['stale_hits'] == 1
+
+def test_when_secret_rotated_token_signed_with_new_secret_is_accepted(create_jwt_secret, setup_env_variables):
+    # Arrange
+    common_handler.get_secrets_from_aws_secrets_manager(JWT_SECRET_NAME, SECRETS_REGION_NAME)
+    age_cached_secret(common_handler.SECRETS_CACHE_MIN_REFRESH_INTERVAL_SECONDS + 1)
+
+    boto3.client('secretsmanager').put_secret_value(
+        SecretId=JWT_SECRET_NAME,
+        SecretString=json.dumps({
+            'jwt_secret': 'rotatedjwtsecretrotatedjwtsecretrotatedjwtsecret',
+            'refresh_secret': 'rotatedrefreshsecretrotatedrefreshsecret'
+        })
+    )
+
+    token = jwt.encode(
+        {'email': 'john.doe@gmail.com', 'exp': datetime.now(timezone.utc) + timedelta(minutes=5)},
+        'rotatedjwtsecretrotatedjwtsecretrotatedjwtsecret',
+        algorithm='HS256'
+    )
+
+    event = {
+        'headers': {
+            'authorization': f'Bearer {token}',
+        }
+    }
+
+    # Act
+    error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(event)
+
+    stats = common_handler.get_secrets_cache_stats()
+
+    # Assert
+    assert error_response is None
+    assert email == 'john.doe@gmail.com'
+    assert stats['invalidations'] == 1
+
+def test_when_token_signature_invalid_secret_is_not_refetched_more_than_once(create_jwt_secret, setup_env_variables):
+    # Arrange
+    token = jwt.encode(
+        {'email': 'john.doe@gmail.com', 'exp': datetime.now(timezone.utc) + timedelta(minutes=5)},
+        'someoneelsessecretsomeoneelsessecretsomeoneelsessecret',
+        algorithm='HS256'
+    )
+
+    event = {
+        'headers': {
+            'authorization': f'Bearer {token}',
+        }
+    }
+
+    # Act
+    for _ in range(5):
+        error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(event)
+
+    stats = common_handler.get_secrets_cache_stats()
+
+    # Assert
+    assert error_response['statusCode'] == 401
+    assert email is None
+    assert stats['misses'] == 1
+    assert stats['invalidations'] == 0
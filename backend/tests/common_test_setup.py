@@ -2,9 +2,11 @@ import os
 import pytest
 import boto3
 import json
+import threading
 from unittest.mock import patch
 
 from moto import mock_aws
+from moto.dynamodb.models import DynamoDBBackend
 
 @pytest.fixture(scope="function")
 def aws_credentials():
@@ -20,6 +22,18 @@ def dynamodb_eu_central_1_mock(aws_credentials):
     with mock_aws():
         yield boto3.resource("dynamodb", region_name="eu-central-1")
 
+@pytest.fixture(scope="function")
+def isolated_transactions(monkeypatch):
+    # DynamoDB isolates transactions, moto runs them on shared tables and restores a copy on failure
+    transaction_lock = threading.Lock()
+    transact_write_items = DynamoDBBackend.transact_write_items
+
+    def locked_transact_write_items(self, *args, **kwargs):
+        with transaction_lock:
+            return transact_write_items(self, *args, **kwargs)
+
+    monkeypatch.setattr(DynamoDBBackend, 'transact_write_items', locked_transact_write_items)
+
 # Users table setup
 @pytest.fixture(scope="function")
 def create_users_table(dynamodb_eu_central_1_mock):
@@ -37,6 +51,37 @@ def create_users_table(dynamodb_eu_central_1_mock):
             {
                 'AttributeName': 'email',
                 'AttributeType': 'S'
+            },
+            {
+                'AttributeName': 'leaderboard_bucket',
+                'AttributeType': 'S'
+            },
+            {
+                'AttributeName': 'leaderboard_score',
+                'AttributeType': 'S'
+            }
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                'IndexName': 'leaderboard-index',
+                'KeySchema': [
+                    {
+                        'AttributeName': 'leaderboard_bucket',
+                        'KeyType': 'HASH'
+                    },
+                    {
+                        'AttributeName': 'leaderboard_score',
+                        'KeyType': 'RANGE'
+                    }
+                ],
+                'Projection': {
+                    'ProjectionType': 'INCLUDE',
+                    'NonKeyAttributes': ['first_name', 'last_name', 'points']
+                },
+                'ProvisionedThroughput': {
+                    'ReadCapacityUnits': 5,
+                    'WriteCapacityUnits': 5
+                }
             }
         ],
         ProvisionedThroughput={
@@ -190,6 +235,312 @@ def create_connections_table(dynamodb_eu_central_1_mock):
     # Wait until the table exists
     table.meta.client.get_waiter('table_exists').wait(TableName=os.getenv('CONNECTIONS_TABLE_NAME'))
 
+# Clubs table setup
+@pytest.fixture(scope="function")
+def create_clubs_table(dynamodb_eu_central_1_mock):
+    os.environ["CLUBS_TABLE_NAME"] = "clubs"
+
+    table = boto3.resource('dynamodb').create_table(
+        TableName=os.getenv('CLUBS_TABLE_NAME'),
+        KeySchema=[
+            {
+                'AttributeName': 'club_id',
+                'KeyType': 'HASH'
+            }
+        ],
+        AttributeDefinitions=[
+            {
+                'AttributeName': 'club_id',
+                'AttributeType': 'S'
+            }
+        ],
+        ProvisionedThroughput={
+            'ReadCapacityUnits': 5,
+            'WriteCapacityUnits': 5
+        }
+    )
+
+    # Wait until the table exists
+    table.meta.client.get_waiter('table_exists').wait(TableName=os.getenv('CLUBS_TABLE_NAME'))
+
+# Events table setup
+@pytest.fixture(scope="function")
+def create_events_table(dynamodb_eu_central_1_mock):
+    os.environ["EVENTS_TABLE_NAME"] = "events"
+
+    table = boto3.resource('dynamodb').create_table(
+        TableName=os.getenv('EVENTS_TABLE_NAME'),
+        KeySchema=[
+            {
+                'AttributeName': 'event_id',
+                'KeyType': 'HASH'
+            }
+        ],
+        AttributeDefinitions=[
+            {
+                'AttributeName': 'event_id',
+                'AttributeType': 'S'
+            },
+            {
+                'AttributeName': 'geohash_3',
+                'AttributeType': 'S'
+            },
+            {
+                'AttributeName': 'geohash',
+                'AttributeType': 'S'
+            }
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                'IndexName': 'geohash-index',
+                'KeySchema': [
+                    {
+                        'AttributeName': 'geohash_3',
+                        'KeyType': 'HASH'
+                    },
+                    {
+                        'AttributeName': 'geohash',
+                        'KeyType': 'RANGE'
+                    }
+                ],
+                'Projection': {
+                    'ProjectionType': 'ALL'
+                },
+                'ProvisionedThroughput': {
+                    'ReadCapacityUnits': 5,
+                    'WriteCapacityUnits': 5
+                }
+            }
+        ],
+        ProvisionedThroughput={
+            'ReadCapacityUnits': 5,
+            'WriteCapacityUnits': 5
+        }
+    )
+
+    # Wait until the table exists
+    table.meta.client.get_waiter('table_exists').wait(TableName=os.getenv('EVENTS_TABLE_NAME'))
+
+# Event images table setup
+@pytest.fixture(scope="function")
+def create_event_images_table(dynamodb_eu_central_1_mock):
+    os.environ["EVENT_IMAGES_TABLE_NAME"] = "event_images"
+
+    table = boto3.resource('dynamodb').create_table(
+        TableName=os.getenv('EVENT_IMAGES_TABLE_NAME'),
+        KeySchema=[
+            {
+                'AttributeName': 'id',
+                'KeyType': 'HASH'
+            }
+        ],
+        AttributeDefinitions=[
+            {
+                'AttributeName': 'id',
+                'AttributeType': 'S'
+            },
+            {
+                'AttributeName': 'event_id',
+                'AttributeType': 'S'
+            },
+            {
+                'AttributeName': 'created_at',
+                'AttributeType': 'S'
+            }
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                'IndexName': 'event_id-created_at-index',
+                'KeySchema': [
+                    {
+                        'AttributeName': 'event_id',
+                        'KeyType': 'HASH'
+                    },
+                    {
+                        'AttributeName': 'created_at',
+                        'KeyType': 'RANGE'
+                    }
+                ],
+                'Projection': {
+                    'ProjectionType': 'ALL'
+                },
+                'ProvisionedThroughput': {
+                    'ReadCapacityUnits': 5,
+                    'WriteCapacityUnits': 5
+                }
+            }
+        ],
+        ProvisionedThroughput={
+            'ReadCapacityUnits': 5,
+            'WriteCapacityUnits': 5
+        }
+    )
+
+    # Wait until the table exists
+    table.meta.client.get_waiter('table_exists').wait(TableName=os.getenv('EVENT_IMAGES_TABLE_NAME'))
+
+# Event participants table setup
+@pytest.fixture(scope="function")
+def create_event_participants_table(dynamodb_eu_central_1_mock):
+    os.environ["EVENT_PARTICIPANTS_TABLE_NAME"] = "event_participants"
+
+    table = boto3.resource('dynamodb').create_table(
+        TableName=os.getenv('EVENT_PARTICIPANTS_TABLE_NAME'),
+        KeySchema=[
+            {
+                'AttributeName': 'event_id',
+                'KeyType': 'HASH'
+            },
+            {
+                'AttributeName': 'user_email',
+                'KeyType': 'RANGE'
+            }
+        ],
+        AttributeDefinitions=[
+            {
+                'AttributeName': 'event_id',
+                'AttributeType': 'S'
+            },
+            {
+                'AttributeName': 'user_email',
+                'AttributeType': 'S'
+            },
+            {
+                'AttributeName': 'joined_at',
+                'AttributeType': 'S'
+            }
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                'IndexName': 'user_email-joined_at-index',
+                'KeySchema': [
+                    {
+                        'AttributeName': 'user_email',
+                        'KeyType': 'HASH'
+                    },
+                    {
+                        'AttributeName': 'joined_at',
+                        'KeyType': 'RANGE'
+                    }
+                ],
+                'Projection': {
+                    'ProjectionType': 'KEYS_ONLY'
+                },
+                'ProvisionedThroughput': {
+                    'ReadCapacityUnits': 5,
+                    'WriteCapacityUnits': 5
+                }
+            }
+        ],
+        ProvisionedThroughput={
+            'ReadCapacityUnits': 5,
+            'WriteCapacityUnits': 5
+        }
+    )
+
+    # Wait until the table exists
+    table.meta.client.get_waiter('table_exists').wait(TableName=os.getenv('EVENT_PARTICIPANTS_TABLE_NAME'))
+
+# Event participant counters table setup
+@pytest.fixture(scope="function")
+def create_event_participant_counters_table(dynamodb_eu_central_1_mock):
+    os.environ["EVENT_PARTICIPANT_COUNTERS_TABLE_NAME"] = "event_participant_counters"
+
+    table = boto3.resource('dynamodb').create_table(
+        TableName=os.getenv('EVENT_PARTICIPANT_COUNTERS_TABLE_NAME'),
+        KeySchema=[
+            {
+                'AttributeName': 'event_id',
+                'KeyType': 'HASH'
+            },
+            {
+                'AttributeName': 'shard',
+                'KeyType': 'RANGE'
+            }
+        ],
+        AttributeDefinitions=[
+            {
+                'AttributeName': 'event_id',
+                'AttributeType': 'S'
+            },
+            {
+                'AttributeName': 'shard',
+                'AttributeType': 'N'
+            }
+        ],
+        ProvisionedThroughput={
+            'ReadCapacityUnits': 5,
+            'WriteCapacityUnits': 5
+        }
+    )
+
+    # Wait until the table exists
+    table.meta.client.get_waiter('table_exists').wait(TableName=os.getenv('EVENT_PARTICIPANT_COUNTERS_TABLE_NAME'))
+
+# Giveaways table setup
+@pytest.fixture(scope="function")
+def create_giveaways_table(dynamodb_eu_central_1_mock):
+    os.environ["GIVEAWAY_TABLE_NAME"] = "giveaways"
+
+    table = boto3.resource('dynamodb').create_table(
+        TableName=os.getenv('GIVEAWAY_TABLE_NAME'),
+        KeySchema=[
+            {
+                'AttributeName': 'giveaway_id',
+                'KeyType': 'HASH'
+            }
+        ],
+        AttributeDefinitions=[
+            {
+                'AttributeName': 'giveaway_id',
+                'AttributeType': 'S'
+            }
+        ],
+        ProvisionedThroughput={
+            'ReadCapacityUnits': 5,
+            'WriteCapacityUnits': 5
+        }
+    )
+
+    # Wait until the table exists
+    table.meta.client.get_waiter('table_exists').wait(TableName=os.getenv('GIVEAWAY_TABLE_NAME'))
+
+# Giveaway entries table setup
+@pytest.fixture(scope="function")
+def create_giveaway_entries_table(dynamodb_eu_central_1_mock):
+    os.environ["GIVEAWAY_ENTRIES_TABLE_NAME"] = "giveaway_entries"
+
+    table = boto3.resource('dynamodb').create_table(
+        TableName=os.getenv('GIVEAWAY_ENTRIES_TABLE_NAME'),
+        KeySchema=[
+            {
+                'AttributeName': 'giveaway_id',
+                'KeyType': 'HASH'
+            },
+            {
+                'AttributeName': 'user_email',
+                'KeyType': 'RANGE'
+            }
+        ],
+        AttributeDefinitions=[
+            {
+                'AttributeName': 'giveaway_id',
+                'AttributeType': 'S'
+            },
+            {
+                'AttributeName': 'user_email',
+                'AttributeType': 'S'
+            }
+        ],
+        ProvisionedThroughput={
+            'ReadCapacityUnits': 5,
+            'WriteCapacityUnits': 5
+        }
+    )
+
+    # Wait until the table exists
+    table.meta.client.get_waiter('table_exists').wait(TableName=os.getenv('GIVEAWAY_ENTRIES_TABLE_NAME'))
+
 # SecretsManager setup
 @pytest.fixture(scope="function")
 def secrets_manager_eu_central_1_mock(aws_credentials):
@@ -222,8 +573,22 @@ def s3_bucket_eu_central_1_mock(aws_credentials):
 
 @pytest.fixture(scope="function")
 def create_profile_pictures_bucket(s3_bucket_eu_central_1_mock):
+    os.environ["PROFILE_PICTURES_BUCKET"] = "lambda-profile-pictures"
+    os.environ["PROFILE_PICTURES_PREFIX"] = "profile-pictures/"
+
+    boto3.client('s3').create_bucket(
+        Bucket=os.getenv('PROFILE_PICTURES_BUCKET'),
+        CreateBucketConfiguration={
+            'LocationConstraint': 'eu-central-1'
+        }
+    )
+
+@pytest.fixture(scope="function")
+def create_event_pictures_bucket(s3_bucket_eu_central_1_mock):
+    os.environ["EVENT_PICTURES_BUCKET"] = "lambda-event-pictures"
+
     boto3.client('s3').create_bucket(
-        Bucket='lambda-profile-pictures',
+        Bucket=os.getenv('EVENT_PICTURES_BUCKET'),
         CreateBucketConfiguration={
             'LocationConstraint': 'eu-central-1'
         }
@@ -0,0 +1,21 @@
+import pytest
+
+import backend.common.common as common_handler
+import backend.common.clients as aws_clients
+import backend.common.images as images
+import backend.common.participants as participants
+
+# Caches live for the whole container, so reset them between tests
+@pytest.fixture(autouse=True)
+def clear_container_caches():
+    common_handler.clear_secrets_cache()
+    common_handler.clear_jwt_cache()
+    aws_clients.reset_clients()
+    images.clear_presigned_url_cache()
+    participants.clear_participant_count_cache()
+    yield
+    common_handler.clear_secrets_cache()
+    common_handler.clear_jwt_cache()
+    aws_clients.reset_clients()
+    images.clear_presigned_url_cache()
+    participants.clear_participant_count_cache()
@@ -0,0 +1,87 @@
+import json
+
+from backend.events_service.events import event_gallery_lambda
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_event_images_table, secrets_manager_eu_central_1_mock, create_jwt_secret, setup_env_variables
+
+def gallery_request(**query_params):
+    return arrange.authorized_request('john.doe@gmail.com', query=query_params)
+
+# Tests
+
+def test_when_event_id_missing_return_400(create_event_images_table, create_jwt_secret, setup_env_variables):
+    # Act
+    result = event_gallery_lambda.lambda_handler(gallery_request(), "")
+
+    # Assert
+    assert result["statusCode"] == 400
+
+def test_when_paging_with_cursor_return_every_image_once_newest_first(create_event_images_table, create_jwt_secret, setup_env_variables):
+    # Arrange
+    for minute in range(25):
+        arrange.add_event_image_to_the_table('event-1', f'2030-05-01T22:{minute:02d}:00+00:00')
+
+    arrange.add_event_image_to_the_table('event-2', '2030-05-01T22:30:00+00:00')
+
+    # Act
+    pages = []
+    cursor = None
+
+    while True:
+        query_params = {'event_id': 'event-1', 'limit': '10'}
+        if cursor:
+            query_params['cursor'] = cursor
+
+        result = event_gallery_lambda.lambda_handler(gallery_request(**query_params), "")
+        response = json.loads(result['body'])
+
+        assert result["statusCode"] == 200
+
+        pages.append(response['event_images'])
+        cursor = response['next_cursor']
+
+        if not cursor:
+            break
+
+    # Assert
+    created_at = [image['created_at'] for page in pages for image in page]
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert created_at == sorted(created_at, reverse=True)
+    assert len(set(created_at)) == 25
+
+def test_when_page_is_exactly_full_return_no_cursor(create_event_images_table, create_jwt_secret, setup_env_variables):
+    # Arrange
+    for minute in range(10):
+        arrange.add_event_image_to_the_table('event-1', f'2030-05-01T22:{minute:02d}:00+00:00')
+
+    # Act
+    result = event_gallery_lambda.lambda_handler(gallery_request(event_id='event-1', limit='10'), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert len(response['event_images']) == 10
+    assert response['next_cursor'] is None
+
+def test_when_cursor_belongs_to_another_event_return_400(create_event_images_table, create_jwt_secret, setup_env_variables):
+    # Arrange
+    for minute in range(3):
+        arrange.add_event_image_to_the_table('event-1', f'2030-05-01T22:{minute:02d}:00+00:00')
+
+    first_page = json.loads(event_gallery_lambda.lambda_handler(gallery_request(event_id='event-1', limit='1'), "")['body'])
+
+    # Act
+    result = event_gallery_lambda.lambda_handler(gallery_request(event_id='event-2', cursor=first_page['next_cursor']), "")
+
+    # Assert
+    assert result["statusCode"] == 400
+    assert json.loads(result['body'])['message'] == 'Invalid cursor.'
+
+def test_when_limit_is_invalid_return_400(create_event_images_table, create_jwt_secret, setup_env_variables):
+    # Act
+    result = event_gallery_lambda.lambda_handler(gallery_request(event_id='event-1', limit='zero'), "")
+
+    # Assert
+    assert result["statusCode"] == 400
@@ -0,0 +1,93 @@
+import os
+import boto3
+
+from backend.events_service.events import event_image_uploaded_lambda
+import backend.common.images as images
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_events_table, s3_bucket_eu_central_1_mock, create_event_pictures_bucket
+
+def object_created(key):
+    return {
+        'source': 'aws.s3',
+        'detail-type': 'Object Created',
+        'detail': {
+            'bucket': {
+                'name': os.getenv('EVENT_PICTURES_BUCKET')
+            },
+            'object': {
+                'key': key
+            }
+        }
+    }
+
+def get_event(event_id):
+    return boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('EVENTS_TABLE_NAME')).get_item(Key={'event_id': event_id})['Item']
+
+# Tests
+
+def test_when_cover_uploaded_create_derivatives_and_mark_event(create_events_table, create_event_pictures_bucket):
+    # Arrange
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44)
+    arrange.add_event_picture_to_the_bucket(saved_event['event_id'], arrange.create_picture(1200, 900))
+
+    # Act
+    result = event_image_uploaded_lambda.lambda_handler(object_created(f"{saved_event['event_id']}.jpg"), "")
+
+    # Assert
+    assert result['processed'] == 1
+    assert get_event(saved_event['event_id'])['has_image'] is True
+    assert all(images.image_exists(os.getenv('EVENT_PICTURES_BUCKET'), key) for key in images.derivative_keys(f"{saved_event['event_id']}.jpg"))
+
+def test_when_s3_notification_record_is_received_process_it(create_events_table, create_event_pictures_bucket):
+    # Arrange
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44)
+    arrange.add_event_picture_to_the_bucket(saved_event['event_id'], arrange.create_picture(300, 200))
+
+    event = {
+        'Records': [
+            {
+                's3': {
+                    'bucket': {'name': os.getenv('EVENT_PICTURES_BUCKET')},
+                    'object': {'key': f"{saved_event['event_id']}.jpg"}
+                }
+            }
+        ]
+    }
+
+    # Act
+    result = event_image_uploaded_lambda.lambda_handler(event, "")
+
+    # Assert
+    assert result['processed'] == 1
+    assert get_event(saved_event['event_id'])['has_image'] is True
+
+def test_when_upload_is_not_an_image_delete_it(create_events_table, create_event_pictures_bucket):
+    # Arrange
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44)
+    arrange.add_event_picture_to_the_bucket(saved_event['event_id'], b'<html></html>')
+
+    # Act
+    event_image_uploaded_lambda.lambda_handler(object_created(f"{saved_event['event_id']}.jpg"), "")
+
+    # Assert
+    assert get_event(saved_event['event_id'])['has_image'] is False
+    assert not images.image_exists(os.getenv('EVENT_PICTURES_BUCKET'), f"{saved_event['event_id']}.jpg")
+
+def test_when_derivative_is_created_ignore_it(create_events_table, create_event_pictures_bucket):
+    # Act
+    result = event_image_uploaded_lambda.lambda_handler(object_created('derivatives/thumbnail/event.webp'), "")
+
+    # Assert
+    assert result['processed'] == 0
+
+def test_when_event_does_not_exist_delete_cover(create_events_table, create_event_pictures_bucket):
+    # Arrange
+    arrange.add_event_picture_to_the_bucket('missing-event', arrange.create_picture(300, 200))
+
+    # Act
+    result = event_image_uploaded_lambda.lambda_handler(object_created('missing-event.jpg'), "")
+
+    # Assert
+    assert result['processed'] == 0
+    assert not images.image_exists(os.getenv('EVENT_PICTURES_BUCKET'), 'missing-event.jpg')
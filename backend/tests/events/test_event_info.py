@@ -0,0 +1,64 @@
+import json
+import os
+import boto3
+
+from backend.events_service.events import event_info
+import backend.common.gallery as gallery
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_events_table, create_event_participant_counters_table, create_event_images_table, secrets_manager_eu_central_1_mock, create_jwt_secret, setup_env_variables
+
+def info_request(event_id):
+    return arrange.authorized_request('john.doe@gmail.com', query={'event_id': event_id})
+
+# Tests
+
+def test_when_event_not_found_return_404(create_events_table, create_event_participant_counters_table, create_event_images_table, create_jwt_secret, setup_env_variables):
+    # Act
+    result = event_info.lambda_handler(info_request('missing'), "")
+
+    # Assert
+    assert result["statusCode"] == 404
+
+def test_when_event_found_return_event_and_first_gallery_page_200(create_events_table, create_event_participant_counters_table, create_event_images_table, create_jwt_secret, setup_env_variables):
+    # Arrange
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44, title='Roman night')
+
+    for minute in range(gallery.GALLERY_DEFAULT_PAGE_SIZE + 5):
+        arrange.add_event_image_to_the_table(saved_event['event_id'], f'2030-05-01T22:{minute:02d}:00+00:00')
+
+    arrange.add_event_image_to_the_table('other-event', '2030-05-01T23:00:00+00:00')
+
+    requests = arrange.count_dynamodb_requests()
+
+    # Act
+    result = event_info.lambda_handler(info_request(saved_event['event_id']), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert response['event_info']['title'] == 'Roman night'
+    assert len(response['event_images']) == gallery.GALLERY_DEFAULT_PAGE_SIZE
+    assert response['event_images'][0]['created_at'] == f'2030-05-01T22:{gallery.GALLERY_DEFAULT_PAGE_SIZE + 4:02d}:00+00:00'
+    assert response['event_images_next_cursor']
+    assert requests['Scan'] == 0
+    assert requests['Query'] == 1
+
+def test_when_event_has_sharded_joins_return_them_with_earlier_participants_200(create_events_table, create_event_participant_counters_table, create_event_images_table, create_jwt_secret, setup_env_variables):
+    # Arrange
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44)
+    arrange.set_attribute_on_item(os.getenv('EVENTS_TABLE_NAME'), {'event_id': saved_event['event_id']}, 'participants', 2)
+
+    counters_table = boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('EVENT_PARTICIPANT_COUNTERS_TABLE_NAME'))
+    counters_table.put_item(Item={'event_id': saved_event['event_id'], 'shard': 0, 'participants': 4})
+    counters_table.put_item(Item={'event_id': saved_event['event_id'], 'shard': 7, 'participants': -1})
+
+    # Act
+    result = event_info.lambda_handler(info_request(saved_event['event_id']), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert response['event_info']['participants'] == 5
@@ -0,0 +1,87 @@
+import json
+import os
+
+from backend.events_service.events import get_clubs_events_lambda
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_clubs_table, create_events_table, create_event_participant_counters_table, s3_bucket_eu_central_1_mock, create_event_pictures_bucket
+
+# Tests
+
+def test_when_club_not_found_return_400(create_clubs_table, create_events_table, create_event_participant_counters_table, create_event_pictures_bucket):
+    # Arrange
+    event = {
+        'queryStringParameters': {
+            'club_id': 'missing@club.com'
+        }
+    }
+
+    # Act
+    result = get_clubs_events_lambda.lambda_handler(event, "")
+
+    # Assert
+    assert result["statusCode"] == 400
+
+def test_when_club_has_events_fetch_them_in_batches_return_200(create_clubs_table, create_events_table, create_event_participant_counters_table, create_event_pictures_bucket):
+    # Arrange
+    arrange.add_club_to_the_table('club@club.com', 45.33, 14.44)
+
+    events = [arrange.add_event_to_the_table(45.33, 14.44, title=f'Event {index}', theme='rock') for index in range(120)]
+    event_ids = [item['event_id'] for item in events]
+
+    for event_id in event_ids:
+        arrange.add_event_picture_to_the_bucket(event_id)
+
+    arrange.set_attribute_on_item(os.getenv('CLUBS_TABLE_NAME'), {'club_id': 'club@club.com'}, 'events', event_ids)
+
+    requests = arrange.count_dynamodb_requests()
+
+    event = {
+        'queryStringParameters': {
+            'club_id': 'club@club.com'
+        }
+    }
+
+    # Act
+    result = get_clubs_events_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert [item['event_id'] for item in response['events']] == event_ids
+    assert response['events'][5]['theme'] == 'rock'
+    assert requests['GetItem'] == 1
+    # Two for the events, twelve for their ten counter shards each
+    assert requests['BatchGetItem'] == 14
+
+def test_when_inline_image_is_missing_return_null_image_and_200(create_clubs_table, create_events_table, create_event_participant_counters_table, create_event_pictures_bucket):
+    # Arrange
+    arrange.add_club_to_the_table('club@club.com', 45.33, 14.44)
+
+    with_picture = arrange.add_event_to_the_table(45.33, 14.44, title='With picture')
+    without_picture = arrange.add_event_to_the_table(45.33, 14.44, title='Without picture')
+
+    arrange.add_event_picture_to_the_bucket(with_picture['event_id'], b'picture')
+    arrange.set_attribute_on_item(
+        os.getenv('CLUBS_TABLE_NAME'),
+        {'club_id': 'club@club.com'},
+        'events',
+        [without_picture['event_id'], with_picture['event_id']]
+    )
+
+    event = {
+        'queryStringParameters': {
+            'club_id': 'club@club.com',
+            'image_mode': 'inline'
+        }
+    }
+
+    # Act
+    result = get_clubs_events_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert [item['image'] for item in response['events']] == [None, 'cGljdHVyZQ==']
@@ -0,0 +1,187 @@
+import io
+import json
+import os
+import base64
+from datetime import datetime, timedelta
+from PIL import Image
+
+from backend.events_service.events import get_users_events_lambda
+import backend.common.images as images
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table, s3_bucket_eu_central_1_mock, create_event_pictures_bucket, secrets_manager_eu_central_1_mock, create_jwt_secret, setup_env_variables
+
+def join_events(email, event_ids):
+    # The first event is the most recently joined one, so it comes first
+    joined_at = datetime(2030, 1, 1)
+
+    for index, event_id in enumerate(event_ids):
+        arrange.add_event_participant_to_the_table(event_id, email, (joined_at - timedelta(minutes=index)).isoformat())
+
+# Tests
+
+def test_when_user_joined_no_events_return_empty_page_200(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table, create_event_pictures_bucket):
+    # Act
+    result = get_users_events_lambda.lambda_handler(arrange.authorized_request('john.doe@gmail.com'), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert response["events"] == []
+    assert response["next_cursor"] is None
+
+def test_when_user_joined_events_fetch_them_in_one_batch_return_200(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table, create_event_pictures_bucket):
+    # Arrange
+    arrange.add_user_to_the_table('john.doe@gmail.com', 'password')
+
+    events = [arrange.add_event_to_the_table(45.33, 14.44, title=f'Event {index}') for index in range(40)]
+    event_ids = [item['event_id'] for item in events] + ['deleted-event']
+
+    for event_id in event_ids[:-1]:
+        arrange.add_event_picture_to_the_bucket(event_id)
+
+    join_events('john.doe@gmail.com', event_ids)
+
+    requests = arrange.count_dynamodb_requests()
+
+    # Act
+    result = get_users_events_lambda.lambda_handler(arrange.authorized_request('john.doe@gmail.com'), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert [item['event_id'] for item in response['events']] == event_ids[:-1]
+    assert response['events'][0]['title'] == 'Event 0'
+    assert f"{event_ids[0]}.jpg" in response['events'][0]['image_url']
+    assert 'image' not in response['events'][0]
+    # One for the events, four for their ten counter shards each
+    assert requests['Query'] == 1
+    assert requests['BatchGetItem'] == 5
+
+def test_when_inline_image_mode_return_base64_images(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table, create_event_pictures_bucket):
+    # Arrange
+    arrange.add_user_to_the_table('john.doe@gmail.com', 'password')
+
+    with_picture = arrange.add_event_to_the_table(45.33, 14.44, title='With picture')
+    without_picture = arrange.add_event_to_the_table(45.33, 14.44, title='Without picture')
+
+    arrange.add_event_picture_to_the_bucket(with_picture['event_id'], b'picture')
+    join_events('john.doe@gmail.com', [with_picture['event_id'], without_picture['event_id']])
+
+    event = arrange.authorized_request('john.doe@gmail.com')
+    event['queryStringParameters'] = {'image_mode': 'inline'}
+
+    # Act
+    result = get_users_events_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert [item['image'] for item in response['events']] == ['cGljdHVyZQ==', None]
+
+def test_when_thumbnail_size_requested_return_inline_derivative(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table, create_event_pictures_bucket):
+    # Arrange
+    arrange.add_user_to_the_table('john.doe@gmail.com', 'password')
+
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44, title='With picture')
+
+    images.save_image(os.getenv('EVENT_PICTURES_BUCKET'), f"{saved_event['event_id']}.jpg", arrange.create_picture(1600, 800))
+    join_events('john.doe@gmail.com', [saved_event['event_id']])
+
+    event = arrange.authorized_request('john.doe@gmail.com')
+    event['queryStringParameters'] = {'image_mode': 'inline', 'image_size': 'thumbnail', 'image_format': 'webp'}
+
+    # Act
+    result = get_users_events_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    picture = Image.open(io.BytesIO(base64.b64decode(response['events'][0]['image'])))
+
+    assert result["statusCode"] == 200
+    assert picture.format == 'WEBP'
+    assert picture.size == (200, 100)
+
+def test_when_medium_size_requested_return_derivative_url(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table, create_event_pictures_bucket):
+    # Arrange
+    arrange.add_user_to_the_table('john.doe@gmail.com', 'password')
+
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44, title='With picture')
+    join_events('john.doe@gmail.com', [saved_event['event_id']])
+
+    event = arrange.authorized_request('john.doe@gmail.com')
+    event['queryStringParameters'] = {'image_size': 'medium'}
+
+    # Act
+    result = get_users_events_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert f"derivatives/medium/{saved_event['event_id']}.jpg" in response['events'][0]['image_url']
+
+def test_when_event_has_no_uploaded_cover_return_null_image(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table, create_event_pictures_bucket):
+    # Arrange
+    arrange.add_user_to_the_table('john.doe@gmail.com', 'password')
+
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44, title='Cover never uploaded')
+    arrange.set_attribute_on_item(os.getenv('EVENTS_TABLE_NAME'), {'event_id': saved_event['event_id']}, 'has_image', False)
+    join_events('john.doe@gmail.com', [saved_event['event_id']])
+
+    # Act
+    result = get_users_events_lambda.lambda_handler(arrange.authorized_request('john.doe@gmail.com'), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert response['events'][0]['image_url'] is None
+
+def test_when_paging_with_cursor_return_every_event_once_most_recent_first(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table, create_event_pictures_bucket, create_jwt_secret, setup_env_variables):
+    # Arrange
+    event_ids = [arrange.add_event_to_the_table(45.33, 14.44, title=f'Event {index}')['event_id'] for index in range(7)]
+    join_events('john.doe@gmail.com', event_ids)
+    join_events('jane.doe@gmail.com', event_ids[:2])
+
+    found_ids = []
+    cursor = None
+
+    # Act
+    while True:
+        event = arrange.authorized_request('john.doe@gmail.com')
+        event['queryStringParameters'] = {'limit': '3', 'cursor': cursor} if cursor else {'limit': '3'}
+
+        response = json.loads(get_users_events_lambda.lambda_handler(event, "")['body'])
+
+        found_ids.extend(item['event_id'] for item in response['events'])
+        cursor = response['next_cursor']
+
+        if not cursor:
+            break
+
+    # Assert
+    assert found_ids == event_ids
+
+def test_when_cursor_belongs_to_another_user_return_400(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table, create_event_pictures_bucket, create_jwt_secret, setup_env_variables):
+    # Arrange
+    event_ids = [arrange.add_event_to_the_table(45.33, 14.44)['event_id'] for _ in range(3)]
+    join_events('jane.doe@gmail.com', event_ids)
+
+    event = arrange.authorized_request('jane.doe@gmail.com')
+    event['queryStringParameters'] = {'limit': '1'}
+
+    first_page = json.loads(get_users_events_lambda.lambda_handler(event, "")['body'])
+
+    event = arrange.authorized_request('john.doe@gmail.com')
+    event['queryStringParameters'] = {'cursor': first_page['next_cursor']}
+
+    # Act
+    result = get_users_events_lambda.lambda_handler(event, "")
+
+    # Assert
+    assert result["statusCode"] == 400
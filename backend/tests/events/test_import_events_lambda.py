@@ -0,0 +1,220 @@
+import json
+import os
+import base64
+import boto3
+
+from backend.events_service.events import import_events_lambda
+import backend.common.clients as aws_clients
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_clubs_table, create_events_table, create_giveaways_table
+
+def import_events(body, content_type='application/x-ndjson', is_base64_encoded=False):
+    return dict(
+        arrange.authorized_request('club@club.com', body=body),
+        isBase64Encoded=is_base64_encoded,
+        headers={
+            'content-type': content_type
+        }
+    )
+
+def event_row(**attributes):
+    row = {
+        'title': 'Roman night',
+        'description': 'Techno in the arena',
+        'startingAt': '2030-05-01 22:00',
+        'endingAt': '2030-05-02 04:00',
+        'genre': 'techno',
+        'giveaway': {
+            'prize': 'Two tickets',
+            'description': 'Join to win',
+            'name': 'Ticket giveaway'
+        }
+    }
+    row.update(attributes)
+
+    return json.dumps(row)
+
+def fail_dynamodb_requests(*operations, then_fail=()):
+    """
+    Makes the given DynamoDB operations raise from now on, and the then_fail ones too once
+    the first of them has failed.
+    """
+    failing = set(operations)
+
+    def fail_request(model, **kwargs):
+        if model.name in failing:
+            failing.update(then_fail)
+
+            raise RuntimeError(f'{model.name} failed')
+
+    aws_clients.get_dynamodb_client().meta.events.register('before-call.dynamodb', fail_request)
+
+CSV_HEADER = 'title,description,startingAt,endingAt,genre,giveaway_prize,giveaway_description,giveaway_name\n'
+
+# Tests
+
+def test_when_jsonl_rows_are_valid_save_events_giveaways_and_club_lists_return_200(create_clubs_table, create_events_table, create_giveaways_table):
+    # Arrange
+    arrange.add_club_to_the_table('club@club.com', 45.33, 14.44)
+
+    body = '\n'.join(event_row(title=f'Night {index}') for index in range(30))
+
+    # Act
+    result = import_events_lambda.lambda_handler(import_events(body), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    dynamodb = boto3.resource('dynamodb', region_name='eu-central-1')
+
+    club = dynamodb.Table(os.getenv('CLUBS_TABLE_NAME')).get_item(Key={'club_id': 'club@club.com'})['Item']
+    stored_event = dynamodb.Table(os.getenv('EVENTS_TABLE_NAME')).get_item(Key={'event_id': response['rows'][29]['event_id']})['Item']
+
+    assert result['statusCode'] == 200
+    assert response['created'] == 30
+    assert [row['row'] for row in response['rows']] == list(range(1, 31))
+    assert club['events'] == [row['event_id'] for row in response['rows']]
+    assert len(club['giveaways']) == 30
+    assert stored_event['title'] == 'Night 29'
+    assert stored_event['latitude'] == '45.33'
+    assert dynamodb.Table(os.getenv('GIVEAWAY_TABLE_NAME')).scan()['Count'] == 30
+
+def test_when_some_rows_are_invalid_report_them_and_save_the_rest_return_200(create_clubs_table, create_events_table, create_giveaways_table):
+    # Arrange
+    arrange.add_club_to_the_table('club@club.com', 45.33, 14.44)
+
+    body = '\n'.join([
+        event_row(),
+        event_row(genre=None),
+        '',
+        '{"title": ',
+        event_row(giveaway={'prize': 'Drinks'}),
+        event_row(title=5)
+    ])
+
+    # Act
+    result = import_events_lambda.lambda_handler(import_events(body), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result['statusCode'] == 200
+    assert response['created'] == 1
+    assert response['failed'] == 4
+    assert response['rows'][0]['status'] == 'created'
+    assert response['rows'][1] == {'row': 2, 'status': 'error', 'message': 'At least one of genre, type, or theme must be provided.'}
+    assert response['rows'][2] == {'row': 4, 'status': 'error', 'message': 'Row is not valid JSON.'}
+    assert response['rows'][3]['message'] == 'Missing required giveaway attribute: description'
+    assert response['rows'][4]['message'] == 'Attribute title must be of type str'
+
+def test_when_csv_is_base64_encoded_nest_giveaway_columns_return_200(create_clubs_table, create_events_table, create_giveaways_table):
+    # Arrange
+    arrange.add_club_to_the_table('club@club.com', 45.33, 14.44)
+
+    body = '\ufeff' + CSV_HEADER + \
+        'Roman night,"Techno, all night",2030-05-01 22:00,2030-05-02 04:00,techno,Two tickets,Join to win,Ticket giveaway\r\n' + \
+        'No genre,Missing genre,2030-05-08 22:00,2030-05-09 04:00,,Two tickets,Join to win,Ticket giveaway\r\n'
+
+    # Act
+    result = import_events_lambda.lambda_handler(import_events(base64.b64encode(body.encode('utf-8')).decode('utf-8'), 'text/csv', True), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    dynamodb = boto3.resource('dynamodb', region_name='eu-central-1')
+
+    stored_event = dynamodb.Table(os.getenv('EVENTS_TABLE_NAME')).get_item(Key={'event_id': response['rows'][0]['event_id']})['Item']
+    stored_giveaway = dynamodb.Table(os.getenv('GIVEAWAY_TABLE_NAME')).scan()['Items'][0]
+
+    assert result['statusCode'] == 200
+    assert response['created'] == 1
+    assert stored_event['description'] == 'Techno, all night'
+    assert stored_giveaway['name'] == 'Ticket giveaway'
+    assert stored_giveaway['event_id'] == stored_event['event_id']
+    assert response['rows'][1] == {'row': 3, 'status': 'error', 'message': 'At least one of genre, type, or theme must be provided.'}
+
+def test_when_rows_exceed_the_limit_stop_and_mark_report_truncated_return_200(create_clubs_table, create_events_table, create_giveaways_table, monkeypatch):
+    # Arrange
+    arrange.add_club_to_the_table('club@club.com', 45.33, 14.44)
+
+    monkeypatch.setattr(import_events_lambda, 'IMPORT_MAX_ROWS', 3)
+    monkeypatch.setattr(import_events_lambda, 'IMPORT_CHUNK_ROWS', 2)
+
+    requests = arrange.count_dynamodb_requests()
+
+    # Act
+    result = import_events_lambda.lambda_handler(import_events('\n'.join(event_row() for _ in range(5))), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result['statusCode'] == 200
+    assert response['created'] == 3
+    assert response['truncated'] is True
+    assert response['resume_from_row'] == 4
+    assert requests['UpdateItem'] == 2
+
+def test_when_time_budget_runs_out_stop_and_tell_where_to_resume_return_200(create_clubs_table, create_events_table, create_giveaways_table, monkeypatch):
+    # Arrange
+    arrange.add_club_to_the_table('club@club.com', 45.33, 14.44)
+
+    monkeypatch.setattr(import_events_lambda, 'IMPORT_TIME_BUDGET_SECONDS', -1)
+
+    # Act
+    result = import_events_lambda.lambda_handler(import_events('\n'.join(event_row() for _ in range(3))), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result['statusCode'] == 200
+    assert response['created'] == 0
+    assert response['truncated'] is True
+    assert response['resume_from_row'] == 1
+
+def test_when_club_lists_fail_to_update_remove_the_chunk_and_report_errors_return_200(create_clubs_table, create_events_table, create_giveaways_table):
+    # Arrange
+    arrange.add_club_to_the_table('club@club.com', 45.33, 14.44)
+
+    fail_dynamodb_requests('UpdateItem')
+
+    # Act
+    result = import_events_lambda.lambda_handler(import_events('\n'.join(event_row() for _ in range(3))), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    dynamodb = boto3.resource('dynamodb', region_name='eu-central-1')
+
+    assert result['statusCode'] == 200
+    assert response['failed'] == 3
+    assert {row['status'] for row in response['rows']} == {'error'}
+    assert dynamodb.Table(os.getenv('EVENTS_TABLE_NAME')).scan()['Count'] == 0
+    assert dynamodb.Table(os.getenv('GIVEAWAY_TABLE_NAME')).scan()['Count'] == 0
+
+def test_when_failed_chunk_cannot_be_removed_report_rows_unlinked_return_200(create_clubs_table, create_events_table, create_giveaways_table):
+    # Arrange
+    arrange.add_club_to_the_table('club@club.com', 45.33, 14.44)
+
+    # The cleanup's batch writes fail too, once the club update has failed
+    fail_dynamodb_requests('UpdateItem', then_fail=('BatchWriteItem',))
+
+    # Act
+    result = import_events_lambda.lambda_handler(import_events('\n'.join(event_row() for _ in range(2))), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    stored_event_ids = [item['event_id'] for item in boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('EVENTS_TABLE_NAME')).scan()['Items']]
+
+    assert result['statusCode'] == 200
+    assert response['failed'] == 0
+    assert response['unlinked'] == 2
+    assert sorted(row['event_id'] for row in response['rows']) == sorted(stored_event_ids)
+
+def test_when_content_type_is_not_supported_return_400(create_clubs_table, create_events_table, create_giveaways_table):
+    # Act
+    result = import_events_lambda.lambda_handler(import_events(event_row(), 'application/xml'), "")
+
+    # Assert
+    assert result['statusCode'] == 400
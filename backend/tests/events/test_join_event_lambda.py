@@ -0,0 +1,124 @@
+import json
+import os
+import boto3
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.events_service.events import join_event_lambda, leave_event_lambda
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table, isolated_transactions
+
+def join_event(email, event_id):
+    return arrange.authorized_request(email, body={'event_id': event_id})
+
+# Tests
+
+def test_when_user_joins_save_membership_and_count_participant_return_200(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table):
+    # Arrange
+    arrange.add_user_to_the_table('john.doe@gmail.com', 'password')
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44)
+
+    requests = arrange.count_dynamodb_requests()
+
+    # Act
+    result = join_event_lambda.lambda_handler(join_event('john.doe@gmail.com', saved_event['event_id']), "")
+
+    # Assert
+    dynamodb = boto3.resource('dynamodb', region_name='eu-central-1')
+
+    participant_count = arrange.count_event_participants(saved_event['event_id'])
+    membership = dynamodb.Table(os.getenv('EVENT_PARTICIPANTS_TABLE_NAME')).get_item(Key={'event_id': saved_event['event_id'], 'user_email': 'john.doe@gmail.com'})
+
+    assert result["statusCode"] == 200
+    assert participant_count == 1
+    assert 'joined_at' in membership['Item']
+    assert requests['TransactWriteItems'] == 1
+    assert requests['UpdateItem'] == 0
+
+def test_when_user_joins_twice_count_once_return_200(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table):
+    # Arrange
+    arrange.add_user_to_the_table('john.doe@gmail.com', 'password')
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44)
+
+    join_event_lambda.lambda_handler(join_event('john.doe@gmail.com', saved_event['event_id']), "")
+
+    # Act
+    result = join_event_lambda.lambda_handler(join_event('john.doe@gmail.com', saved_event['event_id']), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    participant_count = arrange.count_event_participants(saved_event['event_id'])
+
+    assert result["statusCode"] == 200
+    assert response['message'] == 'Already joined the event.'
+    assert participant_count == 1
+
+def test_when_event_not_found_return_404(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table):
+    # Arrange
+    arrange.add_user_to_the_table('john.doe@gmail.com', 'password')
+
+    # Act
+    result = join_event_lambda.lambda_handler(join_event('john.doe@gmail.com', 'missing-event'), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 404
+    assert response['message'] == 'Event not found'
+    assert boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('EVENT_PARTICIPANTS_TABLE_NAME')).scan()['Count'] == 0
+
+def test_when_event_was_deleted_after_a_leave_found_it_return_404(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table):
+    # Arrange
+    arrange.add_user_to_the_table('john.doe@gmail.com', 'password')
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44)
+
+    # The leave caches that the event exists
+    leave_event_lambda.lambda_handler(join_event('john.doe@gmail.com', saved_event['event_id']), "")
+
+    boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('EVENTS_TABLE_NAME')).delete_item(Key={'event_id': saved_event['event_id']})
+
+    # Act
+    result = join_event_lambda.lambda_handler(join_event('john.doe@gmail.com', saved_event['event_id']), "")
+
+    # Assert
+    assert result["statusCode"] == 404
+    assert arrange.count_event_participants(saved_event['event_id']) == 0
+
+def test_when_user_not_found_return_404(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table):
+    # Arrange
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44)
+
+    # Act
+    result = join_event_lambda.lambda_handler(join_event('john.doe@gmail.com', saved_event['event_id']), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 404
+    assert response['message'] == 'User not found'
+
+def test_when_users_join_concurrently_count_every_user_once(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table, isolated_transactions):
+    # Arrange
+    emails = [f'user{index}@gmail.com' for index in range(40)]
+
+    for email in emails:
+        arrange.add_user_to_the_table(email, 'password')
+
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44)
+
+    # Every user sends the join twice, like a client retrying after a timeout
+    requests = [join_event(email, saved_event['event_id']) for email in emails * 2]
+
+    # Act
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(lambda request: join_event_lambda.lambda_handler(request, ""), requests))
+
+    # Assert
+    dynamodb = boto3.resource('dynamodb', region_name='eu-central-1')
+
+    participant_count = arrange.count_event_participants(saved_event['event_id'])
+
+    assert all(result["statusCode"] == 200 for result in results)
+    assert participant_count == 40
+    assert dynamodb.Table(os.getenv('EVENT_PARTICIPANTS_TABLE_NAME')).scan()['Count'] == 40
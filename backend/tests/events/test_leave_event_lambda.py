@@ -0,0 +1,68 @@
+import json
+import os
+import boto3
+
+from backend.events_service.events import join_event_lambda
+from backend.events_service.events import leave_event_lambda
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table
+
+def event_request(email, event_id):
+    return arrange.authorized_request(email, body={'event_id': event_id})
+
+# Tests
+
+def test_when_participant_leaves_remove_membership_and_uncount_return_200(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table):
+    # Arrange
+    arrange.add_user_to_the_table('john.doe@gmail.com', 'password')
+    arrange.add_user_to_the_table('jane.doe@gmail.com', 'password')
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44)
+
+    join_event_lambda.lambda_handler(event_request('john.doe@gmail.com', saved_event['event_id']), "")
+    join_event_lambda.lambda_handler(event_request('jane.doe@gmail.com', saved_event['event_id']), "")
+
+    # Act
+    result = leave_event_lambda.lambda_handler(event_request('john.doe@gmail.com', saved_event['event_id']), "")
+
+    # Assert
+    dynamodb = boto3.resource('dynamodb', region_name='eu-central-1')
+
+    participant_count = arrange.count_event_participants(saved_event['event_id'])
+    participants = dynamodb.Table(os.getenv('EVENT_PARTICIPANTS_TABLE_NAME')).scan()['Items']
+
+    assert result["statusCode"] == 200
+    assert participant_count == 1
+    assert [item['user_email'] for item in participants] == ['jane.doe@gmail.com']
+
+def test_when_leaving_twice_uncount_once_return_200(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table):
+    # Arrange
+    arrange.add_user_to_the_table('john.doe@gmail.com', 'password')
+    arrange.add_user_to_the_table('jane.doe@gmail.com', 'password')
+    saved_event = arrange.add_event_to_the_table(45.33, 14.44)
+
+    join_event_lambda.lambda_handler(event_request('john.doe@gmail.com', saved_event['event_id']), "")
+    join_event_lambda.lambda_handler(event_request('jane.doe@gmail.com', saved_event['event_id']), "")
+    leave_event_lambda.lambda_handler(event_request('john.doe@gmail.com', saved_event['event_id']), "")
+
+    # Act
+    result = leave_event_lambda.lambda_handler(event_request('john.doe@gmail.com', saved_event['event_id']), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    participant_count = arrange.count_event_participants(saved_event['event_id'])
+
+    assert result["statusCode"] == 200
+    assert response['message'] == 'User is not registered for the event.'
+    assert participant_count == 1
+
+def test_when_event_not_found_return_404(create_users_table, create_events_table, create_event_participant_counters_table, create_event_participants_table):
+    # Arrange
+    arrange.add_event_participant_to_the_table('missing-event', 'john.doe@gmail.com', '2030-01-01T00:00:00')
+
+    # Act
+    result = leave_event_lambda.lambda_handler(event_request('john.doe@gmail.com', 'missing-event'), "")
+
+    # Assert
+    assert result["statusCode"] == 404
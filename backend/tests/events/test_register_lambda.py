@@ -0,0 +1,105 @@
+import json
+import os
+import base64
+import boto3
+import requests
+
+from backend.events_service.events import register_lambda
+import backend.common.images as images
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_clubs_table, create_events_table, create_giveaways_table, s3_bucket_eu_central_1_mock, create_event_pictures_bucket
+
+def register_event(**attributes):
+    body = {
+        'title': 'Roman night',
+        'description': 'Techno in the arena',
+        'startingAt': '2030-05-01 22:00',
+        'endingAt': '2030-05-02 04:00',
+        'genre': 'techno',
+        'giveaway': {
+            'prize': 'Two tickets',
+            'description': 'Join to win',
+            'name': 'Ticket giveaway'
+        }
+    }
+    body.update(attributes)
+
+    return arrange.authorized_request('club@club.com', body=body)
+
+# Tests
+
+def test_when_registered_return_presigned_cover_upload_200(create_clubs_table, create_events_table, create_giveaways_table, create_event_pictures_bucket):
+    # Arrange
+    arrange.add_club_to_the_table('club@club.com', 45.33, 14.44)
+
+    # Act
+    result = register_lambda.lambda_handler(register_event(event_image_content_type='image/png'), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    image_upload = response['image_upload']
+    policy = json.loads(base64.b64decode(image_upload['fields']['policy']))
+
+    upload_result = requests.post(image_upload['url'], data=image_upload['fields'], files={'file': arrange.create_picture(50, 50, 'PNG')})
+
+    stored_event = boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('EVENTS_TABLE_NAME')).get_item(Key={'event_id': response['event_id']})
+
+    assert result["statusCode"] == 200
+    assert image_upload['fields']['key'] == f"{response['event_id']}.jpg"
+    assert ['content-length-range', 1, images.IMAGE_UPLOAD_MAX_BYTES] in policy['conditions']
+    assert {'Content-Type': 'image/png'} in policy['conditions']
+    assert upload_result.status_code == 204
+    assert images.image_exists(os.getenv('EVENT_PICTURES_BUCKET'), f"{response['event_id']}.jpg")
+    assert stored_event['Item']['has_image'] is False
+
+def test_when_cover_content_type_is_not_an_image_return_400(create_clubs_table, create_events_table, create_giveaways_table, create_event_pictures_bucket):
+    # Arrange
+    arrange.add_club_to_the_table('club@club.com', 45.33, 14.44)
+
+    # Act
+    result = register_lambda.lambda_handler(register_event(event_image_content_type='text/html'), "")
+
+    # Assert
+    assert result["statusCode"] == 400
+
+def test_when_cover_sent_inline_store_only_original_return_200(create_clubs_table, create_events_table, create_giveaways_table, create_event_pictures_bucket):
+    # Arrange
+    arrange.add_club_to_the_table('club@club.com', 45.33, 14.44)
+
+    event_image = 'data:image/jpeg;base64,' + base64.b64encode(arrange.create_picture(400, 300)).decode('utf-8')
+
+    # Act
+    result = register_lambda.lambda_handler(register_event(event_image=event_image), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert response['image_upload'] is None
+    assert images.image_exists(os.getenv('EVENT_PICTURES_BUCKET'), f"{response['event_id']}.jpg")
+    assert not images.image_exists(os.getenv('EVENT_PICTURES_BUCKET'), f"derivatives/thumbnail/{response['event_id']}.jpg")
+
+def test_when_club_registers_events_append_them_to_its_lists_in_one_transaction(create_clubs_table, create_events_table, create_giveaways_table, create_event_pictures_bucket):
+    # Arrange
+    arrange.add_club_to_the_table('club@club.com', 45.33, 14.44)
+
+    requests = arrange.count_dynamodb_requests()
+
+    # Act
+    first = json.loads(register_lambda.lambda_handler(register_event(), "")['body'])
+    second = json.loads(register_lambda.lambda_handler(register_event(title='Second night'), "")['body'])
+
+    # Assert
+    dynamodb = boto3.resource('dynamodb', region_name='eu-central-1')
+
+    club = dynamodb.Table(os.getenv('CLUBS_TABLE_NAME')).get_item(Key={'club_id': 'club@club.com'})['Item']
+    stored_event = dynamodb.Table(os.getenv('EVENTS_TABLE_NAME')).get_item(Key={'event_id': second['event_id']})['Item']
+
+    assert club['events'] == [first['event_id'], second['event_id']]
+    assert len(club['giveaways']) == 2
+    assert stored_event['latitude'] == '45.33'
+    assert requests['TransactWriteItems'] == 2
+    assert requests['PutItem'] == 0
+    assert requests['UpdateItem'] == 0
@@ -0,0 +1,316 @@
+import json
+import random
+
+from backend.events_service.events import search_lambda
+
+import backend.common.geo as geo
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_events_table, secrets_manager_eu_central_1_mock, create_jwt_secret, setup_env_variables
+
+# Tests
+
+def test_when_invalid_coordinates_return_400(create_events_table):
+    # Arrange
+    event = {
+        'queryStringParameters': {
+            'latitude': 'north',
+            'longitude': '14.44'
+        }
+    }
+
+    # Act
+    result = search_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 400
+    assert response["message"] == "Invalid latitude or longitude format."
+
+def test_when_no_coordinates_return_all_matching_events(create_events_table):
+    # Arrange
+    arrange.add_event_to_the_table(45.33, 14.44, title='Rock night', theme='rock')
+    arrange.add_event_to_the_table(40.71, -74.00, title='Jazz night', theme='jazz')
+    arrange.add_event_to_the_table(48.85, 2.35, title='Rock festival', theme='rock')
+
+    event = {
+        'queryStringParameters': {
+            'theme': 'rock'
+        }
+    }
+
+    # Act
+    result = search_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert sorted(item['title'] for item in response['events']) == ['Rock festival', 'Rock night']
+
+def test_when_coordinates_return_same_events_as_radius_filter(create_events_table):
+    # Arrange
+    rng = random.Random(7)
+    latitude, longitude = 45.3271, 14.4422
+
+    events = [
+        arrange.add_event_to_the_table(
+            latitude + rng.uniform(-0.5, 0.5),
+            longitude + rng.uniform(-0.7, 0.7),
+            title=f'Event {index}',
+            theme=rng.choice(['rock', 'jazz'])
+        )
+        for index in range(300)
+    ]
+
+    expected_ids = sorted(
+        item['event_id']
+        for item in events
+        if item['theme'] == 'rock'
+        and geo.haversine(longitude, latitude, float(item['longitude']), float(item['latitude'])) <= search_lambda.SEARCH_RADIUS_KM
+    )
+
+    event = {
+        'queryStringParameters': {
+            'latitude': str(latitude),
+            'longitude': str(longitude),
+            'theme': 'rock',
+            'limit': '200'
+        }
+    }
+
+    # Act
+    result = search_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert expected_ids
+    assert sorted(item['event_id'] for item in response['events']) == expected_ids
+
+def test_when_name_given_filter_by_title(create_events_table):
+    # Arrange
+    arrange.add_event_to_the_table(45.33, 14.44, title='Summer Rave')
+    arrange.add_event_to_the_table(45.34, 14.45, title='Winter Gala')
+
+    event = {
+        'queryStringParameters': {
+            'latitude': '45.33',
+            'longitude': '14.44',
+            'name': 'rave'
+        }
+    }
+
+    # Act
+    result = search_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert [item['title'] for item in response['events']] == ['Summer Rave']
+
+def test_when_invalid_limit_return_400(create_events_table):
+    # Arrange
+    event = {
+        'queryStringParameters': {
+            'limit': '0'
+        }
+    }
+
+    # Act
+    result = search_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 400
+    assert response["message"] == "Invalid limit."
+
+def test_when_tampered_cursor_return_400(create_events_table, create_jwt_secret, setup_env_variables):
+    # Arrange
+    for index in range(3):
+        arrange.add_event_to_the_table(45.33, 14.44, title=f'Event {index}')
+
+    first_page = search_lambda.lambda_handler({'queryStringParameters': {'limit': '1'}}, "")
+    cursor = json.loads(first_page['body'])['next_cursor']
+
+    payload, signature = cursor.split('.')
+    event = {
+        'queryStringParameters': {
+            'cursor': f'{payload}x.{signature}'
+        }
+    }
+
+    # Act
+    result = search_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 400
+    assert response["message"] == "Invalid cursor."
+
+def test_when_paging_with_cursor_return_every_event_once(create_events_table, create_jwt_secret, setup_env_variables, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(search_lambda, 'SEARCH_PAGE_SIZE', 7)
+
+    rng = random.Random(3)
+    latitude, longitude = 45.3271, 14.4422
+
+    events = [
+        arrange.add_event_to_the_table(
+            latitude + rng.uniform(-0.3, 0.3),
+            longitude + rng.uniform(-0.4, 0.4),
+            title=f'Event {index}',
+            genre=rng.choice(['techno', 'house'])
+        )
+        for index in range(120)
+    ]
+
+    expected_ids = sorted(
+        item['event_id']
+        for item in events
+        if item['genre'] == 'techno'
+        and geo.haversine(longitude, latitude, float(item['longitude']), float(item['latitude'])) <= search_lambda.SEARCH_RADIUS_KM
+    )
+
+    query_params = {
+        'latitude': str(latitude),
+        'longitude': str(longitude),
+        'genre': 'techno',
+        'limit': '5'
+    }
+
+    # Act
+    found_ids = []
+    pages = 0
+
+    while True:
+        result = search_lambda.lambda_handler({'queryStringParameters': query_params}, "")
+        response = json.loads(result['body'])
+
+        assert result["statusCode"] == 200
+        assert len(response['events']) <= 5
+
+        found_ids.extend(item['event_id'] for item in response['events'])
+        pages += 1
+
+        if not response['next_cursor']:
+            break
+
+        # Only the cursor is sent back, the filters travel inside it
+        query_params = {'cursor': response['next_cursor'], 'limit': '5'}
+
+    # Assert
+    assert pages > 1
+    assert sorted(found_ids) == expected_ids
+
+def test_when_time_budget_exhausted_return_cursor(create_events_table, create_jwt_secret, setup_env_variables, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(search_lambda, 'SEARCH_PAGE_SIZE', 2)
+
+    events = [arrange.add_event_to_the_table(45.33, 14.44, title=f'Event {index}') for index in range(6)]
+
+    monkeypatch.setattr(search_lambda, 'SEARCH_TIME_BUDGET_MS', 0)
+
+    # Act
+    result = search_lambda.lambda_handler({'queryStringParameters': {}}, "")
+
+    response = json.loads(result['body'])
+
+    monkeypatch.setattr(search_lambda, 'SEARCH_TIME_BUDGET_MS', 5000)
+
+    resumed_result = search_lambda.lambda_handler({'queryStringParameters': {'cursor': response['next_cursor']}}, "")
+
+    resumed_response = json.loads(resumed_result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert len(response['events']) < 6
+    assert response['next_cursor']
+    assert resumed_response['next_cursor'] is None
+
+    found_ids = [item['event_id'] for item in response['events'] + resumed_response['events']]
+
+    assert sorted(found_ids) == sorted(item['event_id'] for item in events)
+
+def test_when_nearest_without_coordinates_return_400(create_events_table):
+    # Arrange
+    event = {
+        'queryStringParameters': {
+            'nearest': '5'
+        }
+    }
+
+    # Act
+    result = search_lambda.lambda_handler(event, "")
+
+    # Assert
+    assert result["statusCode"] == 400
+
+def test_when_nearest_return_k_closest_events_sorted_by_distance(create_events_table):
+    # Arrange
+    rng = random.Random(17)
+    latitude, longitude = 45.3271, 14.4422
+
+    # Sparse events, so the search has to widen past the initial radius
+    events = [
+        arrange.add_event_to_the_table(
+            latitude + rng.uniform(-1.5, 1.5),
+            longitude + rng.uniform(-2, 2),
+            title=f'Event {index}'
+        )
+        for index in range(150)
+    ]
+
+    expected = sorted(
+        (geo.haversine(longitude, latitude, float(item['longitude']), float(item['latitude'])), item['event_id'])
+        for item in events
+    )[:8]
+
+    event = {
+        'queryStringParameters': {
+            'latitude': str(latitude),
+            'longitude': str(longitude),
+            'nearest': '8'
+        }
+    }
+
+    # Act
+    result = search_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert response['radius_km'] > search_lambda.NEAREST_INITIAL_RADIUS_KM
+    assert [item['event_id'] for item in response['events']] == [event_id for _, event_id in expected]
+    assert [item['distance_km'] for item in response['events']] == sorted(item['distance_km'] for item in response['events'])
+
+def test_when_nearest_and_fewer_events_than_k_return_all_within_max_radius(create_events_table, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(search_lambda, 'NEAREST_MAX_RADIUS_KM', 40)
+
+    arrange.add_event_to_the_table(45.33, 14.44, title='Close')
+    arrange.add_event_to_the_table(45.50, 14.60, title='Further')
+    arrange.add_event_to_the_table(48.85, 2.35, title='Paris')
+
+    event = {
+        'queryStringParameters': {
+            'latitude': '45.33',
+            'longitude': '14.44',
+            'nearest': '5'
+        }
+    }
+
+    # Act
+    result = search_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert response['radius_km'] == 40
+    assert [item['title'] for item in response['events']] == ['Close', 'Further']
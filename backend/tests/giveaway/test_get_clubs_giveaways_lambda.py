@@ -0,0 +1,61 @@
+import json
+import os
+
+from backend.events_service.giveaway import get_clubs_giveaways_lambda, giveaway_join_lambda
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_clubs_table, create_giveaways_table, create_giveaway_entries_table
+
+def get_clubs_giveaways(email):
+    return arrange.authorized_request(email)
+
+def join_giveaway(email, giveaway_id, entrance_number):
+    return arrange.authorized_request(email, query={
+        'giveaway_id': giveaway_id,
+        'entrance_number': entrance_number
+    })
+
+# Tests
+
+def test_when_club_has_giveaways_return_summaries_with_entry_counters(create_clubs_table, create_giveaways_table, create_giveaway_entries_table):
+    # Arrange
+    arrange.add_club_to_the_table('club@club.com', 45.33, 14.44)
+
+    club_giveaways = [arrange.add_giveaway_to_the_table() for _ in range(3)]
+    giveaway_ids = [giveaway['giveaway_id'] for giveaway in club_giveaways] + ['deleted-giveaway']
+
+    arrange.set_attribute_on_item(os.getenv('CLUBS_TABLE_NAME'), {'club_id': 'club@club.com'}, 'giveaways', giveaway_ids)
+
+    for index, entrance_number in enumerate(('1', '4', '2')):
+        giveaway_join_lambda.lambda_handler(join_giveaway(f'user{index}@gmail.com', giveaway_ids[0], entrance_number), "")
+
+    requests = arrange.count_dynamodb_requests()
+
+    # Act
+    result = get_clubs_giveaways_lambda.lambda_handler(get_clubs_giveaways('club@club.com'), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    summaries = response['events']
+
+    assert result['statusCode'] == 200
+    assert [summary['giveaway_id'] for summary in summaries] == giveaway_ids[:3]
+    assert summaries[0]['total_entries'] == 7
+    assert summaries[0]['unique_users'] == 3
+    assert summaries[0]['last_entry_at'] is not None
+    assert summaries[1]['unique_users'] == 0
+    assert summaries[1]['name'] == 'Ticket giveaway'
+    assert 'users' not in summaries[0] and 'entries' not in summaries[0]
+    assert requests == {'GetItem': 1, 'BatchGetItem': 1}
+
+def test_when_club_has_no_giveaways_return_200(create_clubs_table, create_giveaways_table, create_giveaway_entries_table):
+    # Arrange
+    arrange.add_club_to_the_table('club@club.com', 45.33, 14.44)
+
+    # Act
+    result = get_clubs_giveaways_lambda.lambda_handler(get_clubs_giveaways('club@club.com'), "")
+
+    # Assert
+    assert result['statusCode'] == 200
+    assert json.loads(result['body'])['message'] == 'No giveaways found for this club'
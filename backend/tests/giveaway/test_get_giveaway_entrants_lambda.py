@@ -0,0 +1,88 @@
+import json
+
+from backend.events_service.giveaway import get_giveaway_entrants_lambda
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_users_table, create_events_table, create_giveaways_table, create_giveaway_entries_table, secrets_manager_eu_central_1_mock, create_jwt_secret, setup_env_variables
+
+def get_entrants(email, giveaway_id, limit=None, cursor=None):
+    query_parameters = {
+        'giveaway_id': giveaway_id
+    }
+
+    if limit is not None:
+        query_parameters['limit'] = limit
+    if cursor is not None:
+        query_parameters['cursor'] = cursor
+
+    return arrange.authorized_request(email, query=query_parameters)
+
+# Tests
+
+def test_when_paging_with_cursor_return_every_entrant_once_with_names(create_users_table, create_events_table, create_giveaways_table, create_giveaway_entries_table, create_jwt_secret, setup_env_variables):
+    # Arrange
+    giveaway = arrange.add_club_giveaway_to_the_table('club@club.com')
+
+    for index in range(7):
+        arrange.add_user_to_the_table(f'user{index}@gmail.com', 'password', first_name=f'User {index}')
+        arrange.add_giveaway_entry_to_the_table(giveaway['giveaway_id'], f'user{index}@gmail.com', index + 1)
+
+    requests = arrange.count_dynamodb_requests()
+
+    # Act
+    pages = []
+    cursor = None
+
+    while True:
+        result = get_giveaway_entrants_lambda.lambda_handler(get_entrants('club@club.com', giveaway['giveaway_id'], '3', cursor), "")
+        response = json.loads(result['body'])
+
+        assert result['statusCode'] == 200
+
+        pages.append(response['entrants'])
+        cursor = response['next_cursor']
+
+        if cursor is None:
+            break
+
+    # Assert
+    entrants = [entrant for page in pages for entrant in page]
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [entrant['email'] for entrant in entrants] == [f'user{index}@gmail.com' for index in range(7)]
+    assert entrants[6] == {'email': 'user6@gmail.com', 'first_name': 'User 6', 'last_name': None, 'entries': 7, 'entered_at': '2030-01-01T00:00:00+00:00'}
+    assert requests['BatchGetItem'] == 3
+
+def test_when_user_is_not_the_giveaways_club_return_403(create_users_table, create_events_table, create_giveaways_table, create_giveaway_entries_table, create_jwt_secret, setup_env_variables):
+    # Arrange
+    giveaway = arrange.add_club_giveaway_to_the_table('club@club.com')
+    arrange.add_giveaway_entry_to_the_table(giveaway['giveaway_id'], 'john.doe@gmail.com')
+
+    # Act
+    result = get_giveaway_entrants_lambda.lambda_handler(get_entrants('john.doe@gmail.com', giveaway['giveaway_id']), "")
+
+    # Assert
+    assert result['statusCode'] == 403
+
+def test_when_cursor_belongs_to_another_giveaway_return_400(create_users_table, create_events_table, create_giveaways_table, create_giveaway_entries_table, create_jwt_secret, setup_env_variables):
+    # Arrange
+    giveaway = arrange.add_club_giveaway_to_the_table('club@club.com')
+    other_giveaway = arrange.add_club_giveaway_to_the_table('club@club.com')
+
+    for index in range(3):
+        arrange.add_giveaway_entry_to_the_table(other_giveaway['giveaway_id'], f'user{index}@gmail.com')
+
+    other_cursor = json.loads(get_giveaway_entrants_lambda.lambda_handler(get_entrants('club@club.com', other_giveaway['giveaway_id'], '1'), "")['body'])['next_cursor']
+
+    # Act
+    result = get_giveaway_entrants_lambda.lambda_handler(get_entrants('club@club.com', giveaway['giveaway_id'], '1', other_cursor), "")
+
+    # Assert
+    assert result['statusCode'] == 400
+
+def test_when_giveaway_does_not_exist_return_404(create_users_table, create_events_table, create_giveaways_table, create_giveaway_entries_table, create_jwt_secret, setup_env_variables):
+    # Act
+    result = get_giveaway_entrants_lambda.lambda_handler(get_entrants('club@club.com', 'missing-giveaway'), "")
+
+    # Assert
+    assert result['statusCode'] == 404
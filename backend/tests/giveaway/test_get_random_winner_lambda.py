@@ -0,0 +1,203 @@
+import json
+import os
+import boto3
+
+from backend.events_service.giveaway import get_random_winner_lambda
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_users_table, create_events_table, create_giveaways_table, create_giveaway_entries_table
+
+def get_winner(giveaway_id, seed=None, winners=None, email='club@club.com'):
+    query_parameters = {
+        'giveaway_id': giveaway_id
+    }
+
+    if seed is not None:
+        query_parameters['seed'] = seed
+    if winners is not None:
+        query_parameters['winners'] = winners
+
+    return arrange.authorized_request(email, query=query_parameters)
+
+def add_entries(giveaway_id, weights):
+    for email, weight in weights.items():
+        arrange.add_giveaway_entry_to_the_table(giveaway_id, email, weight)
+
+# Tests
+
+def test_when_giveaway_has_entries_draw_and_save_winner_return_200(create_users_table, create_events_table, create_giveaways_table, create_giveaway_entries_table):
+    # Arrange
+    arrange.add_user_to_the_table('john.doe@gmail.com', 'password', first_name='John', last_name='Doe')
+    giveaway = arrange.add_club_giveaway_to_the_table('club@club.com')
+    add_entries(giveaway['giveaway_id'], {'john.doe@gmail.com': 3})
+
+    # Act
+    result = get_random_winner_lambda.lambda_handler(get_winner(giveaway['giveaway_id']), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    stored_giveaway = boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('GIVEAWAY_TABLE_NAME')).get_item(Key={'giveaway_id': giveaway['giveaway_id']})['Item']
+
+    assert result['statusCode'] == 200
+    assert response['winner'] == {'email': 'john.doe@gmail.com', 'first_name': 'John', 'last_name': 'Doe'}
+    assert response['draw']['entries'] == 1
+    assert response['draw']['total_weight'] == 3
+    assert stored_giveaway['winners'] == ['john.doe@gmail.com']
+    assert stored_giveaway['draw']['seed'] == response['draw']['seed']
+
+def test_when_draws_use_the_same_seed_pick_the_same_winner(create_users_table, create_events_table, create_giveaways_table, create_giveaway_entries_table):
+    # Arrange
+    weights = {f'user{index}@gmail.com': index % 5 + 1 for index in range(50)}
+
+    giveaway_ids = [arrange.add_club_giveaway_to_the_table('club@club.com')['giveaway_id'] for _ in range(3)]
+
+    for giveaway_id in giveaway_ids:
+        add_entries(giveaway_id, weights)
+
+    # Act
+    results = [
+        json.loads(get_random_winner_lambda.lambda_handler(get_winner(giveaway_id, seed), "")['body'])
+        for giveaway_id, seed in zip(giveaway_ids, ('audit-2030', 'audit-2030', 'another-seed'))
+    ]
+
+    # Assert
+    assert results[0]['winner']['email'] == results[1]['winner']['email']
+    assert results[0]['draw']['seed'] == 'audit-2030'
+    assert results[2]['draw']['seed'] == 'another-seed'
+
+def test_when_winner_was_drawn_return_it_without_drawing_again(create_users_table, create_events_table, create_giveaways_table, create_giveaway_entries_table):
+    # Arrange
+    giveaway = arrange.add_club_giveaway_to_the_table('club@club.com')
+    add_entries(giveaway['giveaway_id'], {f'user{index}@gmail.com': 1 for index in range(20)})
+
+    first_result = json.loads(get_random_winner_lambda.lambda_handler(get_winner(giveaway['giveaway_id']), "")['body'])
+
+    arrange.add_giveaway_entry_to_the_table(giveaway['giveaway_id'], 'late@gmail.com', 100)
+
+    requests = arrange.count_dynamodb_requests()
+
+    # Act
+    result = get_random_winner_lambda.lambda_handler(get_winner(giveaway['giveaway_id'], 'other-seed'), "")
+
+    # Assert
+    response = json.loads(result['body'])
+
+    assert result['statusCode'] == 200
+    assert response['winner']['email'] == first_result['winner']['email']
+    assert response['draw'] == first_result['draw']
+    assert requests['Query'] == 0
+
+def test_when_several_winners_are_asked_for_draw_distinct_users_return_200(create_users_table, create_events_table, create_giveaways_table, create_giveaway_entries_table):
+    # Arrange
+    for index in range(10):
+        arrange.add_user_to_the_table(f'user{index}@gmail.com', 'password', first_name=f'User {index}')
+
+    giveaway = arrange.add_club_giveaway_to_the_table('club@club.com')
+    add_entries(giveaway['giveaway_id'], {f'user{index}@gmail.com': index + 1 for index in range(10)})
+
+    requests = arrange.count_dynamodb_requests()
+
+    # Act
+    result = get_random_winner_lambda.lambda_handler(get_winner(giveaway['giveaway_id'], 'prizes', '3'), "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    winner_emails = [winner['email'] for winner in response['winners']]
+
+    assert result['statusCode'] == 200
+    assert len(set(winner_emails)) == 3
+    assert response['winner'] == response['winners'][0]
+    assert response['winners'][0]['first_name'] == f'User {winner_emails[0][4:-10]}'
+    assert response['draw']['winners'] == 3
+    assert requests['BatchGetItem'] == 1
+    # The giveaway and its event for the owner check, then the giveaway's saved draw
+    assert requests['GetItem'] == 3
+
+def test_when_more_winners_than_entrants_are_asked_for_draw_every_entrant(create_users_table, create_events_table, create_giveaways_table, create_giveaway_entries_table):
+    # Arrange
+    giveaway = arrange.add_club_giveaway_to_the_table('club@club.com')
+    add_entries(giveaway['giveaway_id'], {'a@gmail.com': 1, 'b@gmail.com': 5})
+
+    # Act
+    result = get_random_winner_lambda.lambda_handler(get_winner(giveaway['giveaway_id'], winners='4'), "")
+
+    # Assert
+    response = json.loads(result['body'])
+
+    assert result['statusCode'] == 200
+    assert sorted(winner['email'] for winner in response['winners']) == ['a@gmail.com', 'b@gmail.com']
+    assert response['winners'][0]['first_name'] is None
+
+def test_when_winners_were_drawn_with_another_count_return_409(create_users_table, create_events_table, create_giveaways_table, create_giveaway_entries_table):
+    # Arrange
+    giveaway = arrange.add_club_giveaway_to_the_table('club@club.com')
+    add_entries(giveaway['giveaway_id'], {f'user{index}@gmail.com': 1 for index in range(5)})
+
+    get_random_winner_lambda.lambda_handler(get_winner(giveaway['giveaway_id'], winners='2'), "")
+
+    # Act
+    result = get_random_winner_lambda.lambda_handler(get_winner(giveaway['giveaway_id'], winners='3'), "")
+
+    # Assert
+    assert result['statusCode'] == 409
+
+def test_when_another_user_asks_for_a_winner_count_leave_it_to_the_club(create_users_table, create_events_table, create_giveaways_table, create_giveaway_entries_table):
+    # Arrange
+    giveaway = arrange.add_club_giveaway_to_the_table('club@club.com')
+    add_entries(giveaway['giveaway_id'], {f'user{index}@gmail.com': 1 for index in range(5)})
+
+    other_result = get_random_winner_lambda.lambda_handler(get_winner(giveaway['giveaway_id'], winners='1000', email='john.doe@gmail.com'), "")
+
+    # Act
+    result = get_random_winner_lambda.lambda_handler(get_winner(giveaway['giveaway_id'], winners='3'), "")
+
+    # Assert
+    assert other_result['statusCode'] == 403
+    assert result['statusCode'] == 200
+    assert json.loads(result['body'])['draw']['winners'] == 3
+
+def test_when_winners_is_not_a_valid_count_return_400(create_users_table, create_events_table, create_giveaways_table, create_giveaway_entries_table):
+    # Arrange
+    giveaway = arrange.add_club_giveaway_to_the_table('club@club.com')
+
+    # Act
+    results = [
+        get_random_winner_lambda.lambda_handler(get_winner(giveaway['giveaway_id'], winners=winners), "")
+        for winners in ('0', 'all', '100000')
+    ]
+
+    # Assert
+    assert [result['statusCode'] for result in results] == [400, 400, 400]
+
+def test_when_giveaway_has_no_entries_return_400(create_users_table, create_events_table, create_giveaways_table, create_giveaway_entries_table):
+    # Arrange
+    giveaway = arrange.add_club_giveaway_to_the_table('club@club.com')
+
+    # Act
+    result = get_random_winner_lambda.lambda_handler(get_winner(giveaway['giveaway_id']), "")
+
+    # Assert
+    assert result['statusCode'] == 400
+
+def test_when_giveaway_does_not_exist_return_404(create_users_table, create_events_table, create_giveaways_table, create_giveaway_entries_table):
+    # Act
+    result = get_random_winner_lambda.lambda_handler(get_winner('missing-giveaway'), "")
+
+    # Assert
+    assert result['statusCode'] == 404
+
+def test_when_caller_is_not_the_club_holding_the_giveaway_return_403_without_drawing(create_users_table, create_events_table, create_giveaways_table, create_giveaway_entries_table):
+    # Arrange
+    giveaway = arrange.add_club_giveaway_to_the_table('club@club.com')
+    add_entries(giveaway['giveaway_id'], {'john.doe@gmail.com': 1})
+
+    # Act
+    result = get_random_winner_lambda.lambda_handler(get_winner(giveaway['giveaway_id'], 'chosen-seed', email='john.doe@gmail.com'), "")
+
+    # Assert
+    stored_giveaway = boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('GIVEAWAY_TABLE_NAME')).get_item(Key={'giveaway_id': giveaway['giveaway_id']})['Item']
+
+    assert result['statusCode'] == 403
+    assert 'winners' not in stored_giveaway
@@ -0,0 +1,118 @@
+import json
+import os
+import boto3
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.events_service.giveaway import giveaway_join_lambda
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_giveaways_table, create_giveaway_entries_table, isolated_transactions
+
+def join_giveaway(email, giveaway_id, entrance_number=None):
+    query_parameters = {
+        'giveaway_id': giveaway_id
+    }
+
+    if entrance_number is not None:
+        query_parameters['entrance_number'] = entrance_number
+
+    return arrange.authorized_request(email, query=query_parameters)
+
+def get_giveaway(giveaway_id):
+    return boto3.resource('dynamodb', region_name='eu-central-1').Table(os.getenv('GIVEAWAY_TABLE_NAME')).get_item(Key={'giveaway_id': giveaway_id})['Item']
+
+# Tests
+
+def test_when_user_joins_save_entry_and_add_it_to_totals_return_200(create_giveaways_table, create_giveaway_entries_table):
+    # Arrange
+    giveaway = arrange.add_giveaway_to_the_table()
+
+    requests = arrange.count_dynamodb_requests()
+
+    # Act
+    result = giveaway_join_lambda.lambda_handler(join_giveaway('john.doe@gmail.com', giveaway['giveaway_id'], '3'), "")
+
+    # Assert
+    entry = arrange.get_giveaway_entry(giveaway['giveaway_id'], 'john.doe@gmail.com')
+    stored_giveaway = get_giveaway(giveaway['giveaway_id'])
+
+    assert result['statusCode'] == 200
+    assert entry['weight'] == 3
+    assert stored_giveaway['entrants'] == 1
+    assert stored_giveaway['total_weight'] == 3
+    assert stored_giveaway['last_entry_at'] == entry['entered_at']
+    assert requests == {'TransactWriteItems': 1}
+
+def test_when_user_joins_twice_keep_first_entry_return_200(create_giveaways_table, create_giveaway_entries_table):
+    # Arrange
+    giveaway = arrange.add_giveaway_to_the_table()
+
+    giveaway_join_lambda.lambda_handler(join_giveaway('john.doe@gmail.com', giveaway['giveaway_id']), "")
+
+    # Act
+    result = giveaway_join_lambda.lambda_handler(join_giveaway('john.doe@gmail.com', giveaway['giveaway_id'], '5'), "")
+
+    # Assert
+    stored_giveaway = get_giveaway(giveaway['giveaway_id'])
+
+    assert result['statusCode'] == 200
+    assert json.loads(result['body'])['message'] == 'Already joined the giveaway.'
+    assert arrange.get_giveaway_entry(giveaway['giveaway_id'], 'john.doe@gmail.com')['weight'] == 1
+    assert stored_giveaway['entrants'] == 1
+    assert stored_giveaway['total_weight'] == 1
+
+def test_when_users_join_concurrently_count_every_entry_once(create_giveaways_table, create_giveaway_entries_table, isolated_transactions):
+    # Arrange
+    giveaway = arrange.add_giveaway_to_the_table()
+
+    emails = [f'user{index}@gmail.com' for index in range(20)]
+
+    # Act
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(lambda email: giveaway_join_lambda.lambda_handler(join_giveaway(email, giveaway['giveaway_id'], '2'), ""), emails * 2))
+
+    # Assert
+    stored_giveaway = get_giveaway(giveaway['giveaway_id'])
+
+    assert all(result['statusCode'] == 200 for result in results)
+    assert stored_giveaway['entrants'] == 20
+    assert stored_giveaway['total_weight'] == 40
+
+def test_when_winners_were_drawn_return_409_without_entering(create_giveaways_table, create_giveaway_entries_table):
+    # Arrange
+    giveaway = arrange.add_giveaway_to_the_table()
+
+    giveaway_join_lambda.lambda_handler(join_giveaway('john.doe@gmail.com', giveaway['giveaway_id']), "")
+    arrange.set_attribute_on_item(os.getenv('GIVEAWAY_TABLE_NAME'), {'giveaway_id': giveaway['giveaway_id']}, 'winners', ['john.doe@gmail.com'])
+
+    # Act
+    result = giveaway_join_lambda.lambda_handler(join_giveaway('late@gmail.com', giveaway['giveaway_id']), "")
+
+    # Assert
+    stored_giveaway = get_giveaway(giveaway['giveaway_id'])
+
+    assert result['statusCode'] == 409
+    assert arrange.get_giveaway_entry(giveaway['giveaway_id'], 'late@gmail.com') is None
+    assert stored_giveaway['entrants'] == 1
+
+def test_when_giveaway_does_not_exist_return_404(create_giveaways_table, create_giveaway_entries_table):
+    # Act
+    result = giveaway_join_lambda.lambda_handler(join_giveaway('john.doe@gmail.com', 'missing-giveaway'), "")
+
+    # Assert
+    assert result['statusCode'] == 404
+    assert arrange.get_giveaway_entry('missing-giveaway', 'john.doe@gmail.com') is None
+
+def test_when_entrance_number_is_not_a_positive_number_return_400(create_giveaways_table, create_giveaway_entries_table):
+    # Arrange
+    giveaway = arrange.add_giveaway_to_the_table()
+
+    # Act
+    results = [
+        giveaway_join_lambda.lambda_handler(join_giveaway('john.doe@gmail.com', giveaway['giveaway_id'], entrance_number), "")
+        for entrance_number in ('0', 'many', '1000000')
+    ]
+
+    # Assert
+    assert [result['statusCode'] for result in results] == [400, 400, 400]
+    assert arrange.get_giveaway_entry(giveaway['giveaway_id'], 'john.doe@gmail.com') is None
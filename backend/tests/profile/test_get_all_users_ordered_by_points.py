@@ -0,0 +1,101 @@
+import json
+
+from backend.user_service.profile import get_all_users_ordered_by_points, update_users_private_info_lambda
+import backend.common.leaderboard as leaderboard
+
+import backend.tests.arrange_setups as arrange
+from backend.tests.common_test_setup import aws_credentials, dynamodb_eu_central_1_mock, create_users_table, secrets_manager_eu_central_1_mock, create_jwt_secret, setup_env_variables
+
+def get_leaderboard(email, limit=None, cursor=None):
+    query_parameters = {}
+
+    if limit is not None:
+        query_parameters['limit'] = limit
+    if cursor is not None:
+        query_parameters['cursor'] = cursor
+
+    return arrange.authorized_request(email, query=query_parameters)
+
+def add_points(email, points):
+    return arrange.authorized_request(email, body={'points': points})
+
+def read_all_pages(email, limit):
+    pages = []
+    cursor = None
+
+    while True:
+        result = get_all_users_ordered_by_points.lambda_handler(get_leaderboard(email, limit, cursor), "")
+        response = json.loads(result['body'])
+
+        assert result['statusCode'] == 200
+
+        pages.append(response['users'])
+        cursor = response['next_cursor']
+
+        if cursor is None:
+            return pages
+
+# Tests
+
+def test_when_paging_return_users_with_points_highest_first_and_only_public_fields(create_users_table, create_jwt_secret, setup_env_variables):
+    # Arrange
+    for index, points in enumerate((5, 120, 40, 120, 7)):
+        arrange.add_user_to_the_table(f'user{index}@gmail.com', 'hashed-password', first_name=f'User {index}', refresh_token='token')
+        update_users_private_info_lambda.lambda_handler(add_points(f'user{index}@gmail.com', points), "")
+
+    arrange.add_user_to_the_table('no.points@gmail.com', 'hashed-password')
+
+    requests = arrange.count_dynamodb_requests()
+
+    # Act
+    pages = read_all_pages('user0@gmail.com', '2')
+
+    # Assert
+    users = [user for page in pages for user in page]
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [user['email'] for user in users] == ['user3@gmail.com', 'user1@gmail.com', 'user2@gmail.com', 'user4@gmail.com', 'user0@gmail.com']
+    assert [user['rank'] for user in users] == [1, 2, 3, 4, 5]
+    assert users[0] == {'email': 'user3@gmail.com', 'first_name': 'User 3', 'last_name': None, 'points': 120, 'rank': 1}
+    assert requests == {'Query': 3}
+
+def test_when_users_are_spread_over_buckets_merge_them_in_order(create_users_table, create_jwt_secret, setup_env_variables, monkeypatch):
+    # Arrange
+    monkeypatch.setattr(leaderboard, 'LEADERBOARD_BUCKETS', 3)
+
+    points = [(index * 37) % 101 for index in range(30)]
+
+    for index, user_points in enumerate(points):
+        arrange.add_user_to_the_table(f'user{index}@gmail.com', 'hashed-password')
+        arrange.set_user_points(f'user{index}@gmail.com', user_points)
+
+    # Act
+    pages = read_all_pages('user0@gmail.com', '7')
+
+    # Assert
+    users = [user for page in pages for user in page]
+
+    assert [user['points'] for user in users] == sorted(points, reverse=True)
+    assert len({user['email'] for user in users}) == 30
+    assert users[-1]['rank'] == 30
+
+def test_when_points_change_move_the_user(create_users_table, create_jwt_secret, setup_env_variables):
+    # Arrange
+    for index in range(3):
+        arrange.add_user_to_the_table(f'user{index}@gmail.com', 'hashed-password')
+        arrange.set_user_points(f'user{index}@gmail.com', 10 * (index + 1))
+
+    # Act
+    update_users_private_info_lambda.lambda_handler(add_points('user0@gmail.com', 25), "")
+
+    # Assert
+    users = read_all_pages('user0@gmail.com', '10')[0]
+
+    assert [(user['email'], user['points']) for user in users] == [('user0@gmail.com', 35), ('user2@gmail.com', 30), ('user1@gmail.com', 20)]
+
+def test_when_cursor_is_invalid_return_400(create_users_table, create_jwt_secret, setup_env_variables):
+    # Act
+    result = get_all_users_ordered_by_points.lambda_handler(get_leaderboard('user0@gmail.com', cursor='not-a-cursor'), "")
+
+    # Assert
+    assert result['statusCode'] == 400
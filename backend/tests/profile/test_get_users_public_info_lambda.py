@@ -116,4 +116,59 @@ def test_when_successful_retrieval_of_data_return_200(create_users_table, create
     assert response["info"]['email'] == "john.doe@gmail.com"
     assert response["info"]['first_name'] == "John"
     assert response["info"]['last_name'] == "Doe"
-    assert response["info"]['profile_picture'] is None
\ No newline at end of file
+    assert response["info"]['profile_picture_url'] is None
+
+def test_when_profile_picture_exists_return_presigned_url(create_users_table, create_profile_pictures_bucket):
+    # Arrange
+    arrange.add_user_to_the_table('john.doe@gmail.com', 'password123', first_name='John', last_name='Doe')
+    arrange.add_profile_picture_to_the_bucket('john.doe@gmail.com')
+
+    event = arrange.authorized_request('john.doe@gmail.com')
+
+    # Act
+    result = get_users_public_info_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert 'profile_picture' not in response["info"]
+    assert 'john.doe%40gmail.com.jpg' in response["info"]['profile_picture_url']
+    assert 'Signature' in response["info"]['profile_picture_url']
+
+def test_when_inline_image_mode_return_base64_picture(create_users_table, create_profile_pictures_bucket):
+    # Arrange
+    arrange.add_user_to_the_table('john.doe@gmail.com', 'password123', first_name='John', last_name='Doe')
+    arrange.add_profile_picture_to_the_bucket('john.doe@gmail.com', b'picture')
+
+    event = arrange.authorized_request('john.doe@gmail.com', query={'image_mode': 'inline'})
+
+    # Act
+    result = get_users_public_info_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert response["info"]['profile_picture'] == 'cGljdHVyZQ=='
+    assert 'profile_picture_url' not in response["info"]
+
+def test_when_authorizer_context_present_email_is_taken_from_it_return_200(create_users_table, create_profile_pictures_bucket):
+    # Arrange
+    arrange.add_user_to_the_table(
+        'john.doe@gmail.com',
+        'password123',
+        first_name='John',
+        last_name='Doe'
+    )
+
+    event = arrange.authorized_request('john.doe@gmail.com')
+
+    # Act
+    result = get_users_public_info_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    # Assert
+    assert result["statusCode"] == 200
+    assert response["info"]['email'] == "john.doe@gmail.com"
@@ -1,4 +1,5 @@
 import json
+import base64
 
 from backend.user_service.profile import update_users_public_info_lambda
 
@@ -193,4 +194,43 @@ def test_when_incorrect_items_types_passed_to_update_return_400(create_users_tab
     # Assert
     assert result["statusCode"] == 400
     assert "message" in response
-    assert response["message"] == "Please provide correct types for request."
\ No newline at end of file
+    assert response["message"] == "Please provide correct types for request."
+
+def test_when_profile_picture_is_not_an_image_return_400(create_users_table, create_jwt_secret, setup_env_variables):
+    # Arrange
+    usersTable = arrange.add_user_to_the_table(
+        'john.doe@gmail.com',
+        'password123',
+        first_name='John',
+        last_name='Doe'
+    )
+
+    token = arrange.generate_jwt_token_for_test(
+        'john.doe@gmail.com'
+    )
+
+    event = {
+        'headers': {
+            'authorization': f'Bearer {token}',
+        },
+        'body': json.dumps({
+            'first_name': 'Joe',
+            'profile_picture': base64.b64encode(b'<html>not a picture</html>').decode('utf-8')
+        })
+    }
+
+    # Act
+    result = update_users_public_info_lambda.lambda_handler(event, "")
+
+    response = json.loads(result['body'])
+
+    expected_user = usersTable.get_item(
+        Key={
+            'email': 'john.doe@gmail.com'
+        }
+    )
+
+    # Assert
+    assert result["statusCode"] == 400
+    assert response["message"] == "Only JPEG, PNG, GIF and WebP images are supported."
+    assert expected_user['Item']['first_name'] == 'John'
@@ -1,8 +1,8 @@
 import json
-import boto3
 import bcrypt
 import os
 import logging
+import backend.common.clients as aws_clients
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -30,8 +30,7 @@ def lambda_handler(event, context):
     
     logger.info(f'CONFIRM PASSWORD CHANGE - Creating client for database')
     
-    dynamodb = boto3.resource('dynamodb')
-    users_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
+    users_table = aws_clients.get_dynamodb_table(os.getenv('USERS_TABLE_NAME'))
 
     logger.info(f'CONFIRM PASSWORD CHANGE - Checking if user exists')
 
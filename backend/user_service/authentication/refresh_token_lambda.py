@@ -1,10 +1,10 @@
 import json
-import boto3
 import os
 from datetime import datetime, timezone
 import logging
 
 import backend.common.common as common_handler
+import backend.common.clients as aws_clients
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -32,8 +32,7 @@ def lambda_handler(event, context):
     
     logger.info(f'REFRESH TOKEN - Getting database client.')
 
-    dynamodb = boto3.resource('dynamodb')
-    users_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
+    users_table = aws_clients.get_dynamodb_table(os.getenv('USERS_TABLE_NAME'))
 
     logger.info(f'REFRESH TOKEN - Checking if user exists.')
 
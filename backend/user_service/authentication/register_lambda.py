@@ -1,10 +1,12 @@
 import json
 import bcrypt
-import boto3
 import os
 import logging
 
 import backend.common.common as common_handler
+import backend.common.clients as aws_clients
+import backend.common.images as images
+import backend.common.leaderboard as leaderboard
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -12,7 +14,8 @@ logger.setLevel(logging.INFO)
 def lambda_handler(event, context):
     event = json.loads(event.get('body')) if 'body' in event else event
 
-    logger.info(f'REGISTER USER - Checking if every required attribute is found: {event}')
+    # The picture alone can be megabytes of base64, so only the attribute names are logged
+    logger.info(f'REGISTER USER - Checking if every required attribute is found: {list(event.keys())}')
 
     try:
         email = event['email']
@@ -31,11 +34,25 @@ def lambda_handler(event, context):
                 'message': f'{e} is missing, please check and try again'
             })
         }
+
+    # Reject oversized or non-image pictures before the account is created
+    if profile_picture_base64:
+        try:
+            images.validate_base64_image(profile_picture_base64)
+        except images.ImageValidationError as e:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json'
+                },
+                'body': json.dumps({
+                    'message': str(e)
+                })
+            }
     
     logger.info(f'REGISTER USER - Getting database client.')
     
-    dynamodb = boto3.resource('dynamodb')
-    user_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
+    user_table = aws_clients.get_dynamodb_table(os.getenv('USERS_TABLE_NAME'))
 
     logger.info(f'REGISTER USER - Checking if user already exists.')
 
@@ -83,7 +100,10 @@ def lambda_handler(event, context):
                 'password': hashed_password,
                 'first_name': first_name,
                 'last_name': last_name,
-                'age': age
+                'age': age,
+                # New users start on the leaderboard with no points
+                'points': 0,
+                **leaderboard.leaderboard_attributes(email, 0)
             }
         )
     except Exception as e:
@@ -1,11 +1,11 @@
 import json
 import bcrypt
-import boto3
 import os
 from datetime import datetime, timedelta, timezone
 import logging
 
 import backend.common.common as common_handler
+import backend.common.clients as aws_clients
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -31,8 +31,7 @@ def lambda_handler(event, context):
     
     logger.info(f'REQUEST USER LOGIN - Getting database client.')
     
-    dynamodb = boto3.resource('dynamodb')
-    users_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
+    users_table = aws_clients.get_dynamodb_table(os.getenv('USERS_TABLE_NAME'))
 
     logger.info(f'REQUEST USER LOGIN - Getting user from the database.')
 
@@ -1,10 +1,11 @@
 import json
-import boto3
 import os
 import requests
 import logging
 
 import backend.common.common as common_handler
+import backend.common.clients as aws_clients
+import backend.common.leaderboard as leaderboard
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -128,8 +129,7 @@ def lambda_handler(event, context):
         logger.info(f'THIRD PARTY LOGIN CONFIRM - Getting database')
         
         # Process and register user in the database
-        dynamodb = boto3.resource('dynamodb')
-        user_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
+        user_table = aws_clients.get_dynamodb_table(os.getenv('USERS_TABLE_NAME'))
 
         logger.info(f'THIRD PARTY LOGIN CONFIRM - Checking if user already exists')
 
@@ -149,6 +149,9 @@ def lambda_handler(event, context):
                     'email': user_email,
                     'first_name': user_name[0],
                     'last_name': user_name[1],
+                    # New users start on the leaderboard with no points
+                    'points': 0,
+                    **leaderboard.leaderboard_attributes(user_email, 0)
                 }
             )
 
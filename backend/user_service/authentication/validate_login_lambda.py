@@ -1,9 +1,10 @@
 import json
-import boto3
 import os
 import logging
 
 import backend.common.common as common_handler
+import backend.common.clients as aws_clients
+import backend.common.participants as participants
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -29,8 +30,7 @@ def lambda_handler(event, context):
     
     logger.info(f'VALIDATE USER LOGIN - Getting database client.')
     
-    dynamodb = boto3.resource('dynamodb')
-    users_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
+    users_table = aws_clients.get_dynamodb_table(os.getenv('USERS_TABLE_NAME'))
 
     logger.info(f'VALIDATE USER LOGIN - Checking if user exists in the database.')
 
@@ -99,6 +99,22 @@ def lambda_handler(event, context):
             })
         }
 
+    # Joins and leaves only write event_participants, the events list on the user item is stale
+    try:
+        event_ids = participants.get_joined_event_ids(email)
+    except Exception as e:
+        logger.error(f'VALIDATE USER LOGIN - Unable to read joined events: {str(e)}')
+
+        return {
+            'statusCode': 500,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': json.dumps({
+                'message': 'Unable to read your events. Please try again or contact support.'
+            })
+        }
+
     return {
         'statusCode': 200,
         'headers': {
@@ -108,6 +124,6 @@ def lambda_handler(event, context):
             'message': 'Logged in successfully, welcome!',
             'token': access_token,
             'refresh_token': refresh_token,
-            'event_ids': response.get('Item').get('events', [])
+            'event_ids': event_ids
         })
     }
\ No newline at end of file
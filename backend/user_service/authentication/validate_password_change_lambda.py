@@ -1,9 +1,9 @@
 import json
-import boto3
 import os
 import logging
 
 import backend.common.common as common_handler
+import backend.common.clients as aws_clients
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -29,8 +29,7 @@ def lambda_handler(event, context):
     
     logger.info(f'VALIDATE PASSWORD CHANGE - Getting database client.')
     
-    dynamodb = boto3.resource('dynamodb')
-    users_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
+    users_table = aws_clients.get_dynamodb_table(os.getenv('USERS_TABLE_NAME'))
 
     logger.info(f'VALIDATE PASSWORD CHANGE - Checking if user exists in the database.')
 
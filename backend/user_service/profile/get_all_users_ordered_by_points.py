@@ -1,58 +1,51 @@
 import json
-import boto3
-import os
 import logging
 
 import backend.common.common as common_handler
+import backend.common.leaderboard as leaderboard
+import backend.common.pagination as pagination
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 def lambda_handler(event, context):
-    error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(event)
+    error_response, email = common_handler.get_authenticated_user_email(event)
     
     if error_response:
         return error_response
     
-    dynamodb = boto3.resource('dynamodb')
-    users_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
+    query_params = event.get('queryStringParameters') or {}
 
-    logger.info("GET USERS PRIVATE INFO - Fetching user information.")
-
-    # Find user in the table by email
     try:
-        response = users_table.scan()
-
-        logger.info(f"GET USERS PRIVATE INFO - Found {response}")
-
-        # Check if user exists
-        if not response.get('Items'):
-            return {
-                'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json'
-                },
-                'body': json.dumps({
-                    'message': 'We could not find your account. Please try again or contact support.'
-                })
-            }
-        
-        users = response['Items']
-
-        logger.info(f"GET USERS PRIVATE INFO - Found {users} users.")
+        limit = pagination.parse_page_size(query_params.get('limit'), leaderboard.LEADERBOARD_DEFAULT_PAGE_SIZE, leaderboard.LEADERBOARD_MAX_PAGE_SIZE)
+    except ValueError:
+        return {
+            'statusCode': 400,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': json.dumps({
+                'message': 'Invalid limit.'
+            })
+        }
 
-        filtered_users = []
+    logger.info("GET USERS ORDERED BY POINTS - Fetching leaderboard page.")
 
-        for user in users:
-            filtered_users.append({
-                'email': user['email'],
-                'points': float(user['points']),
-                'first_name': user['first_name'],
-                'last_name': user['last_name']
+    # Read one page from the points index, highest first, instead of scanning every user
+    try:
+        users, next_cursor = leaderboard.get_leaderboard_page(limit, query_params.get('cursor'))
+    except ValueError:
+        return {
+            'statusCode': 400,
+            'headers': {
+                'Content-Type': 'application/json'
+            },
+            'body': json.dumps({
+                'message': 'Invalid cursor.'
             })
-
+        }
     except Exception as e:
-        logger.error(f"GET USERS PRIVATE INFO - Couldn't get private info: {str(e)}")
+        logger.error(f"GET USERS ORDERED BY POINTS - Couldn't get leaderboard: {str(e)}")
 
         return {
             'statusCode': 500,
@@ -60,17 +53,20 @@ def lambda_handler(event, context):
                 'Content-Type': 'application/json'
             },
             'body': json.dumps({
-                'message': f"Couldn't get private info. Please try again or contact support."
+                'message': f"Couldn't get leaderboard. Please try again or contact support."
             })
         }
-    
+
+    logger.info(f"GET USERS ORDERED BY POINTS - Returning {len(users)} users.")
+
     return {
         'statusCode': 200,
         'headers': {
             'Content-Type': 'application/json'
         },
         'body': json.dumps({
-            'users': filtered_users,
+            'users': users,
+            'next_cursor': next_cursor,
             'current_user': email
         })
     }
\ No newline at end of file
@@ -1,21 +1,21 @@
 import json
-import boto3
 import os
 import logging
 
 import backend.common.common as common_handler
+import backend.common.clients as aws_clients
+import backend.common.images as images
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 def lambda_handler(event, context):
-    error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(event)
+    error_response, email = common_handler.get_authenticated_user_email(event)
     
     if error_response:
         return error_response
     
-    dynamodb = boto3.resource('dynamodb')
-    users_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
+    users_table = aws_clients.get_dynamodb_table(os.getenv('USERS_TABLE_NAME'))
 
     logger.info("GET USERS PUBLIC INFO - Fetching user information.")
 
@@ -39,7 +39,20 @@ def lambda_handler(event, context):
                 })
             }
         
-        user_profile_picture = common_handler.get_profile_picture_as_base64_from_s3(email)
+        user_info = {
+            'email': response['Item']['email'] if response.get('Item').get('email') else None,
+            'first_name': response['Item']['first_name'] if response.get('Item').get('first_name') else None,
+            'last_name': response['Item']['last_name'] if response.get('Item').get('last_name') else None,
+            'points': response['Item']['points'] if response.get('Item').get('points') else 0
+        }
+
+        # A short-lived link keeps the response small, inline base64 is opt-in
+        image_size, image_format = images.get_image_variant(event)
+
+        if images.get_image_mode(event) == images.IMAGE_MODE_INLINE:
+            user_info['profile_picture'] = common_handler.get_profile_picture_as_base64_from_s3(email, image_size, image_format)
+        else:
+            user_info['profile_picture_url'] = common_handler.get_profile_picture_url_from_s3(email, image_size, image_format)
     except Exception as e:
         logger.error(f"GET USERS PUBLIC INFO - Couldn't get public info: {str(e)}")
 
@@ -59,12 +72,6 @@ def lambda_handler(event, context):
             'Content-Type': 'application/json'
         },
         'body': json.dumps({
-            'info': {
-                'email': response['Item']['email'] if response.get('Item').get('email') else None,
-                'first_name': response['Item']['first_name'] if response.get('Item').get('first_name') else None,
-                'last_name': response['Item']['last_name'] if response.get('Item').get('last_name') else None,
-                'points': response['Item']['points'] if response.get('Item').get('points') else 0,
-                'profile_picture': user_profile_picture
-            }
+            'info': user_info
         })
     }
\ No newline at end of file
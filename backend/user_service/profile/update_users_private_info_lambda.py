@@ -1,15 +1,16 @@
 import json
-import boto3
 import os
 import logging
 
 import backend.common.common as common_handler
+import backend.common.clients as aws_clients
+import backend.common.leaderboard as leaderboard
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 def lambda_handler(event, context):
-    error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(event)
+    error_response, email = common_handler.get_authenticated_user_email(event)
     
     if error_response:
         return error_response
@@ -44,8 +45,7 @@ def lambda_handler(event, context):
             })
         }
     
-    dynamodb = boto3.resource('dynamodb')
-    users_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
+    users_table = aws_clients.get_dynamodb_table(os.getenv('USERS_TABLE_NAME'))
 
     logger.info("UPDATE USERS PRIVATE INFO - Updating user information.")
 
@@ -77,6 +77,11 @@ def lambda_handler(event, context):
             update_expression += "points = :points, "
             expression_attribute_values[':points'] = (0 if response.get('Item') is None or response['Item'].get('points') is None else response['Item'].get('points')) + points
 
+            # Keep the user's place in the leaderboard index in step with their points
+            for attribute, value in leaderboard.leaderboard_attributes(email, expression_attribute_values[':points']).items():
+                update_expression += f"{attribute} = :{attribute}, "
+                expression_attribute_values[f':{attribute}'] = value
+
         # Check if there is anything to update
         if expression_attribute_values:
             update_expression = update_expression.rstrip(', ')
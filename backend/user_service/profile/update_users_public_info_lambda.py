@@ -1,22 +1,24 @@
 import json
-import boto3
 import os
 import logging
 
 import backend.common.common as common_handler
+import backend.common.clients as aws_clients
+import backend.common.images as images
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 def lambda_handler(event, context):
-    error_response, email = common_handler.check_is_user_authenticated_and_fetch_email_from_jwt(event)
+    error_response, email = common_handler.get_authenticated_user_email(event)
     
     if error_response:
         return error_response
     
     event = json.loads(event.get('body')) if 'body' in event else event
 
-    logger.info(f'UPDATE USERS PUBLIC INFO - Checking if every required attribute is found: {event}')
+    # The picture alone can be megabytes of base64, so only the attribute names are logged
+    logger.info(f'UPDATE USERS PUBLIC INFO - Checking if every required attribute is found: {list(event.keys())}')
 
     try:
         new_first_name = event['first_name'] if 'first_name' in event else None
@@ -45,9 +47,23 @@ def lambda_handler(event, context):
                 'message': 'Please provide correct types for request.'
             })
         }
+
+    # Reject oversized or non-image pictures before anything is written
+    if new_profile_picture:
+        try:
+            images.validate_base64_image(new_profile_picture)
+        except images.ImageValidationError as e:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json'
+                },
+                'body': json.dumps({
+                    'message': str(e)
+                })
+            }
     
-    dynamodb = boto3.resource('dynamodb')
-    users_table = dynamodb.Table(os.getenv('USERS_TABLE_NAME'))
+    users_table = aws_clients.get_dynamodb_table(os.getenv('USERS_TABLE_NAME'))
 
     logger.info("UPDATE USERS PUBLIC INFO - Updating user information.")
 
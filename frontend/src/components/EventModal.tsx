@@ -19,6 +19,8 @@ interface Event {
     genre?: string;
   
     image?: string;
+
+    image_url?: string | null;
   
     picture: string;
 
@@ -39,6 +41,11 @@ interface EventModalProps {
 const EventModal: React.FC<EventModalProps> = ({ event, onClose }) => {
     const [imageUrl, setImageUrl] = useState<string | null>(null);
     useEffect(() => {
+        // The API returns a presigned S3 URL by default, base64 only with ?image_mode=inline
+        if (event.image_url) {
+          setImageUrl(event.image_url);
+          return;
+        }
         if (event.image) {
           const blob = base64ToBlob(event.image);
           const url = URL.createObjectURL(blob);
@@ -47,7 +54,7 @@ const EventModal: React.FC<EventModalProps> = ({ event, onClose }) => {
           // Clean up the URL object when the component unmounts
           return () => URL.revokeObjectURL(url);
         }
-      }, [event.image]);
+      }, [event.image, event.image_url]);
     
       const base64ToBlob = (base64: string) => {
         const byteCharacters = atob(base64);
@@ -72,7 +79,7 @@ const EventModal: React.FC<EventModalProps> = ({ event, onClose }) => {
           </div>
         </CardHeader>
         <CardContent className="space-y-4">
-        <Image src={images} alt="event" width={400} height={150} />
+        <Image src={imageUrl ?? images} alt="event" width={400} height={150} unoptimized={imageUrl !== null} />
   <p className=' flex justify-center items-center text-lg'> <strong >Performing: </strong> {event.performers}</p>
   <p className='flex justify-center items-center'>{event.description}</p>
   <div className="flex flex-wrap gap-2">